@@ -0,0 +1,193 @@
+import json
+import logging
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import zstandard  # 선택 의존성: 설치되어 있으면 zstd로 압축
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# graduation_analysis.result_encoding 값
+ENCODING_NAME = 'zc1'
+
+# 압축 알고리즘 식별용 2바이트 헤더
+_ZLIB_MAGIC = b'Z1'
+_ZSTD_MAGIC = b'S1'
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 10
+
+# analysis_result(JSON 컬럼)에 평문으로 남기는 요약 필드
+# - JSON_EXTRACT 부분 조회(fields=)와 관리자 SQL 조회가 계속 동작하도록 작은 값만 유지
+SUMMARY_FIELDS = (
+    'analysis_date',
+    'total_completed_credits',
+    'total_required_credits',
+    'overall_completion_rate',
+    'liberal_arts_cap',
+    'liberal_arts_overflow',
+    'major_detail',
+    'general_elective_detail',
+    'liberal_arts_detail',
+    'gsin_basic_detail',
+    'liberal_arts_allocation',
+    'requirement_snapshot_id',
+    'requirement_version',
+)
+
+# 요건 행의 기본 컬럼 순서 (위치 기반 인코딩)
+REQUIREMENT_COLUMNS = (
+    'category',
+    'area',
+    'required_credits',
+    'completed_credits',
+    'missing_credits',
+    'is_fulfilled',
+    'completion_rate',
+)
+
+STUDENT_REF = 'students'
+
+
+def _pack_rows(rows: List[Dict]) -> Dict[str, Any]:
+    """dict 행 목록을 {'c': 컬럼목록, 'r': 값목록} 형태로 변환 (키가 다른 행은 dict 그대로 유지)"""
+    columns = list(REQUIREMENT_COLUMNS)
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    packed = []
+    for row in rows:
+        if len(row) == len(columns) and all(c in row for c in columns):
+            packed.append([row[c] for c in columns])
+        else:
+            packed.append(row)
+    return {'c': columns, 'r': packed}
+
+
+def _unpack_rows(packed: Dict[str, Any]) -> List[Dict]:
+    columns = packed.get('c', [])
+    return [dict(zip(columns, r)) if isinstance(r, list) else r for r in packed.get('r', [])]
+
+
+def _index_subset(subset: List[Dict], rows: List[Dict]) -> Optional[List[int]]:
+    """subset의 각 행이 rows의 몇 번째 행인지 찾음 (하나라도 없으면 None)"""
+    indexes = []
+    for item in subset:
+        found = None
+        for i, row in enumerate(rows):
+            if row is item or row == item:
+                found = i
+                break
+        if found is None:
+            return None
+        indexes.append(found)
+    return indexes
+
+
+def compress_payload(payload: bytes) -> bytes:
+    if zstandard is not None:
+        return _ZSTD_MAGIC + zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    return _ZLIB_MAGIC + zlib.compress(payload, ZLIB_LEVEL)
+
+
+def decompress_payload(blob: bytes) -> bytes:
+    blob = bytes(blob)
+    magic, body = blob[:2], blob[2:]
+    if magic == _ZLIB_MAGIC:
+        return zlib.decompress(body)
+    if magic == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError('zstd로 압축된 분석 결과지만 zstandard 패키지가 설치되어 있지 않습니다.')
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise ValueError(f'알 수 없는 분석 결과 인코딩 헤더: {magic!r}')
+
+
+def compact_document(analysis_result: Dict) -> Dict:
+    """분석 결과를 압축 전 컴팩트 문서로 변환 (학생정보 참조화, 요건 행 위치 인코딩)"""
+    doc = dict(analysis_result)
+
+    student_info = doc.get('student_info')
+    if isinstance(student_info, dict):
+        doc['student_info'] = {'$ref': STUDENT_REF, 'student_id': student_info.get('student_id')}
+
+    rows = doc.get('requirements_analysis')
+    if isinstance(rows, list):
+        doc['requirements_analysis'] = _pack_rows(rows)
+        missing = doc.get('missing_requirements')
+        if isinstance(missing, list):
+            # 미달 요건은 requirements_analysis의 부분집합이므로 인덱스로만 저장
+            indexes = _index_subset(missing, rows)
+            doc['missing_requirements'] = {'$idx': indexes} if indexes is not None else _pack_rows(missing)
+    return doc
+
+
+def expand_document(doc: Dict, student_info: Optional[Dict] = None) -> Dict:
+    """compact_document의 역변환"""
+    result = dict(doc)
+
+    packed_rows = result.get('requirements_analysis')
+    rows = _unpack_rows(packed_rows) if isinstance(packed_rows, dict) else packed_rows
+    if rows is not None:
+        result['requirements_analysis'] = rows
+
+    missing = result.get('missing_requirements')
+    if isinstance(missing, dict):
+        if '$idx' in missing:
+            result['missing_requirements'] = [dict(rows[i]) for i in missing['$idx']]
+        else:
+            result['missing_requirements'] = _unpack_rows(missing)
+
+    ref = result.get('student_info')
+    if isinstance(ref, dict) and ref.get('$ref') == STUDENT_REF and student_info is not None:
+        result['student_info'] = student_info
+    return result
+
+
+def encode_analysis(analysis_result: Dict) -> bytes:
+    """분석 결과를 저장용 바이너리로 인코딩"""
+    doc = compact_document(analysis_result)
+    payload = json.dumps(doc, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+    return compress_payload(payload)
+
+
+def decode_analysis(blob: bytes, student_info: Optional[Dict] = None) -> Dict:
+    """encode_analysis로 저장된 바이너리를 원래 구조로 복원"""
+    doc = json.loads(decompress_payload(blob).decode('utf-8'))
+    return expand_document(doc, student_info)
+
+
+def summary_json(analysis_result: Dict) -> str:
+    """analysis_result 컬럼에 평문으로 남길 요약 JSON"""
+    summary = {k: analysis_result[k] for k in SUMMARY_FIELDS if k in analysis_result}
+    summary['_encoding'] = ENCODING_NAME
+    return json.dumps(summary, ensure_ascii=False, default=str)
+
+
+def encode_for_storage(analysis_result: Dict) -> Tuple[str, bytes, str]:
+    """(analysis_result 요약 JSON, analysis_blob, result_encoding) 튜플 반환"""
+    return summary_json(analysis_result), encode_analysis(analysis_result), ENCODING_NAME
+
+
+def needs_student_info(analysis: Dict) -> bool:
+    ref = analysis.get('student_info')
+    return isinstance(ref, dict) and ref.get('$ref') == STUDENT_REF
+
+
+def load_stored_analysis(row: Dict, student_info: Optional[Dict] = None) -> Optional[Dict]:
+    """graduation_analysis 행(analysis_result/analysis_blob 포함)에서 전체 분석 결과를 복원.
+
+    analysis_blob이 없는 기존 행은 analysis_result의 전체 JSON을 그대로 사용한다.
+    """
+    blob = row.get('analysis_blob')
+    if blob:
+        return decode_analysis(blob, student_info)
+    raw = row.get('analysis_result')
+    if not raw:
+        return None
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode('utf-8')
+    data = json.loads(raw) if isinstance(raw, str) else raw
+    return data
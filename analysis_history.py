@@ -0,0 +1,267 @@
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from analysis_codec import compact_document, compress_payload, decompress_payload, expand_document
+
+logger = logging.getLogger(__name__)
+
+# 델타 연쇄 길이 상한: 이 횟수마다 전체 문서(키프레임)를 저장하여 복원 비용을 제한
+KEYFRAME_INTERVAL = 10
+
+HISTORY_TABLE = 'graduation_analysis_history'
+
+# 진행 추이 조회 시 반환하는 요약 컬럼
+POINT_COLUMNS = (
+    'seq',
+    'analysis_date',
+    'total_completed_credits',
+    'total_required_credits',
+    'overall_completion_rate',
+)
+
+
+def to_document(analysis_result: Dict) -> Dict:
+    """분석 결과를 이력 비교용 컴팩트 문서로 변환 (JSON 직렬화 결과와 동일한 타입으로 정규화)"""
+    doc = compact_document(analysis_result)
+    return json.loads(json.dumps(doc, ensure_ascii=False, default=str))
+
+
+def diff_documents(old: Any, new: Any) -> Optional[Dict]:
+    """old → new 변경분(패치) 계산. 같으면 None.
+
+    패치 형식:
+        {'=': 값}                       값 전체 교체
+        {'o': {키: 패치}, 'x': [키]}     dict 키별 변경/삭제
+        {'l': {'인덱스': 패치}}           길이가 같은 list의 위치별 변경
+    """
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {}
+        for key, value in new.items():
+            sub = diff_documents(old[key], value) if key in old else {'=': value}
+            if sub is not None:
+                changed[key] = sub
+        removed = [key for key in old if key not in new]
+        patch = {}
+        if changed:
+            patch['o'] = changed
+        if removed:
+            patch['x'] = removed
+        return patch
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changed = {}
+        for i, (a, b) in enumerate(zip(old, new)):
+            sub = diff_documents(a, b)
+            if sub is not None:
+                changed[str(i)] = sub
+        return {'l': changed}
+    return {'=': new}
+
+
+def apply_patch(old: Any, patch: Optional[Dict]) -> Any:
+    """diff_documents로 만든 패치를 적용한 새 값 반환 (old는 변경하지 않음)"""
+    if patch is None:
+        return old
+    if '=' in patch:
+        return patch['=']
+    if 'l' in patch:
+        result = list(old)
+        for index, sub in patch['l'].items():
+            i = int(index)
+            result[i] = apply_patch(result[i], sub)
+        return result
+    result = dict(old)
+    for key, sub in patch.get('o', {}).items():
+        result[key] = apply_patch(result.get(key), sub)
+    for key in patch.get('x', []):
+        result.pop(key, None)
+    return result
+
+
+def encode_payload(value: Any) -> bytes:
+    payload = json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+    return compress_payload(payload)
+
+
+def decode_payload(blob: bytes) -> Any:
+    return json.loads(decompress_payload(blob).decode('utf-8'))
+
+
+def replay(rows: List[Dict]) -> Iterator[Tuple[Dict, Dict]]:
+    """seq 오름차순 이력 행(키프레임부터 시작)을 순서대로 적용하며 (행, 컴팩트 문서)를 돌려줌"""
+    doc = None
+    for row in rows:
+        payload = decode_payload(row['payload'])
+        if row['is_keyframe']:
+            doc = payload
+        elif doc is None:
+            raise ValueError(f"키프레임 없이 델타부터 시작하는 이력입니다 (seq={row['seq']})")
+        else:
+            doc = apply_patch(doc, payload)
+        yield row, doc
+
+
+def requirement_progress(doc: Dict) -> List[Dict]:
+    """스냅샷 문서에서 요건별 이수 현황만 추출"""
+    rows = expand_document(doc).get('requirements_analysis') or []
+    return [
+        {
+            'category': r.get('category'),
+            'area': r.get('area'),
+            'required_credits': r.get('required_credits'),
+            'completed_credits': r.get('completed_credits'),
+            'is_fulfilled': r.get('is_fulfilled'),
+        }
+        for r in rows
+    ]
+
+
+class AnalysisHistoryStore:
+    """graduation_analysis_history 테이블 접근 (키프레임 + 델타 추가 전용 이력)
+
+    커밋은 호출자가 담당한다. graduation_analysis 최신 행 갱신과 같은 트랜잭션에서 append를 호출한다.
+    """
+
+    def __init__(self, connection, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.connection = connection
+        self.keyframe_interval = keyframe_interval
+
+    def _fetch_range(self, student_id: str, start_seq: int, end_seq: Optional[int] = None) -> List[Dict]:
+        cursor = self.connection.cursor(dictionary=True)
+        query = f"""
+        SELECT seq, keyframe_seq, is_keyframe, payload, {', '.join(POINT_COLUMNS[1:])}
+        FROM {HISTORY_TABLE}
+        WHERE student_id = %s AND seq >= %s
+        """
+        params = [student_id, start_seq]
+        if end_seq is not None:
+            query += " AND seq <= %s"
+            params.append(end_seq)
+        query += " ORDER BY seq"
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def _latest_row(self, student_id: str, for_update: bool = False) -> Optional[Dict]:
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(
+            f"SELECT seq, keyframe_seq FROM {HISTORY_TABLE} WHERE student_id = %s "
+            f"ORDER BY seq DESC LIMIT 1{' FOR UPDATE' if for_update else ''}",
+            (student_id,)
+        )
+        row = cursor.fetchone()
+        cursor.close()
+        return row
+
+    def latest_seq(self, student_id: str) -> int:
+        """최신 이력 순번 (없으면 0) - (student_id, seq) 유니크 인덱스 역순 조회 1건"""
+        row = self._latest_row(student_id)
+        return row['seq'] if row else 0
+
+    def append(self, student_id: str, analysis_result: Dict) -> int:
+        """분석 결과를 이력에 추가하고 부여된 seq 반환"""
+        doc = to_document(analysis_result)
+        latest = self._latest_row(student_id, for_update=True)
+
+        seq = 1
+        keyframe_seq = 1
+        is_keyframe = True
+        payload = encode_payload(doc)
+        if latest:
+            seq = latest['seq'] + 1
+            if seq - latest['keyframe_seq'] < self.keyframe_interval:
+                previous = None
+                try:
+                    for _, previous in replay(self._fetch_range(student_id, latest['keyframe_seq'], latest['seq'])):
+                        pass
+                    delta = encode_payload(diff_documents(previous, doc))
+                except ValueError as e:
+                    # 이전 이력을 복원할 수 없으면 키프레임으로 저장하여 이후 델타 연쇄를 새로 시작
+                    logger.warning(f"학번 {student_id} 분석 이력 복원 실패, 키프레임으로 저장: {e}")
+                    delta = None
+                # 변경이 커서 델타가 키프레임보다 크면 키프레임으로 저장
+                if delta is not None and len(delta) < len(payload):
+                    payload = delta
+                    is_keyframe = False
+                    keyframe_seq = latest['keyframe_seq']
+            if is_keyframe:
+                keyframe_seq = seq
+
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"""
+            INSERT INTO {HISTORY_TABLE} (
+                student_id, seq, keyframe_seq, is_keyframe, payload, analysis_date,
+                total_completed_credits, total_required_credits, overall_completion_rate, created_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+            """,
+            (
+                student_id, seq, keyframe_seq, is_keyframe, payload,
+                analysis_result.get('analysis_date'),
+                float(analysis_result.get('total_completed_credits') or 0),
+                float(analysis_result.get('total_required_credits') or 0),
+                float(analysis_result.get('overall_completion_rate') or 0),
+            )
+        )
+        cursor.close()
+        return seq
+
+    def list_points(self, student_id: str, limit: Optional[int] = None) -> List[Dict]:
+        """요약 컬럼만 최신순으로 조회 (본문 복원 없음)"""
+        cursor = self.connection.cursor(dictionary=True)
+        query = f"""
+        SELECT {', '.join(POINT_COLUMNS)}
+        FROM {HISTORY_TABLE}
+        WHERE student_id = %s
+        ORDER BY seq DESC
+        """
+        params = [student_id]
+        if limit:
+            query += " LIMIT %s"
+            params.append(int(limit))
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def iter_snapshots(self, student_id: str, from_seq: int = 1,
+                       to_seq: Optional[int] = None) -> Iterator[Tuple[Dict, Dict]]:
+        """from_seq~to_seq 구간의 스냅샷을 (행, 컴팩트 문서)로 순서대로 복원.
+
+        구간 시작 직전 키프레임부터 한 번의 범위 조회로 읽어 델타를 차례로 적용하므로
+        스냅샷 n개 복원 비용은 O(n + 키프레임 간격)이다.
+        """
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(
+            f"SELECT keyframe_seq FROM {HISTORY_TABLE} WHERE student_id = %s AND seq >= %s ORDER BY seq LIMIT 1",
+            (student_id, from_seq)
+        )
+        start = cursor.fetchone()
+        cursor.close()
+        if not start:
+            return
+        for row, doc in replay(self._fetch_range(student_id, start['keyframe_seq'], to_seq)):
+            if row['seq'] >= from_seq:
+                yield row, doc
+
+    def get_snapshot(self, student_id: str, seq: int, student_info: Optional[Dict] = None) -> Optional[Dict]:
+        """특정 seq 시점의 전체 분석 결과 복원"""
+        for row, doc in self.iter_snapshots(student_id, seq, seq):
+            return expand_document(doc, student_info)
+        return None
+
+    def progress(self, student_id: str, limit: Optional[int] = None,
+                 with_requirements: bool = False) -> List[Dict]:
+        """진행 추이 (오래된 순). with_requirements이면 각 시점의 요건별 이수 현황 포함"""
+        points = list(reversed(self.list_points(student_id, limit)))
+        if not with_requirements or not points:
+            return points
+        by_seq = {p['seq']: p for p in points}
+        for row, doc in self.iter_snapshots(student_id, points[0]['seq'], points[-1]['seq']):
+            point = by_seq.get(row['seq'])
+            if point is not None:
+                point['requirements'] = requirement_progress(doc)
+        return points
@@ -0,0 +1,462 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from upload_archive import file_lock
+from upload_intake import UploadRejected, check_xlsx_container
+
+logger = logging.getLogger(__name__)
+
+REPORT_NAME = re.compile(r'^report_.+\.xlsx$', re.IGNORECASE)
+MAX_BULK_FILES = int(os.environ.get('BULK_IMPORT_MAX_FILES', 1000))
+MAX_MEMBER_SIZE = 10 * 1024 * 1024
+BULK_IMPORT_WORKERS = int(os.environ.get('BULK_IMPORT_WORKERS', os.cpu_count() or 2))
+# 진행 상황 파일 갱신 최소 간격(초)
+STATUS_WRITE_INTERVAL = 1.0
+_STUDENT_ID = re.compile(r'^\d{6,12}$')
+# 작업 프로세스로 실행하는 가져오기 스크립트
+IMPORT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools', 'import_reports_zip.py')
+FINISHED_STAGES = ('done', 'error')
+
+
+class BulkImportError(Exception):
+    """압축 파일 전체를 처리할 수 없음 (개별 파일 오류는 결과에 기록)"""
+
+
+def normalize_student_id(value) -> Optional[str]:
+    """파싱된 학번을 문자열로 정리 ('2021123456.0' 등 숫자 셀 포함), 형식이 다르면 None"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if text.endswith('.0'):
+        text = text[:-2]
+    return text if _STUDENT_ID.match(text) else None
+
+
+def report_members(zip_path: str) -> Tuple[List[str], List[Dict]]:
+    """압축 파일에서 처리할 report_*.xlsx 항목과 건너뛴 항목 목록"""
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            infos = archive.infolist()
+    except (zipfile.BadZipFile, OSError) as e:
+        raise BulkImportError(f"ZIP 파일을 열 수 없습니다: {e}")
+
+    names, skipped = [], []
+    for info in infos:
+        base = os.path.basename(info.filename)
+        if info.is_dir() or info.filename.startswith('__MACOSX/') or base.startswith('.'):
+            continue
+        if not REPORT_NAME.match(base):
+            skipped.append({'file': info.filename, 'reason': 'report_*.xlsx 형식의 파일이 아닙니다.'})
+        elif info.file_size > MAX_MEMBER_SIZE:
+            skipped.append({'file': info.filename, 'reason': f"파일 크기가 {MAX_MEMBER_SIZE // (1024 * 1024)}MB를 넘습니다."})
+        else:
+            names.append(info.filename)
+    if not names:
+        raise BulkImportError('압축 파일에 report_*.xlsx 파일이 없습니다.')
+    if len(names) > MAX_BULK_FILES:
+        raise BulkImportError(f"한 번에 {MAX_BULK_FILES}개까지 가져올 수 있습니다 ({len(names)}개).")
+    return sorted(names), skipped
+
+
+def _init_parse_worker():
+    # 파일마다 남기는 파서 INFO 로그가 워커 수만큼 섞이지 않도록
+    logging.disable(logging.INFO)
+
+
+def parse_member(zip_path: str, name: str) -> Dict:
+    """압축 파일의 성적표 하나를 파싱 (프로세스 풀 워커에서 실행)"""
+    from enhanced_xlsx_parser import EnhancedXlsxParser
+
+    result = {'file': name}
+    with zipfile.ZipFile(zip_path) as archive:
+        content = archive.read(name)
+    result['sha256'] = hashlib.sha256(content).hexdigest()
+    try:
+        check_xlsx_container(content)
+    except UploadRejected as e:
+        result['error'] = str(e)
+        return result
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        personal_info, course_records = EnhancedXlsxParser(None).parse_excel_file(path)
+    except Exception as e:
+        result['error'] = f"파싱 실패: {e}"
+        return result
+    finally:
+        os.remove(path)
+
+    student_id = normalize_student_id((personal_info or {}).get('학번'))
+    if student_id is None:
+        result['error'] = '성적표에서 학번을 찾을 수 없습니다.'
+        return result
+    if not personal_info.get('성명'):
+        personal_info['성명'] = f"학생_{student_id}"
+    result.update(student_id=student_id, personal_info=personal_info, course_records=course_records,
+                  warnings=personal_info.get('parsing_warnings', []))
+    return result
+
+
+class BulkImporter:
+    """성적표 ZIP 일괄 가져오기: 프로세스 풀 파싱 → 학생별 저장(수강기록 일괄 INSERT) → 한 연결로 일괄 분석
+
+    파일별 오류(형식/파싱/학번 없음/중복/저장/분석)는 결과에 남기고 나머지 파일은 계속 처리한다.
+    progress(files, summary)는 파일 상태가 바뀔 때마다 호출된다.
+    """
+
+    def __init__(self, db_config: Dict, archive=None, workers: int = BULK_IMPORT_WORKERS,
+                 progress: Optional[Callable[[List[Dict], Dict], None]] = None,
+                 parse: Callable[[str, str], Dict] = parse_member):
+        self.db_config = db_config
+        self.archive = archive
+        self.workers = max(1, workers)
+        self.progress = progress
+        self.parse = parse
+        self.files: Dict[str, Dict] = {}
+        self.stage = 'pending'
+        self.started = None
+
+    def run(self, zip_path: str, analyze: bool = True) -> Dict:
+        self.started = time.perf_counter()
+        names, skipped = report_members(zip_path)
+        for name in names:
+            self.files[name] = {'file': name, 'status': 'pending'}
+        for item in skipped:
+            self.files[item['file']] = {'file': item['file'], 'status': 'skipped', 'error': item['reason']}
+
+        self._set_stage('parsing')
+        parsed = self.parse_all(zip_path, names)
+        parsed = self._drop_duplicates(parsed)
+        self._set_stage('saving')
+        saved = self.save_all(zip_path, parsed)
+        if analyze and saved:
+            self._set_stage('analyzing')
+            self.analyze_all(saved)
+        self._set_stage('done')
+        return self.summary()
+
+    def parse_all(self, zip_path: str, names: List[str]) -> List[Dict]:
+        results = []
+        if self.workers == 1:
+            for name in names:
+                results.append(self._parsed(self._safe_parse(zip_path, name)))
+            return results
+        # 서버 프로세스에는 세션/해시/메트릭 스레드가 있어 fork 대신 spawn으로 워커 시작
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=_init_parse_worker) as pool:
+            futures = {pool.submit(self.parse, zip_path, name): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'file': futures[future], 'error': f"파싱 실패: {e}"}
+                results.append(self._parsed(result))
+        return sorted(results, key=lambda r: r['file'])
+
+    def _safe_parse(self, zip_path: str, name: str) -> Dict:
+        try:
+            return self.parse(zip_path, name)
+        except Exception as e:
+            return {'file': name, 'error': f"파싱 실패: {e}"}
+
+    def _parsed(self, result: Dict) -> Dict:
+        if result.get('error'):
+            self._update(result['file'], 'failed', error=result['error'])
+        else:
+            self._update(result['file'], 'parsed', student_id=result['student_id'],
+                         courses=len(result['course_records']), warnings=result.get('warnings') or [])
+        return result
+
+    def _drop_duplicates(self, parsed: List[Dict]) -> List[Dict]:
+        """같은 학번이 여러 파일에 있으면 파일명 순 첫 파일만 저장"""
+        first: Dict[str, str] = {}
+        kept = []
+        for result in parsed:
+            if result.get('error'):
+                continue
+            student_id = result['student_id']
+            if student_id in first:
+                self._update(result['file'], 'failed', error=f"학번 {student_id}이(가) {first[student_id]}와 중복됩니다.")
+                continue
+            first[student_id] = result['file']
+            kept.append(result)
+        return kept
+
+    def save_all(self, zip_path: str, parsed: List[Dict]) -> List[Dict]:
+        """학생별 트랜잭션으로 저장, 자동 생성 계정 비밀번호 해시는 미리 병렬 계산"""
+        from enhanced_xlsx_parser import DEFAULT_STUDENT_PASSWORD, EnhancedXlsxParser
+        from password_hashing import password_hasher
+
+        if not parsed:
+            return []
+        parser = EnhancedXlsxParser(self.db_config)
+        parser.connect_db()
+        saved = []
+        try:
+            existing = self._existing_users(parser.connection, [r['student_id'] for r in parsed])
+            new_ids = [r['student_id'] for r in parsed if r['student_id'] not in existing]
+            try:
+                hashes = dict(zip(new_ids, password_hasher.hash_many([DEFAULT_STUDENT_PASSWORD] * len(new_ids))))
+            except Exception as e:
+                # 해시 풀이 포화되어도 배치를 멈추지 않고 파일별로 다시 계산
+                logger.warning(f"일괄 가져오기 비밀번호 해시 일괄 계산 실패, 파일별로 재시도: {e}")
+                hashes = {}
+            with zipfile.ZipFile(zip_path) as source:
+                for result in parsed:
+                    student_id = result['student_id']
+                    if student_id not in existing and student_id not in hashes:
+                        try:
+                            hashes[student_id] = password_hasher.hash(DEFAULT_STUDENT_PASSWORD)
+                        except Exception as e:
+                            self._update(result['file'], 'failed', error=f"계정 비밀번호 생성 실패: {e}")
+                            continue
+                    try:
+                        parser.save_records(student_id, result['personal_info'], result['course_records'],
+                                            hashes.get(student_id))
+                    except Exception as e:
+                        self._update(result['file'], 'failed', error=f"저장 실패: {e}")
+                        continue
+                    if self.archive is not None:
+                        try:
+                            self.archive.store(student_id, source.read(result['file']), result['sha256'],
+                                               os.path.basename(result['file']))
+                        except OSError as e:
+                            logger.warning(f"일괄 가져오기 원본 보관 실패: {result['file']} - {e}")
+                    self._update(result['file'], 'saved')
+                    saved.append(result)
+        finally:
+            parser.disconnect_db()
+        return saved
+
+    @staticmethod
+    def _existing_users(connection, student_ids: List[str]) -> set:
+        existing = set()
+        cursor = connection.cursor()
+        try:
+            for start in range(0, len(student_ids), 500):
+                chunk = student_ids[start:start + 500]
+                cursor.execute(f"SELECT username FROM users WHERE username IN ({', '.join(['%s'] * len(chunk))})",
+                               chunk)
+                existing.update(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.close()
+        connection.commit()
+        return existing
+
+    def analyze_all(self, saved: List[Dict]):
+        """한 연결로 학과/입학년도 순 일괄 분석 (같은 코호트의 요건 인덱스/이수 계획 캐시 재사용)"""
+        from graduation_core import extract_admission_year
+        from graduation_requirements_checker import GraduationRequirementsChecker
+
+        def cohort(result):
+            info = result['personal_info']
+            return (str(info.get('학과') or ''), extract_admission_year(info.get('입학일자')) or 0, result['student_id'])
+
+        checker = GraduationRequirementsChecker(self.db_config)
+        checker.connect_db()
+        try:
+            for result in sorted(saved, key=cohort):
+                try:
+                    analysis = checker.analyze_graduation_status(result['student_id'], result.get('warnings') or None)
+                except Exception as e:
+                    analysis = {'error': str(e)}
+                if 'error' in analysis:
+                    self._update(result['file'], 'saved', analysis_error=analysis['error'])
+                else:
+                    self._update(result['file'], 'analyzed',
+                                 completion_rate=analysis.get('overall_completion_rate'))
+        finally:
+            checker.disconnect_db()
+
+    def _set_stage(self, stage: str):
+        self.stage = stage
+        self._notify()
+
+    def _update(self, name: str, status: str, **fields):
+        entry = self.files.setdefault(name, {'file': name})
+        entry['status'] = status
+        entry.update(fields)
+        self._notify()
+
+    def _notify(self):
+        if self.progress is not None:
+            self.progress(list(self.files.values()), self.summary())
+
+    def summary(self) -> Dict:
+        counts: Dict[str, int] = {}
+        for entry in self.files.values():
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        return {
+            'stage': self.stage,
+            'total_files': len(self.files),
+            'counts': counts,
+            'analysis_errors': sum(1 for e in self.files.values() if e.get('analysis_error')),
+            'elapsed_seconds': round(time.perf_counter() - self.started, 1) if self.started else 0.0,
+        }
+
+
+def _process_alive(pid: int) -> bool:
+    if os.name == 'nt':  # Windows 개발 환경: os.kill(pid, 0)이 프로세스를 종료시키므로 확인하지 않음
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class BulkImportJobs:
+    """관리자 일괄 가져오기 작업 (상태는 파일로 공유해 어느 워커에서나 조회)
+
+    웹 워커는 max_requests마다 재시작되므로 작업은 별도 프로세스(tools/import_reports_zip.py --job)로
+    실행한다. 작업 프로세스가 끝나지 않고 사라지면 다음 조회 때 error로 표시하고 ZIP을 정리한다.
+    """
+
+    def __init__(self, root: str, db_config: Dict, archive=None, script: str = IMPORT_SCRIPT):
+        self.root = root
+        self.db_config = db_config
+        self.archive = archive
+        self.script = script
+
+    def _status_path(self, job_id: str) -> str:
+        return os.path.join(self.root, f"{job_id}.json")
+
+    def _zip_path(self, job_id: str) -> str:
+        return os.path.join(self.root, f"{job_id}.zip")
+
+    def _pid_path(self, job_id: str) -> str:
+        return os.path.join(self.root, f"{job_id}.pid")
+
+    def _write_status(self, job_id: str, status: Dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.tmp.')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(status, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self._status_path(job_id))
+
+    def _read_status(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(self._status_path(job_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _job_pid(self, job_id: str) -> Optional[int]:
+        try:
+            with open(self._pid_path(job_id), encoding='utf-8') as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _cleanup(self, job_id: str):
+        for path in (self._zip_path(job_id), self._pid_path(job_id)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        if not re.match(r'^[0-9a-f]{32}$', job_id or ''):
+            return None
+        status = self._read_status(job_id)
+        if status is None or status.get('summary', {}).get('stage') in FINISHED_STAGES:
+            return status
+        pid = self._job_pid(job_id)
+        if pid is not None and not _process_alive(pid):
+            # 완료 상태를 남기기 전에 작업 프로세스가 사라짐 (강제 종료/서버 재시작 등)
+            status = self._read_status(job_id) or status
+            if status.get('summary', {}).get('stage') not in FINISHED_STAGES:
+                logger.error(f"일괄 가져오기 작업 프로세스 종료됨: {job_id} (pid {pid})")
+                status['summary'] = dict(status.get('summary') or {}, stage='error',
+                                         error='가져오기 작업 프로세스가 완료 전에 종료되었습니다.')
+                self._write_status(job_id, status)
+            self._cleanup(job_id)
+        return status
+
+    def _command(self, job_id: str, analyze: bool, workers: int) -> List[str]:
+        command = [sys.executable, self.script, '--job', job_id, '--job-dir', os.path.abspath(self.root),
+                   '--workers', str(workers)]
+        if not analyze:
+            command.append('--no-analysis')
+        if self.archive is None:
+            command.append('--no-archive')
+        else:
+            command += ['--archive-dir', os.path.abspath(self.archive.root)]
+        return command
+
+    def incoming_path(self) -> str:
+        """업로드를 바로 받아 쓸 작업 폴더 안 임시 경로 (start가 같은 파일시스템 안에서 이름만 바꿔 옮김)"""
+        os.makedirs(self.root, exist_ok=True)
+        return os.path.join(self.root, f".incoming.{uuid.uuid4().hex}.zip")
+
+    def start(self, upload_path: str, original_name: str, requested_by: str, analyze: bool = True,
+              workers: int = BULK_IMPORT_WORKERS) -> str:
+        """디스크에 받은 ZIP(upload_path)을 작업 파일로 옮기고 작업 프로세스 시작"""
+        os.makedirs(self.root, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        zip_path = self._zip_path(job_id)
+        os.replace(upload_path, zip_path)
+        # 압축 구조 오류는 작업을 만들기 전에 바로 알림
+        try:
+            report_members(zip_path)
+        except BulkImportError:
+            os.remove(zip_path)
+            raise
+        base = {'job_id': job_id, 'file': original_name, 'requested_by': requested_by,
+                'created_at': datetime.now().isoformat(timespec='seconds')}
+        self._write_status(job_id, dict(base, summary={'stage': 'pending'}, files=[]))
+        try:
+            process = subprocess.Popen(self._command(job_id, analyze, workers), stdin=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)), start_new_session=True)
+        except OSError:
+            self._cleanup(job_id)
+            os.remove(self._status_path(job_id))
+            raise
+        with open(self._pid_path(job_id), 'w', encoding='utf-8') as f:
+            f.write(str(process.pid))
+        # 끝난 작업 프로세스를 회수 (좀비로 남아 살아 있는 것처럼 보이지 않도록)
+        threading.Thread(target=process.wait, name=f"bulk-import-{job_id[:8]}", daemon=True).start()
+        return job_id
+
+    def run(self, job_id: str, analyze: bool = True, workers: int = BULK_IMPORT_WORKERS) -> Dict:
+        """작업 프로세스에서 실행 (같은 루트의 작업은 잠금으로 하나씩 처리)"""
+        base = {k: v for k, v in (self._read_status(job_id) or {'job_id': job_id}).items()
+                if k not in ('summary', 'files')}
+        last_write = [0.0]
+
+        def progress(files, summary, force=False):
+            now = time.monotonic()
+            if not force and now - last_write[0] < STATUS_WRITE_INTERVAL and summary['stage'] != 'done':
+                return
+            last_write[0] = now
+            self._write_status(job_id, dict(base, summary=summary, files=files))
+
+        importer = BulkImporter(self.db_config, self.archive, workers=workers, progress=progress)
+        try:
+            with file_lock(os.path.join(self.root, '.run.lock')):
+                summary = importer.run(self._zip_path(job_id), analyze=analyze)
+            logger.info(f"일괄 가져오기 완료: {job_id} {summary}")
+        except Exception as e:
+            logger.error(f"일괄 가져오기 오류: {job_id} - {e}", exc_info=True)
+            summary = dict(importer.summary(), stage='error', error=str(e))
+        progress(list(importer.files.values()), summary, force=True)
+        self._cleanup(job_id)
+        return summary
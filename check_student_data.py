@@ -1,4 +1,5 @@
 import mysql.connector
+from course_rules import course_category_area, is_passed_course
 
 conn = mysql.connector.connect(
     host='203.255.78.58',
@@ -23,19 +24,14 @@ for s in students:
 if students:
     student_id = students[0]['student_id']
     print(f"\n=== {student_id} 학생의 수강 과목 ===")
-    cursor.execute('SELECT category, area, sub_area, course_name, credit, grade FROM course_records WHERE student_id=%s', (student_id,))
+    cursor.execute('SELECT category, area, sub_area, course_name, credit, grade, completion_type, is_passed FROM course_records WHERE student_id=%s', (student_id,))
     courses = cursor.fetchall()
     
     total_credits = {}
     for c in courses:
-        cat = c['category']
-        area = c['area'] if c['area'] else ''
-        key = f"{cat}_{area}" if area else cat
+        key = course_category_area(c)
         
-        grade = str(c['grade']).upper()
-        passing = grade in ['A+', 'A0', 'A-', 'B+', 'B0', 'B-', 'C+', 'C0', 'C-', 'D+', 'D0', 'P', '통과']
-        
-        if passing:
+        if is_passed_course(c):
             total_credits[key] = total_credits.get(key, 0) + float(c['credit'])
         
         print(f"  [{c['category']}] {c['area'] or ''} - {c['course_name']}: {c['credit']}학점 ({c['grade']})")
@@ -0,0 +1,497 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from course_rules import category_area_key, is_passed
+from liberal_allocation import UNCLASSIFIED_KEY, AllocationPlan, allocate_cohort, allocation_record
+
+logger = logging.getLogger(__name__)
+
+# analyze_graduation_status의 학점 계산을 학과/입학년도 코호트 전체에 배열 연산으로 적용한다.
+# 결과는 학생별 분석기와 같아야 한다 (tests/test_cohort_engine.py).
+EXCLUDE_KEYWORDS = ('총계', '합계', '학점총계', '교양총계', '졸업')
+DEFAULT_LIBERAL_CAP = 40.0
+DEFAULT_GRADUATION_CREDITS = 130.0
+GSIN_AREA = '개신기초교양'
+GSIN_TOTAL_AREA = '개신기초교양(총합)'
+GSIN_PARTS = ('인성과 비판적 사고', '의사소통', '영어', '정보문해')
+GSIN_SUB_MAP = {
+    '인성과 비판적 사고': '인성과 비판적 사고',
+    '인성과비판적사고': '인성과 비판적 사고',
+    '의사소통': '의사소통',
+    '영어': '영어',
+    '정보문해': '정보문해',
+}
+GSIN_PART_REQUIRED = 3.0
+OCU_KEY = '교양_OCU기타'
+
+STUDENT_COLUMNS = ('student_id', 'major_required_credits', 'major_elective_credits', 'general_elective_credits')
+COURSE_COLUMNS = ('student_id', 'category', 'area', 'sub_area', 'course_code', 'grade', 'completion_type',
+                  'credit', 'is_passed')
+# 반복 값이 많은 열은 범주형으로 받아 집계 단계에서 코드만 사용
+CATEGORICAL_COLUMNS = ('student_id', 'category', 'area', 'sub_area', 'course_code', 'grade', 'completion_type',
+                       'is_passed')
+DENSE_COMBINE_LIMIT = 1 << 22
+
+
+def _float_or_none(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RequirementPlan:
+    """요건 행 목록을 분석기 규칙대로 해석한 평가 계획 (학과/입학년도마다 한 번 생성)"""
+
+    def __init__(self, requirements: List[Dict]):
+        caps = [_float_or_none(r.get('max_credits')) for r in requirements
+                if str(r.get('category')) == '교양' and r.get('max_credits') is not None]
+        caps = [c for c in caps if c is not None]
+        self.liberal_cap = max(caps) if caps else DEFAULT_LIBERAL_CAP
+
+        self.graduation_credits = DEFAULT_GRADUATION_CREDITS
+        for r in requirements:
+            if (str(r.get('category')).find('졸업') != -1 or str(r.get('area')).find('졸업') != -1
+                    or str(r.get('category')).find('총계') != -1):
+                value = _float_or_none(r.get('required_credits'))
+                if value is not None:
+                    self.graduation_credits = value
+                    break
+
+        filtered = [r for r in requirements if not any(
+            (str(r.get('area', '')) + str(r.get('category', ''))).find(k) != -1 for k in EXCLUDE_KEYWORDS)]
+
+        self.rows: List[Dict] = []
+        self.liberal_keys: Set[str] = set()
+        used_keys = set()
+        for r in filtered:
+            category = r.get('category')
+            area = r.get('area', '')
+            key = category_area_key(category, area)
+            if key in used_keys:
+                continue
+            used_keys.add(key)
+            max_credits = r.get('max_credits')
+            if category == '교양':
+                self.liberal_keys.add(key)
+                if max_credits is not None:
+                    value = _float_or_none(max_credits)
+                    if value is not None and value > self.liberal_cap:
+                        self.liberal_cap = value
+
+            if category == '전공' and area == '전공필수':
+                source = 'major_required'
+            elif category == '전공' and area == '전공선택':
+                source = 'major_elective'
+            elif category == '일선':
+                source = 'general_elective'
+            else:
+                source = 'key'
+            self.rows.append({
+                'category': category,
+                'area': area,
+                'key': key,
+                'required_credits': float(r.get('required_credits', 0)),
+                'max_credits': _float_or_none(max_credits) if source == 'key' and max_credits is not None else None,
+                'source': source,
+                'gsin': category == '교양' and GSIN_AREA in (area or ''),
+            })
+
+        # 영역 없는 교양 배분 대상 영역 (liberal_allocation)
+        self.allocation = AllocationPlan(requirements)
+        self.has_gsin = any(row['gsin'] for row in self.rows)
+        self.result_labels = {(row['category'], row['area']) for row in self.rows if not row['gsin']}
+        self.result_categories = {row['category'] for row in self.rows if not row['gsin']}
+
+
+class CohortCredits:
+    """학과/입학년도 학생들의 영역별 이수학점 행렬 (학생 × 'category_area' 키)과 개신기초교양 세부영역 합계"""
+
+    def __init__(self, student_ids: List[str], keys: List[str], matrix: np.ndarray,
+                 major_required: np.ndarray, major_elective: np.ndarray, general_elective: np.ndarray,
+                 present: Optional[np.ndarray] = None, gsin_parts: Optional[np.ndarray] = None):
+        self.student_ids = list(student_ids)
+        self._positions = None
+        self.keys = list(keys)
+        self.key_index = {k: i for i, k in enumerate(self.keys)}
+        self.matrix = matrix
+        # present: 해당 키의 통과 과목이 있는지 (분석기의 'key in completed_credits_by_category')
+        self.present = present if present is not None else matrix != 0
+        self.gsin_parts = gsin_parts if gsin_parts is not None else np.zeros((len(self.student_ids), len(GSIN_PARTS)))
+        self.major_required = major_required
+        self.major_elective = major_elective
+        self.general_elective = general_elective
+
+    def __len__(self):
+        return len(self.student_ids)
+
+    def position(self, student_id: str) -> int:
+        # 학생별 결과 조회에서만 필요하므로 처음 쓸 때 만든다
+        if self._positions is None:
+            self._positions = {sid: i for i, sid in enumerate(self.student_ids)}
+        return self._positions[student_id]
+
+    def column(self, key: str) -> np.ndarray:
+        idx = self.key_index.get(key)
+        if idx is None:
+            return np.zeros(len(self.student_ids))
+        return self.matrix[:, idx]
+
+    def has_key(self, key: str) -> np.ndarray:
+        idx = self.key_index.get(key)
+        if idx is None:
+            return np.zeros(len(self.student_ids), dtype=bool)
+        return self.present[:, idx]
+
+
+def _student_credit_column(series: pd.Series) -> np.ndarray:
+    # 분석기: float(x) if x else 0.0 (DataFrame에서 None은 NaN)
+    return pd.to_numeric(series, errors='coerce').fillna(0.0).to_numpy(dtype=float)
+
+
+def _factorize(series) -> Tuple[np.ndarray, List]:
+    """열 값을 정수 코드로 (NaN은 None 하나로 취급)"""
+    if isinstance(getattr(series, 'dtype', None), pd.CategoricalDtype):
+        # 범주형 열은 코드 재사용 (NaN 코드 -1은 마지막 None으로)
+        categories = list(series.cat.categories)
+        codes = series.cat.codes.to_numpy().astype(np.intp)
+        codes[codes < 0] = len(categories)
+        return codes, categories + [None]
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes.astype(np.intp, copy=False), [None if pd.isna(u) else u for u in uniques]
+
+
+def _combine(*columns: Tuple[np.ndarray, List]) -> Tuple[np.ndarray, List[Tuple]]:
+    """여러 (코드, 고유값) 열을 하나의 조합 번호로 묶음. 반환: (행별 조합 번호, 조합별 값 튜플)
+
+    조합 공간이 작으면 정렬 없이 bincount 조회표로 번호를 매긴다.
+    """
+    sizes = [max(len(values), 1) for _, values in columns]
+    combined = np.zeros(len(columns[0][0]), dtype=np.intp)
+    for (codes, _), size in zip(columns, sizes):
+        combined *= size
+        combined += codes
+    space = int(np.prod(sizes, dtype=np.int64))
+    if space > DENSE_COMBINE_LIMIT:
+        used, inverse = np.unique(combined, return_inverse=True)
+        inverse = inverse.reshape(-1)
+    else:
+        used = np.flatnonzero(np.bincount(combined, minlength=space))
+        lookup = np.empty(space, dtype=np.intp)
+        lookup[used] = np.arange(len(used))
+        inverse = lookup[combined]
+    combos = []
+    for value in used.tolist():
+        parts = []
+        for (_, values), size in zip(reversed(columns), reversed(sizes)):
+            value, code = divmod(value, size)
+            parts.append(values[code])
+        combos.append(tuple(reversed(parts)))
+    return inverse, combos
+
+
+def _student_index(student_ids: List[str], series: pd.Series) -> np.ndarray:
+    """수강기록 행별 학생 위치 (코호트에 없는 학생은 -1)"""
+    index = pd.Index(student_ids)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        positions = np.append(index.get_indexer(series.cat.categories), -1)
+        return positions[series.cat.codes.to_numpy()]
+    return index.get_indexer(series)
+
+
+def course_frame(records: List) -> pd.DataFrame:
+    """수강기록 행(COURSE_COLUMNS 순서의 튜플 또는 dict) 목록을 엔진 입력 DataFrame으로"""
+    frame = pd.DataFrame.from_records(records, columns=list(COURSE_COLUMNS))
+    for column in CATEGORICAL_COLUMNS:
+        frame[column] = frame[column].astype('category')
+    return frame
+
+
+def aggregate_cohort(students: pd.DataFrame, courses: pd.DataFrame,
+                     recognized_codes: Iterable[str] = ()) -> CohortCredits:
+    """코호트 수강기록을 (학생, category_area 키) 단위 한 번의 그룹 합계(bincount)로 집계
+
+    통과 판정(course_rules.is_passed / 저장된 is_passed), 타학과 개별과목 인정, 키 생성은
+    값의 서로 다른 조합마다 한 번씩만 분석기 규칙을 적용하고 정수 코드로 모든 행에 펼친다.
+    """
+    student_ids = students['student_id'].tolist()
+    n = len(student_ids)
+    recognized_codes = set(recognized_codes)
+    if courses.empty:
+        return CohortCredits(
+            student_ids, [], np.zeros((n, 0)),
+            _student_credit_column(students['major_required_credits']),
+            _student_credit_column(students['major_elective_credits']),
+            _student_credit_column(students['general_elective_credits']),
+        )
+
+    sidx = _student_index(student_ids, courses['student_id'])
+    credit = pd.to_numeric(courses['credit'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+    credit_positive = (credit > 0).astype(np.intp)
+
+    # 통과 여부: (성적, 이수구분, 학점>0, 저장값) 조합별로 판정
+    stored_column = courses['is_passed'] if 'is_passed' in courses else pd.Series([None] * len(courses))
+    combo, combos = _combine(_factorize(courses['grade']), _factorize(courses['completion_type']),
+                             (credit_positive, [0, 1]), _factorize(stored_column))
+    combo_passed = np.array([
+        bool(stored) if stored is not None else is_passed(grade, completion, positive)
+        for grade, completion, positive, stored in combos
+    ], dtype=bool)
+    passed = combo_passed[combo] & (sidx >= 0)
+
+    # 집계 키: (교과목번호, 카테고리, 영역) 조합별로 인정 규칙 적용 후 'category_area' 키 생성
+    # 인정 규칙이 없으면 교과목번호는 키에 영향이 없으므로 조합에서 뺀다
+    code_column = (_factorize(courses['course_code']) if recognized_codes
+                   else (np.zeros(len(courses), dtype=np.intp), [None]))
+    combo, combos = _combine(code_column, _factorize(courses['category']), _factorize(courses['area']))
+    combo_keys = []
+    combo_gsin = []
+    for code, category, area in combos:
+        if (code or '').strip() in recognized_codes and (category or '').strip() != '전공':
+            category, area = '전공', '전공선택'
+        combo_keys.append(category_area_key(category, area))
+        # 분석기: category == '교양' 그리고 area.strip() == '개신기초교양'인 과목만 세부영역 집계
+        combo_gsin.append(category == '교양' and (area or '').strip() == GSIN_AREA)
+    key_of_combo, keys = pd.factorize(pd.Series(combo_keys, dtype=object), use_na_sentinel=False)
+    key_codes = key_of_combo[combo]
+    k = len(keys)
+
+    flat = sidx[passed] * k + key_codes[passed]
+    totals = np.bincount(flat, weights=credit[passed], minlength=n * k).reshape(n, k)
+    present = (np.bincount(flat, minlength=n * k) > 0).reshape(n, k)
+
+    # 개신기초교양 세부영역: 해당 과목 행만 세부영역 값을 해석
+    gsin_rows = np.flatnonzero(passed & np.array(combo_gsin, dtype=bool)[combo])
+    sub_codes, subs = _factorize(courses['sub_area'])
+    sub_codes = sub_codes[gsin_rows]
+    part_index = {p: i for i, p in enumerate(GSIN_PARTS)}
+    sub_parts = np.array([part_index.get(GSIN_SUB_MAP.get((s or '').strip(), (s or '').strip()), -1)
+                          for s in subs], dtype=np.intp)
+    parts = sub_parts[sub_codes]
+    gsin_rows, parts = gsin_rows[parts >= 0], parts[parts >= 0]
+    gsin_parts = np.bincount(sidx[gsin_rows] * len(GSIN_PARTS) + parts, weights=credit[gsin_rows],
+                             minlength=n * len(GSIN_PARTS)).reshape(n, len(GSIN_PARTS))
+
+    return CohortCredits(
+        student_ids, list(keys), totals,
+        _student_credit_column(students['major_required_credits']),
+        _student_credit_column(students['major_elective_credits']),
+        _student_credit_column(students['general_elective_credits']),
+        present=present, gsin_parts=gsin_parts,
+    )
+
+
+class CohortResult:
+    """코호트 평가 결과 (배열), to_analysis(i)로 학생별 분석 결과 dict를 만든다"""
+
+    def __init__(self, plan: RequirementPlan, credits: CohortCredits):
+        self.plan = plan
+        self.credits = credits
+        self.rows: List[Tuple[Dict, np.ndarray, np.ndarray]] = []  # (행 정보, 이수학점, 해당 학생 여부)
+        self.liberal_detail: List[Tuple[str, np.ndarray, np.ndarray]] = []
+        self.total_completed = None
+        self.liberal_overflow = None
+        self.allocation = None  # (영역 없는 교양 학점, 배분 전 영역별 이수학점, 영역별 배분 학점)
+
+    def requirement_status(self) -> Dict[Tuple[str, Optional[str]], Dict]:
+        """요건표 행(개신기초교양은 총합)별 필요학점과 학생별 충족 여부 배열
+
+        요건표에 없는 표시용 행(OCU기타, 일선, 다전공)은 제외한다.
+        """
+        return {
+            (row['category'], row['area']): {'required_credits': row['required_credits'],
+                                             'fulfilled': completed >= row['required_credits']}
+            for row, completed, applies in self.rows if not row.get('fixed')
+        }
+
+    def to_analysis(self, i: int) -> Dict:
+        """i번째 학생의 학점 관련 분석 결과 (analyze_graduation_status와 같은 구조)"""
+        c = self.credits
+        rows = []
+        for row, completed, applies in self.rows:
+            if not applies[i]:
+                continue
+            required = row['required_credits']
+            done = float(completed[i])
+            rows.append({
+                "category": row['category'],
+                "area": row['area'],
+                "required_credits": required,
+                "completed_credits": done,
+                "missing_credits": max(0.0, required - done),
+                "is_fulfilled": done >= required,
+                "completion_rate": row['rate'] if 'rate' in row else (
+                    round((done / required * 100), 2) if required > 0 else 100),
+            })
+        missing = [r for r in rows if not r['is_fulfilled']]
+        missing.sort(key=lambda x: x['missing_credits'], reverse=True)
+
+        total = float(self.total_completed[i])
+        grad = self.plan.graduation_credits
+        result = {
+            "requirements_analysis": rows,
+            "total_completed_credits": total,
+            "total_required_credits": grad,
+            "overall_completion_rate": round((total / grad * 100), 2) if grad > 0 else 0.0,
+            "missing_requirements": missing,
+            "liberal_arts_detail": {name: float(values[i]) for name, values, applies in self.liberal_detail
+                                    if applies[i]},
+            "major_detail": {"전공필수": float(c.major_required[i]), "전공선택": float(c.major_elective[i])},
+            "general_elective_detail": {"일반선택": float(c.general_elective[i])},
+            "liberal_arts_cap": self.plan.liberal_cap,
+            "liberal_arts_overflow": float(self.liberal_overflow[i]),
+        }
+        pool, current, fills = self.allocation
+        keys = self.plan.allocation.keys
+        result["liberal_arts_allocation"] = allocation_record(
+            self.plan.allocation, float(pool[i]),
+            {key: float(fills[i, j]) for j, key in enumerate(keys) if fills[i, j] > 0},
+            {key: float(current[i, j]) for j, key in enumerate(keys)},
+        )
+        if self.plan.has_gsin:
+            parts = c.gsin_parts[i]
+            result["gsin_basic_detail"] = {
+                part: {
+                    "completed_credits": round(float(parts[j]), 2),
+                    "required_credits": GSIN_PART_REQUIRED,
+                    "is_fulfilled": float(parts[j]) >= GSIN_PART_REQUIRED,
+                    "missing_credits": max(0.0, GSIN_PART_REQUIRED - float(parts[j])),
+                }
+                for j, part in enumerate(GSIN_PARTS)
+            }
+        return result
+
+    def analysis_for(self, student_id: str) -> Dict:
+        return self.to_analysis(self.credits.position(student_id))
+
+
+def _set_detail(details: List, name: str, values: np.ndarray, applies: np.ndarray):
+    """liberal_arts_detail[name] = values (학생별 적용 여부 포함, 같은 이름은 뒤 값이 덮어씀)"""
+    for idx, (existing, old_values, old_applies) in enumerate(details):
+        if existing == name:
+            details[idx] = (name, np.where(applies, values, old_values), old_applies | applies)
+            return
+    details.append((name, values, applies))
+
+
+def evaluate_cohort(plan: RequirementPlan, credits: CohortCredits) -> CohortResult:
+    """요건 계획을 코호트 전체에 배열 연산으로 적용"""
+    n = len(credits)
+    everyone = np.ones(n, dtype=bool)
+    result = CohortResult(plan, credits)
+
+    liberal_sum = np.zeros(n)
+    other_liberal = np.zeros(n)
+    non_liberal = np.zeros(n)
+    gsin_required = 0.0
+    gsin_completed = np.zeros(n)
+
+    # 영역 없는 교양은 요건 판정 전에 배분 (analyze_graduation_status와 같은 규칙)
+    allocation = plan.allocation
+    if allocation.owns_pool:
+        pool = np.zeros(n)
+    else:
+        pool = np.maximum(np.where(credits.has_key(UNCLASSIFIED_KEY), credits.column(UNCLASSIFIED_KEY), 0.0), 0.0)
+    current = np.column_stack([credits.column(key) for key in allocation.keys]) if allocation.keys else np.zeros((n, 0))
+    fills = allocate_cohort(allocation, current, pool)
+    fill_by_key = {key: fills[:, j] for j, key in enumerate(allocation.keys)}
+    result.allocation = (pool, current, fills)
+
+    for row in plan.rows:
+        if row['source'] == 'major_required':
+            completed = credits.major_required
+        elif row['source'] == 'major_elective':
+            completed = credits.major_elective
+        elif row['source'] == 'general_elective':
+            completed = credits.general_elective
+        else:
+            completed = credits.column(row['key'])
+            if row['key'] in fill_by_key:
+                completed = completed + fill_by_key[row['key']]
+            if row['max_credits'] is not None:
+                completed = np.minimum(completed, row['max_credits'])
+
+        if row['gsin']:
+            gsin_required += row['required_credits']
+            gsin_completed = gsin_completed + completed
+        else:
+            result.rows.append((row, completed, everyone))
+
+        if row['category'] == '교양':
+            liberal_sum = liberal_sum + completed
+            _set_detail(result.liberal_detail, row['area'] if row['area'] else '기타', completed, everyone)
+        else:
+            non_liberal = non_liberal + completed
+
+    if plan.has_gsin:
+        result.rows.append(({'category': '교양', 'area': GSIN_TOTAL_AREA, 'required_credits': gsin_required},
+                            gsin_completed, everyone))
+
+    fixed_row = {'required_credits': 0.0, 'rate': 100.0, 'fixed': True}
+
+    # OCU기타: 요건에 없으면 이수 기록이 있는 학생에게만 행 추가
+    if ('교양', 'OCU기타') not in plan.result_labels:
+        has_ocu = credits.has_key(OCU_KEY)
+        ocu = credits.column(OCU_KEY)
+        result.rows.append((dict(fixed_row, category='교양', area='OCU기타'), ocu, has_ocu))
+        _set_detail(result.liberal_detail, 'OCU기타', ocu, has_ocu)
+
+    # 일반선택: 요건에 일선 행이 없으면 학점이 있는 학생에게 행 추가
+    if '일선' not in plan.result_categories:
+        has_general = credits.general_elective > 0
+        result.rows.append((dict(fixed_row, category='일선', area='일선'), credits.general_elective, has_general))
+        non_liberal = non_liberal + np.where(has_general, credits.general_elective, 0.0)
+
+    # 다전공
+    multi = credits.column('다전공') + credits.column('다전공_다전공')
+    has_multi = multi > 0
+    non_liberal = non_liberal + np.where(has_multi, multi, 0.0)
+    if '다전공' not in plan.result_categories:
+        result.rows.append((dict(fixed_row, category='다전공', area='다전공'), multi, has_multi))
+
+    # 요건에 없는 교양 하위영역은 기타교양으로 합산
+    for key in credits.keys:
+        if isinstance(key, str) and key.startswith('교양_') and key not in plan.liberal_keys:
+            value = credits.column(key)
+            has_key = credits.has_key(key)
+            other_liberal = other_liberal + np.where(has_key, value, 0.0)
+            _set_detail(result.liberal_detail, key.replace('교양_', '기타_'), value, has_key)
+
+    # 배분하지 못한 영역 없는 교양은 기타교양
+    other_liberal = other_liberal + np.maximum(0.0, pool - fills.sum(axis=1))
+
+    liberal_total = liberal_sum + other_liberal
+    recognized_liberal = np.minimum(liberal_total, plan.liberal_cap)
+    result.liberal_overflow = np.maximum(0.0, liberal_total - plan.liberal_cap)
+    result.total_completed = non_liberal + recognized_liberal
+    return result
+
+
+def load_cohort_frames(connection, department: str, admission_year: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """학과/입학년도 학생 정보와 수강기록을 열 단위 DataFrame으로 한 번에 조회"""
+    cursor = connection.cursor()
+    cursor.execute(f"""
+        SELECT {', '.join(STUDENT_COLUMNS)}
+        FROM students
+        WHERE department = %s AND admission_year = %s
+        ORDER BY student_id
+    """, (department, admission_year))
+    students = pd.DataFrame.from_records(cursor.fetchall(), columns=list(STUDENT_COLUMNS))
+    cursor.execute(f"""
+        SELECT {', '.join('cr.' + c for c in COURSE_COLUMNS)}
+        FROM course_records cr
+        JOIN students s ON s.student_id = cr.student_id
+        WHERE s.department = %s AND s.admission_year = %s
+          AND (cr.is_passed = TRUE OR cr.is_passed IS NULL)
+    """, (department, admission_year))
+    courses = course_frame(cursor.fetchall())
+    cursor.close()
+    return students, courses
+
+
+def recognized_course_codes(recognition: Dict[str, List[Dict]]) -> Set[str]:
+    """get_major_elective_recognition 결과에서 개별과목 인정 교과목번호 집합"""
+    return {(r.get('course_code') or '').strip() for r in (recognition or {}).get('courses', [])}
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+EQUIVALENCY_TABLE = 'course_equivalencies'
+# 학과별 동등과목 정의 캐시 유지 시간 (관리 화면 없이 테이블을 직접 고치므로 짧게 유지)
+CACHE_TTL_SECONDS = 300
+
+
+def normalize_code(code) -> str:
+    return (code or '').strip()
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+        self.rank: Dict[str, int] = {}
+
+    def find(self, code: str) -> str:
+        root = code
+        while self.parent.setdefault(root, root) != root:
+            root = self.parent[root]
+        # 경로 압축
+        while self.parent[code] != root:
+            self.parent[code], code = root, self.parent[code]
+        return root
+
+    def union(self, a: str, b: str):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if self.rank.get(ra, 0) < self.rank.get(rb, 0):
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if self.rank.get(ra, 0) == self.rank.get(rb, 0):
+            self.rank[ra] = self.rank.get(ra, 0) + 1
+
+
+class CanonicalCodeMap:
+    """교과목번호 → 동등과목 그룹 대표 코드 (정의에 없는 코드는 자기 자신)"""
+
+    def __init__(self, canonical: Optional[Dict[str, str]] = None):
+        self._canonical = canonical or {}
+
+    def __len__(self):
+        return len(self._canonical)
+
+    def canonical(self, code) -> str:
+        code = normalize_code(code)
+        return self._canonical.get(code, code)
+
+    def canonical_set(self, codes: Iterable) -> Set[str]:
+        return {self.canonical(c) for c in codes if normalize_code(c)}
+
+
+def _is_effective(row: Dict, admission_year: Optional[int]) -> bool:
+    if admission_year is None:
+        return True
+    start = row.get('effective_from')
+    end = row.get('effective_to')
+    return (start is None or int(start) <= admission_year) and (end is None or int(end) >= admission_year)
+
+
+def build_canonical_map(rows: List[Dict], admission_year: Optional[int] = None) -> CanonicalCodeMap:
+    """입학년도에 유효한 동등과목 행으로 union-find를 구성해 대표 코드 맵 생성
+
+    같은 그룹의 코드는 하나로 묶이고, 한 코드가 여러 그룹에 있으면 그룹끼리도 합쳐진다.
+    대표 코드는 묶음 안에서 가장 작은 코드(결정적)로 정한다.
+    """
+    uf = _UnionFind()
+    first_in_group: Dict[str, str] = {}
+    for row in rows:
+        code = normalize_code(row.get('course_code'))
+        if not code or not _is_effective(row, admission_year):
+            continue
+        group = str(row.get('equivalence_group'))
+        uf.find(code)
+        if group in first_in_group:
+            uf.union(first_in_group[group], code)
+        else:
+            first_in_group[group] = code
+
+    members: Dict[str, List[str]] = {}
+    for code in uf.parent:
+        members.setdefault(uf.find(code), []).append(code)
+    canonical = {}
+    for codes in members.values():
+        if len(codes) < 2:
+            continue
+        representative = min(codes)
+        for code in codes:
+            canonical[code] = representative
+    return CanonicalCodeMap(canonical)
+
+
+class EquivalencyCache:
+    """학과별 동등과목 정의와 입학년도별 대표 코드 맵 캐시"""
+
+    def __init__(self, ttl_seconds: float = CACHE_TTL_SECONDS, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+
+    def get(self, connection, department: str, admission_year: Optional[int]) -> CanonicalCodeMap:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(department)
+            if entry is None or now - entry['loaded_at'] > self.ttl_seconds:
+                entry = None
+        if entry is None:
+            entry = {'rows': load_equivalency_rows(connection, department), 'loaded_at': now, 'maps': {}}
+            with self._lock:
+                self._entries[department] = entry
+        maps = entry['maps']
+        if admission_year not in maps:
+            maps[admission_year] = build_canonical_map(entry['rows'], admission_year)
+        return maps[admission_year]
+
+    def invalidate(self, department: Optional[str] = None):
+        with self._lock:
+            if department is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(department, None)
+
+
+def load_equivalency_rows(connection, department: str) -> List[Dict]:
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(
+        f"SELECT equivalence_group, course_code, effective_from, effective_to "
+        f"FROM {EQUIVALENCY_TABLE} WHERE department = %s",
+        (department,)
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+    logger.info(f"동등과목 정의 로드: {department} {len(rows)}행")
+    return rows
+
+
+equivalency_cache = EquivalencyCache()
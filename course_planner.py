@@ -0,0 +1,355 @@
+import logging
+import math
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from course_equivalency import CanonicalCodeMap, normalize_code
+from recommendation_index import CurriculumCache
+
+logger = logging.getLogger(__name__)
+
+# 학기당 수강 상한(학점) 기본값
+DEFAULT_CREDIT_CAP = 18.0
+# 계획이 끝나지 않을 때(개설학기 불일치 등) 중단할 학기 수
+MAX_PLAN_TERMS = 16
+# 요건 → 커리큘럼 이수구분 (그 외 요건은 recommended_courses의 구분/영역으로 매칭)
+CURRICULUM_POOLS = {('전공', '전공필수'): '전필', ('전공', '전공선택'): '전선'}
+PREREQUISITE_SEPARATORS = re.compile(r'\s*(?:[,/;·]|및|또는|\s)\s*')
+
+
+def parse_prerequisites(text) -> List[str]:
+    """선수과목 문자열('MIS101, MIS102' / '경영학원론 및 회계원리')을 토큰 목록으로 분리
+
+    '또는'도 구분자로만 취급하므로 나열된 과목은 모두 선수로 본다(보수적 계획).
+    """
+    if not text:
+        return []
+    return [t for t in PREREQUISITE_SEPARATORS.split(str(text).strip()) if t]
+
+
+def parse_offered_terms(text) -> frozenset:
+    """개설학기(1학기/2학기/연중) → 개설 학기 집합 (정보 없으면 두 학기 모두)"""
+    text = (text or '').strip()
+    terms = {int(t) for t in re.findall(r'([12])\s*학기', text)}
+    if not terms or '연중' in text:
+        return frozenset((1, 2))
+    return frozenset(terms)
+
+
+def next_term_from_semester(semester) -> int:
+    """이수학기(예: '6', '5학기')로 다음 학기가 1학기인지 2학기인지 추정"""
+    match = re.search(r'\d+', str(semester or ''))
+    if not match:
+        return 1
+    return 1 if int(match.group()) % 2 == 0 else 2
+
+
+def _order_key(course: Dict) -> Tuple:
+    grade_year = course.get('grade_year')
+    term = course.get('term')
+    return (grade_year is None, grade_year or 0, term is None, term or 0, course['code'])
+
+
+def _term_at(start_term: int, index: int) -> int:
+    """계획의 index번째(1부터) 학기가 1학기인지 2학기인지"""
+    return start_term if index % 2 == 1 else 3 - start_term
+
+
+def _memoized_postorder(start: str, children: Callable[[str], Iterable[str]], memo: Dict[str, int],
+                        combine: Callable[[str, List[int]], int]) -> int:
+    """DAG에서 자식 값이 모두 구해진 뒤 combine(노드, 자식 값들)로 memo를 채움 (재귀 없이 명시적 스택)"""
+    stack = [start]
+    while stack:
+        node = stack[-1]
+        if node in memo:
+            stack.pop()
+            continue
+        pending = [child for child in children(node) if child not in memo]
+        if pending:
+            stack.extend(pending)
+            continue
+        memo[node] = combine(node, [memo[child] for child in children(node)])
+        stack.pop()
+    return memo[start]
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class CoursePlanner:
+    """선수과목 DAG 기반 학기별 이수 계획 생성기 (학과/입학년도 커리큘럼 한 벌)
+
+    과목 정의와 선수 관계는 생성 시 한 번만 정리하고, 학생별 계획은
+    1) 요건별 부족 학점을 채울 과목 선택(선수 부담이 적고 권장 학년이 이른 순)
+    2) 필요한 미이수 선수과목 폐포 추가(메모이즈한 반복 DFS, 긴 선수 사슬에도 재귀 한도 무관)
+    3) 후속 과목 사슬이 긴 과목부터 학기 상한 안에서 배치하는 위상 순 리스트 스케줄링
+    으로 만든다. 과목 수 V, 선수 관계 E에 대해 O((V + E) log V).
+    """
+
+    def __init__(self, curriculum: List[Dict], recommended: Optional[List[Dict]] = None,
+                 equivalency: Optional[CanonicalCodeMap] = None):
+        self.equivalency = equivalency or CanonicalCodeMap()
+        self.courses: Dict[str, Dict] = {}
+        raw_prerequisites: Dict[str, List[str]] = {}
+        for row in curriculum:
+            course = self._course(row)
+            if course is None:
+                continue
+            course['required_type'] = row.get('required_type')
+            course['grade_year'] = row.get('grade_year')
+            course['term'] = row.get('term')
+            self.courses.setdefault(course['code'], course)
+        for row in recommended or []:
+            course = self._course(row)
+            if course is None:
+                continue
+            # 커리큘럼에 있는 과목이면 선수/개설학기 정보만 보완
+            merged = self.courses.setdefault(course['code'], course)
+            if merged is not course:
+                merged.setdefault('category', course.get('category'))
+                merged.setdefault('area', course.get('area', ''))
+            merged['offered'] = parse_offered_terms(row.get('semester_offered'))
+            raw_prerequisites[course['code']] = parse_prerequisites(row.get('prerequisite'))
+
+        by_name = {c['name']: code for code, c in self.courses.items() if c.get('name')}
+        self.prerequisites: Dict[str, Tuple[str, ...]] = {}
+        self.unresolved: Dict[str, List[str]] = {}
+        for code, tokens in raw_prerequisites.items():
+            resolved = []
+            for token in tokens:
+                target = self.equivalency.canonical(token)
+                if target not in self.courses:
+                    target = by_name.get(token)
+                if target and target != code:
+                    resolved.append(target)
+                else:
+                    self.unresolved.setdefault(code, []).append(token)
+            self.prerequisites[code] = tuple(dict.fromkeys(resolved))
+
+        self.pools: Dict = {}
+        for code in sorted(self.courses, key=lambda c: _order_key(self.courses[c])):
+            course = self.courses[code]
+            if course.get('required_type'):
+                self.pools.setdefault(course['required_type'], []).append(code)
+            if course.get('category'):
+                self.pools.setdefault((course['category'], course.get('area') or ''), []).append(code)
+        self._closure: Dict[str, frozenset] = {}
+        self.cycles: Set[Tuple[str, str]] = set()
+        for code in self.courses:
+            self._prerequisite_closure(code)
+        if self.cycles:
+            logger.warning(f"선수과목 순환 관계 무시: {sorted(self.cycles)[:5]}")
+
+    def __len__(self):
+        return len(self.courses)
+
+    def _course(self, row: Dict) -> Optional[Dict]:
+        code = self.equivalency.canonical(row.get('course_code'))
+        if not code:
+            return None
+        course = {
+            'code': code,
+            'course_code': normalize_code(row.get('course_code')),
+            'name': row.get('course_name'),
+            'credits': _to_float(row.get('credits', row.get('credit'))),
+            'offered': frozenset((1, 2)),
+        }
+        if row.get('category'):
+            course['category'] = row.get('category')
+            course['area'] = row.get('area') or ''
+        return course
+
+    def _prerequisite_closure(self, code: str) -> frozenset:
+        """과목의 전체 선행 과목 집합 (메모이즈, 순환 간선은 끊고 기록)
+
+        현재 경로(visiting)를 명시적 스택으로 관리하는 후위 순회라 선수 사슬 길이에 제한이 없다.
+        """
+        cached = self._closure.get(code)
+        if cached is not None:
+            return cached
+        visiting = {code}
+        stack = [(code, iter(self.prerequisites.get(code, ())), set())]
+        while stack:
+            current, pending, closure = stack[-1]
+            for prerequisite in pending:
+                if prerequisite in visiting:
+                    self.cycles.add((prerequisite, current))
+                    continue
+                closure.add(prerequisite)
+                finished = self._closure.get(prerequisite)
+                if finished is None:
+                    visiting.add(prerequisite)
+                    stack.append((prerequisite, iter(self.prerequisites.get(prerequisite, ())), set()))
+                    break
+                closure |= finished
+            else:
+                stack.pop()
+                visiting.discard(current)
+                self._closure[current] = frozenset(closure)
+                if stack:
+                    stack[-1][2].update(self._closure[current])
+        return self._closure[code]
+
+    @staticmethod
+    def _pool_keys(key: Tuple) -> List:
+        """요건 키에 해당하는 과목 풀 키 (커리큘럼 이수구분 + recommended_courses 구분/영역)"""
+        return [k for k in (CURRICULUM_POOLS.get(key), key) if k]
+
+    def _pool(self, key: Tuple) -> List[str]:
+        pool = []
+        for pool_key in self._pool_keys(key):
+            pool.extend(self.pools.get(pool_key, []))
+        return list(dict.fromkeys(pool))
+
+    def _requirement_of(self, code: str, pool_keys: Dict) -> Optional[Tuple]:
+        course = self.courses[code]
+        for key, requirement_key in pool_keys.items():
+            if key == course.get('required_type') or key == (course.get('category'), course.get('area') or ''):
+                return requirement_key
+        return None
+
+    def plan(self, missing_requirements: Iterable[Dict], passed_codes: Iterable[str],
+             credit_cap: float = DEFAULT_CREDIT_CAP, start_term: int = 1,
+             max_terms: int = MAX_PLAN_TERMS) -> Dict:
+        """부족 요건을 채우는 학기별 계획
+
+        passed_codes는 대표 코드(CanonicalCodeMap.canonical) 집합이어야 한다.
+        """
+        passed = set(passed_codes)
+        credit_cap = float(credit_cap)
+        needs = []
+        pool_keys = {}
+        unmet = []
+        for req in missing_requirements:
+            missing = _to_float(req.get('missing_credits'))
+            key = (req.get('category'), req.get('area') or '')
+            if missing <= 0:
+                continue
+            if not self._pool(key):
+                # 과목 목록이 없는 요건(교양 영역 등)은 계획 대상에서 빠졌음을 그대로 알림
+                unmet.append({'category': key[0], 'area': key[1], 'missing_credits': missing})
+                continue
+            needs.append((key, missing))
+            for pool_key in self._pool_keys(key):
+                pool_keys.setdefault(pool_key, key)
+
+        # 1) 요건별 과목 선택: 미이수 선수 부담이 적은 과목부터 부족 학점이 찰 때까지
+        selected: Dict[str, Optional[Tuple]] = {}
+        covered: Dict[Tuple, float] = {}
+
+        def add(code: str):
+            if code in selected or code in passed:
+                return
+            for prerequisite in self._prerequisite_closure(code):
+                if prerequisite not in passed and prerequisite not in selected:
+                    selected[prerequisite] = self._requirement_of(prerequisite, pool_keys)
+                    if selected[prerequisite]:
+                        covered[selected[prerequisite]] = covered.get(selected[prerequisite], 0.0) + \
+                            self.courses[prerequisite]['credits']
+            selected[code] = self._requirement_of(code, pool_keys)
+            if selected[code]:
+                covered[selected[code]] = covered.get(selected[code], 0.0) + self.courses[code]['credits']
+
+        for key, missing in needs:
+            candidates = [c for c in self._pool(key) if c not in passed and c not in selected]
+            candidates.sort(key=lambda c: len(self._closure[c] - passed))
+            for code in candidates:
+                if covered.get(key, 0.0) >= missing:
+                    break
+                add(code)
+            if covered.get(key, 0.0) < missing:
+                unmet.append({'category': key[0], 'area': key[1],
+                              'missing_credits': missing - covered.get(key, 0.0)})
+
+        # 2) 선택된 과목 안에서의 후속 사슬 길이(학기 수 하한) 계산
+        successors: Dict[str, List[str]] = {code: [] for code in selected}
+        for code in selected:
+            for prerequisite in self.prerequisites.get(code, ()):
+                if prerequisite in selected and (prerequisite, code) not in self.cycles:
+                    successors[prerequisite].append(code)
+        chain: Dict[str, int] = {}
+
+        def chain_length(code: str) -> int:
+            return _memoized_postorder(code, successors.__getitem__, chain,
+                                       lambda node, values: 1 + max(values, default=0))
+
+        # 상한이 없을 때 각 과목을 수강할 수 있는 가장 이른 학기(개설학기 반영) → 학기 수 하한
+        start_term = start_term if start_term in (1, 2) else 1
+        earliest: Dict[str, int] = {}
+
+        def selected_prerequisites(code: str) -> List[str]:
+            return [p for p in self.prerequisites.get(code, ()) if p in selected and (p, code) not in self.cycles]
+
+        def first_offered(code: str, values: List[int]) -> int:
+            index = 1 + max(values, default=0)
+            while _term_at(start_term, index) not in self.courses[code]['offered']:
+                index += 1
+            return index
+
+        def earliest_index(code: str) -> int:
+            return _memoized_postorder(code, selected_prerequisites, earliest, first_offered)
+
+        # 3) 리스트 스케줄링: 선수 충족 + 개설학기 일치 과목을 사슬이 긴 순으로 상한까지 배치
+        priority = sorted(selected, key=lambda c: (-chain_length(c),) + _order_key(self.courses[c]))
+        done: Set[str] = set()
+        remaining = list(priority)
+        terms = []
+        term = start_term
+        while remaining and len(terms) < max_terms:
+            credits = 0.0
+            taken = []
+            for code in remaining:
+                course = self.courses[code]
+                if term not in course['offered']:
+                    continue
+                if any(p in selected and p not in done and (p, code) not in self.cycles
+                       for p in self.prerequisites.get(code, ())):
+                    continue
+                if taken and credits + course['credits'] > credit_cap:
+                    continue
+                taken.append(code)
+                credits += course['credits']
+            done.update(taken)
+            taken_set = set(taken)
+            remaining = [c for c in remaining if c not in taken_set]
+            terms.append({
+                'index': len(terms) + 1,
+                'term': term,
+                'credits': credits,
+                'courses': [self._entry(code, selected[code]) for code in taken],
+            })
+            term = 2 if term == 1 else 1
+        while terms and not terms[-1]['courses']:
+            terms.pop()
+
+        total = sum(self.courses[c]['credits'] for c in selected)
+        lower_bound = max([math.ceil(total / credit_cap) if credit_cap > 0 else 0] +
+                          [earliest_index(c) for c in selected])
+        return {
+            'credit_cap': credit_cap,
+            'start_term': start_term,
+            'semesters_needed': len(terms),
+            'lower_bound_semesters': lower_bound,
+            'total_credits': total,
+            'terms': terms,
+            'unmet_requirements': unmet,
+            'unscheduled': [self._entry(code, selected[code]) for code in remaining],
+            'unresolved_prerequisites': {code: self.unresolved[code] for code in selected if code in self.unresolved},
+        }
+
+    def _entry(self, code: str, requirement: Optional[Tuple]) -> Dict:
+        course = self.courses[code]
+        return {
+            'course_code': course['course_code'],
+            'course_name': course['name'],
+            'credits': course['credits'],
+            'requirement': f"{requirement[0]}_{requirement[1]}" if requirement else '선수과목',
+            'prerequisites': [self.courses[p]['course_code'] for p in self.prerequisites.get(code, ())],
+        }
+
+
+course_planner_cache = CurriculumCache('이수 계획 데이터')
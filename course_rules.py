@@ -0,0 +1,47 @@
+from typing import Dict, Optional
+
+# 통과로 인정하는 코드들 (성적/이수구분 모두 포함)
+PASSING_GRADES = frozenset({
+    'A+', 'A0', 'A-', 'B+', 'B0', 'B-', 'C+', 'C0', 'C-', 'D+', 'D0', 'P', 'PASS', '통과', '이수', '합격'
+})
+
+# 이수구분에 카테고리명이 들어온 경우(엑셀 열 밀림 등) 학점이 있으면 통과로 보는 키워드
+CATEGORY_KEYWORDS = ('교양', '전공', '일선', '일반선택', '전공필수', '전공선택', '일반교양', '확대교양')
+
+
+def _credit_positive(credit) -> bool:
+    try:
+        return float(credit or 0) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def is_passed(grade, completion_type, credit) -> bool:
+    """과목 통과 여부 (분석기, 수집 시 is_passed 컬럼, 진단 도구가 같은 규칙을 사용)"""
+    grade = str(grade).upper() if grade is not None else ''
+    completion = str(completion_type).upper() if completion_type is not None else ''
+    if grade in PASSING_GRADES or completion in PASSING_GRADES:
+        return True
+
+    # 페일세이프: completion_type이 카테고리명('교양', '전공', '일선' 등)이면 학점>0 시 통과
+    if any(kw in completion for kw in CATEGORY_KEYWORDS):
+        return _credit_positive(credit)
+
+    # 페일세이프: 성적/이수구분 모두 없으면 학점>0 시 임시 통과 처리
+    if not grade and not completion:
+        return _credit_positive(credit)
+    return False
+
+
+def is_passed_course(course: Dict) -> bool:
+    """course_records 행(dict) 기준 통과 여부"""
+    return is_passed(course.get('grade'), course.get('completion_type'), course.get('credit'))
+
+
+def category_area_key(category, area) -> Optional[str]:
+    """이수학점 집계 키 ('교양_일반교양', 영역이 없으면 '교양')"""
+    return f"{category}_{area}" if area else category
+
+
+def course_category_area(course: Dict) -> Optional[str]:
+    return category_area_key(course.get('category', '기타'), course.get('area', ''))
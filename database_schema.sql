@@ -31,6 +31,7 @@ CREATE TABLE students (
     double_major VARCHAR(100) COMMENT '다전공',
     course_type VARCHAR(50) COMMENT '과정 (학사/석사/박사)',
     admission_date DATE COMMENT '입학일자',
+    admission_year SMALLINT AS (YEAR(admission_date)) STORED COMMENT '입학년도 (입학일자에서 생성, 학과/입학년도 조회용)',
     phone VARCHAR(20) COMMENT '전화번호',
     email VARCHAR(100) COMMENT '이메일',
     name VARCHAR(50) NOT NULL COMMENT '성명',
@@ -47,6 +48,7 @@ CREATE TABLE students (
     FOREIGN KEY (student_id) REFERENCES users(username) ON UPDATE CASCADE,
     INDEX idx_department (department),
     INDEX idx_admission_date (admission_date),
+    INDEX idx_department_admission_year (department, admission_year),
     INDEX idx_grade (grade)
 ) COMMENT='학생 개인정보 및 학적정보';
 
@@ -64,10 +66,13 @@ CREATE TABLE course_records (
     credit DECIMAL(3,1) COMMENT '학점',
     completion_type VARCHAR(50) COMMENT '이수구분',
     grade VARCHAR(10) COMMENT '성적',
+    is_passed BOOLEAN NULL COMMENT '통과 여부 (수집 시 course_rules.is_passed로 계산)',
+    category_area VARCHAR(160) NULL COMMENT '이수학점 집계 키 (category_area, 영역 없으면 category)',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
     INDEX idx_student_id (student_id),
     INDEX idx_category (category),
+    INDEX idx_student_passed_key (student_id, is_passed, category_area),
     INDEX idx_year_semester (year, semester),
     INDEX idx_course_code (course_code)
 ) COMMENT='학생 수강기록';
@@ -91,6 +96,30 @@ CREATE TABLE graduation_requirements (
     INDEX idx_category (category)
 ) COMMENT='졸업요건 기준';
 
+-- 4-1. 졸업요건 버전 스냅샷 테이블 (학과/입학년도별 불변 스냅샷, 추가만 함)
+CREATE TABLE requirement_set_versions (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '스냅샷 ID',
+    department VARCHAR(100) NOT NULL COMMENT '학과',
+    admission_year YEAR NOT NULL COMMENT '입학년도',
+    version INT NOT NULL COMMENT '학과/입학년도별 단조 증가 버전',
+    fingerprint CHAR(40) NOT NULL COMMENT '평가 컬럼 기준 요건 집합 해시',
+    requirements JSON NOT NULL COMMENT '스냅샷 시점 요건 행 (requirement_versions.normalize_requirements)',
+    change_source VARCHAR(50) COMMENT '생성 경로 (admin_create/admin_update/admin_delete/apply_script/analyzer)',
+    changed_by VARCHAR(20) COMMENT '변경한 사용자 ID',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '적용 시작 시각',
+    UNIQUE KEY unique_requirement_version (department, admission_year, version)
+) COMMENT='졸업요건 버전 스냅샷';
+
+-- 4-2. 졸업요건 변경 재분석 대기열 (워커 간 공유, 처리한 행은 삭제)
+CREATE TABLE reanalysis_pending (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    department VARCHAR(100) NOT NULL COMMENT '학과',
+    admission_year INT NOT NULL COMMENT '입학년도',
+    change_data TEXT COMMENT '요건 변경 내용 (JSON, 알림 요약용)',
+    created_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    INDEX idx_cohort (department, admission_year, id)
+) COMMENT='졸업요건 변경 재분석 대기열 (워커 간 공유)';
+
 -- 5. 졸업 분석 결과 테이블 (분석 결과 저장)
 CREATE TABLE graduation_analysis (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -99,7 +128,11 @@ CREATE TABLE graduation_analysis (
     total_completed_credits DECIMAL(5,1) COMMENT '총 이수학점',
     total_required_credits DECIMAL(5,1) COMMENT '총 필요학점',
     overall_completion_rate DECIMAL(5,2) COMMENT '전체 이수율 (%)',
-    analysis_result JSON COMMENT '상세 분석 결과 (JSON)',
+    analysis_result JSON COMMENT '분석 요약 (JSON, 전체 본문은 analysis_blob)',
+    analysis_blob MEDIUMBLOB NULL COMMENT '압축 인코딩된 전체 분석 결과 (analysis_codec)',
+    result_encoding VARCHAR(16) NULL COMMENT '본문 인코딩 (zc1 등, NULL이면 analysis_result에 전체 JSON)',
+    requirement_snapshot_id INT NULL COMMENT '평가에 사용한 졸업요건 스냅샷 ID (requirement_set_versions.id)',
+    requirement_version INT NULL COMMENT '평가에 사용한 졸업요건 버전 (현재 버전과 다르면 재분석 필요)',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
@@ -108,6 +141,23 @@ CREATE TABLE graduation_analysis (
     INDEX idx_completion_rate (overall_completion_rate)
 ) COMMENT='졸업요건 분석결과';
 
+-- 5-1. 졸업 분석 이력 테이블 (실행마다 추가, 키프레임 + 델타 인코딩)
+CREATE TABLE graduation_analysis_history (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    student_id VARCHAR(20) NOT NULL COMMENT '학번',
+    seq INT NOT NULL COMMENT '학생별 분석 순번 (1부터)',
+    keyframe_seq INT NOT NULL COMMENT '복원 기준 키프레임 순번',
+    is_keyframe BOOLEAN NOT NULL COMMENT 'TRUE: 전체 문서, FALSE: 직전 스냅샷 대비 델타',
+    payload MEDIUMBLOB NOT NULL COMMENT '압축된 컴팩트 문서 또는 델타 (analysis_history)',
+    analysis_date DATETIME NOT NULL COMMENT '분석 실행 일시',
+    total_completed_credits DECIMAL(5,1) COMMENT '총 이수학점',
+    total_required_credits DECIMAL(5,1) COMMENT '총 필요학점',
+    overall_completion_rate DECIMAL(5,2) COMMENT '전체 이수율 (%)',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+    UNIQUE KEY unique_student_seq (student_id, seq)
+) COMMENT='졸업요건 분석 이력';
+
 -- 6. 알림 테이블 (관리자가 학생에게 보내는 메시지)
 CREATE TABLE notifications (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -248,6 +298,7 @@ CREATE TABLE user_sessions (
     user_id VARCHAR(20) NOT NULL COMMENT '사용자 ID',
     ip_address VARCHAR(45) COMMENT '접속 IP',
     user_agent TEXT COMMENT '사용자 에이전트',
+    data MEDIUMTEXT COMMENT '세션 데이터 (Flask 세션 직렬화)',
     last_activity DATETIME NOT NULL COMMENT '마지막 활동 시간',
     expires_at DATETIME NOT NULL COMMENT '세션 만료 시간',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
@@ -296,9 +347,9 @@ SELECT
     s.department,
     s.grade,
     COUNT(cr.id) as total_courses,
-    SUM(CASE WHEN cr.grade IN ('A+','A0','A-','B+','B0','B-','C+','C0','C-','D+','D0','P') THEN cr.credit ELSE 0 END) as total_credits,
-    SUM(CASE WHEN cr.category = '교양' AND cr.grade IN ('A+','A0','A-','B+','B0','B-','C+','C0','C-','D+','D0','P') THEN cr.credit ELSE 0 END) as liberal_arts_credits,
-    SUM(CASE WHEN cr.category = '전공' AND cr.grade IN ('A+','A0','A-','B+','B0','B-','C+','C0','C-','D+','D0','P') THEN cr.credit ELSE 0 END) as major_credits,
+    SUM(CASE WHEN cr.is_passed THEN cr.credit ELSE 0 END) as total_credits,
+    SUM(CASE WHEN cr.category = '교양' AND cr.is_passed THEN cr.credit ELSE 0 END) as liberal_arts_credits,
+    SUM(CASE WHEN cr.category = '전공' AND cr.is_passed THEN cr.credit ELSE 0 END) as major_credits,
     s.updated_at as last_updated
 FROM students s
 LEFT JOIN course_records cr ON s.student_id = cr.student_id
@@ -1,7 +1,6 @@
 import pandas as pd
 import mysql.connector
 from mysql.connector import Error
-import bcrypt
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
@@ -11,10 +10,88 @@ import gc
 import openpyxl
 import zipfile
 import xml.etree.ElementTree as ET
+from course_rules import category_area_key, is_passed
+from password_hashing import password_hasher
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 업로드로 자동 생성되는 학생 계정의 초기 비밀번호
+DEFAULT_STUDENT_PASSWORD = 'change_me_123'
+
+# 개인정보(엑셀 한글 필드) → students 컬럼
+STUDENT_FIELD_MAPPING = {
+    '학번': 'student_id',
+    '대학': 'university',
+    '학과': 'department',
+    '전공': 'major',
+    '부전공': 'minor',
+    '다전공': 'double_major',
+    '과정': 'course_type',
+    '입학일자': 'admission_date',
+    '성명': 'name',
+    '교과적용년도': 'curriculum_year',
+    '이수학기': 'semester',
+    '생년월일': 'birth_date',
+    '학년': 'grade',
+    '평생사제상담건수': 'counseling_count',
+    '전공필수학점': 'major_required_credits',
+    '전공선택학점': 'major_elective_credits',
+    '일반선택학점': 'general_elective_credits'
+}
+# course_records INSERT 컬럼 순서 (created_at 제외)
+COURSE_RECORD_COLUMNS = (
+    'student_id', 'category', 'area', 'sub_area', 'year', 'semester',
+    'course_code', 'course_name', 'credit', 'completion_type', 'grade',
+    'is_passed', 'category_area'
+)
+
+
+def personal_info_to_student_row(personal_info: Dict) -> Dict:
+    """parse_excel_file의 개인정보(한글 필드)를 students 행(dict)으로 변환 (DB 저장/오프라인 분석 공용)"""
+    db_data = {}
+    for korean_field, value in personal_info.items():
+        db_field = STUDENT_FIELD_MAPPING.get(korean_field)
+        if db_field:
+            # 특별 처리: 숫자 필드들
+            if db_field == 'grade' and value:
+                # "3학년" -> "3", "3" -> "3"
+                grade_match = re.search(r'\d+', str(value))
+                if grade_match:
+                    db_data[db_field] = int(grade_match.group())
+                else:
+                    db_data[db_field] = None
+            elif db_field == 'counseling_count' and value:
+                # "3 (졸업기준 : 8)" -> "3"
+                count_match = re.search(r'\d+', str(value))
+                if count_match:
+                    db_data[db_field] = int(count_match.group())
+                else:
+                    db_data[db_field] = None
+            else:
+                db_data[db_field] = value
+    return db_data
+
+
+def course_record_to_row(student_id: str, record: Dict) -> Dict:
+    """parse_excel_file의 수강기록(한글 필드)을 course_records 행(dict)으로 변환"""
+    return {
+        'student_id': student_id,
+        'category': record.get('구분'),
+        'area': record.get('영역'),
+        'sub_area': record.get('세부영역'),
+        'year': record.get('년도'),
+        'semester': record.get('학기'),
+        'course_code': record.get('교과목번호'),
+        'course_name': record.get('교과목명'),
+        'credit': record.get('학점'),
+        'completion_type': record.get('이수구분'),
+        'grade': record.get('성적'),
+        'is_passed': is_passed(record.get('성적'), record.get('이수구분'), record.get('학점')),
+        'category_area': category_area_key(record.get('구분'), record.get('영역')),
+    }
+
+
 class EnhancedXlsxParser:
     def __init__(self, db_config: Dict[str, str]):
         self.db_config = db_config
@@ -912,6 +989,14 @@ class EnhancedXlsxParser:
     
     def save_to_database(self, student_id: str, personal_info: Dict, course_records: List[Dict]):
         """데이터베이스에 저장"""
+        # 자동 생성 계정의 비밀번호 해시는 트랜잭션 시작 전에 계산 (해시 동안 잠금을 잡지 않음)
+        provision_hash = self._provision_password_hash(student_id)
+        self.save_records(student_id, personal_info, course_records, provision_hash)
+
+    def save_records(self, student_id: str, personal_info: Dict, course_records: List[Dict],
+                     password_hash: Optional[str] = None):
+        """개인정보/수강기록을 한 트랜잭션으로 저장 (password_hash: 계정 자동 생성용, 미리 계산한 값)"""
+        cursor = None
         try:
             cursor = self.connection.cursor()
             
@@ -924,7 +1009,7 @@ class EnhancedXlsxParser:
                     personal_info[key] = None
             
             # 개인정보 저장
-            self._save_personal_info(cursor, personal_info)
+            self._save_personal_info(cursor, personal_info, password_hash)
             
             # 수강기록 저장
             self._save_course_records(cursor, student_id, course_records)
@@ -945,52 +1030,24 @@ class EnhancedXlsxParser:
             if cursor:
                 cursor.close()
     
-    def _save_personal_info(self, cursor, personal_info: Dict):
+    def _provision_password_hash(self, student_id: str) -> Optional[str]:
+        """users에 없는 학번이면 자동 생성 계정용 비밀번호 해시, 있으면 None"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute('SELECT 1 FROM users WHERE username=%s', (student_id,))
+            exists = cursor.fetchone() is not None
+        finally:
+            cursor.close()
+        # 읽기 트랜잭션을 끝낸 뒤 해시 계산
+        self.connection.commit()
+        if exists:
+            return None
+        return password_hasher.hash(DEFAULT_STUDENT_PASSWORD)
+
+    def _save_personal_info(self, cursor, personal_info: Dict, password_hash: Optional[str] = None):
         """개인정보 저장"""
-        # 필드명 매핑 (DB 컬럼명으로 변환)
-        db_field_mapping = {
-            '학번': 'student_id',
-            '대학': 'university',
-            '학과': 'department',
-            '전공': 'major',
-            '부전공': 'minor',
-            '다전공': 'double_major',
-            '과정': 'course_type',
-            '입학일자': 'admission_date',
-            '성명': 'name',
-            '교과적용년도': 'curriculum_year',
-            '이수학기': 'semester',
-            '생년월일': 'birth_date',
-            '학년': 'grade',
-            '평생사제상담건수': 'counseling_count',
-            '전공필수학점': 'major_required_credits',
-            '전공선택학점': 'major_elective_credits',
-            '일반선택학점': 'general_elective_credits'
-        }
-        
-        # DB 필드로 변환
-        db_data = {}
-        for korean_field, value in personal_info.items():
-            db_field = db_field_mapping.get(korean_field)
-            if db_field:
-                # 특별 처리: 숫자 필드들
-                if db_field == 'grade' and value:
-                    # "3학년" -> "3", "3" -> "3"
-                    grade_match = re.search(r'\d+', str(value))
-                    if grade_match:
-                        db_data[db_field] = int(grade_match.group())
-                    else:
-                        db_data[db_field] = None
-                elif db_field == 'counseling_count' and value:
-                    # "3 (졸업기준 : 8)" -> "3"
-                    count_match = re.search(r'\d+', str(value))
-                    if count_match:
-                        db_data[db_field] = int(count_match.group())
-                    else:
-                        db_data[db_field] = None
-                else:
-                    db_data[db_field] = value
-        
+        db_data = personal_info_to_student_row(personal_info)
+
         # UPSERT 쿼리 생성
         fields = list(db_data.keys())
         placeholders = ', '.join(['%s'] * len(fields))
@@ -1007,14 +1064,10 @@ class EnhancedXlsxParser:
         values = [db_data[field] for field in fields]
         # Ensure users table entry exists to satisfy foreign key
         try:
-            # If user does not exist in users table, create minimal user
+            # If user does not exist in users table, create minimal user (hash precomputed outside the transaction)
             student_id = db_data.get('student_id')
-            if student_id:
-                cursor.execute('SELECT username FROM users WHERE username=%s', (student_id,))
-                if cursor.fetchone() is None:
-                    # create minimal user with a random password
-                    password_hash = bcrypt.hashpw('change_me_123'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-                    cursor.execute('INSERT INTO users (username, password_hash, role, is_active, created_at) VALUES (%s, %s, %s, %s, NOW())', (student_id, password_hash, 'student', 1))
+            if student_id and password_hash:
+                cursor.execute('INSERT IGNORE INTO users (username, password_hash, role, is_active, created_at) VALUES (%s, %s, %s, %s, NOW())', (student_id, password_hash, 'student', 1))
         except Exception as e:
             logger.warning(f"사용자 생성 시도 중 오류: {e}")
         cursor.execute(query, values)
@@ -1030,34 +1083,22 @@ class EnhancedXlsxParser:
             return
         
         # 새 기록 삽입
+        # 통과 여부/집계 키는 수집 시 한 번만 계산하여 저장 (분석기·관리자 집계·뷰가 같은 값 사용)
         query = """
         INSERT INTO course_records (
             student_id, category, area, sub_area, year, semester,
-            course_code, course_name, credit, completion_type, grade, created_at
+            course_code, course_name, credit, completion_type, grade,
+            is_passed, category_area, created_at
         ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW()
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW()
         )
         """
         
-        insert_count = 0
-        for record in course_records:
-            values = (
-                student_id,
-                record.get('구분'),
-                record.get('영역'),
-                record.get('세부영역'),
-                record.get('년도'),
-                record.get('학기'),
-                record.get('교과목번호'),
-                record.get('교과목명'),
-                record.get('학점'),
-                record.get('이수구분'),
-                record.get('성적')
-            )
-            cursor.execute(query, values)
-            insert_count += 1
+        # executemany: 다중 행 INSERT 한 번으로 전송
+        rows = [course_record_to_row(student_id, record) for record in course_records]
+        cursor.executemany(query, [tuple(row[column] for column in COURSE_RECORD_COLUMNS) for row in rows])
         
-        logger.info(f"수강기록 {insert_count}개 저장 완료")
+        logger.info(f"수강기록 {len(rows)}개 저장 완료")
 
 def process_excel_file_enhanced(file_path: str, student_id: str, db_config: Dict[str, str]) -> bool:
     """향상된 Excel 파일 처리 함수"""
@@ -1102,23 +1143,23 @@ def process_excel_file_enhanced(file_path: str, student_id: str, db_config: Dict
         
         parser.save_to_database(student_id, personal_info, course_records)
         
-        # 결과 요약 출력
-        print("\n" + "="*50)
-        print("📊 Excel 파일 처리 완료")
-        print("="*50)
-        print(f"👤 학번: {student_id}")
-        print(f"📋 개인정보: {len([v for v in personal_info.values() if v is not None])}개 필드 추출")
-        print(f"📚 수강기록: {len(course_records)}개 과목 추출")
-        print("\n📝 추출된 개인정보:")
+        # 결과 요약 (디버그 로그)
+        logger.debug("\n" + "="*50)
+        logger.debug("📊 Excel 파일 처리 완료")
+        logger.debug("="*50)
+        logger.debug(f"👤 학번: {student_id}")
+        logger.debug(f"📋 개인정보: {len([v for v in personal_info.values() if v is not None])}개 필드 추출")
+        logger.debug(f"📚 수강기록: {len(course_records)}개 과목 추출")
+        logger.debug("\n📝 추출된 개인정보:")
         for field, value in personal_info.items():
             if value is not None:
-                print(f"  - {field}: {value}")
-        print(f"\n📖 수강기록 샘플 (처음 3개):")
+                logger.debug(f"  - {field}: {value}")
+        logger.debug(f"\n📖 수강기록 샘플 (처음 3개):")
         for i, record in enumerate(course_records[:3]):
-            print(f"  {i+1}. {record.get('교과목명', 'N/A')} ({record.get('학점', 'N/A')}학점, {record.get('성적', 'N/A')})")
+            logger.debug(f"  {i+1}. {record.get('교과목명', 'N/A')} ({record.get('학점', 'N/A')}학점, {record.get('성적', 'N/A')})")
         if len(course_records) > 3:
-            print(f"  ... 총 {len(course_records)}개 과목")
-        print("="*50)
+            logger.debug(f"  ... 총 {len(course_records)}개 과목")
+        logger.debug("="*50)
         
         parsing_warnings = personal_info.get('parsing_warnings', [])
         return True, parsing_warnings
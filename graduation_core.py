@@ -0,0 +1,483 @@
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from course_equivalency import CanonicalCodeMap
+from course_planner import CoursePlanner, next_term_from_semester
+from course_rules import course_category_area, is_passed_course
+from liberal_allocation import (
+    AllocationPlan, allocate_unclassified, allocation_record, describe_allocation, unclassified_pool
+)
+from recommendation_index import RecommendationIndex, course_entry
+
+logger = logging.getLogger(__name__)
+
+
+def evaluate_graduation(student_info: Dict, student_courses: List[Dict], graduation_requirements: List[Dict],
+                        recognition: Optional[Dict] = None, index: Optional[RecommendationIndex] = None,
+                        planner: Optional[CoursePlanner] = None, requirement_snapshot: Optional[Dict] = None,
+                        parsing_warnings: Optional[List[str]] = None) -> Dict:
+    """졸업요건 분석 (DB 없이 입력 값만으로 계산하는 순수 코어)
+
+    GraduationRequirementsChecker.analyze_graduation_status와 오프라인 분석 도구가 같은 코어를 사용한다.
+    index/planner가 없으면 커리큘럼 없이(추천 과목 없이) 분석한다.
+    """
+    if not graduation_requirements:
+        return {"error": "해당 학과의 졸업 요건을 찾을 수 없습니다."}
+    index = index or RecommendationIndex([])
+
+    # 교양 상한(cap) 추출
+    liberal_caps = []
+    for r in graduation_requirements:
+        if str(r.get('category')) == '교양' and r.get('max_credits') is not None:
+            try:
+                liberal_caps.append(float(r.get('max_credits')))
+            except:
+                pass
+    precomputed_liberal_cap = max(liberal_caps) if liberal_caps else 40.0
+
+    # 졸업이수학점(예: 130) 추출 (요건표에서 category/area에 '졸업' 또는 '총계' 등으로 표시된 행)
+    grad_total_credit = None
+    for r in graduation_requirements:
+        if (str(r.get('category')).find('졸업') != -1 or str(r.get('area')).find('졸업') != -1 or str(r.get('category')).find('총계') != -1):
+            try:
+                grad_total_credit = float(r.get('required_credits'))
+                break
+            except:
+                pass
+    if grad_total_credit is None:
+        grad_total_credit = 130.0  # 기본값
+
+    # 집계용 행(총계, 합계 등) 제외
+    exclude_keywords = ['총계', '합계', '학점총계', '교양총계', '졸업']
+    filtered_requirements = [r for r in graduation_requirements if not any(
+        (str(r.get('area', '')) + str(r.get('category', ''))).find(k) != -1 for k in exclude_keywords)]
+
+    analysis_result = {
+        "student_info": student_info,
+        "analysis_date": datetime.now().isoformat(),
+        "requirements_analysis": [],
+        "total_completed_credits": 0.0,
+        "total_required_credits": grad_total_credit,
+        "overall_completion_rate": 0.0,
+        "missing_requirements": [],
+        "recommendations": [],
+        "liberal_arts_detail": {},
+        "major_detail": {},
+        "parsing_warnings": list(parsing_warnings or []),
+        "requirement_snapshot_id": requirement_snapshot.get('id') if requirement_snapshot else None,
+        "requirement_version": requirement_snapshot.get('version') if requirement_snapshot else None,
+    }
+
+    # 타학과 인정 규칙 반영: 규칙형(단과대 전필→전선), 개별과목형(특정 과목 전선 인정)
+    adjusted_courses = apply_recognition_rules(student_courses, recognition)
+    completed_credits_by_category = calculate_completed_credits(adjusted_courses)
+
+    # 영역 없는 교양 과목(키='교양' 단일)은 요건 판정 전에 충족 영역 수가 최대가 되도록 배분
+    allocation_plan = AllocationPlan(graduation_requirements)
+    영역없는교양 = unclassified_pool(allocation_plan, completed_credits_by_category)
+    allocation_fills = allocate_unclassified(allocation_plan, completed_credits_by_category, 영역없는교양)
+    allocation = allocation_record(allocation_plan, 영역없는교양, allocation_fills, completed_credits_by_category)
+    for key, fill_amount in allocation_fills.items():
+        completed_credits_by_category[key] = completed_credits_by_category.get(key, 0.0) + fill_amount
+    analysis_result["liberal_arts_allocation"] = allocation
+
+    # 전공필수/전공선택/일반선택 구분 (엑셀 AC22, AH22, Y22 셀 값 사용)
+    # students 테이블의 major_required_credits, major_elective_credits, general_elective_credits에서 가져옴
+    major_required = float(student_info.get('major_required_credits', 0)) if student_info.get('major_required_credits') else 0.0
+    major_elective = float(student_info.get('major_elective_credits', 0)) if student_info.get('major_elective_credits') else 0.0
+    general_elective = float(student_info.get('general_elective_credits', 0)) if student_info.get('general_elective_credits') else 0.0
+
+    analysis_result["major_detail"] = {
+        "전공필수": major_required,
+        "전공선택": major_elective
+    }
+    
+    analysis_result["general_elective_detail"] = {
+        "일반선택": general_elective
+    }
+
+    # 교양 영역별 집계 및 상한 적용
+    used_keys = set()
+    교양_요건_키 = set()
+    교양_상한 = precomputed_liberal_cap
+    교양_이수합 = 0.0
+    기타_교양_이수합 = 0.0
+    비교양_이수합 = 0.0
+    liberal_arts_detail = {}
+
+
+    # 개신기초교양 세부영역을 총합으로 평가하기 위해 개별 항목을 모아둠
+    gsin_basic_requirements = []
+
+    # 개신기초교양 세부영역 표준화 매핑
+    gsin_basic_map = {
+        '인성과 비판적 사고': '인성과 비판적 사고',
+        '인성과비판적사고': '인성과 비판적 사고',
+        '의사소통': '의사소통',
+        '영어': '영어',
+        '정보문해': '정보문해'
+    }
+    gsin_parts_credits = {k: 0.0 for k in ['인성과 비판적 사고','의사소통','영어','정보문해']}
+    # 코스 기반으로 개신기초교양 세부영역 집계
+    try:
+        for c in adjusted_courses:
+            if (c.get('category') == '교양') and ((c.get('area') or '').strip() == '개신기초교양') and is_passed_record(c):
+                sub = (c.get('sub_area') or '').strip()
+                sub_std = gsin_basic_map.get(sub, sub)
+                if sub_std in gsin_parts_credits:
+                    gsin_parts_credits[sub_std] += float(c.get('credit') or 0.0)
+    except Exception:
+        pass
+
+    for requirement in filtered_requirements:
+        category = requirement.get('category')
+        area = requirement.get('area', '')
+        required_credits = float(requirement.get('required_credits', 0))
+        max_credits = requirement.get('max_credits')
+        key = f"{category}_{area}" if area else category
+        if key in used_keys:
+            continue
+        used_keys.add(key)
+
+        if category == '교양':
+            교양_요건_키.add(key)
+            if max_credits is not None:
+                try:
+                    max_credits_val = float(max_credits)
+                    if 교양_상한 is None or max_credits_val > 교양_상한:
+                        교양_상한 = max_credits_val
+                except:
+                    pass
+
+        # 전공필수/전공선택은 Excel에서 읽은 값 사용
+        if category == '전공' and area == '전공필수':
+            completed = major_required
+        elif category == '전공' and area == '전공선택':
+            completed = major_elective
+        # 일반선택(일선)은 Excel Y22 값 사용
+        elif category == '일선':
+            completed = general_elective
+        else:
+            completed = float(completed_credits_by_category.get(key, 0.0))
+            if max_credits is not None:
+                try:
+                    max_credits_val = float(max_credits)
+                    completed = min(completed, max_credits_val)
+                except:
+                    pass
+
+        # 개신기초교양은 세부영역을 합산하여 총 12학점 등으로 판정
+        if category == '교양' and ('개신기초교양' in (area or '')):
+            gsin_basic_requirements.append({
+                "required_credits": required_credits,
+                "completed_credits": completed,
+                "category": category,
+                "area": area,
+            })
+        else:
+            is_fulfilled = completed >= required_credits
+            missing_credits = max(0.0, required_credits - completed)
+
+            analysis_result["requirements_analysis"].append({
+                "category": category,
+                "area": area,
+                "required_credits": required_credits,
+                "completed_credits": completed,
+                "missing_credits": missing_credits,
+                "is_fulfilled": is_fulfilled,
+                "completion_rate": round((completed / required_credits * 100), 2) if required_credits > 0 else 100,
+            })
+
+        if category == '교양':
+            교양_이수합 += completed
+            liberal_arts_detail[area if area else '기타'] = completed
+        else:
+            비교양_이수합 += completed
+
+    # 개신기초교양 총합 판정 추가
+    if gsin_basic_requirements:
+        total_required = sum(r["required_credits"] for r in gsin_basic_requirements)
+        total_completed = sum(r["completed_credits"] for r in gsin_basic_requirements)
+        is_fulfilled = total_completed >= total_required
+        missing_credits = max(0.0, total_required - total_completed)
+        analysis_result["requirements_analysis"].append({
+            "category": "교양",
+            "area": "개신기초교양(총합)",
+            "required_credits": total_required,
+            "completed_credits": total_completed,
+            "missing_credits": missing_credits,
+            "is_fulfilled": is_fulfilled,
+            "completion_rate": round((total_completed / total_required * 100), 2) if total_required > 0 else 100,
+        })
+        # 각 파트 개별 충족 정보도 함께 제공 (4개 파트 모두 포함)
+        all_parts = ['인성과 비판적 사고', '의사소통', '영어', '정보문해']
+        per_part_required = 3.0  # 각 파트는 3학점 고정
+        analysis_result["gsin_basic_detail"] = {
+            part: {
+                "completed_credits": round(gsin_parts_credits.get(part, 0.0), 2),
+                "required_credits": per_part_required,
+                "is_fulfilled": gsin_parts_credits.get(part, 0.0) >= per_part_required,
+                "missing_credits": max(0.0, per_part_required - gsin_parts_credits.get(part, 0.0))
+            }
+            for part in all_parts
+        }
+
+    # OCU기타 교양이 졸업요건에 없지만 이수학점이 있으면 추가 (프론트 표시 보장)
+    ocu_key = '교양_OCU기타'
+    if ocu_key in completed_credits_by_category:
+        ocu_completed = float(completed_credits_by_category[ocu_key])
+        # requirements_analysis에 OCU기타가 없으면 추가
+        if not any(r.get('category') == '교양' and r.get('area') == 'OCU기타' for r in analysis_result["requirements_analysis"]):
+            analysis_result["requirements_analysis"].append({
+                "category": "교양",
+                "area": "OCU기타",
+                "required_credits": 0.0,
+                "completed_credits": ocu_completed,
+                "missing_credits": 0.0,
+                "is_fulfilled": True,
+                "completion_rate": 100.0
+            })
+            liberal_arts_detail['OCU기타'] = ocu_completed
+
+    # 일반선택(일선) 이수학점이 있으면 추가
+    일선_key = '일선_일선'
+    if general_elective > 0:
+        # requirements_analysis에 일반선택이 없으면 추가
+        if not any(r.get('category') == '일선' for r in analysis_result["requirements_analysis"]):
+            analysis_result["requirements_analysis"].append({
+                "category": "일선",
+                "area": "일선",
+                "required_credits": 0.0,
+                "completed_credits": general_elective,
+                "missing_credits": 0.0,
+                "is_fulfilled": True,
+                "completion_rate": 100.0
+            })
+            비교양_이수합 += general_elective
+    
+    # 다전공 과목 처리 (course_records에서 category='다전공')
+    다전공_이수학점 = float(completed_credits_by_category.get('다전공', 0.0)) + float(completed_credits_by_category.get('다전공_다전공', 0.0))
+    if 다전공_이수학점 > 0:
+        logger.info(f"다전공 과목 이수학점: {다전공_이수학점}학점")
+        비교양_이수합 += 다전공_이수학점
+        # requirements_analysis에 추가
+        if not any(r.get('category') == '다전공' for r in analysis_result["requirements_analysis"]):
+            analysis_result["requirements_analysis"].append({
+                "category": "다전공",
+                "area": "다전공",
+                "required_credits": 0.0,
+                "completed_credits": 다전공_이수학점,
+                "missing_credits": 0.0,
+                "is_fulfilled": True,
+                "completion_rate": 100.0
+            })
+
+    # 졸업요건에 없는 교양 하위영역(OCU/기타 등) 별도 집계
+    for key, value in completed_credits_by_category.items():
+        if key.startswith('교양_') and key not in 교양_요건_키:
+            기타_교양_이수합 += value
+            liberal_arts_detail[key.replace('교양_', '기타_')] = value
+
+    # 배분하지 못한 영역 없는 교양은 기타교양으로 처리
+    if 영역없는교양 > 0:
+        logger.info(f"영역 분류 없는 교양 과목 학점: {영역없는교양}학점 - {describe_allocation(allocation)}")
+        analysis_result["parsing_warnings"].append(
+            f'영역 분류 없는 교양 {영역없는교양}학점을 자동 분배하였습니다. ({describe_allocation(allocation)})')
+        if allocation["unallocated_credits"] > 0:
+            기타_교양_이수합 += allocation["unallocated_credits"]
+            logger.info(f"남은 영역분류없는교양 {allocation['unallocated_credits']}학점을 기타교양으로 처리")
+
+    # 교양 상한 적용 및 초과분 분리
+    교양_총합 = 교양_이수합 + 기타_교양_이수합
+    인정_교양_이수학점 = min(교양_총합, 교양_상한)
+    교양_초과분 = max(0.0, 교양_총합 - 교양_상한)
+
+    analysis_result["liberal_arts_detail"] = liberal_arts_detail
+    analysis_result["liberal_arts_cap"] = 교양_상한
+    analysis_result["liberal_arts_overflow"] = 교양_초과분
+
+    # 전체 이수학점 = 비교양 이수합 + (상한 적용된 교양 이수학점)
+    analysis_result["total_completed_credits"] = 비교양_이수합 + 인정_교양_이수학점
+
+    # 필요학점 = 졸업이수학점(예: 130)
+    analysis_result["total_required_credits"] = grad_total_credit
+    if grad_total_credit > 0:
+        analysis_result["overall_completion_rate"] = round(
+            (analysis_result["total_completed_credits"] / grad_total_credit * 100), 2
+        )
+
+    # 미달 요건
+    for req in analysis_result["requirements_analysis"]:
+        if not req["is_fulfilled"]:
+            analysis_result["missing_requirements"].append(req)
+
+    # 이미 이수한 과목 코드를 집계하여 추천에서 제외 (동등과목은 대표 코드로 비교)
+    passed_codes = collect_passed_course_codes(adjusted_courses, index.equivalency)
+    analysis_result["recommendations"], analysis_result["recommended_courses"] = generate_recommendations(
+        analysis_result["missing_requirements"], index, passed_codes)
+    try:
+        planner = planner or CoursePlanner(index.courses, equivalency=index.equivalency)
+        analysis_result["course_plan"] = planner.plan(
+            analysis_result["missing_requirements"], passed_codes,
+            start_term=next_term_from_semester(student_info.get('semester')))
+    except Exception as e:
+        logger.error(f"이수 계획 생성 오류: {e}")
+        analysis_result["course_plan"] = None
+    return analysis_result
+
+
+def apply_recognition_rules(courses: List[Dict], recognition: Dict[str, List[Dict]]) -> List[Dict]:
+    if not recognition:
+        return courses
+    rules = recognition.get('rules', [])
+    course_rules = recognition.get('courses', [])
+
+    def recognizes_by_rule(c: Dict) -> bool:
+        src_college = (c.get('area') or '').strip()  # 주의: area가 단과대 저장이 아닐 수 있음
+        comp_type = (c.get('completion_type') or '').strip()
+        # 규칙형: source_college 일치 + required_type_source가 전필이면 인정
+        for r in rules:
+            r_college = (r.get('source_college') or '').strip()
+            r_required = (r.get('required_type_source') or '').strip()
+            if r_college and r_required == '전필':
+                # 단과대 매핑은 course_records에 단과대가 없을 수 있어 코드로는 매칭이 어렵다.
+                # 보수적으로: 동일 단과대 정보가 없으면 규칙형은 건너뜀.
+                # 향후 과목 메타(단과대) 저장 시 정확 매칭 가능.
+                pass
+        return False
+
+    def recognizes_by_course(c: Dict) -> bool:
+        code = (c.get('course_code') or '').strip()
+        dept = (c.get('area') or '').strip()
+        name = (c.get('course_name') or '').strip()
+        for r in course_rules:
+            if (r.get('course_code') or '').strip() == code:
+                return True
+        return False
+
+    adjusted = []
+    for c in courses:
+        cat = (c.get('category') or '').strip()
+        # 이미 전공인 경우 그대로
+        if cat == '전공':
+            adjusted.append(c)
+            continue
+        # 개별과목 규칙에 해당하면 전선으로 변환
+        if recognizes_by_course(c) or recognizes_by_rule(c):
+            newc = dict(c)
+            newc['category'] = '전공'
+            newc['area'] = '전공선택'
+            adjusted.append(newc)
+        else:
+            adjusted.append(c)
+    return adjusted
+
+
+ADMISSION_YEAR_MISSING = "입학일자 정보가 없어 입학년도별 졸업요건을 찾을 수 없습니다."
+
+
+def extract_admission_year(admission_date) -> Optional[int]:
+    """입학일자의 연도 (students.admission_year = YEAR(admission_date)와 같은 값), 알 수 없으면 None"""
+    if hasattr(admission_date, 'year'):
+        return admission_date.year
+    if isinstance(admission_date, str):
+        match = re.match(r'\s*(\d{4})', admission_date)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def student_admission_year(student_info: Dict) -> Optional[int]:
+    """students 행의 입학년도: 저장된 admission_year 생성 컬럼 우선, 없으면(오프라인 입력 등) 입학일자에서 계산"""
+    year = student_info.get('admission_year')
+    if year is not None:
+        return int(year)
+    return extract_admission_year(student_info.get('admission_date'))
+
+
+def calculate_completed_credits(courses: List[Dict]) -> Dict[str, float]:
+    credits_by_category = {}
+    for course in courses:
+        if is_passed_record(course):
+            key = course_category_area(course)
+            credit = float(course.get('credit', 0))
+            credits_by_category[key] = credits_by_category.get(key, 0.0) + credit
+    return credits_by_category
+
+
+def is_passed_record(course: Dict) -> bool:
+    # 수집 시 저장된 is_passed가 있으면 그대로 사용 (규칙은 course_rules.is_passed와 동일)
+    stored = course.get('is_passed')
+    if stored is not None:
+        return bool(stored)
+    return is_passed_course(course)
+
+
+def collect_passed_course_codes(courses: List[Dict], equivalency: Optional[CanonicalCodeMap] = None) -> set:
+    equivalency = equivalency or CanonicalCodeMap()
+    codes = set()
+    for c in courses:
+        try:
+            if is_passed_record(c):
+                code = equivalency.canonical(c.get('course_code'))
+                if code:
+                    codes.add(code)
+        except Exception:
+            continue
+    return codes
+
+
+def generate_recommendations(missing_requirements: List[Dict], index: RecommendationIndex,
+                             passed_codes: set) -> Tuple[List[str], List[Dict]]:
+    """추천 문구 목록과 구조화된 추천(recommended_courses)을 함께 생성"""
+    recommendations = []
+    structured = []
+    if not missing_requirements:
+        return ["모든 졸업 요건을 충족하였습니다."], structured
+
+    # 간단 규칙:
+    # - 전공필수 부족: curriculum.required_type='전필' 과목 추천
+    # - 전공선택 부족: curriculum.required_type='전선' 과목 추천
+    # - 교양/일선은 과목 추천은 생략(학과 외 범위 다양성)
+    # 추천은 인덱스의 grade_year/term 오름차순 순서를 따른다
+    passed_mask = index.passed_mask(passed_codes)
+
+    missing_requirements.sort(key=lambda x: x['missing_credits'], reverse=True)
+    for req in missing_requirements:
+        cat = req.get('category')
+        area = req.get('area')
+        miss = float(req.get('missing_credits', 0) or 0)
+        if miss <= 0:
+            continue
+        picks = []
+        if cat == '전공' and area == '전공필수':
+            # 전필은 개수 제한 없이 모두 추천
+            picks = index.candidates('전필', passed_mask)
+            if picks:
+                rec_list = ', '.join(f"{p.get('grade_year', '?')}학년|{p['course_name']}" for p in picks)
+                recommendations.append(f"전공필수 {miss}학점 부족: 권장 과목 → {rec_list}")
+            else:
+                recommendations.append(f"전공필수 {miss}학점 부족: 커리큘럼 과목 목록 없음")
+        elif cat == '전공' and area == '전공선택':
+            # 전선은 최대 8개 추천
+            picks = index.candidates('전선', passed_mask, limit=8)
+            if picks:
+                rec_list = ', '.join(f"{p.get('grade_year', '?')}학년|{p['course_name']}" for p in picks)
+                recommendations.append(f"전공선택 {miss}학점 부족: 추천 과목 → {rec_list}")
+            else:
+                recommendations.append(f"전공선택 {miss}학점 부족: 커리큘럼 과목 목록 없음")
+        else:
+            recommendations.append(f"{cat} {area} {miss}학점 부족")
+        structured.append({
+            'category': cat,
+            'area': area,
+            'missing_credits': miss,
+            'courses': [course_entry(p) for p in picks],
+        })
+
+    total_missing = sum(float(req['missing_credits']) for req in missing_requirements)
+    if total_missing > 0:
+        recommendations.append(f"졸업까지 총 {total_missing}학점이 부족합니다.")
+    return recommendations, structured
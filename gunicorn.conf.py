@@ -0,0 +1,55 @@
+# 운영 서버 설정: gunicorn -c gunicorn.conf.py main_app:app
+#
+# - preload_app: 마스터에서 앱을 한 번 import한 뒤 워커를 fork (모듈 캐시/세션 키 공유, 워커 기동 빠름)
+# - 엑셀 파싱/분석은 CPU 작업이라 워커(프로세스) 수로 코어를 나눠 쓴다
+# - max_requests(+jitter) 처리 후 워커를 순차 재시작해 장기 실행 메모리 증가를 막는다
+import multiprocessing
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', os.environ.get('FLASK_RUN_PORT', '6000'))}"
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('WEB_THREADS', 1))
+preload_app = True
+
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 100))
+# 대용량 성적표 파싱 + 분석이 한 요청 안에서 끝나야 하므로 기본 30초보다 넉넉히
+timeout = int(os.environ.get('WEB_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('WEB_LOG_LEVEL', 'info')
+
+# 워커별 메트릭 스냅샷 파일 위치 (/metrics는 어느 워커가 받아도 전체 합산을 응답)
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'graduation_metrics'))
+
+
+def on_starting(server):
+    # 이전 실행의 워커 스냅샷 제거
+    from instrumentation import reset_metrics_dir
+    reset_metrics_dir()
+
+
+def when_ready(server):
+    # 워커 fork 전 마스터에서 한 번만 DB 설정/관리자 계정 확인
+    from main_app import initialize_app
+    initialize_app()
+
+
+def post_fork(server, worker):
+    # 업로드 보관소 정리/요건 변경 재분석 대기열 스레드 (여러 워커 중 잠금을 잡은 하나만 실제로 처리)
+    from main_app import load_upload_analysis_dates, reanalysis_scheduler, upload_archive
+    upload_archive.start_compactor(load_upload_analysis_dates)
+    reanalysis_scheduler.start()
+
+
+def worker_exit(server, worker):
+    # 재시작되는 워커에 대기 중인 세션 활동 기록이 있으면 종료 전에 실행
+    # (요건 변경 재분석 대기열은 DB에 있어 다른 워커가 이어서 처리)
+    from instrumentation import snapshot_files
+    from main_app import session_store
+    session_store.flush()
+    # 종료 워커의 메트릭은 누적 파일에 합쳐 카운터가 줄어들지 않게 함
+    snapshot_files.fold_on_exit()
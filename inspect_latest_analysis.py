@@ -1,4 +1,5 @@
-import mysql.connector, json
+import mysql.connector
+from analysis_codec import load_stored_analysis
 
 db = dict(host='203.255.78.58', port=9003, user='user29', password='123', database='graduation_system')
 
@@ -6,14 +7,14 @@ conn = mysql.connector.connect(**db)
 cur = conn.cursor(dictionary=True)
 
 print('=== 최근 분석 5건 ===')
-cur.execute("SELECT ga.student_id, ga.analysis_date, ga.overall_completion_rate, ga.total_completed_credits, ga.total_required_credits, ga.analysis_result FROM graduation_analysis ga ORDER BY ga.analysis_date DESC LIMIT 5")
+cur.execute("SELECT ga.student_id, ga.analysis_date, ga.overall_completion_rate, ga.total_completed_credits, ga.total_required_credits, ga.analysis_result, ga.analysis_blob FROM graduation_analysis ga ORDER BY ga.analysis_date DESC LIMIT 5")
 rows = cur.fetchall()
 for i, r in enumerate(rows, 1):
     print(f"\n[{i}] 학생:{r['student_id']} 일시:{r['analysis_date']} 이수율:{r['overall_completion_rate']}% 이수:{r['total_completed_credits']}/{r['total_required_credits']}")
     try:
-        data = json.loads(r['analysis_result']) if r['analysis_result'] else {}
+        data = load_stored_analysis(r) or {}
     except Exception as e:
-        print(f"  analysis_result JSON 파싱 실패: {e}")
+        print(f"  analysis_result 복원 실패: {e}")
         data = {}
     reqs = data.get('requirements_analysis', [])
     cats = {}
@@ -35,8 +36,8 @@ if rows:
     s = cur.fetchone()
     print(s)
     print('\n교과 카테고리 집계:')
-    cur.execute("SELECT category, area, SUM(credit) as sum_credit FROM course_records WHERE student_id=%s AND grade IN ('A+','A0','A-','B+','B0','B-','C+','C0','C-','D+','D0','P','통과') GROUP BY category, area ORDER BY category, area", (sid,))
+    cur.execute("SELECT category_area, SUM(credit) as sum_credit FROM course_records WHERE student_id=%s AND is_passed = TRUE GROUP BY category_area ORDER BY category_area", (sid,))
     for row in cur.fetchall():
-        print(f"  {row['category']}_{row['area']}: {row['sum_credit']}")
+        print(f"  {row['category_area']}: {row['sum_credit']}")
 
 cur.close(); conn.close()
@@ -0,0 +1,350 @@
+import contextvars
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+from flask import g, request
+
+from query_profiler import fingerprint, query_profiler, suppressed
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 버킷(초)과 요청당 쿼리 수 버킷
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', 1.0))
+SLOW_LOG_TOP_QUERIES = 5
+# 워커별 스냅샷 파일 갱신 주기 (gunicorn 다중 워커에서 /metrics가 모든 워커 값을 합산)
+DUMP_INTERVAL_SECONDS = 5.0
+ARCHIVE_FILE = '_exited.json'
+
+METRIC_HELP = {
+    'http_request_duration_seconds': ('histogram', '라우트별 요청 처리 시간'),
+    'http_request_db_queries': ('histogram', '요청당 DB 쿼리 수'),
+    'http_request_db_seconds': ('histogram', '요청당 DB 쿼리 시간 합계'),
+    'app_phase_duration_seconds': ('histogram', '업로드 처리 단계(검증/파싱·저장/분석)별 시간'),
+    'http_slow_requests_total': ('counter', '느린 요청 수'),
+}
+
+_current = contextvars.ContextVar('request_stats', default=None)
+_local = threading.local()
+
+class RequestStats:
+    """요청 하나의 DB 쿼리 수/시간, 쿼리 지문별 시간, 처리 단계별 시간"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.by_fingerprint: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self.phases: Dict[str, float] = {}
+
+    def record_query(self, sql, seconds: float):
+        self.queries += 1
+        self.db_seconds += seconds
+        entry = self.by_fingerprint[fingerprint(sql)]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def top_queries(self, limit: int = SLOW_LOG_TOP_QUERIES) -> List[Tuple[str, int, float]]:
+        ranked = sorted(self.by_fingerprint.items(), key=lambda item: item[1][1], reverse=True)
+        return [(fp, count, seconds) for fp, (count, seconds) in ranked[:limit]]
+
+
+def _labels_key(labels: Dict) -> Tuple:
+    return tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    """프로세스 내 카운터/히스토그램 (Prometheus 텍스트 형식으로 출력)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple, float] = {}
+        # (이름, 라벨) → 버킷 경계, 버킷별 개수(마지막은 +Inf), 합계
+        self.histograms: Dict[Tuple, Dict] = {}
+
+    def inc(self, name: str, labels: Dict, value: float = 1.0):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: Dict, value: float, buckets=LATENCY_BUCKETS):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            entry = self.histograms.get(key)
+            if entry is None:
+                entry = self.histograms[key] = {'buckets': list(buckets), 'counts': [0] * (len(buckets) + 1),
+                                                'sum': 0.0}
+            index = next((i for i, bound in enumerate(entry['buckets']) if value <= bound), len(entry['buckets']))
+            entry['counts'][index] += 1
+            entry['sum'] += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), {'buckets': e['buckets'], 'counts': list(e['counts']),
+                                                     'sum': e['sum']}]
+                               for (name, labels), e in self.histograms.items()],
+            }
+
+
+def merge_snapshots(snapshots: List[Dict]) -> Dict:
+    counters: Dict[Tuple, float] = {}
+    histograms: Dict[Tuple, Dict] = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get('counters', []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, entry in snapshot.get('histograms', []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            merged = histograms.get(key)
+            if merged is None or merged['buckets'] != entry['buckets']:
+                histograms[key] = {'buckets': list(entry['buckets']), 'counts': list(entry['counts']),
+                                   'sum': entry['sum']}
+            else:
+                merged['counts'] = [a + b for a, b in zip(merged['counts'], entry['counts'])]
+                merged['sum'] += entry['sum']
+    return {
+        'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, list(labels), entry] for (name, labels), entry in histograms.items()],
+    }
+
+
+def _format_labels(labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [tuple(pair) for pair in labels] + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_text(snapshot: Dict) -> str:
+    """Prometheus 텍스트 노출 형식 (version 0.0.4)"""
+    grouped: Dict[str, List[str]] = defaultdict(list)
+    for name, labels, value in sorted(snapshot['counters'], key=lambda item: (item[0], item[1])):
+        grouped[name].append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+    for name, labels, entry in sorted(snapshot['histograms'], key=lambda item: (item[0], item[1])):
+        cumulative = 0
+        for bound, count in zip(entry['buckets'], entry['counts']):
+            cumulative += count
+            grouped[name].append(f"{name}_bucket{_format_labels(labels, ('le', _format_number(bound)))} {cumulative}")
+        cumulative += entry['counts'][-1]
+        grouped[name].append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {cumulative}")
+        grouped[name].append(f"{name}_sum{_format_labels(labels)} {_format_number(entry['sum'])}")
+        grouped[name].append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    lines = []
+    for name in sorted(grouped):
+        kind, help_text = METRIC_HELP.get(name, ('untyped', name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(grouped[name])
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+# --- DB 쿼리 추적 ---
+
+def _wrap_execute(method, many=False):
+    @wraps(method)
+    def execute(self, operation, *args, **kwargs):
+        # 내부에서 다시 execute를 부르는 커서(prepared 등)는 바깥 호출 한 번만 기록
+        if getattr(_local, 'in_query', False) or suppressed():
+            return method(self, operation, *args, **kwargs)
+        _local.in_query = True
+        started = time.perf_counter()
+        try:
+            return method(self, operation, *args, **kwargs)
+        finally:
+            _local.in_query = False
+            elapsed = time.perf_counter() - started
+            stats = _current.get()
+            if stats is not None:
+                stats.record_query(operation, elapsed)
+            params = None if many else (args[0] if args else kwargs.get('params'))
+            query_profiler.observe(operation, params, elapsed)
+    execute._instrumented = True
+    return execute
+
+
+def install_query_tracking():
+    """mysql.connector 커서의 execute/executemany에 요청별 쿼리 수/시간 기록을 연결
+
+    핸들러마다 직접 커서를 만들어 쓰므로 커서 클래스에서 한 번에 잡는다.
+    요청별 집계는 요청 안의 쿼리만, 지문별 지연/실행 계획(query_profiler)은 모든 쿼리를 대상으로 한다.
+    """
+    modules = []
+    try:
+        from mysql.connector import cursor as cursor_py
+        modules.append(cursor_py)
+    except ImportError:
+        return
+    try:
+        from mysql.connector import cursor_cext
+        modules.append(cursor_cext)
+    except ImportError:
+        pass
+    for module in modules:
+        for value in list(vars(module).values()):
+            if not isinstance(value, type) or value.__name__.endswith('Abstract'):
+                continue
+            for attr in ('execute', 'executemany'):
+                method = value.__dict__.get(attr)
+                if method is not None and not getattr(method, '_instrumented', False):
+                    setattr(value, attr, _wrap_execute(method, many=(attr == 'executemany')))
+
+
+@contextmanager
+def phase(name: str):
+    """요청 안의 처리 단계 시간 측정 (업로드: 검증/파싱·저장/분석)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe('app_phase_duration_seconds', {'phase': name}, elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.phases[name] = stats.phases.get(name, 0.0) + elapsed
+
+
+# --- 워커 스냅샷 파일 (다중 워커 합산) ---
+
+class _SnapshotFiles:
+    def __init__(self):
+        self.last_dump = 0.0
+
+    @staticmethod
+    def directory() -> Optional[str]:
+        return os.environ.get('METRICS_DIR') or None
+
+    def dump(self, force: bool = False):
+        directory = self.directory()
+        now = time.monotonic()
+        if directory is None or (not force and now - self.last_dump < DUMP_INTERVAL_SECONDS):
+            return
+        self.last_dump = now
+        os.makedirs(directory, exist_ok=True)
+        _write_json(os.path.join(directory, f"{os.getpid()}.json"), registry.snapshot())
+
+    def collect(self) -> Dict:
+        directory = self.directory()
+        if directory is None:
+            return registry.snapshot()
+        self.dump(force=True)
+        snapshots = []
+        for name in os.listdir(directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, name), encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return merge_snapshots(snapshots)
+
+    def fold_on_exit(self):
+        """종료하는 워커의 값을 누적 파일에 합치고 워커 파일 삭제 (카운터가 줄어들지 않도록)"""
+        directory = self.directory()
+        if directory is None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        archive = os.path.join(directory, ARCHIVE_FILE)
+        lock_path = os.path.join(directory, '.lock')
+        with open(lock_path, 'a') as lock:
+            try:
+                import fcntl
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            except ImportError:
+                pass
+            previous = {}
+            if os.path.exists(archive):
+                with open(archive, encoding='utf-8') as f:
+                    previous = json.load(f)
+            _write_json(archive, merge_snapshots([previous, registry.snapshot()]))
+            own = os.path.join(directory, f"{os.getpid()}.json")
+            if os.path.exists(own):
+                os.remove(own)
+
+
+def _write_json(path: str, data: Dict):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp.')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+snapshot_files = _SnapshotFiles()
+
+
+def metrics_text() -> str:
+    return render_text(snapshot_files.collect())
+
+
+def reset_metrics_dir():
+    """서버 시작 시 이전 실행의 워커 파일 정리"""
+    directory = _SnapshotFiles.directory()
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+
+
+# --- Flask 연결 ---
+
+def init_app(app):
+    install_query_tracking()
+
+    @app.before_request
+    def _start_request_stats():
+        g.request_stats = RequestStats()
+        g.request_stats_token = _current.set(g.request_stats)
+
+    @app.teardown_request
+    def _finish_request_stats(exc):
+        stats = g.pop('request_stats', None)
+        token = g.pop('request_stats_token', None)
+        if stats is None:
+            return
+        try:
+            _current.reset(token)
+        except ValueError:
+            _current.set(None)
+        elapsed = time.perf_counter() - stats.started
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        status = getattr(g, 'response_status', 500 if exc else 200)
+        registry.observe('http_request_duration_seconds',
+                         {'method': request.method, 'route': route, 'status': f"{status // 100}xx"}, elapsed)
+        registry.observe('http_request_db_queries', {'route': route}, stats.queries, QUERY_COUNT_BUCKETS)
+        registry.observe('http_request_db_seconds', {'route': route}, stats.db_seconds)
+        if elapsed >= SLOW_REQUEST_SECONDS:
+            registry.inc('http_slow_requests_total', {'route': route})
+            queries = '; '.join(f"[{count}회 {seconds * 1000:.0f}ms] {fp}" for fp, count, seconds in stats.top_queries())
+            phases = ', '.join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in stats.phases.items())
+            logger.warning(
+                f"느린 요청: {request.method} {request.path} ({route}) {elapsed * 1000:.0f}ms, "
+                f"DB {stats.queries}건 {stats.db_seconds * 1000:.0f}ms"
+                f"{', 단계 ' + phases if phases else ''} | {queries}"
+            )
+        try:
+            snapshot_files.dump()
+        except OSError as e:
+            logger.error(f"메트릭 파일 기록 오류: {e}")
+
+    @app.after_request
+    def _remember_status(response):
+        g.response_status = response.status_code
+        return response
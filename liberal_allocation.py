@@ -0,0 +1,134 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from course_rules import category_area_key
+
+logger = logging.getLogger(__name__)
+
+# analyze_graduation_status와 동일한 집계행 제외 키워드
+EXCLUDE_KEYWORDS = ('총계', '합계', '학점총계', '교양총계', '졸업')
+GSIN_AREA = '개신기초교양'
+UNCLASSIFIED_KEY = '교양'
+
+
+class AllocationPlan:
+    """영역 없는 교양 학점을 받을 수 있는 교양 요건 영역 (요건 집합마다 한 번 생성)
+
+    영역 분류 없는 교양 학점(풀 하나)을 영역별 용량 min(부족분, 상한 여유)인 간선으로 나누는
+    이분 흐름 문제에서, 공급원이 하나이므로 충족 영역 수 최대화는 용량이 작은 영역부터
+    채우는 것과 같다. 충족할 수 없는 영역(상한 < 필요학점)은 마지막에 부분 배분한다.
+    """
+
+    def __init__(self, requirements: List[Dict]):
+        self.areas: List[Dict] = []
+        self.owns_pool = False
+        used_keys = set()
+        for r in requirements:
+            category = r.get('category')
+            area = r.get('area', '')
+            if any((str(area) + str(category)).find(k) != -1 for k in EXCLUDE_KEYWORDS):
+                continue
+            key = category_area_key(category, area)
+            if key in used_keys:
+                continue
+            used_keys.add(key)
+            if category != '교양':
+                continue
+            if not area:
+                # 영역 없는 교양 요건 행이 있으면 학점은 그 행에서 이미 인정됨
+                self.owns_pool = True
+                continue
+            if GSIN_AREA in area:
+                # 개신기초교양은 세부영역별 이수가 필요하므로 영역 없는 과목으로 채우지 않음
+                continue
+            max_credits = r.get('max_credits')
+            try:
+                max_credits = float(max_credits) if max_credits is not None else None
+            except (TypeError, ValueError):
+                max_credits = None
+            self.areas.append({
+                'area': area,
+                'key': key,
+                'required_credits': float(r.get('required_credits', 0)),
+                'max_credits': max_credits,
+            })
+        self.keys = [a['key'] for a in self.areas]
+        self.required = np.array([a['required_credits'] for a in self.areas], dtype=float)
+        self.max_credits = np.array([np.inf if a['max_credits'] is None else a['max_credits'] for a in self.areas],
+                                    dtype=float)
+
+
+def _capacities(plan: AllocationPlan, current: np.ndarray):
+    """영역별 배분 용량과 충족 가능 여부 (current: [..., 영역])"""
+    shortfall = np.maximum(plan.required - current, 0.0)
+    headroom = np.maximum(plan.max_credits - current, 0.0)
+    capacity = np.minimum(shortfall, headroom)
+    return capacity, capacity >= shortfall
+
+
+def allocate_cohort(plan: AllocationPlan, current: np.ndarray, pool: np.ndarray) -> np.ndarray:
+    """학생별 영역 배분 학점 (current: 학생 × 영역 이수학점, pool: 학생별 영역 없는 교양 학점)
+
+    충족 가능한 영역을 용량 오름차순(같으면 요건 순서)으로 채우고, 남은 학점은
+    충족할 수 없는 영역의 부족분에 같은 순서로 배분한다. 영역 수 a에 대해 학생당 O(a log a).
+    """
+    fills = np.zeros_like(current, dtype=float)
+    if not plan.areas or current.shape[0] == 0:
+        return fills
+    capacity, fulfillable = _capacities(plan, current)
+    order = np.lexsort((capacity, ~fulfillable))
+    sorted_capacity = np.take_along_axis(capacity, order, axis=1)
+    before = np.cumsum(sorted_capacity, axis=1) - sorted_capacity
+    sorted_fill = np.clip(np.maximum(pool, 0.0)[:, None] - before, 0.0, sorted_capacity)
+    np.put_along_axis(fills, order, sorted_fill, axis=1)
+    return fills
+
+
+def allocate_unclassified(plan: AllocationPlan, completed_by_key: Dict[str, float], pool: float) -> Dict[str, float]:
+    """학생 한 명의 영역별 배분 학점 {키: 학점} (allocate_cohort와 같은 결과)"""
+    if not plan.areas or pool <= 0:
+        return {}
+    current = np.array([[float(completed_by_key.get(key, 0.0)) for key in plan.keys]])
+    fills = allocate_cohort(plan, current, np.array([float(pool)]))[0]
+    return {key: float(fill) for key, fill in zip(plan.keys, fills) if fill > 0}
+
+
+def allocation_record(plan: AllocationPlan, pool: float, fills: Dict[str, float],
+                      completed_by_key: Dict[str, float]) -> Dict:
+    """분석 결과에 남기는 배분 내역 (liberal_arts_allocation)"""
+    pool = float(pool)
+    allocations = []
+    for area in plan.areas:
+        credits = fills.get(area['key'], 0.0)
+        if credits <= 0:
+            continue
+        completed = float(completed_by_key.get(area['key'], 0.0)) + credits
+        if area['max_credits'] is not None:
+            completed = min(completed, area['max_credits'])
+        allocations.append({
+            'area': area['area'],
+            'credits': credits,
+            'is_fulfilled': completed >= area['required_credits'],
+        })
+    return {
+        'unclassified_credits': pool,
+        'allocations': allocations,
+        'unallocated_credits': max(0.0, pool - sum(a['credits'] for a in allocations)),
+    }
+
+
+def unclassified_pool(plan: AllocationPlan, completed_by_key: Dict[str, float]) -> float:
+    """배분 대상 영역 없는 교양 학점 (요건표에 영역 없는 교양 행이 있으면 0)"""
+    if plan.owns_pool:
+        return 0.0
+    return max(float(completed_by_key.get(UNCLASSIFIED_KEY, 0.0)), 0.0)
+
+
+def describe_allocation(record: Optional[Dict]) -> str:
+    """배분 내역 한 줄 요약 (로그/경고 메시지용)"""
+    if not record or not record.get('allocations'):
+        return '배분 없음'
+    parts = [f"{a['area']} {a['credits']}학점" for a in record['allocations']]
+    return ', '.join(parts)
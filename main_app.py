@@ -1,36 +1,92 @@
-from flask import Flask, request, jsonify, render_template, session, redirect, url_for, flash
+from flask import Flask, request, jsonify, render_template, session, redirect, url_for, flash, Response, stream_with_context
+from flask import Request
 import mysql.connector
 from mysql.connector import Error
-import bcrypt
 import logging
 from typing import Dict, Optional
 from datetime import datetime, timedelta
-import secrets
 import hashlib
+import io
 from functools import wraps
 import os
 from werkzeug.utils import secure_filename
-import threading
+import time
 from enhanced_xlsx_parser import process_excel_file_enhanced as process_excel_file
 from graduation_requirements_checker import analyze_student_graduation
 from graduation_requirements_checker import GraduationRequirementsChecker
+from graduation_core import ADMISSION_YEAR_MISSING, student_admission_year
+from student_schema import ensure_admission_year_column
 from notification_system import get_user_notifications, NotificationSystem
+from response_utils import (
+    parse_fields_param, build_json_extract_columns, collect_projected_fields,
+    make_etag, is_not_modified, not_modified_response,
+    conditional_json, compress_response
+)
+from analysis_codec import load_stored_analysis, needs_student_info
+from analysis_history import AnalysisHistoryStore
+from requirement_versions import is_stale, snapshot_requirements
+from requirement_impact import preview_requirement_changes
+from reanalysis_scheduler import SharedReanalysisScheduler, ensure_pending_table, format_change_summary
+from simulation import load_simulation_inputs, simulate, simulation_cache, validate_changes
+from session_secret import load_secret_key
+from session_store import SessionStore, ServerSessionInterface, ensure_session_table
+from password_hashing import HashQueueFull, login_metrics, password_hasher
+from upload_intake import UploadRejected, copy_limited, intake_upload
+from upload_archive import UploadArchive
+from instrumentation import init_app as init_instrumentation, metrics_text, phase
+from query_profiler import query_profiler, read_report
+from student_export import iter_csv, iter_student_rows, iter_xlsx
+from bulk_import import BulkImportError, BulkImportJobs
+from requirement_import import RequirementImportError, import_requirements, read_workbook
 import json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 일괄 가져오기(ZIP) 요청 본문 한도: 일반 업로드 한도와 별도
+BULK_IMPORT_PATH = '/api/admin/bulk-import'
+BULK_IMPORT_MAX_SIZE = int(os.environ.get('BULK_IMPORT_MAX_MB', 500)) * 1024 * 1024
+
+
+class AppRequest(Request):
+    @property
+    def max_content_length(self):
+        if self.path == BULK_IMPORT_PATH:
+            return BULK_IMPORT_MAX_SIZE + 64 * 1024
+        return super().max_content_length
+
+
 app = Flask(__name__)
-app.secret_key = secrets.token_hex(32)
+app.request_class = AppRequest
+# 워커/재시작 간 공유되는 고정 키 (FLASK_SECRET_KEY 또는 instance/secret_key)
+app.secret_key = load_secret_key()
+app.after_request(compress_response)
+# 라우트별 지연 시간/DB 쿼리 수·시간/업로드 단계 시간 기록 (/metrics), 느린 요청 로그
+init_instrumentation(app)
 
 # 업로드 설정
 UPLOAD_FOLDER = 'uploads'
 PROCESSED_FOLDER = os.path.join(UPLOAD_FOLDER, 'processed')
 ALLOWED_EXTENSIONS = {'xlsx'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+# 요청 본문 한도 (multipart 헤더 여유분 포함): 넘으면 본문을 끝까지 읽기 전에 413
+app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE + 64 * 1024
+
+# 분석 진행 추이/이력 조회 건수
+PROGRESS_DEFAULT_LIMIT = 20
+PROGRESS_MAX_LIMIT = 200
+ADMIN_HISTORY_LIMIT = 20
+
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(PROCESSED_FOLDER, exist_ok=True)
 
+# 업로드 보관소: 학생별 최근 N개 + 현재 분석의 원본 유지, 오래된 파일은 묶음 압축
+upload_archive = UploadArchive(
+    os.path.join(UPLOAD_FOLDER, 'archive'),
+    keep_per_student=int(os.environ.get('UPLOAD_KEEP_PER_STUDENT', 5)),
+    pack_after_days=int(os.environ.get('UPLOAD_PACK_AFTER_DAYS', 30))
+)
+
 # 데이터베이스 설정
 db_config = {
     'host': '203.255.78.58',
@@ -40,39 +96,42 @@ db_config = {
     'password': '123'
 }
 
+# 성적표 ZIP 일괄 가져오기 작업 (진행 상황은 instance/bulk_imports/<작업ID>.json)
+bulk_import_jobs = BulkImportJobs(os.path.join(app.instance_path, 'bulk_imports'), db_config, upload_archive)
+
+# 느린 쿼리(지문별 1회)의 실행 계획을 별도 연결로 수집해 instance/slow_queries.jsonl에 기록
+query_profiler.configure(db_config)
+
+# 로그인 세션은 user_sessions에 저장 (워커 간 공유, 재시작 후 유지), 워커별 캐시로 요청마다 DB 조회 없음
+session_store = SessionStore(db_config)
+app.session_interface = ServerSessionInterface(session_store)
+
 class AuthSystem:
+    """로그인/가입 (요청마다 자체 연결 사용, bcrypt는 password_hasher 풀에서 실행)"""
+
     def __init__(self, db_config: Dict[str, str]):
         self.db_config = db_config
-        self.connection = None
         self.session_timeout = timedelta(hours=8)
     
-    def connect_db(self):
-        try:
-            self.connection = mysql.connector.connect(**self.db_config)
-        except Error as e:
-            logger.error(f"MySQL 연결 오류: {e}")
-            raise
-    
-    def disconnect_db(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-    
     def hash_password(self, password: str) -> str:
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        return password_hasher.hash(password)
     
     def verify_password(self, password: str, hashed: str) -> bool:
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        return password_hasher.verify(password, hashed)
     
     def create_user(self, username: str, password: str, role: str = 'student') -> Dict:
+        connection = None
         try:
-            cursor = self.connection.cursor()
+            connection = mysql.connector.connect(**self.db_config)
+            cursor = connection.cursor()
             
             cursor.execute("SELECT username FROM users WHERE username = %s", (username,))
-            if cursor.fetchone():
+            exists = cursor.fetchone() is not None
+            cursor.close()
+            if exists:
                 return {"success": False, "error": "이미 존재하는 사용자 ID입니다."}
             
+            # 해시 계산 동안 트랜잭션/잠금을 잡지 않도록 INSERT 전에 계산
             hashed_password = self.hash_password(password)
             
             query = """
@@ -80,28 +139,55 @@ class AuthSystem:
             VALUES (%s, %s, %s, %s, NOW())
             """
             
+            cursor = connection.cursor()
             cursor.execute(query, (username, hashed_password, role, True))
-            self.connection.commit()
+            connection.commit()
             cursor.close()
             
             return {"success": True, "message": "사용자가 생성되었습니다."}
             
         except Error as e:
-            self.connection.rollback()
+            if connection:
+                connection.rollback()
             return {"success": False, "error": str(e)}
+        finally:
+            if connection and connection.is_connected():
+                connection.close()
+    
+    def _save_rehashed_password(self, username: str, old_hash: str, new_hash: str):
+        connection = mysql.connector.connect(**self.db_config)
+        try:
+            cursor = connection.cursor()
+            # 그 사이 비밀번호가 바뀌었으면 덮어쓰지 않음
+            cursor.execute(
+                "UPDATE users SET password_hash = %s WHERE username = %s AND password_hash = %s",
+                (new_hash, username, old_hash)
+            )
+            connection.commit()
+            cursor.close()
+            logger.info(f"비밀번호 해시 cost 갱신: {username}")
+        finally:
+            connection.close()
     
     def authenticate_user(self, username: str, password: str) -> Dict:
+        """사용자 인증 (해시 대기열이 가득 차면 HashQueueFull)"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            
-            query = """
-            SELECT username, password_hash, role, is_active 
-            FROM users 
-            WHERE username = %s
-            """
-            
-            cursor.execute(query, (username,))
-            user = cursor.fetchone()
+            # 사용자 조회 후 연결을 반납하고 나서 해시 검증 (검증 동안 연결을 잡지 않음)
+            connection = mysql.connector.connect(**self.db_config)
+            try:
+                cursor = connection.cursor(dictionary=True)
+                cursor.execute(
+                    """
+                    SELECT username, password_hash, role, is_active 
+                    FROM users 
+                    WHERE username = %s
+                    """,
+                    (username,)
+                )
+                user = cursor.fetchone()
+                cursor.close()
+            finally:
+                connection.close()
             
             if not user:
                 return {"success": False, "error": "존재하지 않는 사용자 ID입니다."}
@@ -112,12 +198,23 @@ class AuthSystem:
             if not self.verify_password(password, user['password_hash']):
                 return {"success": False, "error": "비밀번호가 올바르지 않습니다."}
             
-            cursor.execute(
-                "UPDATE users SET last_login = NOW() WHERE username = %s", 
-                (username,)
-            )
-            self.connection.commit()
-            cursor.close()
+            if password_hasher.needs_rehash(user['password_hash']):
+                old_hash = user['password_hash']
+                password_hasher.rehash_later(
+                    password, lambda new_hash: self._save_rehashed_password(username, old_hash, new_hash)
+                )
+            
+            connection = mysql.connector.connect(**self.db_config)
+            try:
+                cursor = connection.cursor()
+                cursor.execute(
+                    "UPDATE users SET last_login = NOW() WHERE username = %s", 
+                    (username,)
+                )
+                connection.commit()
+                cursor.close()
+            finally:
+                connection.close()
             
             return {
                 "success": True,
@@ -128,6 +225,7 @@ class AuthSystem:
             }
             
         except Error as e:
+            logger.error(f"인증 오류: {e}")
             return {"success": False, "error": "인증 중 오류가 발생했습니다."}
 
 auth_system = AuthSystem(db_config)
@@ -187,6 +285,51 @@ def student_required(f):
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+@app.errorhandler(413)
+def request_entity_too_large(e):
+    limit = BULK_IMPORT_MAX_SIZE if request.path == BULK_IMPORT_PATH else MAX_FILE_SIZE
+    message = f"파일 크기는 {limit // (1024 * 1024)}MB를 넘을 수 없습니다."
+    if request.path.startswith('/api/'):
+        return jsonify({'success': False, 'error': message}), 413
+    return message, 413
+
+def load_analysis_body(cursor, analysis_id, fields=None, student_info=None):
+    """graduation_analysis 한 건의 본문을 조회하여 복원 (cursor는 dictionary=True)
+
+    fields가 주어지면 요약 JSON에 있는 필드는 JSON_EXTRACT로 읽고,
+    압축 본문(analysis_blob)에만 있는 필드가 요청된 경우에만 본문을 디코딩한다.
+    """
+    if fields is not None:
+        if not fields:
+            return {}
+        cursor.execute(
+            f"SELECT analysis_blob IS NOT NULL AS has_blob, {build_json_extract_columns(fields)} "
+            f"FROM graduation_analysis WHERE id = %s",
+            (analysis_id,)
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        has_blob = row.pop('has_blob')
+        projected = collect_projected_fields(row, fields)
+        if not has_blob or all(name in projected for name in fields):
+            return projected
+
+    cursor.execute(
+        "SELECT student_id, analysis_result, analysis_blob FROM graduation_analysis WHERE id = %s",
+        (analysis_id,)
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None
+    analysis_data = load_stored_analysis(row, student_info)
+    if analysis_data and needs_student_info(analysis_data) and (fields is None or 'student_info' in fields):
+        cursor.execute("SELECT * FROM students WHERE student_id = %s", (row['student_id'],))
+        analysis_data['student_info'] = cursor.fetchone()
+    if analysis_data is None or fields is None:
+        return analysis_data
+    return {name: analysis_data[name] for name in fields if name in analysis_data}
+
 @app.route('/')
 def index():
     if 'user_id' in session:
@@ -208,23 +351,26 @@ def login():
         flash('사용자 ID와 비밀번호를 입력해주세요.', 'error')
         return render_template('login.html')
     
-    auth_system.connect_db()
+    started = time.perf_counter()
     try:
         auth_result = auth_system.authenticate_user(username, password)
+    except HashQueueFull as e:
+        login_metrics.observe(time.perf_counter() - started, 'busy')
+        logger.warning(f"로그인 거절 (해시 대기열 초과): {e}")
+        flash('로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.', 'error')
+        return render_template('login.html'), 503
+    login_metrics.observe(time.perf_counter() - started, 'success' if auth_result['success'] else 'failure')
+    
+    if auth_result['success']:
+        session['user_id'] = username
+        session['role'] = auth_result['user']['role']
         
-        if auth_result['success']:
-            session['user_id'] = username
-            session['role'] = auth_result['user']['role']
-            
-            if auth_result['user']['role'] == 'admin':
-                return redirect(url_for('admin_dashboard'))
-            else:
-                return redirect(url_for('student_dashboard'))
+        if auth_result['user']['role'] == 'admin':
+            return redirect(url_for('admin_dashboard'))
         else:
-            flash(auth_result['error'], 'error')
-    
-    finally:
-        auth_system.disconnect_db()
+            return redirect(url_for('student_dashboard'))
+    else:
+        flash(auth_result['error'], 'error')
     
     return render_template('login.html')
 
@@ -251,19 +397,18 @@ def register():
         flash('비밀번호는 최소 6자 이상이어야 합니다.', 'error')
         return render_template('register.html')
     
-    auth_system.connect_db()
+    role = 'admin' if is_admin else 'student'
     try:
-        role = 'admin' if is_admin else 'student'
         result = auth_system.create_user(username, password, role)
-        
-        if result['success']:
-            flash('계정이 생성되었습니다. 로그인해주세요.', 'success')
-            return redirect(url_for('login'))
-        else:
-            flash(result['error'], 'error')
+    except HashQueueFull:
+        flash('요청이 많습니다. 잠시 후 다시 시도해주세요.', 'error')
+        return render_template('register.html'), 503
     
-    finally:
-        auth_system.disconnect_db()
+    if result['success']:
+        flash('계정이 생성되었습니다. 로그인해주세요.', 'success')
+        return redirect(url_for('login'))
+    else:
+        flash(result['error'], 'error')
     
     return render_template('register.html')
 
@@ -333,14 +478,23 @@ def get_student_info():
 @app.route('/api/student/analysis', methods=['GET'])
 @login_required
 def get_student_analysis():
+    """최신 분석 결과 조회 (ETag 조건부 요청, fields= 부분 조회 지원)"""
     try:
+        fields = parse_fields_param(request.args.get('fields'))
+
         connection = mysql.connector.connect(**db_config)
         cursor = connection.cursor(dictionary=True)
         
+        # 본문(JSON) 없이 분석일시만 먼저 조회하여 조건부 요청을 처리
+        # 현재 요건 버전도 함께 조회하여 분석 시점 버전과 정수 비교로 재분석 필요 여부 판단
         query = """
-        SELECT * FROM graduation_analysis 
-        WHERE student_id = %s 
-        ORDER BY analysis_date DESC 
+        SELECT ga.id, ga.analysis_date, ga.requirement_version,
+               (SELECT MAX(v.version) FROM requirement_set_versions v
+                WHERE v.department = s.department AND v.admission_year = s.admission_year) AS current_requirement_version
+        FROM graduation_analysis ga
+        JOIN students s ON s.student_id = ga.student_id
+        WHERE ga.student_id = %s 
+        ORDER BY ga.analysis_date DESC 
         LIMIT 1
         """
         cursor.execute(query, (session['user_id'],))
@@ -348,41 +502,118 @@ def get_student_analysis():
         
         logger.info(f"분석 데이터 조회 결과: {analysis is not None}")
         
-        if analysis:
-            logger.info(f"분석 데이터 상세: ID={analysis.get('id')}, 날짜={analysis.get('analysis_date')}")
-            
-            if analysis.get('analysis_result'):
-                try:
-                    analysis_data = json.loads(analysis['analysis_result'])
-                    logger.info(f"JSON 파싱 성공, 요건 개수: {len(analysis_data.get('requirements_analysis', []))}")
-                    
-                    # 필요한 필드들이 있는지 확인
-                    required_fields = ['total_completed_credits', 'total_required_credits', 'overall_completion_rate', 'requirements_analysis']
-                    for field in required_fields:
-                        if field not in analysis_data:
-                            logger.warning(f"필수 필드 누락: {field}")
-                    
-                    cursor.close()
-                    connection.close()
-                    return jsonify({'success': True, 'analysis': analysis_data})
-                except json.JSONDecodeError as je:
-                    logger.error(f"JSON 파싱 오류: {je}")
-                    cursor.close()
-                    connection.close()
-                    return jsonify({'success': False, 'error': 'JSON 파싱 오류'})
-            else:
-                logger.warning("analysis_result 필드가 비어있음")
-        else:
+        if not analysis:
             logger.info("분석 데이터 없음")
-        
+            cursor.close()
+            connection.close()
+            return jsonify({'success': True, 'analysis': None})
+
+        logger.info(f"분석 데이터 상세: ID={analysis.get('id')}, 날짜={analysis.get('analysis_date')}")
+        requirement_version = analysis.get('requirement_version')
+        current_requirement_version = analysis.get('current_requirement_version')
+        # 요건 버전/fields까지 반영하는 ETag만 검증자로 사용 (분석일시만으로는 변경을 모두 알 수 없어 Last-Modified 미사용)
+        etag = make_etag('student-analysis', session['user_id'], analysis['id'], analysis.get('analysis_date'),
+                         current_requirement_version, '*' if fields is None else ','.join(fields))
+        if is_not_modified(etag, None):
+            cursor.close()
+            connection.close()
+            return not_modified_response(etag, None)
+
+        # 요약 위젯 등은 필요한 필드만 DB에서 추출하여 전체 본문 전송/디코딩을 피함
+        try:
+            analysis_data = load_analysis_body(cursor, analysis['id'], fields)
+        except (json.JSONDecodeError, ValueError) as je:
+            logger.error(f"분석 결과 복원 오류: {je}")
+            cursor.close()
+            connection.close()
+            return jsonify({'success': False, 'error': 'JSON 파싱 오류'})
         cursor.close()
         connection.close()
-        return jsonify({'success': True, 'analysis': None})
+
+        if analysis_data is None:
+            logger.warning("analysis_result 필드가 비어있음")
+            return jsonify({'success': True, 'analysis': None})
+
+        if fields is None:
+            logger.info(f"분석 결과 복원 성공, 요건 개수: {len(analysis_data.get('requirements_analysis', []))}")
+
+            # 필요한 필드들이 있는지 확인
+            required_fields = ['total_completed_credits', 'total_required_credits', 'overall_completion_rate', 'requirements_analysis']
+            for field in required_fields:
+                if field not in analysis_data:
+                    logger.warning(f"필수 필드 누락: {field}")
+
+        return conditional_json({
+            'success': True,
+            'analysis': analysis_data,
+            'requirement_version': requirement_version,
+            'current_requirement_version': current_requirement_version,
+            'requirements_stale': is_stale(requirement_version, current_requirement_version)
+        }, etag, None)
         
     except Exception as e:
         logger.error(f"분석 데이터 조회 오류: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/student/simulate', methods=['POST'])
+@login_required
+def simulate_student_graduation():
+    """가상 수강(추가/제외) 시 졸업요건 변화 시뮬레이션 (DB에 저장하지 않음)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        student_id = session['user_id']
+        if session.get('role') == 'admin' and data.get('student_id'):
+            student_id = str(data['student_id'])
+        add = data.get('add') or []
+        remove = data.get('remove') or []
+        # 형식 오류는 DB 조회 전에 400으로 응답 (잘못된 항목이 500으로 이어지지 않도록)
+        try:
+            validate_changes(add, remove)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        started = time.perf_counter()
+        # 최근에 확인한 입력은 DB 왕복 없이 사용 (같은 워커의 분석 저장 시 즉시 무효화)
+        inputs = simulation_cache.fresh(student_id)
+        if inputs is None:
+            checker = GraduationRequirementsChecker(db_config)
+            checker.connect_db()
+            try:
+                # 최신 분석일시가 같으면 메모리의 입력(수강기록/요건/인덱스)을 그대로 사용
+                cursor = checker.connection.cursor()
+                cursor.execute("SELECT MAX(analysis_date) FROM graduation_analysis WHERE student_id = %s",
+                               (student_id,))
+                stamp = cursor.fetchone()[0]
+                cursor.close()
+                try:
+                    inputs = simulation_cache.get(student_id, stamp,
+                                                  lambda: load_simulation_inputs(checker, student_id, stamp))
+                except ValueError as e:
+                    return jsonify({'success': False, 'error': str(e)}), 400
+            finally:
+                checker.disconnect_db()
+        if inputs is None:
+            return jsonify({'success': False, 'error': '학생 정보를 찾을 수 없습니다.'}), 404
+
+        try:
+            result = simulate(inputs, add=add, remove=remove)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        response = {
+            'success': True,
+            'diff': result['diff'],
+            'added_courses': result['added_courses'],
+            'removed_count': result['removed_count'],
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+        if data.get('include_analysis'):
+            response['analysis'] = result['analysis']
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"졸업요건 시뮬레이션 오류: {e}")
+        return jsonify({'success': False, 'error': '시뮬레이션 중 오류가 발생했습니다.'}), 500
+
 @app.route('/api/student/profile', methods=['GET'])
 @login_required
 def get_student_profile():
@@ -394,15 +625,8 @@ def get_student_profile():
         cursor.execute("SELECT * FROM students WHERE student_id = %s", (session['user_id'],))
         student = cursor.fetchone()
         
-        # 최근 분석 기록들
-        cursor.execute("""
-            SELECT analysis_date, overall_completion_rate, total_completed_credits, total_required_credits
-            FROM graduation_analysis 
-            WHERE student_id = %s 
-            ORDER BY analysis_date DESC 
-            LIMIT 5
-        """, (session['user_id'],))
-        recent_analyses = cursor.fetchall()
+        # 최근 분석 기록들 (분석 이력 테이블의 요약 컬럼만 조회)
+        recent_analyses = AnalysisHistoryStore(connection).list_points(session['user_id'], limit=5)
         
         cursor.close()
         connection.close()
@@ -434,6 +658,35 @@ def get_student_profile():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def progress_response(connection, student_id, scope):
+    """분석 진행 추이 응답 (limit=N 최근 N회, detail=requirements 요건별 이수 현황 포함)"""
+    limit = request.args.get('limit', type=int) or PROGRESS_DEFAULT_LIMIT
+    limit = min(max(limit, 1), PROGRESS_MAX_LIMIT)
+    with_requirements = request.args.get('detail') == 'requirements'
+
+    store = AnalysisHistoryStore(connection)
+    latest_seq = store.latest_seq(student_id)
+    etag = make_etag(scope, student_id, latest_seq, limit, with_requirements)
+    if is_not_modified(etag, None):
+        return not_modified_response(etag, None)
+
+    points = store.progress(student_id, limit=limit, with_requirements=with_requirements)
+    return conditional_json({'success': True, 'student_id': student_id, 'progress': points}, etag, None)
+
+@app.route('/api/student/progress', methods=['GET'])
+@login_required
+def get_student_progress():
+    """본인 분석 진행 추이 조회"""
+    try:
+        connection = mysql.connector.connect(**db_config)
+        try:
+            return progress_response(connection, session['user_id'], 'student-progress')
+        finally:
+            connection.close()
+    except Exception as e:
+        logger.error(f"분석 진행 추이 조회 오류: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/student/profile/update', methods=['POST'])
 @login_required
 def update_student_profile():
@@ -539,13 +792,23 @@ def upload_file():
         if not allowed_file(file.filename):
             return jsonify({'error': 'Excel 파일(.xlsx)만 업로드 가능합니다.'}), 400
 
-        # 파일 저장
-        filename = secure_filename(f"{session['user_id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}")
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
+        # 크기/xlsx 구조 검증을 통과한 경우에만 디스크에 저장
+        try:
+            with phase('intake'):
+                intake = intake_upload(file.stream, MAX_FILE_SIZE)
+        except UploadRejected as e:
+            logger.warning(f"업로드 거부: {session['user_id']} {file.filename} - {e}")
+            return jsonify({'error': str(e)}), e.status
+        logger.info(f"업로드 수신: {file.filename} {intake.size} bytes sha256={intake.sha256}")
+
+        # 내용 해시 기반 보관소에 저장 (같은 파일 재업로드는 다시 쓰지 않음), 파서는 보관 파일을 직접 읽음
+        filename = secure_filename(file.filename) or 'upload.xlsx'
+        archived = upload_archive.store(session['user_id'], intake.content, intake.sha256, filename)
+        filepath = upload_archive.blob_path(intake.sha256)
 
         # Excel 파일 처리 (parsing_warnings 포함 반환 가능)
-        process_result = process_excel_file(filepath, session['user_id'], db_config)
+        with phase('parse_save'):
+            process_result = process_excel_file(filepath, session['user_id'], db_config)
         if isinstance(process_result, tuple):
             success, parsing_warnings = process_result
         else:
@@ -553,71 +816,27 @@ def upload_file():
             parsing_warnings = []
 
         if not success:
-            try:
-                os.remove(filepath)
-            except PermissionError as pe:
-                logger.warning(f"⚠️ 파일 삭제 실패 (사용 중): {filepath} - {pe}")
-            except Exception as e:
-                logger.warning(f"⚠️ 파일 삭제 중 기타 오류: {e}")
+            upload_archive.discard(session['user_id'], archived)
             return jsonify({'error': 'Excel 파일 처리에 실패했습니다.'}), 500
 
         # 졸업요건 분석 실행 (parsing_warnings를 전달)
         logger.info(f"졸업요건 분석 시작: {session['user_id']}")
         logger.info(f"파싱 경고: {parsing_warnings}")
-        analysis_result = analyze_student_graduation(session['user_id'], db_config, parsing_warnings=parsing_warnings)
+        with phase('analyze'):
+            analysis_result = analyze_student_graduation(session['user_id'], db_config, parsing_warnings=parsing_warnings)
         
         if 'error' in analysis_result:
             logger.error(f"졸업요건 분석 실패: {analysis_result['error']}")
-            try:
-                os.remove(filepath)
-            except:
-                pass
+            upload_archive.discard(session['user_id'], archived)
             return jsonify({'success': False, 'error': f"분석 실패: {analysis_result['error']}"}), 500
         else:
             logger.info(f"졸업요건 분석 완료: 이수율 {analysis_result.get('overall_completion_rate', 0)}%")
 
-        # 파일 정리: 삭제 대신 보관 폴더로 이동 (잠금 이슈 회피)
-        try:
-            dest_name = f"processed_{filename}"
-            dest_path = os.path.join(PROCESSED_FOLDER, dest_name)
-            # 이미 존재하면 타임스탬프를 덧붙임
-            if os.path.exists(dest_path):
-                ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-                dest_path = os.path.join(PROCESSED_FOLDER, f"{ts}_{dest_name}")
-            os.replace(filepath, dest_path)
-            logger.info(f"업로드 파일 이동 완료: {dest_path}")
-        except PermissionError as pe:
-            logger.warning(f"파일 이동 중 잠금 오류: {pe}. 백그라운드로 재시도합니다.")
-            def schedule_move(src: str, dst_folder: str, retries: int = 30, interval: float = 1.0):
-                import time
-                for i in range(retries):
-                    try:
-                        if os.path.exists(src):
-                            base = os.path.basename(src)
-                            dp = os.path.join(dst_folder, f"processed_{base}")
-                            if os.path.exists(dp):
-                                ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-                                dp = os.path.join(dst_folder, f"{ts}_processed_{base}")
-                            os.replace(src, dp)
-                            logger.info(f"백그라운드 파일 이동 성공: {dp}")
-                            return True
-                        return True
-                    except PermissionError as pe2:
-                        logger.warning(f"백그라운드 이동 재시도 {i+1}/{retries}: {pe2}")
-                        time.sleep(interval)
-                    except Exception as e:
-                        logger.warning(f"백그라운드 이동 오류: {e}")
-                        return False
-                logger.warning("백그라운드 이동 최종 실패")
-                return False
-            threading.Thread(target=schedule_move, args=(filepath, PROCESSED_FOLDER), daemon=True).start()
-        except Exception as e:
-            logger.warning(f"파일 이동 중 오류: {e}")
-
         response = {
             'success': True,
             'message': '파일 업로드 및 분석이 완료되었습니다.',
             'filename': filename,
+            'file_sha256': intake.sha256,
             'analysis_summary': {
                 'completion_rate': analysis_result.get('overall_completion_rate', 0),
                 'completed_credits': analysis_result.get('total_completed_credits', 0),
@@ -626,7 +845,7 @@ def upload_file():
         }
         if parsing_warnings:
             response['parsing_warnings'] = parsing_warnings
-        response['stored_file'] = os.path.join('uploads', 'processed', f"processed_{filename}")
+        response['stored_file'] = os.path.relpath(filepath)
         return jsonify(response)
 
     except Exception as e:
@@ -908,6 +1127,38 @@ def get_statistics():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/admin/auth/metrics', methods=['GET'])
+@admin_required
+def get_auth_metrics():
+    """로그인 지연/결과 및 비밀번호 해시 대기열 현황 (이 워커 기준)"""
+    return jsonify({
+        'success': True,
+        'worker_pid': os.getpid(),
+        'login': login_metrics.snapshot(),
+        'password_hashing': password_hasher.metrics()
+    })
+
+@app.route('/api/admin/query-profile', methods=['GET'])
+@admin_required
+def get_query_profile():
+    """쿼리 지문별 지연 시간 상위 목록(이 워커 기준)과 느린 쿼리 실행 계획 보고서"""
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+    return jsonify({
+        'success': True,
+        'worker_pid': os.getpid(),
+        'threshold_ms': round(query_profiler.threshold * 1000, 1),
+        'top_queries': query_profiler.top(limit),
+        'slow_query_report': read_report(query_profiler.report_path, limit)
+    })
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus 텍스트 형식 메트릭 (gunicorn 전체 워커 합산), METRICS_TOKEN 설정 시 Bearer 토큰 필요"""
+    token = os.environ.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization', '') != f"Bearer {token}":
+        return jsonify({'error': '인증이 필요합니다.'}), 401
+    return app.response_class(metrics_text(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/admin/requirements', methods=['POST'])
 @admin_required
 def create_graduation_requirement():
@@ -940,11 +1191,20 @@ def create_graduation_requirement():
         )
         
         cursor.execute(query, values)
+        snapshot = snapshot_requirements(connection, data['department'], data['admission_year'],
+                                         'admin_create', session.get('user_id'))
         connection.commit()
         cursor.close()
         connection.close()
+
+        if snapshot['created']:
+            reanalysis_scheduler.schedule(data['department'], data['admission_year'], {
+                'action': 'create', 'category': data['category'], 'area': data.get('area'),
+                'sub_area': data.get('sub_area'), 'required_credits': data['required_credits']
+            })
         
-        return jsonify({'success': True, 'message': '졸업요건이 추가되었습니다.'})
+        return jsonify({'success': True, 'message': '졸업요건이 추가되었습니다.',
+                        'requirement_version': snapshot['version']})
         
     except mysql.connector.IntegrityError as e:
         return jsonify({'success': False, 'error': '동일한 졸업요건이 이미 존재합니다.'}), 400
@@ -952,6 +1212,47 @@ def create_graduation_requirement():
         logger.error(f"졸업요건 추가 오류: {e}")
         return jsonify({'success': False, 'error': '졸업요건 추가 중 오류가 발생했습니다.'}), 500
 
+@app.route('/api/admin/requirements/preview', methods=['POST'])
+@admin_required
+def preview_graduation_requirement_change():
+    """졸업요건 생성/수정/삭제 제안의 영향 미리보기 (DB에 기록하지 않음)
+
+    요청: {"department", "admission_year", "changes": [{"action": "create|update|delete", "id", ...필드}]}
+    또는 변경 하나를 최상위에 그대로 전달. 학과/입학년도를 생략하면 첫 변경 대상 요건의 값을 사용한다.
+    """
+    try:
+        data = request.get_json() or {}
+        changes = data.get('changes') or [data]
+
+        connection = mysql.connector.connect(**db_config)
+        try:
+            # 읽기 전용 트랜잭션: 기존 요건/수강기록을 같은 시점으로 읽고 어떤 쓰기도 하지 않음
+            connection.start_transaction(readonly=True)
+            department = data.get('department')
+            admission_year = data.get('admission_year')
+            if not department or not admission_year:
+                target_id = next((c.get('id') for c in changes if c.get('id')), None)
+                cursor = connection.cursor(dictionary=True)
+                cursor.execute("SELECT department, admission_year FROM graduation_requirements WHERE id = %s", (target_id,))
+                target = cursor.fetchone()
+                cursor.close()
+                if not target:
+                    return jsonify({'success': False, 'error': '학과/입학년도를 확인할 수 없습니다.'}), 400
+                department, admission_year = target['department'], target['admission_year']
+
+            preview = preview_requirement_changes(connection, department, int(admission_year), changes)
+        finally:
+            connection.rollback()
+            connection.close()
+
+        return jsonify({'success': True, 'preview': preview})
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"졸업요건 변경 미리보기 오류: {e}")
+        return jsonify({'success': False, 'error': '졸업요건 변경 미리보기 중 오류가 발생했습니다.'}), 500
+
 @app.route('/api/admin/requirements/<int:requirement_id>', methods=['PUT'])
 @admin_required
 def update_graduation_requirement(requirement_id):
@@ -961,9 +1262,12 @@ def update_graduation_requirement(requirement_id):
         connection = mysql.connector.connect(**db_config)
         cursor = connection.cursor()
         
-        # 기존 레코드 확인
-        cursor.execute("SELECT id FROM graduation_requirements WHERE id = %s", (requirement_id,))
-        if not cursor.fetchone():
+        # 기존 레코드 확인 (학과/입학년도가 바뀌면 이전 요건 집합도 새 버전이 필요)
+        cursor.execute(
+            "SELECT department, admission_year, category, area, sub_area, required_credits "
+            "FROM graduation_requirements WHERE id = %s", (requirement_id,))
+        previous = cursor.fetchone()
+        if not previous:
             cursor.close()
             connection.close()
             return jsonify({'success': False, 'error': '존재하지 않는 졸업요건입니다.'}), 404
@@ -990,14 +1294,29 @@ def update_graduation_requirement(requirement_id):
         )
         
         cursor.execute(query, values)
+        changed_sets = [(data['department'], int(data['admission_year']))]
+        if (previous[0], int(previous[1])) not in changed_sets:
+            changed_sets.append((previous[0], int(previous[1])))
+        snapshots = [
+            snapshot_requirements(connection, department, admission_year, 'admin_update', session.get('user_id'))
+            for department, admission_year in changed_sets
+        ]
         connection.commit()
         cursor.close()
         connection.close()
         
-        # 해당 졸업요건에 영향받는 학생들의 분석 결과 재계산 트리거
-        update_affected_students_analysis(data['department'], data['admission_year'])
+        # 해당 졸업요건에 영향받는 학생들의 분석 결과 재계산 예약 (연속 수정은 한 번으로 합쳐 실행)
+        change = {
+            'action': 'update', 'category': data['category'], 'area': data.get('area'),
+            'sub_area': data.get('sub_area'), 'required_credits': data['required_credits'],
+            'before_credits': previous[5]
+        }
+        for (department, admission_year), snapshot in zip(changed_sets, snapshots):
+            if snapshot['created']:
+                reanalysis_scheduler.schedule(department, admission_year, change)
         
-        return jsonify({'success': True, 'message': '졸업요건이 수정되었습니다.'})
+        return jsonify({'success': True, 'message': '졸업요건이 수정되었습니다.',
+                        'requirement_version': snapshots[0]['version']})
         
     except mysql.connector.IntegrityError as e:
         return jsonify({'success': False, 'error': '동일한 졸업요건이 이미 존재합니다.'}), 400
@@ -1013,7 +1332,9 @@ def delete_graduation_requirement(requirement_id):
         cursor = connection.cursor(dictionary=True)
         
         # 기존 레코드 확인 및 정보 가져오기
-        cursor.execute("SELECT department, admission_year FROM graduation_requirements WHERE id = %s", (requirement_id,))
+        cursor.execute(
+            "SELECT department, admission_year, category, area, sub_area, required_credits "
+            "FROM graduation_requirements WHERE id = %s", (requirement_id,))
         requirement = cursor.fetchone()
         
         if not requirement:
@@ -1023,12 +1344,18 @@ def delete_graduation_requirement(requirement_id):
         
         # 삭제 실행
         cursor.execute("DELETE FROM graduation_requirements WHERE id = %s", (requirement_id,))
+        snapshot = snapshot_requirements(connection, requirement['department'], requirement['admission_year'],
+                                         'admin_delete', session.get('user_id'))
         connection.commit()
         cursor.close()
         connection.close()
         
-        # 해당 졸업요건에 영향받는 학생들의 분석 결과 재계산 트리거
-        update_affected_students_analysis(requirement['department'], requirement['admission_year'])
+        # 해당 졸업요건에 영향받는 학생들의 분석 결과 재계산 예약
+        if snapshot['created']:
+            reanalysis_scheduler.schedule(requirement['department'], requirement['admission_year'], {
+                'action': 'delete', 'category': requirement['category'], 'area': requirement['area'],
+                'sub_area': requirement['sub_area'], 'required_credits': requirement['required_credits']
+            })
         
         return jsonify({'success': True, 'message': '졸업요건이 삭제되었습니다.'})
         
@@ -1036,19 +1363,59 @@ def delete_graduation_requirement(requirement_id):
         logger.error(f"졸업요건 삭제 오류: {e}")
         return jsonify({'success': False, 'error': '졸업요건 삭제 중 오류가 발생했습니다.'}), 500
 
-def update_affected_students_analysis(department, admission_year):
-    """졸업요건 변경 시 영향받는 학생들의 분석 결과를 재계산"""
+@app.route('/api/admin/requirements/import', methods=['POST'])
+@admin_required
+def import_graduation_requirements():
+    """연도별 졸업요건 엑셀을 DB와 비교해 바뀐 행만 반영하고, 바뀐 학과/입학년도만 재분석 예약
+
+    form: dry_run=true면 비교 결과만 반환, prune=true면 엑셀에 없는 같은 학과/입학년도 요건 삭제
+    """
+    file = request.files.get('file')
+    if file is None or file.filename == '':
+        return jsonify({'success': False, 'error': '파일이 선택되지 않았습니다.'}), 400
+    dry_run = request.form.get('dry_run', 'false').lower() == 'true'
+    prune = request.form.get('prune', 'false').lower() == 'true'
+    try:
+        intake = intake_upload(file.stream, MAX_FILE_SIZE)
+        incoming = read_workbook(io.BytesIO(intake.content))
+        connection = mysql.connector.connect(**db_config)
+        try:
+            diff = import_requirements(connection, incoming, prune=prune, dry_run=dry_run,
+                                       source='admin_import', changed_by=session.get('user_id'))
+        finally:
+            connection.close()
+    except UploadRejected as e:
+        return jsonify({'success': False, 'error': str(e)}), e.status
+    except RequirementImportError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"졸업요건 가져오기 오류: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': '졸업요건 가져오기 중 오류가 발생했습니다.'}), 500
+
+    if not dry_run:
+        for (department, admission_year), changes in diff.changes_by_cohort().items():
+            for change in changes:
+                reanalysis_scheduler.schedule(department, admission_year, change)
+    return jsonify(dict(diff.summary(), success=True, dry_run=dry_run))
+
+def update_affected_students_analysis(department, admission_year, changes=None):
+    """졸업요건 변경 시 영향받는 학생들의 분석 결과를 재계산하고 변경 내역을 한 번에 알림"""
     try:
         connection = mysql.connector.connect(**db_config)
         cursor = connection.cursor()
         
-        # 해당 학과/입학년도 학생들 찾기
+        # 해당 학과/입학년도 학생 중 현재 요건 버전으로 분석되지 않은 학생들 찾기
         cursor.execute("""
             SELECT DISTINCT s.student_id 
             FROM students s 
+            LEFT JOIN graduation_analysis ga ON ga.student_id = s.student_id
             WHERE s.department = %s 
-            AND YEAR(s.admission_date) = %s
-        """, (department, admission_year))
+            AND s.admission_year = %s
+            AND (ga.requirement_version IS NULL OR ga.requirement_version < COALESCE((
+                SELECT MAX(v.version) FROM requirement_set_versions v
+                WHERE v.department = %s AND v.admission_year = %s
+            ), 0))
+        """, (department, admission_year, department, admission_year))
         
         affected_students = cursor.fetchall()
         cursor.close()
@@ -1077,6 +1444,7 @@ def update_affected_students_analysis(department, admission_year):
 변경사항:
 - 학과: {department}
 - 입학년도: {admission_year}년
+{format_change_summary(changes or [])}
 
 졸업학점 관리 시스템에 로그인하여 변경된 졸업요건과 새로운 분석 결과를 확인해주세요.
 변경된 요건에 따라 이수 계획을 재검토하시기 바랍니다.
@@ -1110,6 +1478,35 @@ def update_affected_students_analysis(department, admission_year):
     except Exception as e:
         logger.error(f"영향받는 학생 분석 업데이트 오류: {e}")
 
+# 같은 학과/입학년도의 연속된 요건 수정은 조용한 구간 이후 한 번의 재분석/알림으로 합침
+# (대기 변경은 DB에 두어 수정 요청을 받은 워커와 관계없이 한 워커가 한 번만 처리)
+reanalysis_scheduler = SharedReanalysisScheduler(
+    lambda: mysql.connector.connect(**db_config),
+    update_affected_students_analysis,
+    quiet_period=float(os.environ.get('REANALYSIS_QUIET_SECONDS', 30)),
+    max_delay=float(os.environ.get('REANALYSIS_MAX_DELAY_SECONDS', 300))
+)
+
+def student_list_filters(args):
+    """학생 목록/내보내기 공통 검색 조건 (WHERE 절, 파라미터)"""
+    conditions = []
+    params = []
+    search = args.get('search', '').strip()
+    if search:
+        conditions.append("(s.student_id LIKE %s OR s.name LIKE %s OR s.department LIKE %s)")
+        search_param = f"%{search}%"
+        params.extend([search_param, search_param, search_param])
+    if args.get('department'):
+        conditions.append("s.department = %s")
+        params.append(args.get('department'))
+    if args.get('grade'):
+        conditions.append("s.grade = %s")
+        params.append(int(args.get('grade')))
+    if args.get('admission_year'):
+        conditions.append("s.admission_year = %s")
+        params.append(int(args.get('admission_year')))
+    return ' AND '.join(conditions), params
+
 # 학생 관리 API
 @app.route('/api/admin/students', methods=['GET'])
 @admin_required
@@ -1144,41 +1541,18 @@ def get_students():
         WHERE 1=1
         """
         
-        params = []
-        
-        # 검색 조건 추가
-        if search:
-            query += " AND (s.student_id LIKE %s OR s.name LIKE %s OR s.department LIKE %s)"
-            search_param = f"%{search}%"
-            params.extend([search_param, search_param, search_param])
-        
-        if department:
-            query += " AND s.department = %s"
-            params.append(department)
-        
-        if grade:
-            query += " AND s.grade = %s"
-            params.append(int(grade))
+        # 검색 조건 (내보내기와 공통)
+        where, params = student_list_filters(request.args)
+        if where:
+            query += f" AND {where}"
         
         # 총 개수 조회
-        count_query = """
+        count_query = f"""
         SELECT COUNT(DISTINCT s.student_id) as total_count
         FROM students s
-        WHERE 1=1
+        WHERE 1=1{' AND ' + where if where else ''}
         """
-        count_params = []
-        
-        if search:
-            count_query += " AND (s.student_id LIKE %s OR s.name LIKE %s OR s.department LIKE %s)"
-            count_params.extend([search_param, search_param, search_param])
-        
-        if department:
-            count_query += " AND s.department = %s"
-            count_params.append(department)
-        
-        if grade:
-            count_query += " AND s.grade = %s"
-            count_params.append(int(grade))
+        count_params = list(params)
         
         cursor.execute(count_query, count_params)
         total = cursor.fetchone()['total_count']
@@ -1231,11 +1605,91 @@ def get_students():
         logger.error(f"학생 목록 조회 오류: {e}", exc_info=True)
         return jsonify({'success': False, 'error': f'학생 목록을 조회할 수 없습니다: {str(e)}'}), 500
 
+@app.route(BULK_IMPORT_PATH, methods=['POST'])
+@admin_required
+def start_bulk_import():
+    """report_*.xlsx 성적표 ZIP을 받아 일괄 가져오기 작업 시작 (진행 상황은 작업 조회 API로 확인)"""
+    file = request.files.get('file')
+    if file is None or file.filename == '':
+        return jsonify({'success': False, 'error': '파일이 선택되지 않았습니다.'}), 400
+    if not file.filename.lower().endswith('.zip'):
+        return jsonify({'success': False, 'error': 'ZIP 파일만 업로드 가능합니다.'}), 400
+    # 업로드를 메모리에 모으지 않고 작업 폴더로 청크 단위 복사 (start는 이 파일을 작업 ZIP으로 옮김)
+    upload_path = bulk_import_jobs.incoming_path()
+    try:
+        size = copy_limited(file.stream, upload_path, BULK_IMPORT_MAX_SIZE)
+        analyze = request.form.get('analyze', 'true').lower() != 'false'
+        job_id = bulk_import_jobs.start(upload_path, secure_filename(file.filename) or 'import.zip',
+                                        session['user_id'], analyze=analyze)
+    except UploadRejected as e:
+        return jsonify({'success': False, 'error': str(e)}), e.status
+    except BulkImportError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"일괄 가져오기 시작 오류: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': f'일괄 가져오기를 시작할 수 없습니다: {str(e)}'}), 500
+    finally:
+        if os.path.exists(upload_path):
+            os.remove(upload_path)
+    logger.info(f"일괄 가져오기 시작: {job_id} {file.filename} ({size} bytes)")
+    return jsonify({'success': True, 'job_id': job_id,
+                    'status_url': url_for('get_bulk_import', job_id=job_id)}), 202
+
+@app.route(BULK_IMPORT_PATH + '/<job_id>', methods=['GET'])
+@admin_required
+def get_bulk_import(job_id):
+    """일괄 가져오기 진행 상황 (파일별 상태/오류 포함)"""
+    status = bulk_import_jobs.status(job_id)
+    if status is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(dict(status, success=True))
+
+@app.route('/api/admin/students/export', methods=['GET'])
+@admin_required
+def export_students():
+    """검색 조건에 맞는 학생 전체와 분석 요약/미충족 요건을 CSV 또는 XLSX로 스트리밍"""
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in ('csv', 'xlsx'):
+        return jsonify({'success': False, 'error': 'format은 csv 또는 xlsx만 가능합니다.'}), 400
+    try:
+        where, params = student_list_filters(request.args)
+    except ValueError:
+        return jsonify({'success': False, 'error': '학년/입학년도는 숫자여야 합니다.'}), 400
+
+    def generate():
+        connection = mysql.connector.connect(**db_config)
+        try:
+            # 비버퍼 커서: 서버에서 배치 단위로 읽어 결과 전체를 메모리에 올리지 않음
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            rows = iter_student_rows(cursor, where, params)
+            chunks = iter_csv(rows) if export_format == 'csv' else iter_xlsx(rows)
+            for chunk in chunks:
+                yield chunk
+            cursor.close()
+        except Exception as e:
+            logger.error(f"학생 목록 내보내기 오류: {e}", exc_info=True)
+            raise
+        finally:
+            connection.close()
+
+    filename = f"students_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    mimetype = ('text/csv; charset=utf-8' if export_format == 'csv' else
+                'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    logger.info(f"학생 목록 내보내기: {export_format} 조건={where or '전체'}")
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
 @app.route('/api/admin/students/<student_id>', methods=['GET'])
 @admin_required
 def get_student_detail(student_id):
-    """특정 학생 상세 정보 조회"""
+    """특정 학생 상세 정보 조회 (ETag 조건부 요청, fields= 부분 조회 지원)
+
+    fields 파라미터가 주어지면 analysis_result는 해당 필드만 포함하며,
+    빈 값(fields=)이면 분석 본문을 생략하고 요약 컬럼만 반환한다.
+    """
     try:
+        fields = parse_fields_param(request.args.get('fields'))
+
         connection = mysql.connector.connect(**db_config)
         cursor = connection.cursor(dictionary=True)
         
@@ -1248,20 +1702,25 @@ def get_student_detail(student_id):
             connection.close()
             return jsonify({'success': False, 'error': '학생을 찾을 수 없습니다.'}), 404
         
-        # 분석 결과
+        # 분석 결과 (본문 제외 요약 컬럼만 먼저 조회)
         cursor.execute("""
-            SELECT * FROM graduation_analysis 
+            SELECT id, student_id, analysis_date, total_completed_credits,
+                   total_required_credits, overall_completion_rate, created_at, updated_at
+            FROM graduation_analysis 
             WHERE student_id = %s 
             ORDER BY analysis_date DESC
         """, (student_id,))
         analyses = cursor.fetchall()
+
+        # 이전 분석 이력 (최신 1건은 graduation_analysis 행과 같으므로 제외)
+        history = AnalysisHistoryStore(connection).list_points(student_id, limit=ADMIN_HISTORY_LIMIT + 1)
         
         # 수강 기록 요약
         cursor.execute("""
             SELECT 
                 category,
                 COUNT(*) as course_count,
-                SUM(CASE WHEN grade IN ('A+','A0','A-','B+','B0','B-','C+','C0','C-','D+','D0','P') THEN credit ELSE 0 END) as total_credits
+                SUM(CASE WHEN is_passed THEN credit ELSE 0 END) as total_credits
             FROM course_records 
             WHERE student_id = %s
             GROUP BY category
@@ -1278,22 +1737,58 @@ def get_student_detail(student_id):
             WHERE nr.recipient_id = %s
         """, (student_id,))
         notification_stats = cursor.fetchone()
+
+        # 분석일시/학생정보 갱신시각/알림 상태가 같으면 본문을 읽지 않고 304 응답
+        # 이력/수강 요약/알림 수는 시각으로 표현되지 않으므로 Last-Modified 없이 ETag로만 검증
+        etag = make_etag(
+            'admin-student', student_id, student.get('updated_at'),
+            ';'.join(f"{a['id']}@{a['analysis_date']}" for a in analyses),
+            history[0]['seq'] if history else 0,
+            json.dumps(course_summary, default=str),
+            notification_stats.get('total_notifications'), notification_stats.get('unread_count'),
+            '*' if fields is None else ','.join(fields)
+        )
+        if is_not_modified(etag, None):
+            cursor.close()
+            connection.close()
+            return not_modified_response(etag, None)
+
+        if fields is None or fields:
+            for a in analyses:
+                a['analysis_result'] = load_analysis_body(cursor, a['id'], fields, student_info=student)
+        # 최신 1건은 analyses와 같으므로 이전 이력만 별도 키로 반환
+        analysis_history = history[1:] if analyses else history
         
         cursor.close()
         connection.close()
         
-        return jsonify({
+        return conditional_json({
             'success': True,
             'student': student,
             'analyses': analyses,
+            'analysis_history': analysis_history,
             'course_summary': course_summary,
             'notification_stats': notification_stats
-        })
+        }, etag, None)
         
     except Exception as e:
         logger.error(f"학생 상세 정보 조회 오류: {e}")
         return jsonify({'success': False, 'error': '학생 정보를 조회할 수 없습니다.'}), 500
 
+@app.route('/api/admin/students/<student_id>/progress', methods=['GET'])
+@admin_required
+def get_student_progress_admin(student_id):
+    """특정 학생 분석 진행 추이 조회"""
+    try:
+        connection = mysql.connector.connect(**db_config)
+        try:
+            return progress_response(connection, student_id, 'admin-progress')
+        finally:
+            connection.close()
+    except Exception as e:
+        logger.error(f"학생 분석 진행 추이 조회 오류: {e}")
+        return jsonify({'success': False, 'error': '분석 진행 추이를 조회할 수 없습니다.'}), 500
+
 @app.route('/api/admin/students/<student_id>', methods=['PUT'])
 @admin_required
 def update_student(student_id):
@@ -1501,15 +1996,18 @@ def debug_recommendation(student_id):
             info = checker.get_student_info(student_id)
             if not info:
                 return jsonify({'success': False, 'error': '학생 정보를 찾을 수 없습니다.'}), 404
-            admission_year = checker._extract_admission_year(info.get('admission_date'))
+            admission_year = student_admission_year(info)
+            if admission_year is None:
+                return jsonify({'success': False, 'error': ADMISSION_YEAR_MISSING}), 400
             department = info.get('department')
             courses = checker.get_student_courses(student_id)
             requirements = checker.get_graduation_requirements(department, admission_year)
             recognition = checker.get_major_elective_recognition(department, admission_year)
             adjusted = checker._apply_recognition_rules(courses, recognition)
             completed = checker._calculate_completed_credits(adjusted)
-            curriculum = checker.get_curriculum_courses(department, admission_year)
-            passed_codes = list(checker._collect_passed_course_codes(adjusted))
+            index = checker.get_recommendation_index(department, admission_year)
+            passed_codes = checker._collect_passed_course_codes(adjusted, index.equivalency)
+            passed_mask = index.passed_mask(passed_codes)
 
             # 전필/전선 부족 추출
             missing = []
@@ -1528,12 +2026,6 @@ def debug_recommendation(student_id):
                         'missing_credits': req - comp
                     })
 
-            # 추천 풀 구성 및 제외 카운트
-            required_pool = [c for c in curriculum if (c.get('required_type') == '전필' and (c.get('course_code') or '').strip() not in passed_codes)]
-            elective_pool = [c for c in curriculum if (c.get('required_type') == '전선' and (c.get('course_code') or '').strip() not in passed_codes)]
-            required_excluded = [c for c in curriculum if (c.get('required_type') == '전필' and (c.get('course_code') or '').strip() in passed_codes)]
-            elective_excluded = [c for c in curriculum if (c.get('required_type') == '전선' and (c.get('course_code') or '').strip() in passed_codes)]
-
             return jsonify({
                 'success': True,
                 'student': {
@@ -1542,16 +2034,17 @@ def debug_recommendation(student_id):
                     'admission_year': admission_year
                 },
                 'curriculum': {
-                    'count': len(curriculum)
+                    'count': len(index)
                 },
                 'missing_requirements': missing,
                 'recommendation_pools': {
-                    'required_candidates': len(required_pool),
-                    'elective_candidates': len(elective_pool),
-                    'required_excluded_as_passed': len(required_excluded),
-                    'elective_excluded_as_passed': len(elective_excluded)
+                    'required_candidates': index.count('전필', passed_mask),
+                    'elective_candidates': index.count('전선', passed_mask),
+                    'required_excluded_as_passed': index.count('전필', passed_mask, excluded=True),
+                    'elective_excluded_as_passed': index.count('전선', passed_mask, excluded=True)
                 },
-                'passed_codes': passed_codes[:50]
+                'equivalency_codes': len(index.equivalency),
+                'passed_codes': sorted(passed_codes)[:50]
             })
         finally:
             checker.disconnect_db()
@@ -1779,25 +2272,50 @@ def setup_database():
                 connection.commit()
                 print("테이블 구조가 업데이트되었습니다.")
         
+        # 입학년도 생성 컬럼 + 학과/입학년도 인덱스 (학과·입학년도 조회가 인덱스 범위 검색이 되도록)
+        ensure_admission_year_column(cursor)
+        connection.commit()
+
+        # 서버 세션 테이블/데이터 컬럼
+        ensure_session_table(cursor)
+        connection.commit()
+
+        # 워커 간 공유 재분석 대기열
+        ensure_pending_table(cursor)
+        connection.commit()
+        
         cursor.close()
         connection.close()
         
     except Error as e:
         print(f"데이터베이스 설정 오류: {e}")
 
-if __name__ == '__main__':
-    # 데이터베이스 설정
-    setup_database()
-    
-    # 관리자 계정 생성 (초기 설정)
-    auth_system.connect_db()
+def load_upload_analysis_dates():
+    """학생별 현재 분석 일시 (업로드 보관소 보존 정책: 현재 분석의 원본 파일 유지)"""
+    connection = mysql.connector.connect(**db_config)
     try:
-        result = auth_system.create_user('admin', 'admin123', 'admin')
-        if result['success']:
-            print("관리자 계정 생성 완료: admin / admin123")
-        else:
-            print(f"관리자 계정 생성 결과: {result['error']}")
+        cursor = connection.cursor()
+        cursor.execute("SELECT student_id, analysis_date FROM graduation_analysis")
+        dates = {student_id: analysis_date for student_id, analysis_date in cursor.fetchall() if analysis_date}
+        cursor.close()
+        return dates
     finally:
-        auth_system.disconnect_db()
+        connection.close()
+
+def initialize_app():
+    """데이터베이스 설정 및 관리자 계정 생성 (개발 서버 시작 / gunicorn 마스터 준비 시 한 번)"""
+    setup_database()
+    
+    result = auth_system.create_user('admin', 'admin123', 'admin')
+    if result['success']:
+        print("관리자 계정 생성 완료: admin / admin123")
+    else:
+        print(f"관리자 계정 생성 결과: {result['error']}")
+
+if __name__ == '__main__':
+    # 개발 서버 (운영은 gunicorn -c gunicorn.conf.py main_app:app)
+    initialize_app()
+    upload_archive.start_compactor(load_upload_analysis_dates)
+    reanalysis_scheduler.start()
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -132,7 +132,7 @@ class NotificationSystem:
                     params.append(target_filter['grade'])
                 
                 if target_filter.get('admission_year'):
-                    conditions.append("YEAR(s.admission_date) = %s")
+                    conditions.append("s.admission_year = %s")
                     params.append(target_filter['admission_year'])
                 
                 if target_filter.get('completion_rate_below'):
@@ -0,0 +1,117 @@
+import gzip
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from course_equivalency import build_canonical_map, load_equivalency_rows
+from course_planner import CoursePlanner
+from graduation_core import ADMISSION_YEAR_MISSING, evaluate_graduation, student_admission_year
+from recommendation_index import RecommendationIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+# 분석에 쓰이지 않는 컬럼은 스냅샷에서 제외
+DROP_COLUMNS = frozenset({'id', 'created_at', 'updated_at', 'description', 'notes', 'metadata'})
+
+
+def _compact(rows: Iterable[Dict]) -> List[Dict]:
+    return [{k: v for k, v in row.items() if k not in DROP_COLUMNS} for row in rows]
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"JSON 변환 불가 타입: {type(value).__name__}")
+
+
+def plan_key(department: str, admission_year: int) -> str:
+    return f"{department}|{int(admission_year)}"
+
+
+def export_snapshot(checker, pairs: Iterable[Tuple[str, int]]) -> Dict:
+    """연결된 GraduationRequirementsChecker로 (학과, 입학년도)별 요건/인정규칙/커리큘럼을 수집"""
+    plans = {}
+    departments = {}
+    for department, admission_year in pairs:
+        admission_year = int(admission_year)
+        plans[plan_key(department, admission_year)] = {
+            'department': department,
+            'admission_year': admission_year,
+            'requirements': _compact(checker.get_graduation_requirements(department, admission_year)),
+            'recognition': {kind: _compact(rows) for kind, rows in
+                            checker.get_major_elective_recognition(department, admission_year).items()},
+            'curriculum': _compact(checker.get_curriculum_courses(department, admission_year)),
+        }
+        if department not in departments:
+            # 추천 교과목/동등과목 정의는 학과 단위 (입학년도 적용은 분석 시점에)
+            departments[department] = {
+                'recommended': _compact(checker.get_recommended_courses(department)),
+                'equivalencies': _compact(load_equivalency_rows(checker.connection, department)),
+            }
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+        'plans': plans,
+        'departments': departments,
+    }
+
+
+def write_snapshot(snapshot: Dict, path: str):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+def read_snapshot(path: str) -> Dict:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if snapshot.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {snapshot.get('format')}")
+    return snapshot
+
+
+class SnapshotPlans:
+    """스냅샷의 (학과, 입학년도)별 분석 입력 (추천 인덱스/계획 생성기는 처음 쓸 때 한 번 생성)"""
+
+    def __init__(self, snapshot: Dict):
+        self.snapshot = snapshot
+        self._built: Dict[str, Tuple] = {}
+
+    def keys(self) -> List[str]:
+        return sorted(self.snapshot['plans'])
+
+    def get(self, department: str, admission_year: int) -> Optional[Tuple]:
+        """(요건, 인정규칙, 추천 인덱스, 계획 생성기) 또는 스냅샷에 없으면 None"""
+        key = plan_key(department, admission_year)
+        if key in self._built:
+            return self._built[key]
+        plan = self.snapshot['plans'].get(key)
+        if plan is None:
+            return None
+        shared = self.snapshot['departments'].get(department, {})
+        equivalency = build_canonical_map(shared.get('equivalencies', []), int(admission_year))
+        index = RecommendationIndex(plan['curriculum'], equivalency)
+        planner = CoursePlanner(index.courses, shared.get('recommended', []), equivalency)
+        self._built[key] = (plan['requirements'], plan['recognition'], index, planner)
+        return self._built[key]
+
+    def analyze(self, student_info: Dict, courses: List[Dict],
+                parsing_warnings: Optional[List[str]] = None) -> Dict:
+        department = student_info.get('department')
+        admission_year = student_admission_year(student_info)
+        if admission_year is None:
+            return {"error": ADMISSION_YEAR_MISSING}
+        inputs = self.get(department, admission_year)
+        if inputs is None:
+            return {"error": f"스냅샷에 {department} {admission_year}학번 졸업요건이 없습니다."}
+        requirements, recognition, index, planner = inputs
+        return evaluate_graduation(student_info, courses, requirements, recognition,
+                                   index=index, planner=planner, parsing_warnings=parsing_warnings)
@@ -0,0 +1,243 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable, Dict, List, Optional
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# 저장할 해시의 bcrypt cost (로그인 시 다른 cost의 해시는 이 값으로 다시 저장)
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+# bcrypt는 GIL을 풀고 실행되므로 스레드 수만큼 코어를 쓴다
+HASH_WORKERS = int(os.environ.get('BCRYPT_WORKERS', os.cpu_count() or 2))
+HASH_TIMEOUT_SECONDS = 10.0
+# cost 12 해시 1건 예상 시간(초), cost가 1 오를 때마다 두 배
+HASH_SECONDS_AT_COST_12 = 0.25
+# 최악 대기 시간이 타임아웃의 이 비율을 넘지 않도록 대기열 크기를 정함
+QUEUE_WAIT_BUDGET = 0.8
+LATENCY_WINDOW = 1024
+
+_COST_PATTERN = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+
+class HashQueueFull(Exception):
+    """해시 대기열이 가득 차 요청을 받을 수 없음 (잠시 후 재시도)"""
+
+
+def queue_capacity(workers: int, timeout: float, hash_seconds: float) -> int:
+    """대기열 상한: 맨 뒤 작업의 최악 대기 (workers + max_queue) / workers * hash_seconds 가 타임아웃 예산 이내"""
+    return max(0, int(workers * timeout * QUEUE_WAIT_BUDGET / max(hash_seconds, 1e-3)) - workers)
+
+
+def estimated_hash_seconds(rounds: int) -> float:
+    return HASH_SECONDS_AT_COST_12 * 2 ** (rounds - 12)
+
+
+# 실행 중 + 대기 중 작업 상한 (넘으면 바로 거절해 요청 스레드가 쌓이지 않게 함)
+HASH_MAX_QUEUE = int(os.environ.get('BCRYPT_MAX_QUEUE') or queue_capacity(
+    HASH_WORKERS, HASH_TIMEOUT_SECONDS, estimated_hash_seconds(BCRYPT_ROUNDS)))
+
+
+def hash_cost(hashed: str) -> Optional[int]:
+    match = _COST_PATTERN.match(hashed or '')
+    return int(match.group(1)) if match else None
+
+
+class LatencyWindow:
+    """최근 N건 지연 시간(ms) 분위수"""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self._values = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._values.append(seconds * 1000.0)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            values = sorted(self._values)
+        if not values:
+            return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+
+        def pct(p):
+            return round(values[min(len(values) - 1, int(len(values) * p))], 1)
+
+        return {'count': len(values), 'p50_ms': pct(0.5), 'p95_ms': pct(0.95), 'max_ms': round(values[-1], 1)}
+
+
+class PasswordHasher:
+    """bcrypt 해시/검증을 크기 제한 스레드 풀에서 실행
+
+    gunicorn fork 이후에는 워커마다 풀을 새로 만든다 (마스터의 스레드는 fork되지 않음).
+    """
+
+    def __init__(self, rounds: int = BCRYPT_ROUNDS, max_workers: int = HASH_WORKERS,
+                 max_queue: int = HASH_MAX_QUEUE, timeout: float = HASH_TIMEOUT_SECONDS):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._init_lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_worker(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._init_lock:
+            if self._pid == pid:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bcrypt')
+            self._lock = threading.Lock()
+            self._in_flight = 0
+            self._running = 0
+            self._counts = {'hash': 0, 'verify': 0, 'rehash': 0, 'rejected': 0, 'timeout': 0}
+            self._wait = LatencyWindow()
+            self._work = LatencyWindow()
+            self._pid = pid
+
+    def queue_limit(self) -> int:
+        """설정 상한과 실측 해시 시간(p95) 기준 상한 중 작은 값 (서버가 느려지면 대기열을 줄임)"""
+        observed = self._work.snapshot()
+        if observed['count'] < 8:
+            return self.max_queue
+        return min(self.max_queue, queue_capacity(self.max_workers, self.timeout, observed['p95_ms'] / 1000.0))
+
+    def submit(self, kind: str, fn: Callable, *args) -> Future:
+        """대기열에 여유가 있으면 작업 제출, 없으면 HashQueueFull"""
+        self._ensure_worker()
+        limit = self.max_workers + self.queue_limit()
+        with self._lock:
+            if self._in_flight >= limit:
+                self._counts['rejected'] += 1
+                raise HashQueueFull(f"비밀번호 처리 대기열이 가득 찼습니다 ({self._in_flight}건)")
+            self._in_flight += 1
+            self._counts[kind] += 1
+        submitted = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            self._wait.add(started - submitted)
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args)
+            finally:
+                self._work.add(time.perf_counter() - started)
+                with self._lock:
+                    self._running -= 1
+                    self._in_flight -= 1
+
+        def release_if_cancelled(future: Future):
+            # 타임아웃으로 대기 중에 취소된 작업은 run()이 실행되지 않으므로 여기서 자리를 반납
+            if future.cancelled():
+                with self._lock:
+                    self._in_flight -= 1
+
+        try:
+            future = self._executor.submit(run)
+        except RuntimeError:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(release_if_cancelled)
+        return future
+
+    def _result(self, future: Future):
+        """작업 결과 대기, 타임아웃은 대기열 포화로 보고 HashQueueFull (호출자는 503으로 응답)"""
+        try:
+            return future.result(self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            with self._lock:
+                self._counts['timeout'] += 1
+            raise HashQueueFull(f"비밀번호 처리가 {self.timeout:g}초 안에 끝나지 않았습니다")
+
+    def hash(self, password: str) -> str:
+        return self._result(self.submit('hash', self._hash, password))
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._result(self.submit('verify', self._verify, password, hashed))
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """여러 비밀번호를 풀 크기만큼씩 병렬 해시 (일괄 등록용, 대기열을 다른 요청 몫까지 차지하지 않음)"""
+        hashes = []
+        for start in range(0, len(passwords), self.max_workers):
+            futures = [self.submit('hash', self._hash, password)
+                       for password in passwords[start:start + self.max_workers]]
+            hashes.extend(self._result(future) for future in futures)
+        return hashes
+
+    def needs_rehash(self, hashed: str) -> bool:
+        cost = hash_cost(hashed)
+        return cost is not None and cost != self.rounds
+
+    def rehash_later(self, password: str, save: Callable[[str], None]) -> bool:
+        """설정 cost로 다시 해시해 save(new_hash) 호출 (로그인 응답을 기다리게 하지 않음)
+
+        대기열이 가득 차면 건너뛰고 다음 로그인 때 다시 시도한다.
+        """
+        def run():
+            try:
+                save(self._hash(password))
+            except Exception as e:
+                logger.error(f"비밀번호 재해시 오류: {e}")
+
+        try:
+            self.submit('rehash', run)
+        except HashQueueFull:
+            return False
+        return True
+
+    def _hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)).decode('utf-8')
+
+    @staticmethod
+    def _verify(password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def metrics(self) -> Dict:
+        self._ensure_worker()
+        with self._lock:
+            in_flight, running, counts = self._in_flight, self._running, dict(self._counts)
+        return {
+            'rounds': self.rounds,
+            'workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'queue_limit': self.queue_limit(),
+            'running': running,
+            'queue_depth': in_flight - running,
+            'counts': counts,
+            'queue_wait': self._wait.snapshot(),
+            'hash_time': self._work.snapshot(),
+        }
+
+
+class LoginMetrics:
+    """로그인 결과별 건수와 지연 시간"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outcomes: Dict[str, int] = {}
+        self._latency = LatencyWindow()
+
+    def observe(self, seconds: float, outcome: str):
+        self._latency.add(seconds)
+        with self._lock:
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            outcomes = dict(self._outcomes)
+        return {'outcomes': outcomes, 'latency': self._latency.snapshot()}
+
+
+password_hasher = PasswordHasher()
+login_metrics = LoginMetrics()
@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import queue
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 이 시간 이상 걸린 문장은 지문별로 한 번 EXPLAIN FORMAT=JSON 수집
+SLOW_QUERY_SECONDS = float(os.environ.get('SLOW_QUERY_SECONDS', 0.2))
+SLOW_QUERY_REPORT = os.environ.get('SLOW_QUERY_REPORT', os.path.join('instance', 'slow_queries.jsonl'))
+# 지문 종류 상한 (동적 SQL이 무한히 늘어나도 메모리 고정)
+MAX_FINGERPRINTS = 2000
+EXPLAIN_QUEUE_SIZE = 100
+
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACE = re.compile(r'\s+')
+_EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH|UPDATE|DELETE)\b', re.IGNORECASE)
+# 인덱스 컬럼을 함수로 감싼 조건 (예: YEAR(s.admission_date) = %s → idx_admission_date 사용 불가)
+_FUNCTION_ON_COLUMN = re.compile(
+    r'\b(YEAR|MONTH|DAY|DATE|LOWER|UPPER|TRIM|SUBSTRING|LEFT|CAST|CONCAT)\s*\(\s*([\w.`]+)\s*\)\s*'
+    r'(?:=|<=|>=|<>|!=|<|>|IN\b|BETWEEN\b|LIKE\b)',
+    re.IGNORECASE
+)
+
+_local = threading.local()
+
+
+def fingerprint(sql) -> str:
+    """쿼리 지문: 값/자리표시자를 ?로, IN 목록을 하나로, 공백을 정리"""
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode('utf-8', 'replace')
+    text = _STRING.sub('?', str(sql)).replace('%s', '?')
+    text = _NUMBER.sub('?', text)
+    text = _IN_LIST.sub('(?+)', text)
+    return _SPACE.sub(' ', text).strip()[:300]
+
+
+def suppressed() -> bool:
+    """EXPLAIN 수집 스레드 자신의 쿼리는 측정하지 않음"""
+    return getattr(_local, 'suppressed', False)
+
+
+def static_findings(sql: str) -> List[str]:
+    return [f"function_on_column:{func.upper()}({column})" for func, column in _FUNCTION_ON_COLUMN.findall(sql)]
+
+
+def plan_findings(plan) -> List[str]:
+    """EXPLAIN FORMAT=JSON 결과에서 전체 스캔/파일 정렬/임시 테이블/미사용 인덱스 표시"""
+    findings = []
+
+    def walk(node):
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+            return
+        if not isinstance(node, dict):
+            return
+        table = node.get('table_name')
+        access = node.get('access_type')
+        if table and access:
+            rows = node.get('rows_examined_per_scan')
+            suffix = f"({rows} rows)" if rows is not None else ''
+            if access == 'ALL':
+                findings.append(f"full_scan:{table}{suffix}")
+            elif access == 'index':
+                findings.append(f"full_index_scan:{table}{suffix}")
+            if node.get('possible_keys') and not node.get('key'):
+                findings.append(f"index_not_used:{table}")
+        if node.get('using_filesort'):
+            findings.append('filesort')
+        if node.get('using_temporary_table'):
+            findings.append('temporary_table')
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                walk(value)
+
+    walk(plan)
+    return list(dict.fromkeys(findings))
+
+
+class QueryProfiler:
+    """쿼리 지문별 지연 시간 집계와 느린 문장의 실행 계획 수집
+
+    커서 execute 래퍼(instrumentation)가 observe()를 호출한다. 임계값을 넘은 지문은
+    워커마다 한 번 별도 연결에서 EXPLAIN FORMAT=JSON을 실행해 보고서 파일(JSON Lines)에 남긴다.
+    원래 커서는 결과를 다 읽기 전일 수 있어 같은 연결을 쓰지 않는다.
+    """
+
+    def __init__(self, threshold: float = SLOW_QUERY_SECONDS, report_path: str = SLOW_QUERY_REPORT,
+                 db_config: Optional[Dict] = None, background: bool = True):
+        self.threshold = threshold
+        self.report_path = report_path
+        self.db_config = db_config
+        self.background = background
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+        self._explained = set()
+        self._pid = None
+
+    def configure(self, db_config: Dict, report_path: Optional[str] = None):
+        self.db_config = db_config
+        if report_path:
+            self.report_path = report_path
+
+    def _ensure_worker(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # fork 후에는 대기열/스레드를 새로 만들고 부모의 수집 여부를 이어받지 않음
+            self._queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+            self._explained = set()
+            threading.Thread(target=self._run, name='query-explain', daemon=True).start()
+            self._pid = pid
+
+    def observe(self, sql, params, seconds: float):
+        if isinstance(sql, (bytes, bytearray)):
+            sql = sql.decode('utf-8', 'replace')
+        fp = fingerprint(sql)
+        if self.background:
+            self._ensure_worker()
+        with self._lock:
+            entry = self._stats.get(fp)
+            if entry is None:
+                if len(self._stats) >= MAX_FINGERPRINTS:
+                    return
+                entry = self._stats[fp] = {'count': 0, 'total': 0.0, 'max': 0.0, 'slow': 0}
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            if seconds < self.threshold:
+                return
+            entry['slow'] += 1
+            if fp in self._explained or self.db_config is None:
+                return
+            self._explained.add(fp)
+        job = (fp, str(sql), params, seconds)
+        if not self.background:
+            self._capture(*job)
+            return
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._explained.discard(fp)
+
+    def top(self, limit: int = 20) -> List[Dict]:
+        with self._lock:
+            items = [(fp, dict(entry)) for fp, entry in self._stats.items()]
+        items.sort(key=lambda item: item[1]['total'], reverse=True)
+        return [{
+            'fingerprint': fp,
+            'count': entry['count'],
+            'slow_count': entry['slow'],
+            'total_ms': round(entry['total'] * 1000, 1),
+            'avg_ms': round(entry['total'] * 1000 / entry['count'], 2),
+            'max_ms': round(entry['max'] * 1000, 1),
+        } for fp, entry in items[:limit]]
+
+    def _run(self):
+        _local.suppressed = True
+        while True:
+            job = self._queue.get()
+            try:
+                self._capture(*job)
+            except Exception as e:
+                logger.error(f"실행 계획 수집 오류: {e}")
+
+    def _capture(self, fp: str, sql: str, params, seconds: float):
+        findings = static_findings(sql)
+        plan = None
+        if _EXPLAINABLE.match(sql):
+            try:
+                plan = self._explain(sql, params)
+            except Exception as e:
+                findings.append(f"explain_failed:{e}")
+            else:
+                findings.extend(plan_findings(plan))
+        entry = {
+            'captured_at': datetime.now().isoformat(timespec='seconds'),
+            'pid': os.getpid(),
+            'fingerprint': fp,
+            'sample': sql.strip()[:2000],
+            'elapsed_ms': round(seconds * 1000, 1),
+            'findings': findings,
+            'plan': plan,
+        }
+        if self._append_report(entry) and findings:
+            logger.warning(f"느린 쿼리 실행 계획: {', '.join(findings)} | {fp}")
+
+    def _explain(self, sql: str, params):
+        import mysql.connector
+        previous = getattr(_local, 'suppressed', False)
+        _local.suppressed = True
+        connection = mysql.connector.connect(**self.db_config)
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params or ())
+            row = cursor.fetchone()
+            cursor.close()
+            return json.loads(row[0]) if row else None
+        finally:
+            connection.close()
+            _local.suppressed = previous
+
+    def _append_report(self, entry: Dict) -> bool:
+        """보고서에 지문이 아직 없을 때만 추가 (여러 워커가 같은 지문을 중복 기록하지 않게 잠금 후 확인)"""
+        directory = os.path.dirname(self.report_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.report_path, 'a+', encoding='utf-8') as f:
+            try:
+                import fcntl
+                fcntl.flock(f, fcntl.LOCK_EX)
+            except ImportError:
+                pass
+            f.seek(0)
+            for line in f:
+                try:
+                    if json.loads(line).get('fingerprint') == entry['fingerprint']:
+                        return False
+                except ValueError:
+                    continue
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            f.flush()
+        return True
+
+
+def read_report(path: str = SLOW_QUERY_REPORT, limit: int = 50) -> List[Dict]:
+    """보고서의 최근 항목 (실행 계획 본문 제외)"""
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entry.pop('plan', None)
+            entries.append(entry)
+    return entries[-limit:]
+
+
+query_profiler = QueryProfiler()
@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 마지막 변경 후 이 시간(초) 동안 추가 변경이 없으면 재분석 실행
+DEFAULT_QUIET_PERIOD = 30.0
+# 변경이 계속 들어와도 첫 변경 후 이 시간(초) 안에는 반드시 실행
+DEFAULT_MAX_DELAY = 300.0
+
+ACTION_LABELS = {'create': '추가', 'update': '수정', 'delete': '삭제'}
+
+Key = Tuple[str, int]
+
+
+def _credits_text(value) -> str:
+    if value is None:
+        return '-'
+    try:
+        return f"{float(value):g}학점"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def describe_change(change: Dict) -> str:
+    """요건 변경 1건을 알림용 한 줄 설명으로 변환"""
+    label = ACTION_LABELS.get(change.get('action'), change.get('action') or '변경')
+    target = ' '.join(str(v) for v in (change.get('category'), change.get('area'), change.get('sub_area')) if v)
+    before = change.get('before_credits')
+    after = change.get('required_credits')
+    if change.get('action') == 'update' and before is not None and before != after:
+        return f"- {label}: {target} {_credits_text(before)} → {_credits_text(after)}"
+    if change.get('action') == 'delete':
+        return f"- {label}: {target}"
+    return f"- {label}: {target} {_credits_text(after)}"
+
+
+def format_change_summary(changes: List[Dict]) -> str:
+    """같은 요건 영역에 대한 연속 변경은 마지막 결과만 남겨 요약"""
+    merged: Dict[Tuple, Dict] = {}
+    for change in changes:
+        key = (change.get('category'), change.get('area'), change.get('sub_area'))
+        previous = merged.get(key)
+        if previous is not None and change.get('action') == 'update':
+            # 처음 변경 전 학점을 유지하여 최종 변화량만 표시
+            change = dict(change, before_credits=previous.get('before_credits', previous.get('required_credits')),
+                          action='create' if previous.get('action') == 'create' else 'update')
+        merged[key] = change
+    return '\n'.join(describe_change(c) for c in merged.values())
+
+
+PENDING_TABLE = 'reanalysis_pending'
+DRAIN_LOCK_NAME = 'graduation_system.reanalysis_drain'
+DEFAULT_POLL_SECONDS = 5.0
+
+CREATE_PENDING_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {PENDING_TABLE} (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    department VARCHAR(100) NOT NULL COMMENT '학과',
+    admission_year INT NOT NULL COMMENT '입학년도',
+    change_data TEXT COMMENT '요건 변경 내용 (JSON, 알림 요약용)',
+    created_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    INDEX idx_cohort (department, admission_year, id)
+) COMMENT='졸업요건 변경 재분석 대기열 (워커 간 공유)'
+"""
+
+
+def ensure_pending_table(cursor):
+    cursor.execute(CREATE_PENDING_TABLE_SQL)
+
+
+class SharedReanalysisScheduler:
+    """여러 gunicorn 워커가 공유하는 재분석 대기열 (reanalysis_pending 테이블)
+
+    schedule()은 변경을 테이블에 기록만 한다. 각 워커의 폴링 스레드 중 DB 잠금(GET_LOCK)을 잡은 하나가
+    조용한 구간/최대 지연이 지난 (학과, 입학년도)를 골라 run_batch를 한 번 실행하고 처리한 행을 지운다.
+    실행 중 들어온 변경은 id가 더 크므로 다음 배치로 모이며, 워커가 재시작되어도 대기 변경은 남는다.
+    """
+
+    def __init__(self, connect: Callable, run_batch: Callable[[str, int, List[Dict]], None],
+                 quiet_period: float = DEFAULT_QUIET_PERIOD, max_delay: float = DEFAULT_MAX_DELAY,
+                 poll_seconds: float = DEFAULT_POLL_SECONDS):
+        self.connect = connect
+        self.run_batch = run_batch
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+        self.poll_seconds = poll_seconds
+        self._pid = None
+
+    def schedule(self, department: str, admission_year: int, change: Optional[Dict] = None) -> bool:
+        """변경을 대기열에 기록 (요건 수정은 이미 커밋되었으므로 기록 실패는 로그만 남기고 False)"""
+        try:
+            connection = self.connect()
+            try:
+                cursor = connection.cursor()
+                cursor.execute(
+                    f"INSERT INTO {PENDING_TABLE} (department, admission_year, change_data) VALUES (%s, %s, %s)",
+                    (department, int(admission_year),
+                     json.dumps(change, ensure_ascii=False, default=str) if change is not None else None)
+                )
+                connection.commit()
+                cursor.close()
+            finally:
+                connection.close()
+        except Exception as e:
+            logger.error(f"졸업요건 변경 재분석 예약 실패: {department} {admission_year} - {e}")
+            return False
+        logger.info(f"졸업요건 변경 재분석 예약: {department} {admission_year}")
+        return True
+
+    def pending(self) -> Dict[Key, int]:
+        """대기 중인 (학과, 입학년도)별 변경 건수"""
+        connection = self.connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT department, admission_year, COUNT(*) FROM {PENDING_TABLE} "
+                           f"GROUP BY department, admission_year")
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+        return {(department, int(year)): count for department, year, count in rows}
+
+    def drain(self, force: bool = False) -> int:
+        """실행할 때가 된 코호트 배치를 처리하고 실행한 배치 수 반환 (다른 워커가 처리 중이면 0)
+
+        force=True이면 대기 시간과 관계없이 모두 처리한다.
+        """
+        connection = self.connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (DRAIN_LOCK_NAME,))
+            if not cursor.fetchone()[0]:
+                cursor.close()
+                return 0
+            try:
+                return self._drain_locked(cursor, connection, force)
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (DRAIN_LOCK_NAME,))
+                cursor.fetchall()
+                cursor.close()
+        finally:
+            connection.close()
+
+    def _drain_locked(self, cursor, connection, force: bool) -> int:
+        # 대기 시간은 DB 시각으로 계산 (워커/호스트 간 시계 차이 무관)
+        query = f"""
+        SELECT department, admission_year, MAX(id)
+        FROM {PENDING_TABLE}
+        GROUP BY department, admission_year
+        """
+        params = ()
+        if not force:
+            query += """
+            HAVING TIMESTAMPDIFF(MICROSECOND, MAX(created_at), NOW(3)) >= %s
+                OR TIMESTAMPDIFF(MICROSECOND, MIN(created_at), NOW(3)) >= %s
+            """
+            params = (int(self.quiet_period * 1e6), int(self.max_delay * 1e6))
+        cursor.execute(query, params)
+        due = cursor.fetchall()
+        connection.commit()
+
+        for department, admission_year, last_id in due:
+            cursor.execute(
+                f"SELECT change_data FROM {PENDING_TABLE} "
+                f"WHERE department = %s AND admission_year = %s AND id <= %s ORDER BY id",
+                (department, admission_year, last_id)
+            )
+            changes = [json.loads(row[0]) for row in cursor.fetchall() if row[0]]
+            connection.commit()
+            try:
+                self.run_batch(department, int(admission_year), changes)
+            except Exception as e:
+                logger.error(f"졸업요건 변경 일괄 재분석 오류 ({department} {admission_year}): {e}")
+            # 처리한 변경만 삭제 (실패해도 같은 변경으로 무한 반복하지 않도록 제거)
+            cursor.execute(
+                f"DELETE FROM {PENDING_TABLE} WHERE department = %s AND admission_year = %s AND id <= %s",
+                (department, admission_year, last_id)
+            )
+            connection.commit()
+        return len(due)
+
+    def start(self):
+        """워커마다 한 번 폴링 스레드 시작 (gunicorn fork 이후 호출)"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+
+        def run():
+            while True:
+                time.sleep(self.poll_seconds)
+                try:
+                    self.drain()
+                except Exception as e:
+                    logger.error(f"졸업요건 변경 재분석 대기열 처리 오류: {e}")
+
+        threading.Thread(target=run, name='reanalysis-drain', daemon=True).start()
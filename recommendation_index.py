@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from course_equivalency import CanonicalCodeMap
+
+logger = logging.getLogger(__name__)
+
+# 커리큘럼은 tools/ingest_curriculum_courses.py로만 갱신되므로 요건 캐시보다 길게 유지
+CACHE_TTL_SECONDS = 600
+
+T = TypeVar('T')
+
+
+def _term_order(course: Dict) -> Tuple:
+    """권장 학년/학기 오름차순, 값이 없으면 뒤로"""
+    grade_year = course.get('grade_year')
+    term = course.get('term')
+    return (grade_year is None, grade_year or 0, term is None, term or 0)
+
+
+class RecommendationIndex:
+    """커리큘럼(학과/입학년도 한 벌) 추천 인덱스
+
+    과목을 (학년, 학기) 순으로 한 번 정렬해 위치를 고정하고, 이수구분별 위치 집합과
+    대표 코드별 위치 집합을 정수 비트셋으로 보관한다. 학생별 후보는
+    `이수구분 비트셋 & ~이수 비트셋`으로 구해 위치 순서(=권장 순서) 그대로 꺼낸다.
+    """
+
+    def __init__(self, curriculum: List[Dict], equivalency: Optional[CanonicalCodeMap] = None):
+        self.equivalency = equivalency or CanonicalCodeMap()
+        # 같은 학년/학기 안에서는 조회 순서(ORDER BY ... course_code)를 유지 (sorted는 안정 정렬)
+        self.courses: List[Dict] = sorted(curriculum, key=_term_order)
+        self.type_masks: Dict[str, int] = {}
+        self.code_masks: Dict[str, int] = {}
+        for position, course in enumerate(self.courses):
+            bit = 1 << position
+            required_type = course.get('required_type')
+            self.type_masks[required_type] = self.type_masks.get(required_type, 0) | bit
+            code = self.equivalency.canonical(course.get('course_code'))
+            if code:
+                self.code_masks[code] = self.code_masks.get(code, 0) | bit
+
+    def __len__(self):
+        return len(self.courses)
+
+    def passed_mask(self, passed_codes: Iterable[str]) -> int:
+        """이수한 대표 코드 집합에 해당하는 커리큘럼 위치 비트셋"""
+        mask = 0
+        for code in passed_codes:
+            mask |= self.code_masks.get(code, 0)
+        return mask
+
+    def candidate_mask(self, required_type: str, passed_mask: int = 0) -> int:
+        return self.type_masks.get(required_type, 0) & ~passed_mask
+
+    def candidates(self, required_type: str, passed_mask: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """이수하지 않은 추천 후보 (권장 학년/학기 순, limit개까지)"""
+        mask = self.candidate_mask(required_type, passed_mask)
+        picks = []
+        while mask and (limit is None or len(picks) < limit):
+            lowest = mask & -mask
+            picks.append(self.courses[lowest.bit_length() - 1])
+            mask ^= lowest
+        return picks
+
+    def count(self, required_type: str, passed_mask: int = 0, excluded: bool = False) -> int:
+        """후보 수 (excluded=True면 이수하여 제외된 과목 수)"""
+        mask = self.type_masks.get(required_type, 0)
+        mask = mask & passed_mask if excluded else mask & ~passed_mask
+        return bin(mask).count('1')
+
+
+def course_entry(course: Dict) -> Dict:
+    """구조화된 추천 항목의 과목 표현"""
+    credits = course.get('credits')
+    return {
+        'course_code': (course.get('course_code') or '').strip(),
+        'course_name': course.get('course_name'),
+        'required_type': course.get('required_type'),
+        'grade_year': course.get('grade_year'),
+        'term': course.get('term'),
+        'credits': float(credits) if credits is not None else None,
+    }
+
+
+class CurriculumCache:
+    """(학과, 입학년도)별 커리큘럼 파생 데이터 캐시 (추천 인덱스, 이수 계획기 등 len()이 과목 수인 객체)"""
+
+    def __init__(self, label: str, ttl_seconds: float = CACHE_TTL_SECONDS, clock=time.monotonic):
+        self.label = label
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Tuple[float, object]] = {}
+
+    def get(self, department: str, admission_year: int, loader: Callable[[], T]) -> T:
+        key = (department, admission_year)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and now - entry[0] <= self.ttl_seconds:
+            return entry[1]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now, value)
+        logger.info(f"{self.label} 생성: {department} {admission_year}학번 {len(value)}과목")
+        return value
+
+    def invalidate(self, department: Optional[str] = None):
+        with self._lock:
+            if department is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == department]:
+                    del self._entries[key]
+
+
+class RecommendationIndexCache(CurriculumCache):
+    """(학과, 입학년도)별 추천 인덱스 캐시"""
+
+    def __init__(self, ttl_seconds: float = CACHE_TTL_SECONDS, clock=time.monotonic):
+        super().__init__('추천 데이터', ttl_seconds, clock)
+
+
+recommendation_index_cache = RecommendationIndexCache()
@@ -0,0 +1,145 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cohort_engine import (
+    CohortCredits, RequirementPlan, aggregate_cohort, evaluate_cohort, load_cohort_frames, recognized_course_codes
+)
+from graduation_requirements_checker import GraduationRequirementsChecker
+
+logger = logging.getLogger(__name__)
+
+# 변경 미리보기에서 수정 가능한 요건 필드
+EDITABLE_FIELDS = (
+    'department', 'admission_year', 'category', 'area', 'sub_area',
+    'required_credits', 'max_credits', 'description', 'is_active',
+)
+
+
+def load_cohort(connection, department: str, admission_year: int) -> CohortCredits:
+    """코호트의 학생/수강기록을 한 번씩만 조회하여 이수학점 행렬 생성 (cohort_engine 집계)
+
+    타학과 인정 규칙은 분석기(GraduationRequirementsChecker)와 같은 조회를 사용한다.
+    """
+    students, courses = load_cohort_frames(connection, department, admission_year)
+    checker = GraduationRequirementsChecker(db_config=None)
+    checker.connection = connection
+    recognition = checker.get_major_elective_recognition(department, admission_year)
+    return aggregate_cohort(students, courses, recognized_course_codes(recognition))
+
+
+def evaluate_requirements(cohort: CohortCredits, requirements: List[Dict]) -> Dict[Tuple[str, Optional[str]], Dict]:
+    """요건 집합을 코호트 전체에 대해 한 번에 판정.
+
+    반환: {(category, area): {'required_credits': float, 'fulfilled': bool 배열}}
+    판정 규칙은 analyze_graduation_status의 요건 루프와 같다
+    (집계행 제외, 같은 키는 첫 행만, 전필/전선/일선은 학생 정보 값, 개신기초교양은 총합 판정).
+    """
+    return evaluate_cohort(RequirementPlan(requirements), cohort).requirement_status()
+
+
+def apply_changes(rows: List[Dict], changes: List[Dict], department: str, admission_year: int) -> List[Dict]:
+    """현재 요건 행에 제안된 생성/수정/삭제를 메모리에서 적용한 새 요건 목록 반환 (DB 변경 없음)"""
+    proposed = [dict(r) for r in rows]
+    for change in changes:
+        action = change.get('action')
+        fields = {k: change[k] for k in EDITABLE_FIELDS if k in change}
+        if action == 'create':
+            row = {'department': department, 'admission_year': admission_year}
+            row.update(fields)
+            if str(row['department']) == str(department) and int(row['admission_year']) == int(admission_year):
+                proposed.append(row)
+            continue
+
+        target = next((r for r in proposed if r.get('id') == change.get('id')), None)
+        if target is None:
+            raise ValueError(f"이 학과/입학년도에 없는 졸업요건입니다: id={change.get('id')}")
+        proposed.remove(target)
+        if action == 'update':
+            row = dict(target)
+            row.update(fields)
+            # 다른 학과/입학년도로 옮기는 수정은 이 집합에서 빠지는 것으로 처리
+            if (str(row.get('department', department)) == str(department)
+                    and int(row.get('admission_year', admission_year)) == int(admission_year)):
+                proposed.append(row)
+        elif action != 'delete':
+            raise ValueError(f"알 수 없는 변경 유형입니다: {action}")
+    return proposed
+
+
+def compare_evaluations(before: Dict, after: Dict) -> List[Dict]:
+    """요건별 충족 학생 수와 충족↔미충족 전환 학생 수"""
+    impact = []
+    for label in list(before) + [k for k in after if k not in before]:
+        old = before.get(label)
+        new = after.get(label)
+        old_fulfilled = old['fulfilled'] if old else None
+        new_fulfilled = new['fulfilled'] if new else None
+        entry = {
+            'category': label[0],
+            'area': label[1],
+            'required_credits_before': old['required_credits'] if old else None,
+            'required_credits_after': new['required_credits'] if new else None,
+            'fulfilled_before': int(old_fulfilled.sum()) if old else None,
+            'fulfilled_after': int(new_fulfilled.sum()) if new else None,
+        }
+        if old and new:
+            entry['status'] = 'changed' if old['required_credits'] != new['required_credits'] else 'unchanged'
+            entry['newly_fulfilled'] = int((~old_fulfilled & new_fulfilled).sum())
+            entry['newly_unfulfilled'] = int((old_fulfilled & ~new_fulfilled).sum())
+        elif new:
+            # 새 요건: 충족하지 못하는 학생이 미충족으로 전환
+            entry['status'] = 'added'
+            entry['newly_fulfilled'] = 0
+            entry['newly_unfulfilled'] = int((~new_fulfilled).sum())
+        else:
+            # 삭제된 요건: 미충족이던 학생은 해당 요건에서 벗어남
+            entry['status'] = 'removed'
+            entry['newly_fulfilled'] = int((~old_fulfilled).sum())
+            entry['newly_unfulfilled'] = 0
+        impact.append(entry)
+    return impact
+
+
+def students_with_flips(before: Dict, after: Dict, n: int) -> int:
+    """하나 이상의 요건에서 충족 여부가 바뀌는 학생 수"""
+    flipped = np.zeros(n, dtype=bool)
+    for label in set(before) | set(after):
+        old = before[label]['fulfilled'] if label in before else np.ones(n, dtype=bool)
+        new = after[label]['fulfilled'] if label in after else np.ones(n, dtype=bool)
+        flipped |= old != new
+    return int(flipped.sum())
+
+
+def preview_requirement_changes(connection, department: str, admission_year: int,
+                                changes: List[Dict]) -> Dict:
+    """제안된 요건 변경의 코호트 영향 미리보기 (읽기 전용)"""
+    started = time.perf_counter()
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(
+        "SELECT * FROM graduation_requirements WHERE department = %s AND admission_year = %s ORDER BY category, area",
+        (department, admission_year)
+    )
+    current = cursor.fetchall()
+    cursor.close()
+
+    proposed = apply_changes(current, changes, department, admission_year)
+    proposed.sort(key=lambda r: (str(r.get('category') or ''), str(r.get('area') or '')))
+
+    cohort = load_cohort(connection, department, admission_year)
+    before = evaluate_requirements(cohort, current)
+    after = evaluate_requirements(cohort, proposed)
+    impact = compare_evaluations(before, after)
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"졸업요건 변경 미리보기: {department} {admission_year} 학생 {len(cohort)}명, {elapsed_ms}ms")
+    return {
+        'department': department,
+        'admission_year': admission_year,
+        'student_count': len(cohort),
+        'students_affected': students_with_flips(before, after, len(cohort)),
+        'impact': [e for e in impact if e['status'] != 'unchanged' or e['newly_fulfilled'] or e['newly_unfulfilled']],
+        'elapsed_ms': elapsed_ms,
+    }
@@ -0,0 +1,330 @@
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from requirement_versions import snapshot_requirements
+
+logger = logging.getLogger(__name__)
+
+# 연도별 졸업요건 엑셀을 graduation_requirements와 유니크 키 기준으로 비교해
+# 바뀐 행만 한 트랜잭션으로 반영한다 (같은 엑셀을 다시 넣으면 DB 쓰기 없이 끝남).
+COLUMN_MAP = {
+    '입학연도': 'admission_year',
+    '입학년도': 'admission_year',
+    '학과': 'department',
+    '카테고리': 'category',
+    '영역': 'area',
+    '세부영역': 'sub_area',
+    '최저이수학점': 'required_credits',
+    '상한학점': 'max_credits',
+    'admission_year': 'admission_year',
+    'department': 'department',
+    'category': 'category',
+    'area': 'area',
+    'sub_area': 'sub_area',
+    'min_credits': 'required_credits',
+    'required_credits': 'required_credits',
+    'max_credits': 'max_credits',
+}
+REQUIRED_COLUMNS = ('admission_year', 'department', 'area', 'required_credits')
+DEFAULT_CATEGORY = '교양'
+
+# unique_requirement (department, admission_year, category, area, sub_area)
+KEY_COLUMNS = ('department', 'admission_year', 'category', 'area', 'sub_area')
+# 비교 대상 값 (requirement_versions.EVALUATED_COLUMNS 중 키가 아닌 것, 설명은 비교하지 않음)
+VALUE_COLUMNS = ('required_credits', 'max_credits', 'is_active')
+CURRENT_QUERY = """
+    SELECT id, department, admission_year, category, area, sub_area,
+           required_credits, max_credits, description, is_active
+    FROM graduation_requirements
+    WHERE admission_year IN ({placeholders})
+    ORDER BY id
+"""
+INSERT_QUERY = """
+    INSERT INTO graduation_requirements
+        (department, admission_year, category, area, sub_area, required_credits, max_credits, description, is_active)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+UPDATE_QUERY = """
+    UPDATE graduation_requirements
+    SET required_credits = %s, max_credits = %s, description = %s, is_active = %s
+    WHERE id = %s
+"""
+DELETE_QUERY = "DELETE FROM graduation_requirements WHERE id = %s"
+
+Cohort = Tuple[str, int]
+
+
+class RequirementImportError(Exception):
+    """졸업요건 엑셀을 가져올 수 없음 (필수 컬럼 없음, 유효 행 없음 등)"""
+
+
+def _normalize_header(name) -> str:
+    return str(name).strip().lower().replace(' ', '')
+
+
+_HEADER_MAP = {_normalize_header(k): v for k, v in COLUMN_MAP.items()}
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """한/영 컬럼명을 표준 키로 변경 (공백/대소문자 무시, 모르는 컬럼은 그대로)"""
+    renamed = {}
+    for col in df.columns:
+        std = _HEADER_MAP.get(_normalize_header(col))
+        if std and std not in renamed.values():
+            renamed[col] = std
+    return df.rename(columns=renamed)
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """앞뒤 공백 제거, 빈 문자열/NaN은 None인 object 열"""
+    text = series.astype('string').str.strip()
+    present = (text.notna() & (text != '')).fillna(False).astype(bool)
+    return text.astype(object).where(present, None)
+
+
+def _credits(series: pd.Series) -> pd.Series:
+    # DECIMAL(4,1)과 같은 자릿수로 맞춰 비교
+    return pd.to_numeric(series.astype(object).where(series.notna(), np.nan), errors='coerce').astype(float).round(1)
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """엑셀 데이터프레임을 graduation_requirements 행 형태로 정규화 (열 단위 연산)
+
+    필수 값(입학년도/학과/영역/최저이수학점)이 없는 행은 버리고,
+    같은 유니크 키가 여러 번 나오면 마지막 행을 사용한다.
+    """
+    df = normalize_columns(df)
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise RequirementImportError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    empty = pd.Series([None] * len(df), index=df.index, dtype=object)
+    years = df['admission_year'].astype(object).where(df['admission_year'].notna(), '')
+    frame = pd.DataFrame({
+        'department': _text(df['department']),
+        'admission_year': pd.to_numeric(years.astype(str).str.extract(r'(\d{4})', expand=False), errors='coerce'),
+        'category': _text(df['category']) if 'category' in df.columns else empty,
+        'area': _text(df['area']),
+        'sub_area': _text(df['sub_area']) if 'sub_area' in df.columns else empty,
+        'required_credits': _credits(df['required_credits']),
+        'max_credits': _credits(df['max_credits']) if 'max_credits' in df.columns else np.nan,
+    })
+    valid = (frame['department'].notna() & frame['admission_year'].notna()
+             & frame['area'].notna() & frame['required_credits'].notna())
+    frame = frame[valid].copy()
+    frame['admission_year'] = frame['admission_year'].astype(int)
+    frame['category'] = frame['category'].where(frame['category'].notna(), DEFAULT_CATEGORY)
+    frame['is_active'] = True
+
+    has_max = frame['max_credits'].notna()
+    frame['description'] = '최저이수학점: ' + frame['required_credits'].astype(str)
+    frame.loc[has_max, 'description'] += ', 상한학점: ' + frame.loc[has_max, 'max_credits'].astype(str)
+
+    duplicated = _with_match_key(frame)['_key'].duplicated(keep='last')
+    if duplicated.any():
+        logger.warning(f"졸업요건 엑셀 중복 키 {int(duplicated.sum())}행은 마지막 행만 사용")
+    return frame[~duplicated].reset_index(drop=True)
+
+
+def read_workbook(path: str, sheet_name=0) -> pd.DataFrame:
+    """연도별 졸업요건 엑셀 읽기 + 정규화"""
+    try:
+        raw = pd.read_excel(path, sheet_name=sheet_name, header=0)
+    except Exception as e:
+        raise RequirementImportError(f"엑셀 파일을 읽을 수 없습니다: {e}")
+    frame = normalize_frame(raw)
+    if frame.empty:
+        raise RequirementImportError('유효한 졸업요건 행이 없습니다.')
+    return frame
+
+
+def current_frame(rows: List[Dict]) -> pd.DataFrame:
+    """DB 요건 행 목록을 비교용 데이터프레임으로 (DECIMAL → float, is_active → bool)"""
+    columns = ['id', *KEY_COLUMNS, *VALUE_COLUMNS, 'description']
+    frame = pd.DataFrame.from_records(rows, columns=columns)
+    for col in ('department', 'category', 'area', 'sub_area'):
+        frame[col] = _text(frame[col])
+    frame['admission_year'] = frame['admission_year'].astype(int)
+    frame['required_credits'] = _credits(frame['required_credits'])
+    frame['max_credits'] = _credits(frame['max_credits'])
+    frame['is_active'] = frame['is_active'].astype(object).where(frame['is_active'].notna(), True).astype(bool)
+    return frame
+
+
+def _match_columns(frame: pd.DataFrame) -> List[pd.Series]:
+    # DB의 NULL과 엑셀의 빈 칸을 같은 키로 비교하도록 area/sub_area는 빈 문자열로 맞춤
+    # (MySQL 유니크 키는 NULL끼리 서로 다른 값으로 보므로 NULL이 섞인 같은 요건이 DB에 여러 행 있을 수 있음)
+    return [frame[c].where(frame[c].notna(), '') if c in ('area', 'sub_area') else frame[c] for c in KEY_COLUMNS]
+
+
+def _with_match_key(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.copy()
+    frame['_key'] = list(zip(*_match_columns(frame)))
+    return frame
+
+
+def _same(left: pd.Series, right: pd.Series) -> np.ndarray:
+    left = left.to_numpy(dtype=float)
+    right = right.to_numpy(dtype=float)
+    return np.isclose(left, right, atol=0.05) | (np.isnan(left) & np.isnan(right))
+
+
+class RequirementDiff:
+    """엑셀(incoming)과 DB(current)의 차이: 추가/수정/삭제 행과 같은 키로 중복된 DB 행"""
+
+    def __init__(self, inserts: pd.DataFrame, updates: pd.DataFrame, deletes: pd.DataFrame, unchanged: int,
+                 duplicates: Optional[pd.DataFrame] = None):
+        self.inserts = inserts
+        self.updates = updates
+        self.deletes = deletes
+        self.unchanged = unchanged
+        self.duplicates = duplicates if duplicates is not None else deletes.iloc[0:0]
+
+    @property
+    def is_empty(self) -> bool:
+        return self.inserts.empty and self.updates.empty and self.deletes.empty
+
+    @property
+    def changed_cohorts(self) -> Set[Cohort]:
+        """실제로 요건이 바뀐 (학과, 입학년도)"""
+        cohorts = set()
+        for frame in (self.inserts, self.updates, self.deletes):
+            cohorts.update(zip(frame['department'], frame['admission_year'].astype(int)))
+        return {(str(d), int(y)) for d, y in cohorts}
+
+    def changes_by_cohort(self) -> Dict[Cohort, List[Dict]]:
+        """재분석 알림용 변경 내역 (reanalysis_scheduler.describe_change 형식)"""
+        changes: Dict[Cohort, List[Dict]] = {}
+        for action, frame in (('create', self.inserts), ('update', self.updates), ('delete', self.deletes)):
+            for row in frame.to_dict('records'):
+                change = {
+                    'action': action,
+                    'category': row['category'],
+                    'area': _none(row['area']),
+                    'sub_area': _none(row['sub_area']),
+                    'required_credits': _float(row['required_credits']),
+                }
+                if action == 'update':
+                    change['before_credits'] = _float(row['before_credits'])
+                changes.setdefault((str(row['department']), int(row['admission_year'])), []).append(change)
+        return changes
+
+    def summary(self) -> Dict:
+        return {
+            'inserted': len(self.inserts),
+            'updated': len(self.updates),
+            'deleted': len(self.deletes),
+            'unchanged': self.unchanged,
+            'duplicates': len(self.duplicates),
+            'changed_cohorts': [{'department': d, 'admission_year': y} for d, y in sorted(self.changed_cohorts)],
+        }
+
+
+def _float(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def _none(value):
+    return None if value is None or (not isinstance(value, str) and pd.isna(value)) else value
+
+
+def diff_requirements(incoming: pd.DataFrame, current: pd.DataFrame, prune: bool = False) -> RequirementDiff:
+    """유니크 키로 엑셀과 DB 행을 맞춰 바뀐 행만 골라냄
+
+    prune=True이면 엑셀에 있는 (학과, 입학년도)의 DB 행 중 엑셀에 없는 행을 삭제 대상으로 넣는다.
+    같은 키의 DB 행이 여럿이면 id가 가장 작은 행만 비교하고 나머지는 duplicates로 보고한다 (prune이면 삭제).
+    """
+    incoming = _with_match_key(incoming)
+    cohorts = set(zip(incoming['department'], incoming['admission_year']))
+    in_cohorts = np.array([c in cohorts for c in zip(current['department'], current['admission_year'])], dtype=bool)
+    current = current.loc[in_cohorts]
+    current = _with_match_key(current).sort_values('id', kind='stable')
+    duplicated = current['_key'].duplicated(keep='first')
+    duplicates = current[duplicated].drop(columns='_key')
+    current = current[~duplicated]
+
+    merged = incoming.merge(current[['_key', 'id', *VALUE_COLUMNS]], on='_key', how='left',
+                            suffixes=('', '_db'), indicator=True)
+    matched = merged[merged['_merge'] == 'both']
+    same = (_same(matched['required_credits'], matched['required_credits_db'])
+            & _same(matched['max_credits'], matched['max_credits_db'])
+            & (matched['is_active'].to_numpy() == matched['is_active_db'].astype(bool).to_numpy()))
+
+    inserts = merged[merged['_merge'] == 'left_only'][list(incoming.columns)].drop(columns='_key')
+    updates = matched[~same].rename(columns={'required_credits_db': 'before_credits'})
+    updates = updates[[*incoming.columns, 'id', 'before_credits']].drop(columns='_key')
+    if prune:
+        deletes = pd.concat([current[~current['_key'].isin(set(incoming['_key']))].drop(columns='_key'), duplicates])
+    else:
+        deletes = current.iloc[0:0].drop(columns='_key')
+    if not duplicates.empty:
+        logger.warning(f"같은 키의 중복 DB 요건 {len(duplicates)}행 (id: {', '.join(str(i) for i in duplicates['id'])})"
+                       f"{' - 삭제 대상에 포함' if prune else ' - prune 시 삭제'}")
+    return RequirementDiff(inserts.reset_index(drop=True), updates.reset_index(drop=True),
+                           deletes.reset_index(drop=True), int(same.sum()), duplicates.reset_index(drop=True))
+
+
+def load_current(connection, admission_years) -> pd.DataFrame:
+    """엑셀에 나온 입학년도의 DB 요건 행"""
+    years = sorted({int(y) for y in admission_years})
+    if not years:
+        return current_frame([])
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(CURRENT_QUERY.format(placeholders=', '.join(['%s'] * len(years))), years)
+    rows = cursor.fetchall()
+    cursor.close()
+    return current_frame(rows)
+
+
+def _insert_params(frame: pd.DataFrame) -> List[Tuple]:
+    return [(r['department'], int(r['admission_year']), r['category'], _none(r['area']), _none(r['sub_area']),
+             float(r['required_credits']), _float(r['max_credits']), r['description'], bool(r['is_active']))
+            for r in frame.to_dict('records')]
+
+
+def _update_params(frame: pd.DataFrame) -> List[Tuple]:
+    return [(float(r['required_credits']), _float(r['max_credits']), r['description'], bool(r['is_active']),
+             int(r['id']))
+            for r in frame.to_dict('records')]
+
+
+def apply_diff(connection, diff: RequirementDiff, source: str = 'requirement_import',
+               changed_by: Optional[str] = None) -> Dict[Cohort, Dict]:
+    """바뀐 행만 한 트랜잭션으로 반영하고 바뀐 (학과, 입학년도)마다 요건 스냅샷 생성
+
+    실패하면 전체 롤백. 반환: {(학과, 입학년도): 스냅샷 정보}
+    """
+    if diff.is_empty:
+        return {}
+    # 비교용 조회와 같은 트랜잭션 (autocommit 꺼짐)
+    cursor = connection.cursor()
+    try:
+        if not diff.deletes.empty:
+            cursor.executemany(DELETE_QUERY, [(int(i),) for i in diff.deletes['id']])
+        if not diff.updates.empty:
+            cursor.executemany(UPDATE_QUERY, _update_params(diff.updates))
+        if not diff.inserts.empty:
+            cursor.executemany(INSERT_QUERY, _insert_params(diff.inserts))
+        snapshots = {cohort: snapshot_requirements(connection, cohort[0], cohort[1], source, changed_by)
+                     for cohort in sorted(diff.changed_cohorts)}
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    logger.info(f"졸업요건 가져오기 반영: 추가 {len(diff.inserts)}, 수정 {len(diff.updates)}, "
+                f"삭제 {len(diff.deletes)}, 변경 코호트 {len(snapshots)}")
+    return snapshots
+
+
+def import_requirements(connection, incoming: pd.DataFrame, prune: bool = False, dry_run: bool = False,
+                        source: str = 'requirement_import', changed_by: Optional[str] = None) -> RequirementDiff:
+    """정규화된 엑셀 행을 DB와 비교해 반영 (dry_run이면 비교만)"""
+    diff = diff_requirements(incoming, load_current(connection, incoming['admission_year']), prune=prune)
+    if not dry_run:
+        apply_diff(connection, diff, source, changed_by)
+    return diff
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TABLE = 'requirement_set_versions'
+
+# 분석 결과에 영향을 주는 요건 컬럼 (id/설명/시각 컬럼은 버전 비교에서 제외)
+EVALUATED_COLUMNS = (
+    'category',
+    'area',
+    'sub_area',
+    'required_credits',
+    'max_credits',
+    'is_active',
+)
+
+
+def _normalize_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8')
+    return value
+
+
+def normalize_requirements(rows: List[Dict]) -> List[Dict]:
+    """요건 행을 스냅샷 저장 형태로 정규화 (평가 컬럼만, 정렬된 순서)"""
+    normalized = []
+    for row in rows:
+        item = {col: _normalize_value(row.get(col)) for col in EVALUATED_COLUMNS}
+        if item['is_active'] is not None:
+            item['is_active'] = bool(item['is_active'])
+        if row.get('description') is not None:
+            item['description'] = row.get('description')
+        normalized.append(item)
+    normalized.sort(key=lambda r: tuple('' if r[c] is None else str(r[c]) for c in EVALUATED_COLUMNS))
+    return normalized
+
+
+def fingerprint_requirements(rows: List[Dict]) -> str:
+    """평가 컬럼 기준 요건 집합 해시 (행 순서/설명 변경과 무관)"""
+    evaluated = [[r.get(c) for c in EVALUATED_COLUMNS] for r in normalize_requirements(rows)]
+    payload = json.dumps(evaluated, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def is_stale(analysis_version: Optional[int], current_version: Optional[int]) -> bool:
+    """분석 시점 요건 버전이 현재 버전과 다르면 재분석 필요"""
+    if current_version is None:
+        return False
+    return analysis_version is None or int(analysis_version) < int(current_version)
+
+
+def _load_live_requirements(cursor, department: str, admission_year: int) -> List[Dict]:
+    cursor.execute(
+        "SELECT * FROM graduation_requirements WHERE department = %s AND admission_year = %s",
+        (department, admission_year)
+    )
+    return cursor.fetchall()
+
+
+def get_latest_snapshot(connection, department: str, admission_year: int,
+                        for_update: bool = False, with_rows: bool = False) -> Optional[Dict]:
+    """학과/입학년도의 최신 스냅샷 (id, version, fingerprint[, requirements])"""
+    cursor = connection.cursor(dictionary=True)
+    columns = 'id, version, fingerprint, created_at' + (', requirements' if with_rows else '')
+    cursor.execute(
+        f"SELECT {columns} FROM {SNAPSHOT_TABLE} "
+        f"WHERE department = %s AND admission_year = %s "
+        f"ORDER BY version DESC LIMIT 1{' FOR UPDATE' if for_update else ''}",
+        (department, admission_year)
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    if row and with_rows and isinstance(row.get('requirements'), (str, bytes, bytearray)):
+        raw = row['requirements']
+        row['requirements'] = json.loads(raw.decode('utf-8') if isinstance(raw, (bytes, bytearray)) else raw)
+    return row
+
+
+def current_version(connection, department: str, admission_year: int) -> Optional[int]:
+    """현재 요건 버전 번호 (스냅샷이 없으면 None)"""
+    snapshot = get_latest_snapshot(connection, department, admission_year)
+    return snapshot['version'] if snapshot else None
+
+
+def ensure_snapshot(connection, department: str, admission_year: int, rows: List[Dict],
+                    source: str, changed_by: Optional[str] = None) -> Dict:
+    """주어진 요건 행이 최신 스냅샷과 다르면 새 버전을 추가하고, 같으면 최신 스냅샷을 반환.
+
+    스냅샷 행은 추가만 하며 수정하지 않는다. 커밋은 호출자가 담당한다.
+    반환: {'id': 스냅샷 ID, 'version': 버전, 'created': 새로 만들었는지}
+    """
+    fingerprint = fingerprint_requirements(rows)
+    # 분석마다 호출되므로 '변경 없음'은 잠금 없이 확인하고, 다를 때만 FOR UPDATE로 잠근 뒤 다시 확인
+    latest = get_latest_snapshot(connection, department, admission_year)
+    if latest and latest['fingerprint'] == fingerprint:
+        return {'id': latest['id'], 'version': latest['version'], 'created': False}
+    latest = get_latest_snapshot(connection, department, admission_year, for_update=True)
+    if latest and latest['fingerprint'] == fingerprint:
+        return {'id': latest['id'], 'version': latest['version'], 'created': False}
+
+    version = (latest['version'] if latest else 0) + 1
+    cursor = connection.cursor()
+    cursor.execute(
+        f"""
+        INSERT INTO {SNAPSHOT_TABLE}
+            (department, admission_year, version, fingerprint, requirements, change_source, changed_by)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """,
+        (
+            department, admission_year, version, fingerprint,
+            json.dumps(normalize_requirements(rows), ensure_ascii=False, default=str),
+            source, changed_by
+        )
+    )
+    snapshot_id = cursor.lastrowid
+    cursor.close()
+    logger.info(f"졸업요건 스냅샷 생성: {department} {admission_year} v{version} (id={snapshot_id}, {source})")
+    return {'id': snapshot_id, 'version': version, 'created': True}
+
+
+def snapshot_requirements(connection, department: str, admission_year: int,
+                          source: str, changed_by: Optional[str] = None) -> Dict:
+    """현재 graduation_requirements 내용으로 스냅샷 보장 (같은 트랜잭션의 변경 내용 포함)"""
+    cursor = connection.cursor(dictionary=True)
+    rows = _load_live_requirements(cursor, department, admission_year)
+    cursor.close()
+    return ensure_snapshot(connection, department, admission_year, rows, source, changed_by)
@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from flask import Response, jsonify, request
+
+try:
+    import brotli  # 선택 의존성: 설치되어 있으면 br 인코딩 우선 사용
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 이 크기 미만의 응답은 압축 이득보다 비용이 커서 그대로 보냄
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# analysis_result 최상위 키 화이트리스트 (fields= 파라미터 검증 및 JSON 경로 생성용)
+ANALYSIS_FIELDS = (
+    'student_info',
+    'analysis_date',
+    'requirements_analysis',
+    'total_completed_credits',
+    'total_required_credits',
+    'overall_completion_rate',
+    'missing_requirements',
+    'recommendations',
+    'recommended_courses',
+    'course_plan',
+    'liberal_arts_detail',
+    'major_detail',
+    'general_elective_detail',
+    'gsin_basic_detail',
+    'liberal_arts_cap',
+    'liberal_arts_overflow',
+    'liberal_arts_allocation',
+    'parsing_warnings',
+    'requirement_snapshot_id',
+    'requirement_version',
+)
+
+
+def parse_fields_param(raw: Optional[str], allowed: Iterable[str] = ANALYSIS_FIELDS) -> Optional[List[str]]:
+    """fields= 쿼리 파라미터를 검증된 필드 목록으로 변환.
+
+    파라미터가 없으면 None(전체 반환), 빈 문자열이면 빈 목록(분석 본문 생략)을 돌려준다.
+    화이트리스트에 없는 이름은 무시한다.
+    """
+    if raw is None:
+        return None
+    allowed_set = set(allowed)
+    fields = []
+    for name in raw.split(','):
+        name = name.strip()
+        if name and name in allowed_set and name not in fields:
+            fields.append(name)
+    return fields
+
+
+def build_json_extract_columns(fields: List[str], column: str = 'analysis_result') -> str:
+    """화이트리스트 필드 목록을 JSON_EXTRACT 컬럼 목록 SQL로 변환"""
+    return ', '.join(
+        f"JSON_EXTRACT({column}, '$.{name}') AS `f_{name}`" for name in fields
+    )
+
+
+def collect_projected_fields(row: Dict, fields: List[str]) -> Dict:
+    """JSON_EXTRACT 결과 행에서 필드별 값을 복원 (NULL은 누락으로 처리)"""
+    projected = {}
+    for name in fields:
+        raw = row.pop(f'f_{name}', None)
+        if raw is None:
+            continue
+        if isinstance(raw, (bytes, bytearray)):
+            raw = raw.decode('utf-8')
+        try:
+            projected[name] = json.loads(raw) if isinstance(raw, str) else raw
+        except json.JSONDecodeError:
+            projected[name] = raw
+    return projected
+
+
+def project_analysis(analysis_data: Dict, fields: Optional[List[str]]) -> Dict:
+    """이미 파싱된 분석 결과에서 요청 필드만 남김"""
+    if fields is None:
+        return analysis_data
+    return {name: analysis_data[name] for name in fields if name in analysis_data}
+
+
+def make_etag(*parts) -> str:
+    """임의의 값들로 약한 ETag 값을 생성 (압축 여부와 무관하게 동일 표현으로 취급)"""
+    digest = hashlib.sha1('|'.join('' if p is None else str(p) for p in parts).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """요청의 If-None-Match/If-Modified-Since가 현재 표현과 일치하는지 확인"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP 날짜는 초 단위이므로 마이크로초를 버리고 비교
+        lm = last_modified.replace(microsecond=0)
+        ims = request.if_modified_since
+        if ims.tzinfo is not None and lm.tzinfo is None:
+            ims = ims.replace(tzinfo=None)
+        return lm <= ims
+    return False
+
+
+def apply_cache_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> Response:
+    """ETag/Last-Modified를 설정하고 매 요청 재검증하도록 캐시 정책 지정"""
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    response = Response(status=304)
+    return apply_cache_validators(response, etag, last_modified)
+
+
+def conditional_json(payload: Dict, etag: str, last_modified: Optional[datetime]) -> Response:
+    """검증자가 붙은 JSON 응답 생성"""
+    response = jsonify(payload)
+    return apply_cache_validators(response, etag, last_modified)
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {}
+    for part in accept_encoding.split(','):
+        token = part.strip()
+        if not token:
+            continue
+        name, _, params = token.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress_response(response: Response) -> Response:
+    """JSON 응답을 Accept-Encoding에 맞춰 br/gzip으로 압축 (after_request 훅)"""
+    try:
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype != 'application/json'):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = _choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        body = response.get_data()
+        if len(body) < MIN_COMPRESS_SIZE:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+        else:
+            compressed = gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        response.headers['Content-Length'] = str(len(compressed))
+    except Exception as e:
+        logger.warning(f"응답 압축 실패, 원본 전송: {e}")
+    return response
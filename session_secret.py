@@ -0,0 +1,47 @@
+import logging
+import os
+import secrets
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+SECRET_KEY_ENV = 'FLASK_SECRET_KEY'
+SECRET_KEY_FILE_ENV = 'FLASK_SECRET_KEY_FILE'
+DEFAULT_SECRET_KEY_FILE = os.path.join('instance', 'secret_key')
+
+
+def _read_key(path: str) -> str:
+    with open(path, encoding='utf-8') as f:
+        return f.read().strip()
+
+
+def load_secret_key(path: str = None) -> str:
+    """세션 쿠키 서명 키: 환경변수 > 키 파일 > (없으면) 새로 만들어 키 파일에 저장
+
+    모든 워커와 재시작 후에도 같은 키를 써야 기존 로그인 세션이 유지된다.
+    """
+    key = os.environ.get(SECRET_KEY_ENV, '').strip()
+    if key:
+        return key
+    path = path or os.environ.get(SECRET_KEY_FILE_ENV) or DEFAULT_SECRET_KEY_FILE
+    if os.path.exists(path):
+        key = _read_key(path)
+        if key:
+            return key
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.secret_key.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(secrets.token_hex(32))
+        os.chmod(tmp_path, 0o600)
+        try:
+            # 완성된 파일을 link로 게시: 동시에 시작한 프로세스 중 하나만 성공하고 나머지는 그 키를 읽는다
+            os.link(tmp_path, path)
+            logger.info(f"세션 키 파일 생성: {path}")
+        except FileExistsError:
+            pass
+    finally:
+        os.remove(tmp_path)
+    return _read_key(path)
@@ -0,0 +1,330 @@
+import atexit
+import logging
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import mysql.connector
+from flask import request
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface
+from itsdangerous import BadSignature, Signer
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+SESSION_LIFETIME = timedelta(hours=8)
+# 워커 캐시에 세션을 믿고 쓰는 시간 (다른 워커의 로그아웃/변경은 최대 이 시간 뒤 반영)
+CACHE_SECONDS = 30
+# last_activity/만료 연장 write-behind 주기, 만료 세션 정리 주기
+FLUSH_SECONDS = 60
+SWEEP_SECONDS = 600
+
+CREATE_SESSION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS user_sessions (
+    id VARCHAR(128) PRIMARY KEY COMMENT '세션 ID',
+    user_id VARCHAR(20) NOT NULL COMMENT '사용자 ID',
+    ip_address VARCHAR(45) COMMENT '접속 IP',
+    user_agent TEXT COMMENT '사용자 에이전트',
+    data MEDIUMTEXT COMMENT '세션 데이터 (Flask 세션 직렬화)',
+    last_activity DATETIME NOT NULL COMMENT '마지막 활동 시간',
+    expires_at DATETIME NOT NULL COMMENT '세션 만료 시간',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(username) ON DELETE CASCADE,
+    INDEX idx_user_id (user_id),
+    INDEX idx_expires_at (expires_at),
+    INDEX idx_last_activity (last_activity)
+) COMMENT='사용자 세션 관리'
+"""
+
+
+class SessionUnavailable(Exception):
+    """세션 DB 조회 실패 (세션이 없는 것과 구분하여 로그아웃시키지 않음)"""
+
+
+def ensure_session_table(cursor):
+    """user_sessions 테이블과 세션 데이터 컬럼 준비"""
+    cursor.execute(CREATE_SESSION_TABLE_SQL)
+    cursor.execute("SHOW COLUMNS FROM user_sessions LIKE 'data'")
+    if cursor.fetchone() is None:
+        cursor.execute("ALTER TABLE user_sessions ADD COLUMN data MEDIUMTEXT COMMENT '세션 데이터 (Flask 세션 직렬화)' AFTER user_agent")
+
+
+class SessionStore:
+    """user_sessions 기반 서버 세션 저장소
+
+    - 조회: 워커별 TTL 캐시 → 캐시 미스일 때만 DB 조회
+    - 활동 기록: last_activity/만료 연장을 모아 두었다가 주기적으로 일괄 UPDATE (write-behind)
+    - 만료: 로그인 시점이 아니라 백그라운드 주기 정리
+    gunicorn fork 이후 워커마다 캐시/백그라운드 스레드를 새로 만든다.
+    """
+
+    def __init__(self, db_config: Dict, lifetime: timedelta = SESSION_LIFETIME,
+                 cache_seconds: float = CACHE_SECONDS, flush_seconds: float = FLUSH_SECONDS,
+                 sweep_seconds: float = SWEEP_SECONDS, background: bool = True,
+                 clock=time.monotonic, now=datetime.now):
+        self.db_config = db_config
+        self.lifetime = lifetime
+        self.cache_seconds = cache_seconds
+        self.flush_seconds = flush_seconds
+        self.sweep_seconds = sweep_seconds
+        self.background = background
+        self.clock = clock
+        self.now = now
+        self.serializer = TaggedJSONSerializer()
+        self._init_lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_worker(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._init_lock:
+            if self._pid == pid:
+                return
+            self._lock = threading.Lock()
+            # sid → (데이터, 사용자 ID, 만료 시각, 캐시 시각)
+            self._cache: Dict[str, Tuple[Dict, str, datetime, float]] = {}
+            self._pending: Dict[str, datetime] = {}
+            self._stop = threading.Event()
+            if self.background:
+                threading.Thread(target=self._run, name='session-store', daemon=True).start()
+                atexit.register(self.flush)
+            self._pid = pid
+
+    def _run(self):
+        last_sweep = self.clock()
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+            if self.clock() - last_sweep >= self.sweep_seconds:
+                self.sweep()
+                last_sweep = self.clock()
+
+    # --- 세션 API ---
+
+    def load(self, sid: str) -> Optional[Dict]:
+        """세션 데이터 반환, 없거나 만료되었으면 None (DB 오류는 SessionUnavailable)"""
+        self._ensure_worker()
+        now = self.now()
+        with self._lock:
+            entry = self._cache.get(sid)
+        if entry is not None and self.clock() - entry[3] < self.cache_seconds:
+            return dict(entry[0]) if entry[2] > now else None
+        try:
+            row = self._db_fetch(sid)
+        except Error as e:
+            logger.error(f"세션 조회 오류: {e}")
+            raise SessionUnavailable(str(e)) from e
+        if row is None or row['expires_at'] <= now:
+            with self._lock:
+                self._cache.pop(sid, None)
+            return None
+        data = self.serializer.loads(row['data']) if row.get('data') else {}
+        with self._lock:
+            # 아직 기록되지 않은 활동으로 연장된 만료 시각은 유지
+            expires_at = max(row['expires_at'], self._cache[sid][2]) if sid in self._cache else row['expires_at']
+            self._cache[sid] = (data, row['user_id'], expires_at, self.clock())
+        return dict(data)
+
+    def touch(self, sid: str):
+        """요청마다 호출: DB에 바로 쓰지 않고 다음 flush 때 일괄 반영"""
+        self._ensure_worker()
+        now = self.now()
+        with self._lock:
+            self._pending[sid] = now
+            entry = self._cache.get(sid)
+            if entry is not None:
+                self._cache[sid] = (entry[0], entry[1], now + self.lifetime, entry[3])
+
+    def create(self, user_id: str, data: Dict, ip_address: str = None, user_agent: str = None) -> str:
+        self._ensure_worker()
+        sid = secrets.token_urlsafe(32)
+        now = self.now()
+        self._db_insert(sid, user_id, self.serializer.dumps(data), ip_address, (user_agent or '')[:1000],
+                        now, now + self.lifetime)
+        with self._lock:
+            self._cache[sid] = (dict(data), user_id, now + self.lifetime, self.clock())
+        return sid
+
+    def save(self, sid: str, user_id: str, data: Dict):
+        self._ensure_worker()
+        now = self.now()
+        self._db_update(sid, user_id, self.serializer.dumps(data), now, now + self.lifetime)
+        with self._lock:
+            self._pending.pop(sid, None)
+            self._cache[sid] = (dict(data), user_id, now + self.lifetime, self.clock())
+
+    def delete(self, sid: str):
+        self._ensure_worker()
+        with self._lock:
+            self._cache.pop(sid, None)
+            self._pending.pop(sid, None)
+        try:
+            self._db_delete(sid)
+        except Error as e:
+            logger.error(f"세션 삭제 오류: {e}")
+
+    def flush(self):
+        """모아 둔 last_activity/만료 연장을 한 번에 기록"""
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        rows = [(last, last + self.lifetime, sid) for sid, last in pending.items()]
+        try:
+            self._db_touch(rows)
+        except Error as e:
+            logger.error(f"세션 활동 기록 오류: {e}")
+            with self._lock:
+                for sid, last in pending.items():
+                    if self._pending.get(sid, last) <= last:
+                        self._pending[sid] = last
+
+    def sweep(self) -> int:
+        if self._pid != os.getpid():
+            return 0
+        now = self.now()
+        with self._lock:
+            for sid in [sid for sid, entry in self._cache.items() if entry[2] <= now]:
+                del self._cache[sid]
+        try:
+            deleted = self._db_delete_expired(now)
+        except Error as e:
+            logger.error(f"만료 세션 정리 오류: {e}")
+            return 0
+        if deleted:
+            logger.info(f"만료 세션 정리: {deleted}건")
+        return deleted
+
+    # --- DB 접근 ---
+
+    def _execute(self, query: str, params=None, many: bool = False, fetch: bool = False):
+        connection = mysql.connector.connect(**self.db_config)
+        try:
+            cursor = connection.cursor(dictionary=True)
+            if many:
+                cursor.executemany(query, params)
+            else:
+                cursor.execute(query, params)
+            result = cursor.fetchone() if fetch else cursor.rowcount
+            connection.commit()
+            cursor.close()
+            return result
+        finally:
+            connection.close()
+
+    def _db_fetch(self, sid: str) -> Optional[Dict]:
+        return self._execute("SELECT user_id, data, expires_at FROM user_sessions WHERE id = %s", (sid,), fetch=True)
+
+    def _db_insert(self, sid, user_id, data, ip_address, user_agent, last_activity, expires_at):
+        self._execute(
+            """
+            INSERT INTO user_sessions (id, user_id, ip_address, user_agent, data, last_activity, expires_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            (sid, user_id, ip_address, user_agent, data, last_activity, expires_at)
+        )
+
+    def _db_update(self, sid, user_id, data, last_activity, expires_at):
+        self._execute(
+            "UPDATE user_sessions SET user_id = %s, data = %s, last_activity = %s, expires_at = %s WHERE id = %s",
+            (user_id, data, last_activity, expires_at, sid)
+        )
+
+    def _db_delete(self, sid: str):
+        self._execute("DELETE FROM user_sessions WHERE id = %s", (sid,))
+
+    def _db_touch(self, rows: List[Tuple]):
+        self._execute("UPDATE user_sessions SET last_activity = %s, expires_at = %s WHERE id = %s", rows, many=True)
+
+    def _db_delete_expired(self, now: datetime) -> int:
+        return self._execute("DELETE FROM user_sessions WHERE expires_at < %s", (now,))
+
+
+class ServerSession(SecureCookieSession):
+    sid = None
+    # 세션을 불러올 때의 로그인 사용자 (사용자가 바뀌면 세션 ID 재발급)
+    loaded_user_id = None
+    # 세션 DB 장애로 불러오지 못함 (쿠키를 그대로 두어 복구 후 같은 세션 유지)
+    unavailable = False
+
+
+class ServerSessionInterface(SecureCookieSessionInterface):
+    """로그인 세션은 user_sessions에, 로그인 전 세션(플래시 메시지 등)은 기존 서명 쿠키에 저장
+
+    쿠키에는 서명된 세션 ID만 담기므로 모든 워커와 재시작 후에도 같은 세션을 찾는다.
+    """
+
+    session_class = ServerSession
+    sid_salt = 'server-session'
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+
+    def _signer(self, app) -> Signer:
+        return Signer(app.secret_key, salt=self.sid_salt)
+
+    def open_session(self, app, request):
+        value = request.cookies.get(self.get_cookie_name(app))
+        if value and app.secret_key:
+            try:
+                sid = self._signer(app).unsign(value).decode()
+            except BadSignature:
+                sid = None
+            if sid is not None:
+                try:
+                    data = self.store.load(sid)
+                except SessionUnavailable:
+                    session = self.session_class()
+                    session.unavailable = True
+                    return session
+                if data is None:
+                    # 만료/삭제된 세션: 빈 세션으로 시작하고 쿠키를 지운다
+                    session = self.session_class()
+                    session.modified = True
+                    return session
+                self.store.touch(sid)
+                session = self.session_class(data)
+                session.sid = sid
+                session.loaded_user_id = data.get('user_id')
+                return session
+        return super().open_session(app, request)
+
+    def save_session(self, app, session, response):
+        user_id = session.get('user_id')
+        sid = getattr(session, 'sid', None)
+        if not user_id:
+            if getattr(session, 'unavailable', False):
+                # DB 장애 중에는 비로그인으로 처리하되 세션 쿠키는 지우거나 덮어쓰지 않음
+                return
+            if sid:
+                # 로그아웃: 서버 세션을 지우고 남은 데이터(플래시)는 쿠키 세션으로
+                self.store.delete(sid)
+                session.modified = True
+            return super().save_session(app, session, response)
+
+        if sid and getattr(session, 'loaded_user_id', None) == user_id:
+            if session.modified:
+                self.store.save(sid, user_id, dict(session))
+            return
+
+        # 로그인(또는 사용자 변경) 시 새 세션 ID 발급 (세션 고정 방지)
+        if sid:
+            self.store.delete(sid)
+        sid = self.store.create(user_id, dict(session), request.remote_addr, request.headers.get('User-Agent'))
+        response.set_cookie(
+            self.get_cookie_name(app),
+            self._signer(app).sign(sid).decode(),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=self.get_cookie_domain(app),
+            path=self.get_cookie_path(app),
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add('Cookie')
@@ -0,0 +1,250 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from course_equivalency import normalize_code
+from course_rules import is_passed_course
+from graduation_core import ADMISSION_YEAR_MISSING, evaluate_graduation, student_admission_year
+from graduation_requirements_checker import GraduationRequirementsChecker, analysis_saved_hooks
+
+logger = logging.getLogger(__name__)
+
+# 시뮬레이션 입력을 메모리에 유지할 학생 수 (LRU)
+MAX_CACHED_STUDENTS = 512
+# 최신 분석일시를 다시 확인하지 않고 캐시 입력을 쓰는 시간 (같은 워커의 분석 저장은 즉시 무효화)
+CACHE_TTL_SECONDS = 30
+MAX_HYPOTHETICAL_COURSES = 30
+# 커리큘럼 이수구분 → 가상 과목 구분/영역
+CURRICULUM_AREAS = {'전필': '전공필수', '전선': '전공선택'}
+# 분석기가 수강기록 대신 엑셀 고정칸(students 컬럼)을 쓰는 요건 → 가상 과목 학점을 더할 컬럼
+STUDENT_CREDIT_COLUMNS = {
+    ('전공', '전공필수'): 'major_required_credits',
+    ('전공', '전공선택'): 'major_elective_credits',
+    ('일선', None): 'general_elective_credits',
+}
+
+
+class SimulationInputs:
+    """학생 한 명의 분석 입력(학생정보/수강기록/요건/인정규칙/추천 인덱스)과 기준 분석 결과"""
+
+    def __init__(self, student_info: Dict, courses: List[Dict], requirements: List[Dict], recognition: Dict,
+                 index, planner, stamp=None):
+        self.student_info = student_info
+        self.courses = courses
+        self.requirements = requirements
+        self.recognition = recognition
+        self.index = index
+        self.planner = planner
+        self.stamp = stamp
+        self.baseline = evaluate(self, courses, student_info)
+
+
+def evaluate(inputs: SimulationInputs, courses: List[Dict], student_info: Dict) -> Dict:
+    # 요건 스냅샷 생성/결과 저장 없이 순수 코어로만 계산
+    return evaluate_graduation(student_info, [dict(c) for c in courses], inputs.requirements, inputs.recognition,
+                               index=inputs.index, planner=inputs.planner)
+
+
+def _credit_column(course: Dict) -> Optional[str]:
+    category = course.get('category')
+    return STUDENT_CREDIT_COLUMNS.get((category, course.get('area') or None),
+                                      STUDENT_CREDIT_COLUMNS.get((category, None)))
+
+
+def adjusted_student_info(student_info: Dict, added: List[Dict], removed: List[Dict]) -> Dict:
+    """전필/전선/일선 가상 과목을 엑셀 고정칸 학점(students 컬럼)에 반영한 학생 정보"""
+    info = dict(student_info)
+    for courses, sign in ((added, 1.0), (removed, -1.0)):
+        for course in courses:
+            column = _credit_column(course)
+            if column is None or not is_passed_course(course):
+                continue
+            current = float(info.get(column) or 0.0)
+            info[column] = max(0.0, current + sign * float(course.get('credit') or 0.0))
+    return info
+
+
+def load_simulation_inputs(checker: GraduationRequirementsChecker, student_id: str, stamp=None) -> Optional[SimulationInputs]:
+    """연결된 검사기로 학생의 분석 입력을 한 번 조회"""
+    student_info = checker.get_student_info(student_id)
+    if not student_info:
+        return None
+    department = student_info.get('department')
+    admission_year = student_admission_year(student_info)
+    if admission_year is None:
+        raise ValueError(ADMISSION_YEAR_MISSING)
+    return SimulationInputs(
+        student_info,
+        checker.get_student_courses(student_id),
+        checker.get_graduation_requirements(department, admission_year),
+        checker.get_major_elective_recognition(department, admission_year),
+        checker.get_recommendation_index(department, admission_year),
+        checker.get_course_planner(department, admission_year),
+        stamp=stamp,
+    )
+
+
+def hypothetical_course(spec: Dict, inputs: SimulationInputs) -> Dict:
+    """요청의 가상 과목을 course_records 행 형태로 변환
+
+    커리큘럼에 있는 교과목번호만 주면 구분/영역/학점을 커리큘럼에서 채운다.
+    """
+    code = normalize_code(spec.get('course_code'))
+    curriculum = None
+    if code:
+        canonical = inputs.index.equivalency.canonical(code)
+        curriculum = next((c for c in inputs.index.courses
+                           if inputs.index.equivalency.canonical(c.get('course_code')) == canonical), None)
+    category = spec.get('category') or ('전공' if curriculum else None)
+    area = spec.get('area')
+    if area is None and curriculum:
+        area = CURRICULUM_AREAS.get(curriculum.get('required_type'), '')
+    credit = spec.get('credit', curriculum.get('credits') if curriculum else None)
+    try:
+        credit = float(credit)
+    except (TypeError, ValueError):
+        raise ValueError(f"가상 과목 학점이 올바르지 않습니다: {code or spec.get('course_name')}")
+    if not category or credit <= 0:
+        raise ValueError(f"가상 과목의 구분(category)과 학점이 필요합니다: {code or spec.get('course_name')}")
+    return {
+        'student_id': inputs.student_info.get('student_id'),
+        'course_code': code,
+        'course_name': spec.get('course_name') or (curriculum.get('course_name') if curriculum else code),
+        'category': category,
+        'area': area or '',
+        'sub_area': spec.get('sub_area') or '',
+        'credit': credit,
+        'grade': spec.get('grade') or 'P',
+        'completion_type': None,
+        'is_passed': None,
+        'is_hypothetical': True,
+    }
+
+
+def _requirement_label(req: Dict) -> str:
+    return f"{req.get('category')}_{req.get('area')}" if req.get('area') else str(req.get('category'))
+
+
+def analysis_diff(before: Dict, after: Dict) -> Dict:
+    """두 분석 결과의 변경점 (요건별 이수학점/충족 여부, 총 이수학점, 예상 학기 수)"""
+    before_reqs = {_requirement_label(r): r for r in before.get('requirements_analysis', [])}
+    changes = []
+    for req in after.get('requirements_analysis', []):
+        label = _requirement_label(req)
+        prev = before_reqs.get(label, {})
+        if prev.get('completed_credits') == req.get('completed_credits') and \
+                prev.get('is_fulfilled') == req.get('is_fulfilled'):
+            continue
+        changes.append({
+            'requirement': label,
+            'completed_before': prev.get('completed_credits', 0.0),
+            'completed_after': req.get('completed_credits'),
+            'required_credits': req.get('required_credits'),
+            'fulfilled_before': bool(prev.get('is_fulfilled')),
+            'fulfilled_after': bool(req.get('is_fulfilled')),
+        })
+
+    def plan_semesters(result):
+        plan = result.get('course_plan')
+        return plan.get('semesters_needed') if plan else None
+
+    return {
+        'total_completed_credits': {'before': before.get('total_completed_credits'),
+                                    'after': after.get('total_completed_credits')},
+        'overall_completion_rate': {'before': before.get('overall_completion_rate'),
+                                    'after': after.get('overall_completion_rate')},
+        'graduation_ready': {'before': not before.get('missing_requirements'),
+                             'after': not after.get('missing_requirements')},
+        'semesters_needed': {'before': plan_semesters(before), 'after': plan_semesters(after)},
+        'requirements': changes,
+        'newly_fulfilled': [c['requirement'] for c in changes if c['fulfilled_after'] and not c['fulfilled_before']],
+        'newly_missing': [c['requirement'] for c in changes if c['fulfilled_before'] and not c['fulfilled_after']],
+    }
+
+
+def validate_changes(add, remove):
+    """요청 본문의 add(과목 객체 목록)/remove(교과목번호 문자열 목록) 형식 확인, 잘못되면 ValueError"""
+    if not isinstance(add, list) or not all(isinstance(spec, dict) for spec in add):
+        raise ValueError("add는 가상 과목 객체의 목록이어야 합니다.")
+    if not isinstance(remove, list) or not all(isinstance(code, str) for code in remove):
+        raise ValueError("remove는 교과목번호 문자열의 목록이어야 합니다.")
+    if len(add) > MAX_HYPOTHETICAL_COURSES:
+        raise ValueError(f"가상 과목은 최대 {MAX_HYPOTHETICAL_COURSES}개까지 추가할 수 있습니다.")
+
+
+def simulate(inputs: SimulationInputs, add: Optional[List[Dict]] = None,
+             remove: Optional[List[str]] = None) -> Dict:
+    """가상 과목 추가/이수 과목 제외를 메모리에서만 반영한 분석과 기준 대비 변경점"""
+    add = add or []
+    remove = remove or []
+    validate_changes(add, remove)
+    equivalency = inputs.index.equivalency
+    removed_codes = {equivalency.canonical(code) for code in remove if normalize_code(code)}
+    kept, removed = [], []
+    for course in inputs.courses:
+        (removed if equivalency.canonical(course.get('course_code')) in removed_codes else kept).append(course)
+    added = [hypothetical_course(spec, inputs) for spec in add]
+    result = evaluate(inputs, kept + added, adjusted_student_info(inputs.student_info, added, removed))
+    return {
+        'added_courses': added,
+        'removed_count': len(removed),
+        'diff': analysis_diff(inputs.baseline, result),
+        'analysis': result,
+    }
+
+
+class SimulationCache:
+    """학생별 SimulationInputs LRU 캐시
+
+    최신 분석일시(stamp)가 바뀌면(업로드/재분석/요건 변경 후 재분석) 입력을 다시 조회한다.
+    stamp 확인 후 ttl_seconds 동안은 fresh()가 DB 조회 없이 캐시 입력을 돌려준다.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_STUDENTS, ttl_seconds: float = CACHE_TTL_SECONDS,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        # 학번 → (입력, stamp 확인 시각)
+        self._entries: 'OrderedDict[str, Tuple[SimulationInputs, float]]' = OrderedDict()
+
+    def fresh(self, student_id: str) -> Optional[SimulationInputs]:
+        """TTL 안에 stamp를 확인한 입력 (없으면 None → get으로 확인)"""
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is None or self.clock() - entry[1] > self.ttl_seconds:
+                return None
+            self._entries.move_to_end(student_id)
+            return entry[0]
+
+    def get(self, student_id: str, stamp, loader) -> Optional[SimulationInputs]:
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is not None and entry[0].stamp == stamp:
+                self._entries[student_id] = (entry[0], self.clock())
+                self._entries.move_to_end(student_id)
+                return entry[0]
+        inputs = loader()
+        if inputs is None:
+            return None
+        with self._lock:
+            self._entries[student_id] = (inputs, self.clock())
+            self._entries.move_to_end(student_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return inputs
+
+    def invalidate(self, student_id: Optional[str] = None):
+        with self._lock:
+            if student_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(student_id, None)
+
+
+simulation_cache = SimulationCache()
+# 이 프로세스에서 분석 결과가 저장되면(업로드/재분석) 해당 학생 입력을 바로 버림
+analysis_saved_hooks.append(simulation_cache.invalidate)
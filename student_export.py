@@ -0,0 +1,124 @@
+import csv
+import io
+import logging
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from analysis_codec import load_stored_analysis
+
+logger = logging.getLogger(__name__)
+
+# 서버 측(비버퍼) 커서에서 한 번에 가져올 행 수 / CSV 응답 조각당 행 수
+FETCH_BATCH = 500
+CSV_ROWS_PER_CHUNK = 200
+FILE_CHUNK_SIZE = 64 * 1024
+
+EXPORT_QUERY = """
+SELECT s.student_id, s.name, s.department, s.grade, s.admission_year, s.major, s.minor, s.double_major,
+       ga.overall_completion_rate, ga.total_completed_credits, ga.total_required_credits,
+       ga.analysis_date, ga.requirement_version, ga.analysis_result, ga.analysis_blob
+FROM students s
+LEFT JOIN graduation_analysis ga ON s.student_id = ga.student_id
+"""
+
+HEADERS = (
+    '학번', '이름', '학과', '학년', '입학년도', '전공', '부전공', '다전공',
+    '이수율(%)', '이수학점', '필요학점', '분석일시', '요건버전', '미충족 요건 수', '부족학점 합계', '미충족 요건',
+)
+
+# 엑셀이 수식으로 해석하는 시작 문자 (CSV/XLSX 수식 주입 방지)
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _cell(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _number(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def shortfalls(row: Dict) -> List[Tuple[str, str, float]]:
+    """저장된 분석 결과의 미충족 요건 (구분, 영역, 부족학점)"""
+    if not row.get('analysis_blob') and not row.get('analysis_result'):
+        return []
+    try:
+        analysis = load_stored_analysis(row) or {}
+    except Exception as e:
+        logger.warning(f"내보내기 분석 결과 복원 실패: {row.get('student_id')} - {e}")
+        return []
+    result = []
+    for item in analysis.get('missing_requirements') or []:
+        missing = float(item.get('missing_credits') or 0)
+        if missing > 0:
+            result.append((item.get('category') or '', item.get('area') or '', missing))
+    return result
+
+
+def export_row(row: Dict) -> List:
+    missing = shortfalls(row)
+    analysis_date = row.get('analysis_date')
+    return [_cell(v) for v in (
+        row.get('student_id'), row.get('name'), row.get('department'), row.get('grade'),
+        row.get('admission_year'), row.get('major'), row.get('minor'), row.get('double_major'),
+        _number(row.get('overall_completion_rate')), _number(row.get('total_completed_credits')),
+        _number(row.get('total_required_credits')),
+        analysis_date.strftime('%Y-%m-%d %H:%M:%S') if isinstance(analysis_date, datetime) else analysis_date,
+        row.get('requirement_version'), len(missing), sum(m for _, _, m in missing),
+        '; '.join(f"{category}/{area} {credits:g}학점" for category, area, credits in missing),
+    )]
+
+
+def iter_student_rows(cursor, where: str = '', params: Iterable = ()) -> Iterator[List]:
+    """비버퍼 커서로 조건에 맞는 학생을 배치 단위로 읽어 내보내기 행으로 변환 (결과 전체를 메모리에 두지 않음)"""
+    cursor.execute(EXPORT_QUERY + (f" WHERE {where}" if where else '') + " ORDER BY s.student_id", list(params))
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH)
+        if not rows:
+            break
+        for row in rows:
+            yield export_row(row)
+
+
+def iter_csv(rows: Iterable[List]) -> Iterator[bytes]:
+    """CSV(UTF-8 BOM, 엑셀 한글 호환)를 행 묶음 단위로 생성"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(HEADERS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % CSV_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iter_xlsx(rows: Iterable[List], title: str = '학생목록') -> Iterator[bytes]:
+    """openpyxl 쓰기 전용 통합문서로 XLSX 생성
+
+    쓰기 전용 시트는 행을 임시 파일에 바로 기록하고, 완성된 통합문서도 임시 파일에 저장한 뒤
+    조각 단위로 내보낸다. XLSX(ZIP)는 끝에 중앙 디렉터리가 있어 저장이 끝나야 첫 바이트를 보낼 수 있다.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    sheet.append(list(HEADERS))
+    for row in rows:
+        sheet.append(row)
+    with tempfile.TemporaryFile() as tmp:
+        workbook.save(tmp)
+        tmp.seek(0)
+        while True:
+            chunk = tmp.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
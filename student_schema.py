@@ -0,0 +1,32 @@
+ADMISSION_YEAR_COLUMN_SQL = (
+    "ADD COLUMN admission_year SMALLINT AS (YEAR(admission_date)) STORED "
+    "COMMENT '입학년도 (입학일자에서 생성, 학과/입학년도 조회용)' AFTER admission_date"
+)
+COHORT_INDEX = 'idx_department_admission_year'
+
+
+def column_exists(cursor, table: str, column: str) -> bool:
+    cursor.execute("SHOW COLUMNS FROM {} LIKE %s".format(table), (column,))
+    return cursor.fetchone() is not None
+
+
+def index_exists(cursor, table: str, index: str) -> bool:
+    cursor.execute("SHOW INDEX FROM {} WHERE Key_name = %s".format(table), (index,))
+    return bool(cursor.fetchall())
+
+
+def ensure_admission_year_column(cursor) -> bool:
+    """students.admission_year 저장 생성 컬럼과 (department, admission_year) 인덱스 준비, 변경 여부 반환
+
+    저장(STORED) 생성 컬럼이라 추가할 때 기존 행이 함께 채워지고, 이후 입학일자가 저장/수정될 때마다
+    MySQL이 같은 식으로 갱신한다 (파서/수정 API에서 따로 쓰지 않음).
+    """
+    to_add = []
+    if not column_exists(cursor, 'students', 'admission_year'):
+        to_add.append(ADMISSION_YEAR_COLUMN_SQL)
+    if not index_exists(cursor, 'students', COHORT_INDEX):
+        to_add.append(f"ADD INDEX {COHORT_INDEX} (department, admission_year)")
+    if not to_add:
+        return False
+    cursor.execute(f"ALTER TABLE students {', '.join(to_add)}")
+    return True
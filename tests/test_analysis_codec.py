@@ -0,0 +1,56 @@
+import json
+
+from analysis_codec import (
+    decode_analysis, encode_analysis, encode_for_storage, load_stored_analysis, needs_student_info
+)
+
+
+def _sample_analysis():
+    rows = [
+        {'category': '교양', 'area': '일반교양', 'required_credits': 6.0, 'completed_credits': 3.0,
+         'missing_credits': 3.0, 'is_fulfilled': False, 'completion_rate': 50.0},
+        {'category': '전공', 'area': '전공필수', 'required_credits': 24.0, 'completed_credits': 24.0,
+         'missing_credits': 0.0, 'is_fulfilled': True, 'completion_rate': 100.0},
+        {'category': '전공', 'area': '전공선택', 'required_credits': 36.0, 'completed_credits': 27.0,
+         'missing_credits': 9.0, 'is_fulfilled': False, 'completion_rate': 75.0},
+    ]
+    return {
+        'student_info': {'student_id': '2021026017', 'name': '홍길동', 'department': '경영정보학과'},
+        'analysis_date': '2025-11-30T01:00:00',
+        'requirements_analysis': rows,
+        'total_completed_credits': 54.0,
+        'total_required_credits': 130.0,
+        'overall_completion_rate': 41.54,
+        # 미달 요건은 부족학점 내림차순으로 재정렬되어 저장됨
+        'missing_requirements': [rows[2], rows[0]],
+        'recommendations': ['전공선택 9.0학점 부족: 추천 과목 → 2학년|경영정보론'] * 3,
+        'liberal_arts_detail': {'일반교양': 3.0},
+        'parsing_warnings': [],
+    }
+
+
+def test_roundtrip_restores_rows_and_student_ref():
+    analysis = _sample_analysis()
+    student = analysis['student_info']
+    restored = decode_analysis(encode_analysis(analysis), student_info=student)
+    assert restored == analysis
+
+
+def test_student_info_is_stored_by_reference():
+    restored = decode_analysis(encode_analysis(_sample_analysis()))
+    assert needs_student_info(restored)
+    assert restored['student_info']['student_id'] == '2021026017'
+    assert 'name' not in restored['student_info']
+
+
+def test_storage_is_smaller_and_legacy_rows_still_load():
+    analysis = _sample_analysis()
+    legacy = json.dumps(analysis, ensure_ascii=False, default=str)
+    summary, blob, encoding = encode_for_storage(analysis)
+    assert len(summary.encode('utf-8')) + len(blob) < len(legacy.encode('utf-8'))
+    assert json.loads(summary)['overall_completion_rate'] == 41.54
+
+    assert load_stored_analysis({'analysis_result': legacy, 'analysis_blob': None}) == analysis
+    stored = load_stored_analysis({'analysis_result': summary, 'analysis_blob': blob},
+                                  student_info=analysis['student_info'])
+    assert stored == analysis
@@ -0,0 +1,69 @@
+import copy
+
+from analysis_history import (
+    AnalysisHistoryStore, apply_patch, diff_documents, encode_payload, replay, requirement_progress, to_document
+)
+
+
+def _analysis(completed_major, recommendations):
+    rows = [
+        {'category': '교양', 'area': '일반교양', 'required_credits': 6.0, 'completed_credits': 6.0,
+         'missing_credits': 0.0, 'is_fulfilled': True, 'completion_rate': 100.0},
+        {'category': '전공', 'area': '전공선택', 'required_credits': 36.0, 'completed_credits': completed_major,
+         'missing_credits': 36.0 - completed_major, 'is_fulfilled': completed_major >= 36.0,
+         'completion_rate': round(completed_major / 36.0 * 100, 2)},
+    ]
+    return {
+        'student_info': {'student_id': '2021026017', 'name': '홍길동'},
+        'analysis_date': '2025-11-30T01:00:00',
+        'requirements_analysis': rows,
+        'total_completed_credits': 6.0 + completed_major,
+        'missing_requirements': [r for r in rows if not r['is_fulfilled']],
+        'recommendations': recommendations,
+    }
+
+
+def test_patch_roundtrip_and_small_delta():
+    old = to_document(_analysis(27.0, ['전공선택 9.0학점 부족']))
+    new = to_document(_analysis(36.0, []))
+    patch = diff_documents(old, new)
+    assert apply_patch(copy.deepcopy(old), patch) == new
+    assert diff_documents(new, new) is None
+    assert len(encode_payload(patch)) < len(encode_payload(new))
+
+
+def test_replay_reconstructs_every_snapshot_from_keyframe():
+    docs = [to_document(_analysis(c, ['추천'] * int((36 - c) // 3))) for c in (18.0, 21.0, 24.0, 36.0)]
+    rows = [{'seq': 1, 'is_keyframe': True, 'payload': encode_payload(docs[0])}]
+    for i in range(1, len(docs)):
+        rows.append({'seq': i + 1, 'is_keyframe': False,
+                     'payload': encode_payload(diff_documents(docs[i - 1], docs[i]))})
+
+    restored = [doc for _, doc in replay(rows)]
+    assert restored == docs
+    assert requirement_progress(restored[-1])[1]['is_fulfilled'] is True
+
+
+class _RecordingCursor:
+    def __init__(self, inserted):
+        self.inserted = inserted
+
+    def execute(self, query, params=()):
+        self.inserted.append(params)
+
+    def close(self):
+        pass
+
+
+def test_append_restarts_with_keyframe_when_history_cannot_be_replayed():
+    inserted = []
+    connection = type('Connection', (), {'cursor': lambda self, **kwargs: _RecordingCursor(inserted)})()
+    store = AnalysisHistoryStore(connection)
+    store._latest_row = lambda student_id, for_update=False: {'seq': 3, 'keyframe_seq': 2}
+    # 키프레임 없이 델타로 시작하는 손상된 이력
+    store._fetch_range = lambda student_id, start, end: [
+        {'seq': 2, 'is_keyframe': False, 'payload': encode_payload({'a': 1})}]
+
+    assert store.append('2021026017', _analysis(36.0, [])) == 4
+    student_id, seq, keyframe_seq, is_keyframe = inserted[0][:4]
+    assert (seq, keyframe_seq, is_keyframe) == (4, 4, True)
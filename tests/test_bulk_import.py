@@ -0,0 +1,101 @@
+import zipfile
+
+import pytest
+
+from bulk_import import BulkImporter, BulkImportError, BulkImportJobs, normalize_student_id, report_members
+
+STUDENTS = {
+    'reports/report_a.xlsx': '20210001',
+    'reports/report_b.xlsx': '20210002',
+    'reports/report_c.xlsx': '20210001',
+}
+
+
+def fake_parse(zip_path, name):
+    if name.endswith('report_bad.xlsx'):
+        raise ValueError('손상된 시트')
+    if name.endswith('report_noid.xlsx'):
+        return {'file': name, 'error': '성적표에서 학번을 찾을 수 없습니다.'}
+    return {'file': name, 'sha256': 'x', 'student_id': STUDENTS[name], 'personal_info': {'학과': '경영정보학과'},
+            'course_records': [{'교과목명': '회계원리'}], 'warnings': []}
+
+
+class RecordingImporter(BulkImporter):
+    def save_all(self, zip_path, parsed):
+        self.saved_ids = [r['student_id'] for r in parsed]
+        for result in parsed:
+            self._update(result['file'], 'saved')
+        return parsed
+
+    def analyze_all(self, saved):
+        for result in saved:
+            self._update(result['file'], 'analyzed', completion_rate=50.0)
+
+
+def _zip(path, names):
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name in names:
+            archive.writestr(name, b'PK')
+    return str(path)
+
+
+def test_report_members_filters_entries(tmp_path):
+    path = _zip(tmp_path / 'in.zip', ['reports/report_b.xlsx', 'reports/report_a.xlsx', 'readme.txt',
+                                      '__MACOSX/reports/._report_a.xlsx', 'reports/'])
+    names, skipped = report_members(path)
+    assert names == ['reports/report_a.xlsx', 'reports/report_b.xlsx']
+    assert [s['file'] for s in skipped] == ['readme.txt']
+
+    with pytest.raises(BulkImportError):
+        report_members(_zip(tmp_path / 'empty.zip', ['notes.txt']))
+    (tmp_path / 'broken.zip').write_bytes(b'not a zip')
+    with pytest.raises(BulkImportError):
+        report_members(str(tmp_path / 'broken.zip'))
+
+
+def test_bad_files_do_not_abort_batch(tmp_path):
+    path = _zip(tmp_path / 'in.zip', list(STUDENTS) + ['reports/report_bad.xlsx', 'reports/report_noid.xlsx'])
+    events = []
+    importer = RecordingImporter({}, workers=1, parse=fake_parse,
+                                 progress=lambda files, summary: events.append(summary['stage']))
+    summary = importer.run(path)
+
+    assert importer.saved_ids == ['20210001', '20210002']
+    assert summary['stage'] == 'done'
+    assert summary['counts'] == {'analyzed': 2, 'failed': 3}
+    files = importer.files
+    assert files['reports/report_c.xlsx']['error'].startswith('학번 20210001')
+    assert files['reports/report_bad.xlsx']['error'] == '파싱 실패: 손상된 시트'
+    assert files['reports/report_a.xlsx']['completion_rate'] == 50.0
+    assert events[0] == 'parsing' and events[-1] == 'done' and 'analyzing' in events
+
+
+def test_normalize_student_id():
+    assert normalize_student_id(' 2021123456 ') == '2021123456'
+    assert normalize_student_id(2021123456.0) == '2021123456'
+    assert normalize_student_id('홍길동') is None
+    assert normalize_student_id(None) is None
+
+
+def test_job_status_rejects_unknown_ids(tmp_path):
+    jobs = BulkImportJobs(str(tmp_path), {})
+    assert jobs.status('../secret') is None
+    assert jobs.status('0' * 32) is None
+
+
+def test_job_whose_process_is_gone_is_marked_error(tmp_path):
+    import subprocess
+    import sys
+
+    jobs = BulkImportJobs(str(tmp_path), {})
+    job_id = 'a' * 32
+    jobs._write_status(job_id, {'job_id': job_id, 'summary': {'stage': 'saving'}, 'files': []})
+    (tmp_path / f'{job_id}.zip').write_bytes(b'PK')
+    finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+    finished.wait()
+    (tmp_path / f'{job_id}.pid').write_text(str(finished.pid))
+
+    status = jobs.status(job_id)
+    assert status['summary']['stage'] == 'error'
+    assert jobs.status(job_id)['summary']['stage'] == 'error'
+    assert not (tmp_path / f'{job_id}.zip').exists()
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('mysql.connector')
+
+from cohort_engine import RequirementPlan, aggregate_cohort, course_frame, evaluate_cohort  # noqa: E402
+from graduation_requirements_checker import GraduationRequirementsChecker  # noqa: E402
+
+COMPARED_FIELDS = (
+    'requirements_analysis', 'total_completed_credits', 'total_required_credits', 'overall_completion_rate',
+    'missing_requirements', 'liberal_arts_detail', 'major_detail', 'general_elective_detail',
+    'liberal_arts_cap', 'liberal_arts_overflow', 'gsin_basic_detail', 'liberal_arts_allocation',
+)
+
+REQUIREMENTS = [
+    {'category': '교양', 'area': '개신기초교양', 'sub_area': '의사소통', 'required_credits': 12, 'max_credits': None},
+    {'category': '교양', 'area': '개신기초교양', 'sub_area': '영어', 'required_credits': 3, 'max_credits': None},
+    {'category': '교양', 'area': '교양총계', 'required_credits': 30, 'max_credits': 45},
+    {'category': '교양', 'area': '일반교양', 'required_credits': 6, 'max_credits': 9},
+    {'category': '교양', 'area': '확대교양', 'required_credits': 3, 'max_credits': None},
+    {'category': '교양', 'area': '', 'required_credits': 2, 'max_credits': None},
+    {'category': '전공', 'area': '전공선택', 'required_credits': 30, 'max_credits': None},
+    {'category': '전공', 'area': '전공필수', 'required_credits': 24, 'max_credits': None},
+    {'category': '졸업', 'area': '졸업이수학점', 'required_credits': 130, 'max_credits': None},
+]
+# 영역 없는 교양 행이 없으면 해당 학점은 교양 영역에 배분된다
+ALLOCATING_REQUIREMENTS = [r for r in REQUIREMENTS if not (r['category'] == '교양' and not r['area'])] + [
+    {'category': '교양', 'area': 'OCU기타', 'required_credits': 4, 'max_credits': 3},
+]
+
+AREAS = [
+    ('교양', '개신기초교양'), ('교양', '일반교양'), ('교양', '확대교양'), ('교양', 'OCU기타'),
+    ('교양', '자연과학'), ('교양', ''), ('교양', None), ('전공', '전공선택'), ('전공', '전공필수'),
+    ('다전공', ''), ('다전공', '다전공'), ('일선', ''), ('자유선택', '기타'),
+]
+SUB_AREAS = ['인성과비판적사고', '의사소통', ' 영어 ', '정보문해', '', None]
+GRADES = ['A+', 'B0', 'C-', 'F', 'NP', 'P', None, '']
+COMPLETION_TYPES = [None, '', '교양', '전필', '이수']
+
+
+class InMemoryChecker(GraduationRequirementsChecker):
+    def __init__(self, students, courses, requirements, recognition):
+        super().__init__(db_config=None)
+        self.students = {s['student_id']: s for s in students}
+        self.courses = courses
+        self.requirements = requirements
+        self.recognition = recognition
+
+    def get_student_info(self, student_id):
+        return dict(self.students[student_id])
+
+    def get_student_courses(self, student_id):
+        return [dict(c) for c in self.courses if c['student_id'] == student_id]
+
+    def get_graduation_requirements(self, department, admission_year):
+        return [dict(r) for r in self.requirements]
+
+    def get_major_elective_recognition(self, department, admission_year):
+        return self.recognition
+
+    def get_requirement_snapshot(self, department, admission_year, requirements):
+        return None
+
+    def get_curriculum_courses(self, department, admission_year):
+        return []
+
+    def _save_analysis_result(self, student_id, analysis_result):
+        pass
+
+
+def _synthetic_cohort(count, seed):
+    rng = random.Random(seed)
+    students, courses = [], []
+    for i in range(count):
+        sid = f'2021{i:04d}'
+        students.append({
+            'student_id': sid, 'department': '경영학과', 'admission_date': '2021-03-01',
+            'major_required_credits': rng.choice([None, 0, 12.0, 24.0, 27.0]),
+            'major_elective_credits': rng.choice([None, 15.0, 30.0, 36.0]),
+            'general_elective_credits': rng.choice([None, 0, 3.0, 7.5]),
+        })
+        for j in range(rng.randint(0, 40)):
+            category, area = rng.choice(AREAS)
+            courses.append({
+                'student_id': sid, 'course_code': rng.choice(['GEN101', 'X100', 'MAJ200', None]),
+                'course_name': f'과목{j}', 'category': category, 'area': area,
+                'sub_area': rng.choice(SUB_AREAS), 'grade': rng.choice(GRADES),
+                'completion_type': rng.choice(COMPLETION_TYPES), 'credit': rng.choice([0, 1, 1.5, 2, 3, 3]),
+                'is_passed': rng.choice([None, None, True, False]),
+            })
+    return students, courses
+
+
+def test_cohort_engine_matches_per_student_analyzer():
+    students, courses = _synthetic_cohort(120, seed=7)
+    recognition = {'rules': [], 'courses': [{'course_code': 'X100 '}]}
+
+    for requirements in (REQUIREMENTS, ALLOCATING_REQUIREMENTS):
+        checker = InMemoryChecker(students, courses, requirements, recognition)
+        expected = {s['student_id']: checker.analyze_graduation_status(s['student_id'])
+                    for s in students}
+
+        # 범주형 열(load_cohort_frames)과 일반 object 열 입력 모두 같은 결과
+        for courses_df in (course_frame(courses), pd.DataFrame(courses)):
+            result = evaluate_cohort(RequirementPlan(requirements),
+                                     aggregate_cohort(pd.DataFrame(students), courses_df, {'X100'}))
+            for student in students:
+                actual = result.analysis_for(student['student_id'])
+                for field in COMPARED_FIELDS:
+                    assert actual.get(field) == expected[student['student_id']].get(field), \
+                        (student['student_id'], field)
+
+
+def test_requirement_status_excludes_display_rows():
+    students, courses = _synthetic_cohort(10, seed=3)
+    credits = aggregate_cohort(pd.DataFrame(students), pd.DataFrame(courses))
+    status = evaluate_cohort(RequirementPlan(REQUIREMENTS), credits).requirement_status()
+
+    assert ('교양', '개신기초교양(총합)') in status
+    assert status[('교양', '개신기초교양(총합)')]['required_credits'] == 12.0
+    assert not any(label in status for label in [('교양', 'OCU기타'), ('일선', '일선'), ('다전공', '다전공')])
+    assert all(len(entry['fulfilled']) == 10 for entry in status.values())
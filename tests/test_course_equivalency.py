@@ -0,0 +1,87 @@
+import pytest
+
+from course_equivalency import EquivalencyCache, build_canonical_map
+
+ROWS = [
+    {'equivalence_group': 'G1', 'course_code': 'MIS101', 'effective_from': None, 'effective_to': None},
+    {'equivalence_group': 'G1', 'course_code': 'BUS101 ', 'effective_from': None, 'effective_to': None},
+    # 다른 그룹과 코드를 공유하면 두 그룹이 하나로 묶인다
+    {'equivalence_group': 'G2', 'course_code': 'BUS101', 'effective_from': None, 'effective_to': None},
+    {'equivalence_group': 'G2', 'course_code': 'ACC205', 'effective_from': 2020, 'effective_to': None},
+    {'equivalence_group': 'G3', 'course_code': 'MIS300', 'effective_from': None, 'effective_to': 2019},
+    {'equivalence_group': 'G3', 'course_code': 'MIS310', 'effective_from': None, 'effective_to': None},
+]
+
+
+def test_canonical_map_merges_groups_transitively_within_effective_years():
+    mapping = build_canonical_map(ROWS, 2021)
+    assert {mapping.canonical(c) for c in ('MIS101', ' BUS101', 'ACC205')} == {'ACC205'}
+    # 2019년까지만 유효한 코드는 2021학번에게 동등처리되지 않음
+    assert mapping.canonical('MIS300') == 'MIS300'
+    assert mapping.canonical('MIS310') == 'MIS310'
+    assert mapping.canonical('UNKNOWN') == 'UNKNOWN'
+
+    old = build_canonical_map(ROWS, 2018)
+    assert old.canonical('ACC205') == 'ACC205'
+    assert old.canonical('MIS101') == old.canonical('BUS101') == 'BUS101'
+    assert old.canonical('MIS310') == 'MIS300'
+
+
+class _FakeCursor:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def execute(self, query, params):
+        self.owner.queries += 1
+
+    def fetchall(self):
+        return ROWS
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.queries = 0
+
+    def cursor(self, dictionary=False):
+        return _FakeCursor(self)
+
+
+def test_cache_loads_department_once_until_expired_or_invalidated():
+    now = [0.0]
+    cache = EquivalencyCache(ttl_seconds=60, clock=lambda: now[0])
+    connection = _FakeConnection()
+
+    first = cache.get(connection, '경영정보학과', 2021)
+    assert cache.get(connection, '경영정보학과', 2021) is first
+    cache.get(connection, '경영정보학과', 2018)
+    assert connection.queries == 1
+
+    now[0] = 61
+    cache.get(connection, '경영정보학과', 2021)
+    assert connection.queries == 2
+    cache.invalidate('경영정보학과')
+    cache.get(connection, '경영정보학과', 2021)
+    assert connection.queries == 3
+
+
+def test_recommendations_skip_courses_passed_under_equivalent_code():
+    pytest.importorskip('mysql.connector')
+    from graduation_requirements_checker import GraduationRequirementsChecker
+    from recommendation_index import RecommendationIndex
+
+    checker = GraduationRequirementsChecker(db_config=None)
+    equivalency = build_canonical_map(ROWS, 2021)
+    passed = checker._collect_passed_course_codes(
+        [{'course_code': 'MIS101', 'grade': 'A0', 'credit': 3}], equivalency)
+    curriculum = [
+        {'course_code': 'ACC205', 'course_name': '회계원리', 'required_type': '전필', 'credit': 3},
+        {'course_code': 'MIS310', 'course_name': '데이터베이스', 'required_type': '전필', 'credit': 3},
+    ]
+    missing = [{'category': '전공', 'area': '전공필수', 'missing_credits': 3}]
+    messages, _ = checker._generate_recommendations(missing, RecommendationIndex(curriculum, equivalency), passed)
+    recommendations = ' '.join(messages)
+    assert '데이터베이스' in recommendations
+    assert '회계원리' not in recommendations
@@ -0,0 +1,92 @@
+from course_planner import CoursePlanner, next_term_from_semester, parse_offered_terms, parse_prerequisites
+
+CURRICULUM = [
+    {'course_code': 'MIS101', 'course_name': '경영정보개론', 'required_type': '전필', 'grade_year': 1, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS201', 'course_name': '데이터베이스', 'required_type': '전필', 'grade_year': 2, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS301', 'course_name': '시스템분석', 'required_type': '전필', 'grade_year': 3, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS401', 'course_name': '캡스톤디자인', 'required_type': '전필', 'grade_year': 4, 'term': 2, 'credits': 3},
+    {'course_code': 'MIS210', 'course_name': '프로그래밍', 'required_type': '전선', 'grade_year': 2, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS220', 'course_name': '경영통계', 'required_type': '전선', 'grade_year': 2, 'term': 2, 'credits': 3},
+    {'course_code': 'MIS320', 'course_name': '데이터마이닝', 'required_type': '전선', 'grade_year': 3, 'term': 2, 'credits': 3},
+]
+RECOMMENDED = [
+    {'category': '전공', 'area': '전공필수', 'course_code': 'MIS201', 'course_name': '데이터베이스', 'credit': 3,
+     'prerequisite': 'MIS101', 'semester_offered': '1학기'},
+    {'category': '전공', 'area': '전공필수', 'course_code': 'MIS301', 'course_name': '시스템분석', 'credit': 3,
+     'prerequisite': 'MIS201, MIS999', 'semester_offered': '연중'},
+    {'category': '전공', 'area': '전공필수', 'course_code': 'MIS401', 'course_name': '캡스톤디자인', 'credit': 3,
+     'prerequisite': '시스템분석', 'semester_offered': '2학기'},
+    {'category': '전공', 'area': '전공선택', 'course_code': 'MIS320', 'course_name': '데이터마이닝', 'credit': 3,
+     'prerequisite': 'MIS220 및 MIS210', 'semester_offered': None},
+]
+
+
+def _schedule(plan):
+    return [[c['course_code'] for c in term['courses']] for term in plan['terms']]
+
+
+def test_parsers():
+    assert parse_prerequisites('MIS101, MIS102 / 회계원리 또는 경영학원론') == ['MIS101', 'MIS102', '회계원리', '경영학원론']
+    assert parse_offered_terms('2학기') == frozenset({2})
+    assert parse_offered_terms('연중') == parse_offered_terms(None) == frozenset({1, 2})
+    assert next_term_from_semester('6') == 1
+    assert next_term_from_semester('5학기') == 2
+
+
+def test_plan_respects_prerequisites_offerings_and_cap():
+    planner = CoursePlanner(CURRICULUM, RECOMMENDED)
+    missing = [
+        {'category': '전공', 'area': '전공필수', 'missing_credits': 9},
+        {'category': '전공', 'area': '전공선택', 'missing_credits': 3},
+        {'category': '교양', 'area': '일반교양', 'missing_credits': 3},
+    ]
+    plan = planner.plan(missing, {'MIS101'}, credit_cap=6, start_term=1)
+
+    # 전필 사슬 MIS201(1학기 개설) → MIS301 → MIS401(2학기 개설)이 학기 수를 결정
+    assert _schedule(plan) == [['MIS201', 'MIS210'], ['MIS301'], [], ['MIS401']]
+    assert [term['term'] for term in plan['terms']] == [1, 2, 1, 2]
+    assert plan['semesters_needed'] == plan['lower_bound_semesters'] == 4
+    assert plan['unmet_requirements'] == [{'category': '교양', 'area': '일반교양', 'missing_credits': 3.0}]
+    assert plan['unresolved_prerequisites'] == {'MIS301': ['MIS999']}
+
+
+def test_plan_adds_unpassed_prerequisites_and_waits_for_offered_term():
+    planner = CoursePlanner(CURRICULUM, RECOMMENDED)
+    plan = planner.plan([{'category': '전공', 'area': '전공필수', 'missing_credits': 3}], set(),
+                        credit_cap=18, start_term=2)
+
+    # 선수과목 없는 MIS101이 먼저 선택되어 부족분 3학점을 채운다
+    assert _schedule(plan) == [['MIS101']]
+    plan = planner.plan([{'category': '전공', 'area': '전공필수', 'missing_credits': 6}], set(),
+                        credit_cap=18, start_term=2)
+    # 1학기에만 개설되는 MIS201은 선수과목 MIS101 다음 1학기로 배치
+    assert _schedule(plan) == [['MIS101'], ['MIS201']]
+    assert plan['terms'][1]['term'] == 1
+    assert plan['unscheduled'] == []
+
+
+def test_cyclic_prerequisites_do_not_hang():
+    recommended = [
+        {'category': '전공', 'area': '전공선택', 'course_code': 'A', 'course_name': 'A', 'credit': 3, 'prerequisite': 'B'},
+        {'category': '전공', 'area': '전공선택', 'course_code': 'B', 'course_name': 'B', 'credit': 3, 'prerequisite': 'A'},
+    ]
+    planner = CoursePlanner([], recommended)
+    assert planner.cycles
+    plan = planner.plan([{'category': '전공', 'area': '전공선택', 'missing_credits': 6}], set())
+    assert sorted(code for term in _schedule(plan) for code in term) == ['A', 'B']
+
+
+def test_long_prerequisite_chain_does_not_recurse():
+    import sys
+
+    length = sys.getrecursionlimit() + 500
+    curriculum = [{'course_code': f'C{i:05d}', 'course_name': f'과목{i}', 'required_type': '전필', 'credits': 3}
+                  for i in range(length)]
+    recommended = [{'category': '전공', 'area': '전공필수', 'course_code': f'C{i:05d}', 'credit': 3,
+                    'prerequisite': f'C{i - 1:05d}' if i else None} for i in range(length)]
+    planner = CoursePlanner(curriculum, recommended)
+    assert len(planner._closure[f'C{length - 1:05d}']) == length - 1
+
+    plan = planner.plan([{'category': '전공', 'area': '전공필수', 'missing_credits': 3 * length}], set(),
+                        max_terms=2)
+    assert plan['lower_bound_semesters'] == length
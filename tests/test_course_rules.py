@@ -0,0 +1,18 @@
+from course_rules import category_area_key, course_category_area, is_passed, is_passed_course
+
+
+def test_passing_grades_and_fail_safes():
+    assert is_passed('a0', None, 3)
+    assert is_passed('', '이수', 3)
+    assert is_passed(None, '교양필수', 3)
+    assert not is_passed(None, '교양필수', 0)
+    assert is_passed(None, None, 2)
+    assert not is_passed('F', None, 3)
+    assert not is_passed('NP', '', 3)
+
+
+def test_category_area_key_matches_analyzer_keys():
+    assert category_area_key('교양', '일반교양') == '교양_일반교양'
+    assert category_area_key('교양', None) == '교양'
+    assert course_category_area({'category': '전공', 'area': ''}) == '전공'
+    assert is_passed_course({'grade': 'P', 'completion_type': None, 'credit': 1})
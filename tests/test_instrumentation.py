@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip('flask')
+from flask import Flask
+
+import instrumentation
+from instrumentation import (
+    MetricsRegistry, _wrap_execute, fingerprint, init_app, merge_snapshots, phase, registry, render_text
+)
+
+
+class FakeCursor:
+    def execute(self, operation, params=None):
+        return None
+
+
+FakeCursor.execute = _wrap_execute(FakeCursor.execute)
+
+
+def _histogram(name, **labels):
+    wanted = tuple(sorted(labels.items()))
+    for hist_name, hist_labels, entry in registry.snapshot()['histograms']:
+        if hist_name == name and tuple(hist_labels) == wanted:
+            return entry
+    return None
+
+
+def test_fingerprint_normalizes_values_and_in_lists():
+    a = fingerprint("SELECT * FROM users WHERE user_id = '2021001' AND id IN (1, 2, 3)")
+    b = fingerprint("SELECT * FROM users\n WHERE user_id = %s AND id IN (%s, %s)")
+    assert a == b == "SELECT * FROM users WHERE user_id = ? AND id IN (?+)"
+    assert fingerprint(b"SELECT  1\n FROM dual") == "SELECT ? FROM dual"
+
+
+def test_render_text_merges_worker_snapshots():
+    first, second = MetricsRegistry(), MetricsRegistry()
+    first.observe('http_request_duration_seconds', {'route': '/a'}, 0.02)
+    second.observe('http_request_duration_seconds', {'route': '/a'}, 3.0)
+    second.inc('http_slow_requests_total', {'route': '/a'})
+    text = render_text(merge_snapshots([first.snapshot(), second.snapshot()]))
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'http_request_duration_seconds_bucket{route="/a",le="0.025"} 1' in text
+    assert 'http_request_duration_seconds_bucket{route="/a",le="+Inf"} 2' in text
+    assert 'http_request_duration_seconds_count{route="/a"} 2' in text
+    assert 'http_slow_requests_total{route="/a"} 1' in text
+
+
+def test_request_records_route_queries_and_phases(monkeypatch):
+    monkeypatch.delenv('METRICS_DIR', raising=False)
+    monkeypatch.setattr(instrumentation, 'SLOW_REQUEST_SECONDS', 0.0)
+    app = Flask(__name__)
+    init_app(app)
+
+    @app.route('/items/<int:item_id>')
+    def item(item_id):
+        cursor = FakeCursor()
+        with phase('analyze'):
+            for _ in range(3):
+                cursor.execute("SELECT name FROM items WHERE id = %s", (item_id,))
+        return 'ok'
+
+    before = _histogram('http_request_db_queries', route='/items/<int:item_id>')
+    before_count = sum(before['counts']) if before else 0
+    response = app.test_client().get('/items/7')
+    assert response.status_code == 200
+
+    queries = _histogram('http_request_db_queries', route='/items/<int:item_id>')
+    assert sum(queries['counts']) == before_count + 1
+    assert queries['sum'] >= 3
+    assert _histogram('http_request_duration_seconds', method='GET', route='/items/<int:item_id>',
+                      status='2xx') is not None
+    assert _histogram('app_phase_duration_seconds', phase='analyze') is not None
+
+
+def test_queries_outside_requests_are_not_tracked():
+    assert instrumentation._current.get() is None
+    FakeCursor().execute("SELECT 1")
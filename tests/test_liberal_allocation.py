@@ -0,0 +1,41 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from liberal_allocation import (  # noqa: E402
+    AllocationPlan, allocate_cohort, allocate_unclassified, allocation_record, unclassified_pool
+)
+
+REQUIREMENTS = [
+    {'category': '교양', 'area': '일반교양', 'required_credits': 6, 'max_credits': None},
+    {'category': '교양', 'area': '확대교양', 'required_credits': 3, 'max_credits': None},
+    {'category': '교양', 'area': '자연과학', 'required_credits': 2, 'max_credits': None},
+    {'category': '교양', 'area': 'OCU기타', 'required_credits': 6, 'max_credits': 3},
+    {'category': '교양', 'area': '개신기초교양', 'required_credits': 12, 'max_credits': None},
+    {'category': '교양', 'area': '교양총계', 'required_credits': 30, 'max_credits': 45},
+]
+
+
+def test_allocation_maximises_fulfilled_areas_regardless_of_row_order():
+    completed = {'교양': 4.0, '교양_확대교양': 1.0}
+    for requirements in (REQUIREMENTS, list(reversed(REQUIREMENTS))):
+        plan = AllocationPlan(requirements)
+        pool = unclassified_pool(plan, completed)
+        fills = allocate_unclassified(plan, completed, pool)
+        # 요건 순서대로 채우면 일반교양 4학점(충족 0개), 부족분이 작은 영역부터면 2개 충족
+        assert fills == {'교양_자연과학': 2.0, '교양_확대교양': 2.0}
+        record = allocation_record(plan, pool, fills, completed)
+        assert [a['is_fulfilled'] for a in record['allocations']] == [True, True]
+        assert record['unallocated_credits'] == 0.0
+
+
+def test_unfulfillable_capped_area_takes_leftover_last_and_pool_owned_by_plain_row():
+    plan = AllocationPlan(REQUIREMENTS)
+    assert '교양_개신기초교양' not in plan.keys
+    current = np.array([[6.0, 3.0, 2.0, 0.0], [0.0, 0.0, 0.0, 0.0]])
+    fills = allocate_cohort(plan, current, np.array([5.0, 12.0]))
+    assert fills[0].tolist() == [0.0, 0.0, 0.0, 3.0]
+    assert fills[1].tolist() == [6.0, 3.0, 2.0, 1.0]
+
+    owned = AllocationPlan(REQUIREMENTS + [{'category': '교양', 'area': '', 'required_credits': 3}])
+    assert unclassified_pool(owned, {'교양': 9.0}) == 0.0
@@ -0,0 +1,108 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from graduation_core import (  # noqa: E402
+    ADMISSION_YEAR_MISSING, evaluate_graduation, extract_admission_year, student_admission_year
+)
+from offline_snapshot import SnapshotPlans, read_snapshot, write_snapshot  # noqa: E402
+
+STUDENT = {
+    'student_id': '20210001', 'department': '경영정보학과', 'admission_date': '2021-03-01', 'semester': '6',
+    'major_required_credits': 3.0, 'major_elective_credits': 3.0, 'general_elective_credits': None,
+}
+REQUIREMENTS = [
+    {'category': '교양', 'area': '일반교양', 'required_credits': Decimal('6'), 'max_credits': None},
+    {'category': '전공', 'area': '전공필수', 'required_credits': Decimal('6'), 'max_credits': None},
+    {'category': '전공', 'area': '전공선택', 'required_credits': Decimal('6'), 'max_credits': None},
+    {'category': '졸업', 'area': '졸업이수학점', 'required_credits': Decimal('18'), 'max_credits': None},
+]
+COURSES = [
+    {'student_id': '20210001', 'course_code': 'GEN101', 'course_name': '글쓰기', 'category': '교양',
+     'area': '일반교양', 'sub_area': '', 'credit': 3, 'grade': 'A0', 'completion_type': None},
+    {'student_id': '20210001', 'course_code': 'MIS101', 'course_name': '경영정보개론', 'category': '전공',
+     'area': '전공필수', 'sub_area': '', 'credit': 3, 'grade': 'B+', 'completion_type': None},
+]
+CURRICULUM = [
+    {'course_code': 'MIS101', 'course_name': '경영정보개론', 'required_type': '전필', 'grade_year': 1, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS201', 'course_name': '데이터베이스', 'required_type': '전필', 'grade_year': 2, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS220', 'course_name': '경영통계', 'required_type': '전선', 'grade_year': 2, 'term': 2, 'credits': 3},
+]
+
+
+def _snapshot():
+    return {
+        'format': 1,
+        'exported_at': '2024-01-01T00:00:00',
+        'plans': {'경영정보학과|2021': {
+            'department': '경영정보학과', 'admission_year': 2021, 'requirements': REQUIREMENTS,
+            'recognition': {'rules': [], 'courses': []}, 'curriculum': CURRICULUM,
+        }},
+        'departments': {'경영정보학과': {
+            'recommended': [], 'equivalencies': [
+                {'equivalence_group': 1, 'course_code': 'MIS101', 'effective_from': 2019, 'effective_to': None,
+                 'updated_at': date(2024, 1, 1)},
+                {'equivalence_group': 1, 'course_code': 'BA101', 'effective_from': 2019, 'effective_to': None,
+                 'updated_at': date(2024, 1, 1)},
+            ],
+        }},
+    }
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / 'snapshot.json.gz')
+    write_snapshot(_snapshot(), path)
+    snapshot = read_snapshot(path)
+    plan = snapshot['plans']['경영정보학과|2021']
+    assert plan['requirements'][0]['required_credits'] == 6.0
+    assert snapshot['departments']['경영정보학과']['equivalencies'][0]['updated_at'] == '2024-01-01'
+
+    bad = tmp_path / 'bad.json'
+    bad.write_text('{"format": 99}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        read_snapshot(str(bad))
+
+
+def test_snapshot_analysis_matches_core(tmp_path):
+    path = str(tmp_path / 'snapshot.json')
+    write_snapshot(_snapshot(), path)
+    plans = SnapshotPlans(read_snapshot(path))
+    assert plans.keys() == ['경영정보학과|2021']
+
+    result = plans.analyze(dict(STUDENT), [dict(c) for c in COURSES])
+    expected = evaluate_graduation(dict(STUDENT), [dict(c) for c in COURSES],
+                                   [dict(r, required_credits=float(r['required_credits'])) for r in REQUIREMENTS],
+                                   {'rules': [], 'courses': []})
+    for key in ('total_completed_credits', 'overall_completion_rate', 'missing_requirements'):
+        assert result[key] == expected[key]
+    # 호출자의 경고 목록은 결과에 복사되어 분석 중 추가되는 경고로 바뀌지 않는다
+    warnings = ['parser_used: zip']
+    evaluate_graduation(dict(STUDENT), [], [dict(r, required_credits=float(r['required_credits'])) for r in REQUIREMENTS],
+                        {'rules': [], 'courses': []}, parsing_warnings=warnings)['parsing_warnings'].append('추가')
+    assert warnings == ['parser_used: zip']
+    inputs = plans.get('경영정보학과', 2021)
+    assert inputs is plans.get('경영정보학과', 2021)
+    assert inputs[2].equivalency.canonical('MIS101') == 'BA101'
+
+    missing = plans.analyze(dict(STUDENT, department='컴퓨터공학과'), [])
+    assert 'error' in missing
+
+    # 입학일자가 없으면 임의 연도로 분석하지 않고 오류
+    no_year = plans.analyze(dict(STUDENT, admission_date=None), [dict(c) for c in COURSES])
+    assert no_year == {'error': ADMISSION_YEAR_MISSING}
+    # 저장된 admission_year 컬럼이 있으면 그 값을 사용
+    stored = plans.analyze(dict(STUDENT, admission_date=None, admission_year=2021), [dict(c) for c in COURSES])
+    assert stored['total_completed_credits'] == result['total_completed_credits']
+
+
+def test_admission_year_matches_sql_year():
+    assert extract_admission_year(date(2021, 3, 2)) == 2021
+    assert extract_admission_year('2019-03-01') == 2019
+    assert extract_admission_year(' 2018.03.02') == 2018
+    assert extract_admission_year('') is None
+    assert extract_admission_year(None) is None
+    assert student_admission_year({'admission_year': 2022, 'admission_date': '2021-03-01'}) == 2022
+    assert student_admission_year({'admission_year': None, 'admission_date': date(2020, 3, 1)}) == 2020
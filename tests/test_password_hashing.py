@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+pytest.importorskip('bcrypt')
+
+from password_hashing import (  # noqa: E402
+    HashQueueFull, LoginMetrics, PasswordHasher, hash_cost, queue_capacity
+)
+
+
+def test_hash_verify_and_rehash_to_configured_cost():
+    old = PasswordHasher(rounds=4)
+    hashed = old.hash('secret123')
+    assert hash_cost(hashed) == 4
+    assert old.verify('secret123', hashed)
+    assert not old.verify('wrong', hashed)
+    assert not old.needs_rehash(hashed)
+
+    hasher = PasswordHasher(rounds=5)
+    assert hasher.needs_rehash(hashed)
+    saved = []
+    done = threading.Event()
+    assert hasher.rehash_later('secret123', lambda h: (saved.append(h), done.set()))
+    assert done.wait(5)
+    assert hash_cost(saved[0]) == 5 and hasher.verify('secret123', saved[0])
+    assert hasher.metrics()['counts']['rehash'] == 1
+
+
+def test_queue_limit_rejects_instead_of_waiting():
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_queue=1)
+    release = threading.Event()
+    blocked = [hasher.submit('hash', release.wait) for _ in range(2)]
+    with pytest.raises(HashQueueFull):
+        hasher.hash('secret123')
+    metrics = hasher.metrics()
+    assert metrics['counts']['rejected'] == 1
+    assert metrics['running'] + metrics['queue_depth'] == 2
+
+    release.set()
+    for future in blocked:
+        future.result(5)
+    assert hasher.verify('secret123', hasher.hash('secret123'))
+
+
+def test_timeout_on_saturated_pool_is_reported_as_queue_full():
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_queue=4, timeout=0.05)
+    release = threading.Event()
+    blocked = hasher.submit('hash', release.wait)
+    with pytest.raises(HashQueueFull):
+        hasher.verify('secret123', '$2b$04$' + 'a' * 53)
+    assert hasher.metrics()['counts']['timeout'] == 1
+    release.set()
+    blocked.result(5)
+
+
+def test_cancelled_timeouts_release_their_queue_slots():
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_queue=5, timeout=0.05)
+    release = threading.Event()
+    blocked = hasher.submit('hash', release.wait)
+    for _ in range(3):
+        with pytest.raises(HashQueueFull):
+            hasher.hash('secret123')
+    release.set()
+    blocked.result(5)
+    hasher._executor.submit(lambda: None).result(5)
+    assert hasher._in_flight == 0
+    assert hasher.metrics()['queue_depth'] == 0
+
+
+def test_queue_capacity_keeps_worst_case_wait_within_timeout():
+    workers, timeout, hash_seconds = 2, 10.0, 0.25
+    queue = queue_capacity(workers, timeout, hash_seconds)
+    assert (workers + queue) / workers * hash_seconds <= timeout
+    assert queue_capacity(1, timeout, 20.0) == 0
+
+
+def test_login_metrics_snapshot():
+    metrics = LoginMetrics()
+    for seconds in (0.1, 0.2, 0.3):
+        metrics.observe(seconds, 'success')
+    metrics.observe(0.05, 'busy')
+    snapshot = metrics.snapshot()
+    assert snapshot['outcomes'] == {'success': 3, 'busy': 1}
+    assert snapshot['latency']['count'] == 4 and snapshot['latency']['max_ms'] == 300.0
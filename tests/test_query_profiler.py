@@ -0,0 +1,68 @@
+import json
+
+from query_profiler import QueryProfiler, plan_findings, read_report, static_findings
+
+PLAN = {
+    'query_block': {
+        'select_id': 1,
+        'ordering_operation': {
+            'using_filesort': True,
+            'nested_loop': [
+                {'table': {'table_name': 's', 'access_type': 'ALL', 'possible_keys': ['idx_admission_date'],
+                           'rows_examined_per_scan': 1200}},
+                {'table': {'table_name': 'ga', 'access_type': 'eq_ref', 'possible_keys': ['PRIMARY'],
+                           'key': 'PRIMARY'}},
+            ]
+        }
+    }
+}
+
+
+class FakeExplainProfiler(QueryProfiler):
+    def __init__(self, report_path, **kwargs):
+        super().__init__(threshold=0.1, report_path=report_path, db_config={'host': 'test'}, background=False,
+                         **kwargs)
+        self.explained = []
+
+    def _explain(self, sql, params):
+        self.explained.append((sql, params))
+        return PLAN
+
+
+def test_static_findings_flag_function_wrapped_columns():
+    sql = "SELECT * FROM students s WHERE YEAR(s.admission_date) = %s AND s.department = %s"
+    assert static_findings(sql) == ['function_on_column:YEAR(s.admission_date)']
+    assert static_findings("SELECT YEAR(admission_date) AS y FROM students") == []
+
+
+def test_plan_findings_report_scans_and_filesort():
+    assert plan_findings(PLAN) == ['filesort', 'full_scan:s(1200 rows)', 'index_not_used:s']
+
+
+def test_slow_statement_explained_once_per_fingerprint(tmp_path):
+    report = str(tmp_path / 'slow.jsonl')
+    profiler = FakeExplainProfiler(report)
+    profiler.observe("SELECT * FROM students WHERE department = 'A'", None, 0.01)
+    profiler.observe("SELECT * FROM students WHERE department = %s", ('B',), 0.5)
+    profiler.observe("SELECT * FROM students WHERE department = %s", ('C',), 0.7)
+
+    assert profiler.explained == [("SELECT * FROM students WHERE department = %s", ('B',))]
+    [top] = profiler.top()
+    assert (top['count'], top['slow_count'], top['max_ms']) == (3, 2, 700.0)
+
+    entries = read_report(report)
+    assert len(entries) == 1 and 'plan' not in entries[0]
+    assert entries[0]['findings'] == ['filesort', 'full_scan:s(1200 rows)', 'index_not_used:s']
+    with open(report, encoding='utf-8') as f:
+        assert json.loads(f.readline())['plan'] == PLAN
+
+    # 다른 워커(새 프로파일러)도 이미 보고서에 있는 지문은 다시 기록하지 않음
+    FakeExplainProfiler(report).observe("SELECT * FROM students WHERE department = %s", ('D',), 0.9)
+    assert len(read_report(report)) == 1
+
+
+def test_inserts_are_not_explained(tmp_path):
+    profiler = FakeExplainProfiler(str(tmp_path / 'slow.jsonl'))
+    profiler.observe("INSERT INTO logs (message) VALUES (%s)", ('x',), 0.5)
+    assert profiler.explained == []
+    assert read_report(profiler.report_path)[0]['findings'] == []
@@ -0,0 +1,80 @@
+from reanalysis_scheduler import format_change_summary
+
+
+def test_summary_keeps_net_change_per_area():
+    summary = format_change_summary([
+        {'action': 'update', 'category': '전공', 'area': '전공선택', 'before_credits': 30, 'required_credits': 33},
+        {'action': 'update', 'category': '전공', 'area': '전공선택', 'before_credits': 33, 'required_credits': 36},
+        {'action': 'delete', 'category': '교양', 'area': '확대교양', 'required_credits': 3},
+    ])
+    assert summary.splitlines() == ['- 수정: 전공 전공선택 30학점 → 36학점', '- 삭제: 교양 확대교양']
+
+
+class FakePendingDb:
+    """reanalysis_pending 대기열과 GET_LOCK만 흉내 내는 연결"""
+
+    def __init__(self):
+        self.rows = []
+        self.locked = False
+
+    def cursor(self):
+        return FakePendingCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakePendingCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, query, params=()):
+        db = self.db
+        if 'GET_LOCK' in query:
+            self.result = [(0,)] if db.locked else [(1,)]
+            db.locked = True
+        elif 'RELEASE_LOCK' in query:
+            db.locked = False
+            self.result = [(1,)]
+        elif query.lstrip().startswith('INSERT'):
+            db.rows.append({'id': len(db.rows) + 1, 'key': (params[0], params[1]), 'change': params[2]})
+        elif 'MAX(id)' in query:
+            keys = {}
+            for row in db.rows:
+                keys[row['key']] = max(keys.get(row['key'], 0), row['id'])
+            self.result = [(k[0], k[1], last) for k, last in keys.items()]
+        elif query.lstrip().startswith('SELECT change_data'):
+            self.result = [(r['change'],) for r in db.rows if r['key'] == (params[0], params[1]) and r['id'] <= params[2]]
+        elif query.lstrip().startswith('DELETE'):
+            db.rows = [r for r in db.rows if not (r['key'] == (params[0], params[1]) and r['id'] <= params[2])]
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+def test_shared_queue_coalesces_edits_from_any_worker():
+    from reanalysis_scheduler import SharedReanalysisScheduler
+
+    db, runs = FakePendingDb(), []
+    # 서로 다른 워커의 스케줄러가 같은 대기열을 공유
+    workers = [SharedReanalysisScheduler(lambda: db, lambda d, y, c: runs.append((d, y, c))) for _ in range(2)]
+    workers[0].schedule('경영학과', 2021, {'action': 'update', 'area': '전공선택'})
+    workers[1].schedule('경영학과', 2021, {'action': 'delete', 'area': '일반교양'})
+
+    db.locked = True  # 다른 워커가 처리 중이면 건너뜀
+    assert workers[1].drain(force=True) == 0
+    db.locked = False
+    assert workers[1].drain(force=True) == 1
+    assert [(d, y, [c['action'] for c in changes]) for d, y, changes in runs] == \
+        [('경영학과', 2021, ['update', 'delete'])]
+    assert db.rows == [] and workers[0].drain(force=True) == 0
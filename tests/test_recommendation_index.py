@@ -0,0 +1,67 @@
+import pytest
+
+from course_equivalency import build_canonical_map
+from recommendation_index import RecommendationIndex, RecommendationIndexCache
+
+CURRICULUM = [
+    {'course_code': 'MIS401', 'course_name': '캡스톤디자인', 'required_type': '전선', 'grade_year': 4, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS101', 'course_name': '경영정보개론', 'required_type': '전필', 'grade_year': 1, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS310', 'course_name': '데이터베이스', 'required_type': '전선', 'grade_year': 3, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS900', 'course_name': '특강', 'required_type': '전선', 'grade_year': None, 'term': None, 'credits': 1},
+    {'course_code': 'MIS210', 'course_name': '프로그래밍', 'required_type': '전선', 'grade_year': 2, 'term': 2, 'credits': 3},
+    {'course_code': 'MIS205', 'course_name': '경영통계', 'required_type': '전선', 'grade_year': 2, 'term': 1, 'credits': 3},
+]
+
+
+def test_candidates_follow_grade_term_order_and_skip_passed_equivalents():
+    equivalency = build_canonical_map([
+        {'equivalence_group': 'G', 'course_code': 'MIS210'},
+        {'equivalence_group': 'G', 'course_code': 'CS110'},
+    ])
+    index = RecommendationIndex(CURRICULUM, equivalency)
+
+    names = [c['course_name'] for c in index.candidates('전선')]
+    assert names == ['경영통계', '프로그래밍', '데이터베이스', '캡스톤디자인', '특강']
+
+    passed = index.passed_mask({equivalency.canonical('CS110'), 'MIS310', 'UNKNOWN'})
+    assert [c['course_code'] for c in index.candidates('전선', passed, limit=2)] == ['MIS205', 'MIS401']
+    assert index.count('전선', passed) == 3
+    assert index.count('전선', passed, excluded=True) == 2
+    assert index.candidates('전필', passed)[0]['course_code'] == 'MIS101'
+
+
+def test_cache_reuses_index_per_department_and_year():
+    now = [0.0]
+    cache = RecommendationIndexCache(ttl_seconds=10, clock=lambda: now[0])
+    builds = []
+
+    def loader():
+        builds.append(1)
+        return RecommendationIndex(CURRICULUM)
+
+    first = cache.get('경영정보학과', 2021, loader)
+    assert cache.get('경영정보학과', 2021, loader) is first
+    cache.get('경영정보학과', 2022, loader)
+    assert len(builds) == 2
+    cache.invalidate('경영정보학과')
+    cache.get('경영정보학과', 2021, loader)
+    assert len(builds) == 3
+
+
+def test_checker_returns_structured_recommendations():
+    pytest.importorskip('mysql.connector')
+    from graduation_requirements_checker import GraduationRequirementsChecker
+
+    checker = GraduationRequirementsChecker(db_config=None)
+    missing = [
+        {'category': '전공', 'area': '전공선택', 'missing_credits': 6},
+        {'category': '교양', 'area': '일반교양', 'missing_credits': 3},
+    ]
+    messages, structured = checker._generate_recommendations(missing, RecommendationIndex(CURRICULUM), {'MIS205'})
+
+    assert messages[0].startswith('전공선택 6.0학점 부족: 추천 과목 → 2학년|프로그래밍')
+    assert structured[0]['courses'][0] == {
+        'course_code': 'MIS210', 'course_name': '프로그래밍', 'required_type': '전선',
+        'grade_year': 2, 'term': 2, 'credits': 3.0,
+    }
+    assert structured[1] == {'category': '교양', 'area': '일반교양', 'missing_credits': 3.0, 'courses': []}
@@ -0,0 +1,57 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('mysql.connector')
+
+from requirement_impact import (  # noqa: E402
+    CohortCredits, apply_changes, compare_evaluations, evaluate_requirements, students_with_flips
+)
+
+
+def _cohort():
+    return CohortCredits(
+        ['s1', 's2', 's3'],
+        ['교양_일반교양', '교양_개신기초교양'],
+        np.array([[6.0, 12.0], [3.0, 9.0], [9.0, 12.0]]),
+        np.array([24.0, 21.0, 24.0]),
+        np.array([36.0, 30.0, 27.0]),
+        np.zeros(3),
+    )
+
+
+def _requirements():
+    return [
+        {'id': 1, 'category': '교양', 'area': '개신기초교양', 'required_credits': 12, 'max_credits': None},
+        {'id': 2, 'category': '교양', 'area': '일반교양', 'required_credits': 6, 'max_credits': None},
+        {'id': 3, 'category': '전공', 'area': '전공선택', 'required_credits': 30, 'max_credits': None},
+        {'id': 4, 'category': '졸업', 'area': '졸업이수학점', 'required_credits': 130, 'max_credits': None},
+    ]
+
+
+def test_update_reports_flips_per_area():
+    cohort = _cohort()
+    current = _requirements()
+    proposed = apply_changes(current, [{'action': 'update', 'id': 3, 'required_credits': 33}], '경영학과', 2021)
+    before = evaluate_requirements(cohort, current)
+    after = evaluate_requirements(cohort, proposed)
+
+    assert ('졸업', '졸업이수학점') not in before
+    assert before[('교양', '개신기초교양(총합)')]['fulfilled'].tolist() == [True, False, True]
+    impact = {(e['category'], e['area']): e for e in compare_evaluations(before, after)}
+    assert impact[('전공', '전공선택')]['newly_unfulfilled'] == 1
+    assert impact[('교양', '일반교양')]['status'] == 'unchanged'
+    assert students_with_flips(before, after, len(cohort)) == 1
+
+
+def test_delete_and_create_count_as_removed_and_added():
+    cohort = _cohort()
+    current = _requirements()
+    proposed = apply_changes(current, [
+        {'action': 'delete', 'id': 2},
+        {'action': 'create', 'category': '교양', 'area': '확대교양', 'required_credits': 3},
+    ], '경영학과', 2021)
+    impact = {(e['category'], e['area']): e for e in compare_evaluations(
+        evaluate_requirements(cohort, current), evaluate_requirements(cohort, proposed))}
+    assert impact[('교양', '일반교양')]['status'] == 'removed'
+    assert impact[('교양', '일반교양')]['newly_fulfilled'] == 1
+    assert impact[('교양', '확대교양')]['newly_unfulfilled'] == 3
@@ -0,0 +1,121 @@
+from decimal import Decimal
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from requirement_import import (
+    RequirementImportError, apply_diff, current_frame, diff_requirements, normalize_frame,
+)
+
+WORKBOOK = pd.DataFrame({
+    '입학연도': [2021, '2021', 2021, 2022, None, 2021],
+    '학과': ['경영정보학과', ' 경영정보학과 ', '경영정보학과', '경영정보학과', '경영정보학과', '경영정보학과'],
+    '카테고리': ['전공', '교양', '교양', '전공', '전공', '전공'],
+    '영역': ['전공필수', '개신기초교양', '일반교양', '전공필수', '전공선택', '전공선택'],
+    '세부영역': [None, '의사소통', '', None, None, None],
+    '최저이수학점': [21, 3, 9, 24, 30, None],
+    '상한학점': [None, None, 15, None, None, None],
+})
+
+DB_ROWS = [
+    {'id': 1, 'department': '경영정보학과', 'admission_year': 2021, 'category': '전공', 'area': '전공필수',
+     'sub_area': None, 'required_credits': Decimal('21.0'), 'max_credits': None, 'description': '관리자 메모',
+     'is_active': 1},
+    {'id': 2, 'department': '경영정보학과', 'admission_year': 2021, 'category': '교양', 'area': '개신기초교양',
+     'sub_area': '의사소통', 'required_credits': Decimal('3.0'), 'max_credits': None, 'description': None,
+     'is_active': 1},
+    {'id': 3, 'department': '경영정보학과', 'admission_year': 2021, 'category': '교양', 'area': '일반교양',
+     'sub_area': None, 'required_credits': Decimal('6.0'), 'max_credits': Decimal('15.0'), 'description': None,
+     'is_active': 1},
+    {'id': 4, 'department': '경영정보학과', 'admission_year': 2021, 'category': '전공', 'area': '전공심화',
+     'sub_area': None, 'required_credits': Decimal('12.0'), 'max_credits': None, 'description': None,
+     'is_active': 1},
+    {'id': 5, 'department': '컴퓨터공학과', 'admission_year': 2021, 'category': '전공', 'area': '전공필수',
+     'sub_area': None, 'required_credits': Decimal('30.0'), 'max_credits': None, 'description': None,
+     'is_active': 1},
+]
+
+
+class FakeConnection:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self.committed = self.rolled_back = False
+
+    def cursor(self, dictionary=False):
+        return self
+
+    def executemany(self, query, params):
+        if self.fail:
+            raise RuntimeError('deadlock')
+        self.calls.append((query.split()[0], list(params)))
+
+    def close(self):
+        pass
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def test_normalize_frame_drops_invalid_rows():
+    frame = normalize_frame(WORKBOOK)
+    assert len(frame) == 4
+    assert list(frame['admission_year']) == [2021, 2021, 2021, 2022]
+    assert frame.loc[1, 'department'] == '경영정보학과'
+    assert frame.loc[2, 'sub_area'] is None
+    assert frame.loc[2, 'description'] == '최저이수학점: 9.0, 상한학점: 15.0'
+
+    with pytest.raises(RequirementImportError):
+        normalize_frame(pd.DataFrame({'학과': ['경영정보학과']}))
+
+
+def test_diff_only_reports_changed_rows_and_cohorts():
+    diff = diff_requirements(normalize_frame(WORKBOOK), current_frame(DB_ROWS))
+    assert list(diff.inserts['admission_year']) == [2022]
+    assert list(diff.updates['id']) == [3]
+    assert diff.updates.loc[0, 'before_credits'] == 6.0
+    assert diff.deletes.empty and diff.unchanged == 2
+    assert diff.changed_cohorts == {('경영정보학과', 2021), ('경영정보학과', 2022)}
+    change = diff.changes_by_cohort()[('경영정보학과', 2021)][0]
+    assert change == {'action': 'update', 'category': '교양', 'area': '일반교양', 'sub_area': None,
+                      'required_credits': 9.0, 'before_credits': 6.0}
+
+    pruned = diff_requirements(normalize_frame(WORKBOOK), current_frame(DB_ROWS), prune=True)
+    assert list(pruned.deletes['id']) == [4]
+
+
+def test_duplicate_db_rows_with_null_sub_area_are_reported():
+    # 유니크 키가 NULL sub_area를 막지 못해 생긴 같은 요건의 중복 행
+    rows = DB_ROWS + [dict(DB_ROWS[2], id=6, required_credits=Decimal('9.0'))]
+    diff = diff_requirements(normalize_frame(WORKBOOK), current_frame(rows))
+    assert list(diff.duplicates['id']) == [6]
+    assert list(diff.updates['id']) == [3] and diff.deletes.empty
+    assert diff.summary()['duplicates'] == 1
+
+    pruned = diff_requirements(normalize_frame(WORKBOOK), current_frame(rows), prune=True)
+    assert sorted(pruned.deletes['id']) == [4, 6]
+
+
+def test_unchanged_workbook_is_a_noop():
+    incoming = normalize_frame(WORKBOOK)
+    rows = [dict(r, id=i, required_credits=Decimal(str(r['required_credits'])),
+                 max_credits=None if pd.isna(r['max_credits']) else Decimal(str(r['max_credits'])))
+            for i, r in enumerate(incoming.to_dict('records'), start=1)]
+    diff = diff_requirements(incoming, current_frame(rows), prune=True)
+    assert diff.is_empty and diff.changed_cohorts == set()
+
+    connection = FakeConnection()
+    assert apply_diff(connection, diff) == {}
+    assert connection.calls == [] and not connection.committed
+
+
+def test_apply_rolls_back_on_error():
+    diff = diff_requirements(normalize_frame(WORKBOOK), current_frame(DB_ROWS))
+    connection = FakeConnection(fail=True)
+    with pytest.raises(RuntimeError):
+        apply_diff(connection, diff)
+    assert connection.rolled_back and not connection.committed
@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from requirement_versions import ensure_snapshot, fingerprint_requirements, is_stale, normalize_requirements
+
+
+def _rows():
+    return [
+        {'id': 1, 'category': '전공', 'area': '전공필수', 'sub_area': None, 'required_credits': Decimal('24.0'),
+         'max_credits': None, 'is_active': 1, 'description': '전필', 'updated_at': '2025-01-01'},
+        {'id': 2, 'category': '교양', 'area': '일반교양', 'sub_area': None, 'required_credits': Decimal('6.0'),
+         'max_credits': Decimal('40.0'), 'is_active': 1, 'description': None, 'updated_at': '2025-01-01'},
+    ]
+
+
+def test_fingerprint_ignores_order_and_bookkeeping_columns():
+    rows = _rows()
+    reordered = [dict(rows[1], id=9, updated_at='2025-06-01'), dict(rows[0], description='전공필수 과목')]
+    assert fingerprint_requirements(rows) == fingerprint_requirements(reordered)
+
+    changed = [dict(rows[0], required_credits=Decimal('27.0')), rows[1]]
+    assert fingerprint_requirements(rows) != fingerprint_requirements(changed)
+    assert normalize_requirements(rows)[0]['required_credits'] == 6.0
+
+
+class FakeSnapshotCursor:
+    def __init__(self, db):
+        self.db = db
+        self.lastrowid = None
+        self.row = None
+
+    def execute(self, query, params=None):
+        self.db.queries.append(query)
+        if query.lstrip().startswith('INSERT'):
+            self.db.snapshots.append({'id': len(self.db.snapshots) + 1, 'version': params[2], 'fingerprint': params[3]})
+            self.lastrowid = len(self.db.snapshots)
+        else:
+            self.row = dict(self.db.snapshots[-1]) if self.db.snapshots else None
+
+    def fetchone(self):
+        return self.row
+
+    def close(self):
+        pass
+
+
+class FakeSnapshotDb:
+    def __init__(self):
+        self.snapshots = []
+        self.queries = []
+
+    def cursor(self, dictionary=False):
+        return FakeSnapshotCursor(self)
+
+
+def test_unchanged_requirements_are_checked_without_locking():
+    db = FakeSnapshotDb()
+    first = ensure_snapshot(db, '경영학과', 2021, _rows(), source='analyzer')
+    assert first['created'] and first['version'] == 1
+    assert sum('FOR UPDATE' in q for q in db.queries) == 1
+
+    db.queries.clear()
+    again = ensure_snapshot(db, '경영학과', 2021, list(reversed(_rows())), source='analyzer')
+    assert again == {'id': first['id'], 'version': 1, 'created': False}
+    assert len(db.queries) == 1 and 'FOR UPDATE' not in db.queries[0]
+
+    changed = ensure_snapshot(db, '경영학과', 2021, [dict(_rows()[0], required_credits=Decimal('27.0'))],
+                              source='admin')
+    assert changed['created'] and changed['version'] == 2
+
+
+def test_stale_check_is_integer_comparison():
+    assert is_stale(None, 1)
+    assert is_stale(2, 3)
+    assert not is_stale(3, 3)
+    assert not is_stale(None, None)
@@ -0,0 +1,117 @@
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('flask')
+from flask import Flask, Response, jsonify  # noqa: E402
+
+import response_utils  # noqa: E402
+from response_utils import (  # noqa: E402
+    MIN_COMPRESS_SIZE, _choose_encoding, compress_response, is_not_modified, make_etag, parse_fields_param,
+    project_analysis
+)
+
+app = Flask(__name__)
+ANALYZED_AT = datetime(2024, 3, 2, 10, 30, 15, 123456)
+HTTP_DATE = 'Sat, 02 Mar 2024 10:30:15 GMT'
+
+
+def _not_modified(headers, etag='abc', last_modified=ANALYZED_AT):
+    with app.test_request_context('/', headers=headers):
+        return is_not_modified(etag, last_modified)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    # 날짜는 일치해도 ETag가 다르면 변경된 것으로 판단
+    assert not _not_modified({'If-None-Match': '"other"', 'If-Modified-Since': HTTP_DATE})
+    assert _not_modified({'If-None-Match': '"abc"', 'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT'})
+
+
+def test_weak_etags_match():
+    assert _not_modified({'If-None-Match': 'W/"abc"'})
+    assert _not_modified({'If-None-Match': '"zzz", W/"abc"'})
+    assert _not_modified({'If-None-Match': '*'})
+    assert not _not_modified({'If-None-Match': 'W/"abd"'})
+
+
+def test_if_modified_since_ignores_sub_second_precision():
+    assert _not_modified({'If-Modified-Since': HTTP_DATE})
+    assert not _not_modified({'If-Modified-Since': HTTP_DATE}, last_modified=ANALYZED_AT + timedelta(seconds=1))
+    assert not _not_modified({'If-Modified-Since': HTTP_DATE}, last_modified=None)
+    assert not _not_modified({})
+
+
+def test_etag_is_stable_and_covers_every_part():
+    assert make_etag('a', 1, None) == make_etag('a', 1, None)
+    assert make_etag('a', 1, None) != make_etag('a', 1, 'x')
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate', 'gzip'),
+    ('br;q=1.0, gzip;q=0.5', 'br'),
+    ('br;q=0, gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('GZIP;q=0.1', 'gzip'),
+    ('gzip;q=abc', None),
+    ('', None),
+    ('identity', None),
+])
+def test_accept_encoding_parsing(monkeypatch, header, expected):
+    monkeypatch.setattr(response_utils, 'brotli', object())
+    assert _choose_encoding(header) == expected
+
+
+def test_br_is_skipped_without_brotli(monkeypatch):
+    monkeypatch.setattr(response_utils, 'brotli', None)
+    assert _choose_encoding('br, gzip') == 'gzip'
+    assert _choose_encoding('br') is None
+
+
+def _compressed(response, accept='gzip'):
+    with app.test_request_context('/', headers={'Accept-Encoding': accept}):
+        return compress_response(response)
+
+
+def test_json_is_gzipped_only_above_threshold():
+    with app.test_request_context('/'):
+        large = jsonify({'data': 'x' * MIN_COMPRESS_SIZE})
+        small = jsonify({'data': 'x'})
+    body = large.get_data()
+
+    large = _compressed(large)
+    assert large.headers['Content-Encoding'] == 'gzip'
+    assert large.headers['Content-Length'] == str(len(large.get_data()))
+    assert gzip.decompress(large.get_data()) == body
+    assert 'Accept-Encoding' in large.vary
+
+    small = _compressed(small)
+    assert 'Content-Encoding' not in small.headers
+    assert 'Accept-Encoding' in small.vary
+
+
+def test_streamed_and_non_json_responses_are_left_alone():
+    streamed = _compressed(Response((b'x' * MIN_COMPRESS_SIZE for _ in range(2)), mimetype='application/json'))
+    assert 'Content-Encoding' not in streamed.headers
+    assert streamed.is_streamed
+
+    html = _compressed(Response('x' * (MIN_COMPRESS_SIZE * 2), mimetype='text/html'))
+    assert 'Content-Encoding' not in html.headers
+
+    with app.test_request_context('/'):
+        not_modified = jsonify({'data': 'x' * MIN_COMPRESS_SIZE})
+    not_modified.status_code = 304
+    assert 'Content-Encoding' not in _compressed(not_modified).headers
+
+
+def test_fields_param_projection():
+    assert parse_fields_param(None) is None
+    assert parse_fields_param('') == []
+    assert parse_fields_param(' recommendations, unknown,recommendations,student_info') == [
+        'recommendations', 'student_info']
+
+    analysis = {'student_info': {'name': '홍길동'}, 'recommendations': ['MIS101'], 'course_plan': []}
+    assert project_analysis(analysis, None) is analysis
+    assert project_analysis(analysis, []) == {}
+    assert project_analysis(analysis, parse_fields_param('recommendations,liberal_arts_cap')) == {
+        'recommendations': ['MIS101']}
@@ -0,0 +1,13 @@
+from session_secret import load_secret_key
+
+
+def test_secret_key_is_created_once_and_reused(tmp_path, monkeypatch):
+    monkeypatch.delenv('FLASK_SECRET_KEY', raising=False)
+    path = str(tmp_path / 'instance' / 'secret_key')
+    key = load_secret_key(path)
+    assert len(key) == 64
+    assert load_secret_key(path) == key
+    assert [p.name for p in (tmp_path / 'instance').iterdir()] == ['secret_key']
+
+    monkeypatch.setenv('FLASK_SECRET_KEY', 'from-env')
+    assert load_secret_key(path) == 'from-env'
@@ -0,0 +1,136 @@
+import pytest
+
+pytest.importorskip('mysql.connector')
+flask = pytest.importorskip('flask')
+
+from datetime import datetime, timedelta  # noqa: E402
+
+from mysql.connector import Error  # noqa: E402
+
+from session_store import ServerSessionInterface, SessionStore  # noqa: E402
+
+
+class MemoryStore(SessionStore):
+    """user_sessions 대신 공유 dict를 쓰는 저장소 (DB 호출 횟수 기록)"""
+
+    def __init__(self, rows, **kwargs):
+        super().__init__({}, background=False, **kwargs)
+        self.rows = rows
+        self.fetches = 0
+        self.touches = []
+        self.down = False
+
+    def _db_fetch(self, sid):
+        self.fetches += 1
+        if self.down:
+            raise Error('Lost connection to MySQL server')
+        row = self.rows.get(sid)
+        return dict(row) if row else None
+
+    def _db_insert(self, sid, user_id, data, ip_address, user_agent, last_activity, expires_at):
+        self.rows[sid] = {'user_id': user_id, 'data': data, 'expires_at': expires_at}
+
+    def _db_update(self, sid, user_id, data, last_activity, expires_at):
+        self.rows[sid].update(user_id=user_id, data=data, expires_at=expires_at)
+
+    def _db_delete(self, sid):
+        self.rows.pop(sid, None)
+
+    def _db_touch(self, rows):
+        self.touches.extend(rows)
+        for last, expires_at, sid in rows:
+            if sid in self.rows:
+                self.rows[sid]['expires_at'] = expires_at
+
+    def _db_delete_expired(self, now):
+        expired = [sid for sid, row in self.rows.items() if row['expires_at'] < now]
+        for sid in expired:
+            del self.rows[sid]
+        return len(expired)
+
+
+def _worker(rows, **kwargs):
+    app = flask.Flask(__name__)
+    app.secret_key = 'shared-secret'
+    store = MemoryStore(rows, **kwargs)
+    app.session_interface = ServerSessionInterface(store)
+
+    @app.route('/login/<user>')
+    def login(user):
+        flask.session['user_id'] = user
+        flask.session['role'] = 'student'
+        return 'ok'
+
+    @app.route('/me')
+    def me():
+        return flask.session.get('user_id') or 'anonymous'
+
+    @app.route('/notice')
+    def notice():
+        flask.flash('login required')
+        return 'ok'
+
+    @app.route('/logout')
+    def logout():
+        flask.session.clear()
+        flask.flash('bye')
+        return 'ok'
+
+    return app, store
+
+
+def test_session_is_shared_across_workers_and_cached():
+    rows = {}
+    app_a, store_a = _worker(rows)
+    app_b, store_b = _worker(rows)
+    client = app_a.test_client()
+    client.get('/login/20210001')
+    assert len(rows) == 1
+    cookie = client.get_cookie('session').value
+    assert '20210001' not in cookie
+
+    other = app_b.test_client()
+    other.set_cookie('session', cookie)
+    for _ in range(5):
+        assert other.get('/me').data == b'20210001'
+    assert store_b.fetches == 1
+
+    store_b.flush()
+    assert len(store_b.touches) == 1
+
+    client.get('/logout')
+    assert rows == {}
+    assert client.get('/me').data == b'anonymous'
+
+
+def test_login_rotates_session_id_and_sweep_removes_expired():
+    rows = {}
+    now = [datetime(2025, 3, 1, 9, 0)]
+    app, store = _worker(rows, now=lambda: now[0], cache_seconds=0)
+    client = app.test_client()
+    client.get('/login/a')
+    first = set(rows)
+    client.get('/login/b')
+    assert set(rows) != first and len(rows) == 1
+
+    now[0] += timedelta(hours=9)
+    assert client.get('/me').data == b'anonymous'
+    store._ensure_worker()
+    assert store.sweep() == 1 and rows == {}
+
+
+def test_db_error_keeps_session_cookie():
+    rows = {}
+    app, store = _worker(rows, cache_seconds=0)
+    client = app.test_client()
+    client.get('/login/20210001')
+    cookie = client.get_cookie('session').value
+
+    store.down = True
+    assert client.get('/me').data == b'anonymous'
+    response = client.get('/notice')
+    assert 'Set-Cookie' not in response.headers
+    assert client.get_cookie('session').value == cookie and len(rows) == 1
+
+    store.down = False
+    assert client.get('/me').data == b'20210001'
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from course_planner import CoursePlanner  # noqa: E402
+from recommendation_index import RecommendationIndex  # noqa: E402
+from simulation import SimulationCache, SimulationInputs, simulate  # noqa: E402
+
+STUDENT = {
+    'student_id': '20210001', 'department': '경영정보학과', 'admission_date': '2021-03-01', 'semester': '6',
+    'major_required_credits': 3.0, 'major_elective_credits': 3.0, 'general_elective_credits': None,
+}
+REQUIREMENTS = [
+    {'category': '교양', 'area': '일반교양', 'required_credits': 6, 'max_credits': None},
+    {'category': '전공', 'area': '전공필수', 'required_credits': 6, 'max_credits': None},
+    {'category': '전공', 'area': '전공선택', 'required_credits': 6, 'max_credits': None},
+    {'category': '졸업', 'area': '졸업이수학점', 'required_credits': 18, 'max_credits': None},
+]
+COURSES = [
+    {'student_id': '20210001', 'course_code': 'GEN101', 'course_name': '글쓰기', 'category': '교양',
+     'area': '일반교양', 'sub_area': '', 'credit': 3, 'grade': 'A0', 'completion_type': None},
+    {'student_id': '20210001', 'course_code': 'MIS101', 'course_name': '경영정보개론', 'category': '전공',
+     'area': '전공필수', 'sub_area': '', 'credit': 3, 'grade': 'B+', 'completion_type': None},
+    {'student_id': '20210001', 'course_code': 'MIS210', 'course_name': '프로그래밍', 'category': '전공',
+     'area': '전공선택', 'sub_area': '', 'credit': 3, 'grade': 'A+', 'completion_type': None},
+]
+CURRICULUM = [
+    {'course_code': 'MIS101', 'course_name': '경영정보개론', 'required_type': '전필', 'grade_year': 1, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS201', 'course_name': '데이터베이스', 'required_type': '전필', 'grade_year': 2, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS210', 'course_name': '프로그래밍', 'required_type': '전선', 'grade_year': 2, 'term': 1, 'credits': 3},
+    {'course_code': 'MIS220', 'course_name': '경영통계', 'required_type': '전선', 'grade_year': 2, 'term': 2, 'credits': 3},
+]
+
+
+def _inputs(stamp=None):
+    index = RecommendationIndex(CURRICULUM)
+    return SimulationInputs(STUDENT, COURSES, REQUIREMENTS, {'rules': [], 'courses': []}, index,
+                            CoursePlanner(index.courses), stamp=stamp)
+
+
+def test_simulation_reports_diff_without_touching_inputs():
+    inputs = _inputs()
+    before = [dict(c) for c in inputs.courses]
+
+    result = simulate(inputs, add=[
+        {'course_code': 'MIS201'},
+        {'course_code': 'MIS220'},
+        {'course_name': '철학의 이해', 'category': '교양', 'area': '일반교양', 'credit': 3},
+    ])
+    diff = result['diff']
+    assert diff['graduation_ready'] == {'before': False, 'after': True}
+    assert diff['total_completed_credits'] == {'before': 9.0, 'after': 18.0}
+    assert sorted(diff['newly_fulfilled']) == ['교양_일반교양', '전공_전공선택', '전공_전공필수']
+    assert diff['semesters_needed']['before'] >= 1 and diff['semesters_needed']['after'] == 0
+    assert [c['area'] for c in result['added_courses']] == ['전공필수', '전공선택', '일반교양']
+    assert inputs.courses == before
+
+    # 전공 학점은 엑셀 고정칸(students 컬럼) 기준이므로 제외 시 그 값에서 뺀다
+    removed = simulate(inputs, remove=['MIS101'])
+    assert removed['removed_count'] == 1
+    assert [(c['requirement'], c['completed_after']) for c in removed['diff']['requirements']] == [('전공_전공필수', 0.0)]
+
+    with pytest.raises(ValueError):
+        simulate(inputs, add=[{'course_name': '학점 없음', 'category': '교양'}])
+    for add, remove in ((['MIS201'], []), ([{'course_code': 'MIS201'}, None], []), ([], [{'course_code': 'MIS101'}]),
+                        ({'course_code': 'MIS201'}, []), ([], 'MIS101')):
+        with pytest.raises(ValueError):
+            simulate(inputs, add=add, remove=remove)
+
+
+def test_simulation_latency_and_cache_stamp():
+    inputs = _inputs(stamp='2024-03-01')
+    samples = []
+    for _ in range(50):
+        started = time.perf_counter()
+        simulate(inputs, add=[{'course_code': 'MIS201'}, {'course_code': 'MIS220'}])
+        samples.append(time.perf_counter() - started)
+    assert sorted(samples)[int(len(samples) * 0.95) - 1] < 0.02
+
+    cache = SimulationCache(max_entries=1)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _inputs(stamp='2024-03-01')
+
+    cache.get('20210001', '2024-03-01', loader)
+    cache.get('20210001', '2024-03-01', loader)
+    assert len(loads) == 1
+    cache.get('20210001', '2024-04-01', loader)
+    assert len(loads) == 2
+
+
+def test_fresh_inputs_skip_stamp_check_until_ttl_or_invalidation():
+    now = [0.0]
+    cache = SimulationCache(ttl_seconds=30, clock=lambda: now[0])
+    assert cache.fresh('20210001') is None
+    inputs = cache.get('20210001', '2024-03-01', lambda: _inputs(stamp='2024-03-01'))
+    now[0] = 20.0
+    assert cache.fresh('20210001') is inputs
+    now[0] = 31.0
+    assert cache.fresh('20210001') is None
+    cache.get('20210001', '2024-03-01', lambda: None)
+    assert cache.fresh('20210001') is inputs
+    cache.invalidate('20210001')
+    assert cache.fresh('20210001') is None
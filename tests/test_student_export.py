@@ -0,0 +1,86 @@
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+import student_export
+from analysis_codec import encode_for_storage
+from student_export import HEADERS, iter_csv, iter_student_rows, iter_xlsx
+
+ANALYSIS = {
+    'overall_completion_rate': 80.0,
+    'requirements_analysis': [
+        {'category': '전공', 'area': '전공필수', 'required_credits': 21, 'completed_credits': 15,
+         'missing_credits': 6, 'is_fulfilled': False, 'completion_rate': 71.4},
+        {'category': '교양', 'area': '일반교양', 'required_credits': 9, 'completed_credits': 9,
+         'missing_credits': 0, 'is_fulfilled': True, 'completion_rate': 100.0},
+    ],
+}
+ANALYSIS['missing_requirements'] = [ANALYSIS['requirements_analysis'][0]]
+
+
+class FakeCursor:
+    """fetchmany 호출 단위로만 행을 넘기는 비버퍼 커서 흉내"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = None
+        self.fetches = 0
+
+    def execute(self, query, params):
+        self.executed = (query, params)
+
+    def fetchmany(self, size):
+        self.fetches += 1
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+def _row(student_id, analyzed=True, name='홍길동'):
+    row = {'student_id': student_id, 'name': name, 'department': '경영정보학과', 'grade': 3,
+           'admission_year': 2021, 'major': None, 'minor': None, 'double_major': None,
+           'overall_completion_rate': None, 'total_completed_credits': None, 'total_required_credits': None,
+           'analysis_date': None, 'requirement_version': None, 'analysis_result': None, 'analysis_blob': None}
+    if analyzed:
+        summary, blob, _ = encode_for_storage(ANALYSIS)
+        row.update(overall_completion_rate=Decimal('80.00'), total_completed_credits=Decimal('104.0'),
+                   total_required_credits=Decimal('130.0'), analysis_date=datetime(2025, 3, 2, 9, 30),
+                   requirement_version=2, analysis_result=summary, analysis_blob=blob)
+    return row
+
+
+def test_rows_are_fetched_in_batches_with_shortfalls(monkeypatch):
+    monkeypatch.setattr(student_export, 'FETCH_BATCH', 2)
+    cursor = FakeCursor([_row('20210001'), _row('20210002', analyzed=False), _row('20210003', name='=HYPERLINK("x")')])
+    rows = iter_student_rows(cursor, 's.department = %s', ['경영정보학과'])
+    first = next(rows)
+    assert cursor.fetches == 1
+    assert 'WHERE s.department = %s ORDER BY s.student_id' in cursor.executed[0]
+    assert first[8:] == [80.0, 104.0, 130.0, '2025-03-02 09:30:00', 2, 1, 6.0, '전공/전공필수 6학점']
+    rest = list(rows)
+    assert rest[0][13:] == [0, 0, '']
+    assert rest[1][1] == '\'=HYPERLINK("x")'
+
+
+def test_csv_streams_in_chunks(monkeypatch):
+    monkeypatch.setattr(student_export, 'CSV_ROWS_PER_CHUNK', 2)
+    rows = [[f'2021{i:04d}', '이름'] + [None] * (len(HEADERS) - 2) for i in range(5)]
+    chunks = list(iter_csv(iter(rows)))
+    assert len(chunks) == 3
+    text = b''.join(chunks).decode('utf-8-sig')
+    parsed = list(csv.reader(io.StringIO(text)))
+    assert parsed[0] == list(HEADERS)
+    assert [r[0] for r in parsed[1:]] == [f'2021{i:04d}' for i in range(5)]
+
+
+def test_xlsx_write_only_output():
+    openpyxl = pytest.importorskip('openpyxl')
+    cursor = FakeCursor([_row('20210001'), _row('20210002', analyzed=False)])
+    content = b''.join(iter_xlsx(iter_student_rows(cursor)))
+    sheet = openpyxl.load_workbook(io.BytesIO(content), read_only=True).active
+    values = [list(r) for r in sheet.iter_rows(values_only=True)]
+    assert values[0] == list(HEADERS)
+    assert values[1][0] == '20210001' and values[1][-1] == '전공/전공필수 6학점'
+    assert values[2][0] == '20210002' and values[2][13] == 0
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta
+
+from upload_archive import UploadArchive
+
+
+def _store(archive, student_id, content, name='report.xlsx'):
+    return archive.store(student_id, content, hashlib.sha256(content).hexdigest(), name)
+
+
+def _age_blobs(archive, seconds=7200):
+    past = time.time() - seconds
+    for base, _, names in os.walk(archive.blob_dir):
+        for name in names:
+            os.utime(os.path.join(base, name), (past, past))
+
+
+def test_identical_uploads_share_one_blob(tmp_path):
+    archive = UploadArchive(str(tmp_path))
+    first = _store(archive, '20210001', b'same')
+    _store(archive, '20210002', b'same')
+    _store(archive, '20210001', b'same', 'again.xlsx')
+    manifest = archive.manifest('20210001')
+    assert [(e['sha256'], e['original_name']) for e in manifest] == [(first['sha256'], 'again.xlsx')]
+    assert archive.usage()['loose_bytes'] == len(b'same')
+    assert archive.read(first['sha256']) == b'same'
+
+
+def test_retention_keeps_recent_and_analysis_source(tmp_path):
+    clock = [datetime(2025, 1, 1, 9, 0)]
+    archive = UploadArchive(str(tmp_path), keep_per_student=2, pack_after_days=30, now=lambda: clock[0])
+    entries = []
+    for i in range(5):
+        entries.append(_store(archive, '20210001', f'upload-{i}'.encode()))
+        clock[0] += timedelta(days=1)
+    _age_blobs(archive)
+
+    # 현재 분석은 두 번째 업로드 직후에 만들어졌다
+    analysis_date = datetime(2025, 1, 2, 12, 0)
+    stats = archive.compact({'20210001': analysis_date})
+    kept = [e['sha256'] for e in archive.manifest('20210001')]
+    assert kept == [entries[1]['sha256'], entries[3]['sha256'], entries[4]['sha256']]
+    assert stats['pruned_entries'] == 2 and stats['deleted_blobs'] == 2
+    assert archive.read(entries[0]['sha256']) is None
+
+    # 30일이 지나면 남은 blob은 pack으로 옮겨지고 pack에서 읽힌다
+    clock[0] += timedelta(days=40)
+    stats = archive.compact({'20210001': analysis_date})
+    assert stats['packed_blobs'] == 3
+    assert archive.usage()['loose_bytes'] == 0
+    assert archive.read(entries[4]['sha256']) == b'upload-4'
+
+    # 보존 대상에서 빠진 항목이 많아진 pack은 다시 묶인다
+    archive.keep_per_student = 1
+    stats = archive.compact()
+    assert stats['repacked'] == 1
+    assert [e['sha256'] for e in archive.manifest('20210001')] == [entries[4]['sha256']]
+    assert archive.read(entries[4]['sha256']) == b'upload-4'
+    assert archive.read(entries[1]['sha256']) is None
+    assert len([n for n in os.listdir(archive.pack_dir) if n.endswith('.zip')]) == 1
+
+
+def test_fresh_orphans_are_not_deleted(tmp_path):
+    archive = UploadArchive(str(tmp_path))
+    entry = _store(archive, '20210001', b'in-flight')
+    archive.discard('20210001', entry)
+    assert archive.compact()['deleted_blobs'] == 0
+    _age_blobs(archive)
+    assert archive.compact()['deleted_blobs'] == 1
+
+
+def test_failed_reupload_keeps_earlier_entry(tmp_path):
+    clock = [datetime(2025, 1, 1, 9, 0)]
+    archive = UploadArchive(str(tmp_path), now=lambda: clock[0])
+    original = _store(archive, '20210001', b'analysed')
+    clock[0] += timedelta(days=1)
+    retry = _store(archive, '20210001', b'analysed', 'retry.xlsx')
+    archive.discard('20210001', retry)
+    assert [(e['original_name'], e['uploaded_at']) for e in archive.manifest('20210001')] == \
+        [('report.xlsx', original['uploaded_at'])]
+
+
+def test_compaction_schedule_survives_restarts(tmp_path):
+    archive = UploadArchive(str(tmp_path))
+    assert archive.compaction_due(3600)
+    archive.compact()
+    # 새 워커(새 인스턴스)도 마지막 정리 시각을 이어받는다
+    restarted = UploadArchive(str(tmp_path))
+    assert not restarted.compaction_due(3600)
+    assert restarted.compact(min_interval=3600) == {'skipped': True}
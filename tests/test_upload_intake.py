@@ -0,0 +1,62 @@
+import hashlib
+import io
+import zipfile
+
+import pytest
+
+from upload_intake import UploadRejected, copy_limited, intake_upload
+
+
+def _xlsx(extra=None, compression=zipfile.ZIP_DEFLATED):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        archive.writestr('xl/workbook.xml', '<workbook/>')
+        for name, data in (extra or {}).items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_valid_workbook_is_hashed_while_reading():
+    content = _xlsx({'xl/worksheets/sheet1.xml': '<sheet/>' * 100})
+    intake = intake_upload(io.BytesIO(content), 1024 * 1024)
+    assert intake.content == content
+    assert intake.sha256 == hashlib.sha256(content).hexdigest()
+    assert intake.entries == 3
+
+
+@pytest.mark.parametrize('content, status', [
+    (b'', 400),
+    (b'%PDF-1.4 not a workbook', 400),
+    (b'PK\x03\x04' + b'\x00' * 100, 400),
+    (b'x' * 2048, 413),
+])
+def test_invalid_uploads_are_rejected(content, status):
+    with pytest.raises(UploadRejected) as excinfo:
+        intake_upload(io.BytesIO(content), 1024)
+    assert excinfo.value.status == status
+
+
+def test_zip_bomb_and_non_workbook_archives_are_rejected():
+    bomb = _xlsx({'xl/worksheets/sheet1.xml': b'\x00' * (8 * 1024 * 1024)})
+    assert len(bomb) < 1024 * 1024
+    with pytest.raises(UploadRejected, match='압축'):
+        intake_upload(io.BytesIO(bomb), 10 * 1024 * 1024)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', '<document/>')
+    with pytest.raises(UploadRejected, match='형식'):
+        intake_upload(io.BytesIO(buffer.getvalue()), 1024 * 1024)
+
+
+def test_copy_limited_streams_to_disk_and_removes_oversized_files(tmp_path):
+    path = str(tmp_path / 'upload.zip')
+    assert copy_limited(io.BytesIO(b'x' * 100), path, 100) == 100
+    with open(path, 'rb') as f:
+        assert f.read() == b'x' * 100
+
+    with pytest.raises(UploadRejected) as excinfo:
+        copy_limited(io.BytesIO(b'x' * 101), path, 100)
+    assert excinfo.value.status == 413
+    assert not (tmp_path / 'upload.zip').exists()
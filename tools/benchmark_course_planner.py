@@ -0,0 +1,99 @@
+"""course_planner(선수과목 DAG 학기별 계획) 속도/품질 측정.
+
+사용법:
+    python tools/benchmark_course_planner.py [--courses 300 600] [--students 500] [--cap 18] [--seed 1]
+
+- DB 없이 합성 커리큘럼(선수관계 DAG, 개설학기 포함)과 학생별 이수/부족 학점을 만들어 측정
+- 모든 계획의 선수 순서/개설학기/학기 상한 위반 여부와 학기 수 하한 달성 비율을 함께 출력
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from course_planner import CoursePlanner
+
+
+def synthetic_curriculum(count: int, rng: random.Random):
+    curriculum, recommended = [], []
+    for i in range(count):
+        code = f'C{i:04d}'
+        grade_year = min(4, 1 + i * 4 // count)
+        required_type = '전필' if rng.random() < 0.25 else '전선'
+        credits = float(rng.choice([2, 3, 3, 3]))
+        curriculum.append({
+            'course_code': code, 'course_name': f'과목{i}', 'required_type': required_type,
+            'grade_year': grade_year, 'term': rng.choice([1, 2]), 'credits': credits,
+        })
+        # 앞 학년 과목 중에서만 선수과목을 골라 DAG 유지
+        earlier = [f'C{j:04d}' for j in rng.sample(range(i), min(i, rng.choice([0, 0, 1, 1, 2, 3])))]
+        recommended.append({
+            'category': '전공', 'area': '전공필수' if required_type == '전필' else '전공선택',
+            'course_code': code, 'course_name': f'과목{i}', 'credit': credits,
+            'prerequisite': ', '.join(earlier), 'semester_offered': rng.choice(['1학기', '2학기', '연중', '연중']),
+        })
+    return curriculum, recommended
+
+
+def verify(planner: CoursePlanner, plan, passed, cap) -> int:
+    """계획 위반 건수 (선수 순서, 개설학기, 학기 상한)"""
+    violations = 0
+    finished = set(passed)
+    for term in plan['terms']:
+        codes = [c['course_code'] for c in term['courses']]
+        if term['credits'] > cap and len(codes) > 1:
+            violations += 1
+        for code in codes:
+            if term['term'] not in planner.courses[code]['offered']:
+                violations += 1
+            if any(p not in finished for p in planner.prerequisites.get(code, ())):
+                violations += 1
+        finished.update(codes)
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='학기별 이수 계획 생성 속도 측정')
+    parser.add_argument('--courses', type=int, nargs='+', default=[300, 600])
+    parser.add_argument('--students', type=int, default=500)
+    parser.add_argument('--cap', type=float, default=18.0, help='학기당 수강 상한 학점')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    for count in args.courses:
+        rng = random.Random(args.seed)
+        curriculum, recommended = synthetic_curriculum(count, rng)
+        started = time.perf_counter()
+        planner = CoursePlanner(curriculum, recommended)
+        build = time.perf_counter() - started
+
+        cases = []
+        for _ in range(args.students):
+            passed = {c['course_code'] for c in curriculum if c['grade_year'] <= rng.randint(0, 3) and rng.random() < 0.7}
+            missing = [
+                {'category': '전공', 'area': '전공필수', 'missing_credits': float(rng.choice([0, 3, 9, 15]))},
+                {'category': '전공', 'area': '전공선택', 'missing_credits': float(rng.choice([6, 15, 30, 45]))},
+            ]
+            cases.append((passed, missing, rng.choice([1, 2])))
+
+        started = time.perf_counter()
+        plans = [planner.plan(missing, passed, credit_cap=args.cap, start_term=term) for passed, missing, term in cases]
+        elapsed = time.perf_counter() - started
+
+        violations = sum(verify(planner, plan, passed, args.cap) for plan, (passed, _, _) in zip(plans, cases))
+        optimal = sum(1 for p in plans if p['semesters_needed'] <= p['lower_bound_semesters'])
+        semesters = sum(p['semesters_needed'] for p in plans) / len(plans)
+        print(f"과목 {count}개 (선수관계 {sum(len(v) for v in planner.prerequisites.values())}개): "
+              f"생성 {build * 1000:.1f}ms, 계획 {elapsed / len(plans) * 1000:.2f}ms/명, "
+              f"평균 {semesters:.1f}학기, 하한 달성 {optimal}/{len(plans)}, 위반 {violations}건")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,15 @@
+import os
+import sys
+
 import mysql.connector
 from mysql.connector import Error
 
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from course_rules import is_passed_course
+
 DB = {
     'host': '203.255.78.58',
     'port': 9003,
@@ -27,13 +36,10 @@ def main(student_id: str):
     for r in rows:
         credit = float(r.get('credit') or 0)
         total += credit
-        grade = (r.get('grade') or '').upper()
-        completion = (r.get('completion_type') or '').upper()
-        # passing heuristic same as checker
-        passing = grade in {'A+','A0','A-','B+','B0','B-','C+','C0','C-','D+','D0','P','PASS','통과','이수','합격'} or \
-                  completion in {'A+','A0','A-','B+','B0','B-','C+','C0','C-','D+','D0','P','PASS','통과','이수','합격'} or \
-                  (credit>0 and any(kw in completion for kw in ['교양','전공','일선','일반선택','전공필수','전공선택','일반교양','확대교양'])) or \
-                  (credit>0 and not grade and not completion)
+        # 분석기와 같은 통과 규칙 (저장된 is_passed와 다르면 백필 필요)
+        passing = is_passed_course(r)
+        if r.get('is_passed') is not None and bool(r['is_passed']) != passing:
+            print(f"  is_passed 불일치: {r.get('course_code')} {r.get('course_name')} (저장={r['is_passed']}, 계산={passing})")
         if passing:
             passed_total += credit
         code = (r.get('course_code') or '').strip()
@@ -0,0 +1,130 @@
+"""연도별 졸업요건 엑셀을 graduation_requirements에 직접 반영 (SQL 파일 생성/실행 대체).
+
+사용법:
+    python tools/import_graduation_requirements.py [엑셀 경로] [--dry-run] [--prune] [--reanalyze] [--output changed.json]
+
+- 엑셀을 정규화해 DB 요건과 유니크 키(학과, 입학년도, 구분, 영역, 세부영역)로 비교
+- 추가/수정(--prune 시 삭제 포함)된 행만 한 트랜잭션으로 반영하고 바뀐 학과/입학년도마다 요건 버전 스냅샷 생성
+- 바뀐 (학과, 입학년도) 목록 출력 (--output으로 JSON 저장), --reanalyze면 해당 코호트 학생만 재분석
+- 같은 엑셀을 다시 실행하면 DB에 쓰지 않고 바로 종료
+"""
+import argparse
+import json
+import os
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from requirement_import import RequirementImportError, import_requirements, read_workbook
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+
+DEFAULT_WORKBOOK = os.path.join(ROOT, '연도별 졸업요건 정리.xlsx')
+
+
+def print_diff(diff):
+    for label, frame in (('추가', diff.inserts), ('수정', diff.updates), ('삭제', diff.deletes)):
+        for row in frame.to_dict('records'):
+            target = ' '.join(str(row[c]) for c in ('category', 'area', 'sub_area') if row.get(c))
+            credits = f"{row['required_credits']:g}학점"
+            if label == '수정':
+                credits = f"{row['before_credits']:g} → {credits}"
+            print(f"  [{label}] {row['department']} {row['admission_year']} {target} {credits}")
+
+
+def print_duplicates(diff, pruned):
+    if diff.duplicates.empty:
+        return
+    print(f"같은 키로 중복된 DB 요건 {len(diff.duplicates)}행 ({'삭제 대상에 포함' if pruned else '--prune으로 삭제 가능'}):")
+    for row in diff.duplicates.to_dict('records'):
+        target = ' '.join(str(row[c]) for c in ('category', 'area', 'sub_area') if row.get(c))
+        print(f"  [중복] id={row['id']} {row['department']} {row['admission_year']} {target}")
+
+
+def reanalyze_cohort(department, admission_year):
+    from graduation_requirements_checker import analyze_student_graduation
+
+    connection = mysql.connector.connect(**db_config)
+    cursor = connection.cursor()
+    cursor.execute("SELECT student_id FROM students WHERE department = %s AND admission_year = %s",
+                   (department, admission_year))
+    student_ids = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    connection.close()
+
+    failed = 0
+    for student_id in student_ids:
+        result = analyze_student_graduation(student_id, db_config)
+        if 'error' in result:
+            failed += 1
+            print(f"    {student_id}: 분석 실패 - {result['error']}")
+    print(f"  재분석 {department} {admission_year}: {len(student_ids) - failed}/{len(student_ids)}명")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='연도별 졸업요건 엑셀 가져오기 (변경분만 반영)')
+    parser.add_argument('xlsx_path', nargs='?', default=DEFAULT_WORKBOOK)
+    parser.add_argument('--sheet', default=0, help='시트 이름 또는 번호 (기본: 첫 시트)')
+    parser.add_argument('--dry-run', action='store_true', help='비교 결과만 출력하고 반영하지 않음')
+    parser.add_argument('--prune', action='store_true', help='엑셀의 학과/입학년도에 있는데 엑셀에 없는 DB 요건 삭제')
+    parser.add_argument('--reanalyze', action='store_true', help='바뀐 학과/입학년도 학생 재분석')
+    parser.add_argument('--output', help='바뀐 (학과, 입학년도) 목록을 JSON으로 저장')
+    args = parser.parse_args()
+
+    sheet = int(args.sheet) if str(args.sheet).isdigit() else args.sheet
+    try:
+        incoming = read_workbook(args.xlsx_path, sheet)
+    except RequirementImportError as e:
+        print(f"가져오기 불가: {e}")
+        sys.exit(1)
+    print(f"엑셀 요건 {len(incoming)}행 ({args.xlsx_path})")
+
+    try:
+        connection = mysql.connector.connect(**db_config)
+    except Error as e:
+        print(f"DB 연결 실패: {e}")
+        sys.exit(1)
+    try:
+        diff = import_requirements(connection, incoming, prune=args.prune, dry_run=args.dry_run,
+                                   source='import_script')
+    except Error as e:
+        print(f"반영 실패 (롤백됨): {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+    summary = diff.summary()
+    print_duplicates(diff, args.prune)
+    if diff.is_empty:
+        print(f"변경 없음 (동일 {summary['unchanged']}행)")
+    else:
+        print_diff(diff)
+        print(f"{'반영 예정' if args.dry_run else '반영 완료'}: 추가 {summary['inserted']}, 수정 {summary['updated']}, "
+              f"삭제 {summary['deleted']}, 동일 {summary['unchanged']}")
+        print('바뀐 학과/입학년도:')
+        for cohort in summary['changed_cohorts']:
+            print(f"  {cohort['department']} {cohort['admission_year']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.reanalyze and not args.dry_run:
+        for department, admission_year in sorted(diff.changed_cohorts):
+            reanalyze_cohort(department, admission_year)
+
+
+if __name__ == '__main__':
+    main()
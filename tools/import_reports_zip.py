@@ -0,0 +1,102 @@
+"""성적표(report_*.xlsx) ZIP 일괄 가져오기.
+
+사용법:
+    python tools/import_reports_zip.py reports.zip [--workers 8] [--no-analysis] [--no-archive] [--output result.json]
+    python tools/import_reports_zip.py --job <작업ID> --job-dir instance/bulk_imports [--archive-dir uploads/archive]
+
+- 각 파일의 학번(성적표 개인정보)으로 학생을 찾아 개인정보/수강기록 저장 (계정 없으면 자동 생성)
+- 프로세스 풀에서 병렬 파싱, 모두 저장한 뒤 한 번에 졸업요건 분석
+- 파일별 진행 상황 출력, 오류 파일은 건너뛰고 마지막에 목록 출력
+- --job: 관리자 화면에서 시작한 작업 실행 (웹 서버가 별도 프로세스로 호출, 진행 상황은 <작업ID>.json)
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bulk_import import BULK_IMPORT_WORKERS, BulkImporter, BulkImportError, BulkImportJobs
+from upload_archive import UploadArchive
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+
+STATUS_LABELS = {
+    'parsed': '파싱', 'saved': '저장', 'analyzed': '분석', 'failed': '실패', 'skipped': '건너뜀',
+}
+
+
+def print_progress():
+    shown = {}
+    stage = [None]
+
+    def progress(files, summary):
+        if summary['stage'] != stage[0]:
+            stage[0] = summary['stage']
+            print(f"== {stage[0]} ({summary['elapsed_seconds']}s)")
+        for entry in files:
+            key = (entry['status'], entry.get('analysis_error'))
+            if shown.get(entry['file']) == key or entry['status'] == 'pending':
+                continue
+            shown[entry['file']] = key
+            detail = entry.get('error') or entry.get('analysis_error') or ''
+            if entry['status'] == 'analyzed':
+                detail = f"이수율 {entry.get('completion_rate')}%"
+            elif entry['status'] == 'parsed':
+                detail = f"{entry.get('student_id')} 수강기록 {entry.get('courses')}개"
+            print(f"  [{STATUS_LABELS.get(entry['status'], entry['status'])}] {entry['file']} {detail}")
+
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description='성적표 ZIP 일괄 가져오기')
+    parser.add_argument('zip_path', nargs='?')
+    parser.add_argument('--workers', type=int, default=BULK_IMPORT_WORKERS)
+    parser.add_argument('--no-analysis', action='store_true', help='저장만 하고 분석은 하지 않음')
+    parser.add_argument('--no-archive', action='store_true', help='원본 파일을 업로드 보관소에 저장하지 않음')
+    parser.add_argument('--output', help='파일별 결과를 JSON으로 저장')
+    parser.add_argument('--job', help='웹에서 시작한 일괄 가져오기 작업 ID')
+    parser.add_argument('--job-dir', default=os.path.join(ROOT, 'instance', 'bulk_imports'))
+    parser.add_argument('--archive-dir', default=os.path.join(ROOT, 'uploads', 'archive'))
+    args = parser.parse_args()
+    if not args.job and not args.zip_path:
+        parser.error('zip_path 또는 --job 이 필요합니다.')
+
+    archive = None if args.no_archive else UploadArchive(args.archive_dir)
+    if args.job:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+        jobs = BulkImportJobs(args.job_dir, db_config, archive)
+        summary = jobs.run(args.job, analyze=not args.no_analysis, workers=args.workers)
+        sys.exit(1 if summary.get('stage') == 'error' else 0)
+
+    importer = BulkImporter(db_config, archive, workers=args.workers, progress=print_progress())
+    try:
+        summary = importer.run(args.zip_path, analyze=not args.no_analysis)
+    except BulkImportError as e:
+        print(f"가져오기 불가: {e}")
+        sys.exit(1)
+
+    print(f"완료: {summary}")
+    failed = [e for e in importer.files.values() if e['status'] in ('failed', 'skipped') or e.get('analysis_error')]
+    if failed:
+        print(f"문제 파일 {len(failed)}개:")
+        for entry in failed:
+            print(f"  {entry['file']}: {entry.get('error') or entry.get('analysis_error')}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'files': list(importer.files.values())}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
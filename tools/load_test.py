@@ -0,0 +1,152 @@
+"""업로드/분석 API 처리량을 gunicorn 워커 수별로 측정하는 부하 테스트.
+
+사용법:
+    # 워커 수별로 gunicorn을 직접 띄워 측정 (프로젝트 루트에서 실행)
+    python tools/load_test.py --workers 1 2 4 --account 2021026017:비밀번호 --file 샘플파일/report.xlsx
+
+    # 이미 떠 있는 서버 측정
+    python tools/load_test.py --url http://localhost:6000 --account 2021026017:비밀번호 --file ...
+
+- 시나리오: upload(성적표 업로드+분석), analysis(분석 결과 조회), mixed(업로드 1 : 조회 4)
+- --account를 여러 개 주면 클라이언트가 돌아가며 사용 (같은 학생 업로드 경합 방지)
+- 출력: 워커 수별 처리량(req/s), p50/p95 지연, 오류 수, 워커 1개 대비 배율
+"""
+import argparse
+import itertools
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from http.cookiejar import CookieJar
+from urllib import error, parse, request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Client:
+    def __init__(self, base_url: str, username: str, password: str):
+        self.base_url = base_url.rstrip('/')
+        self.opener = request.build_opener(request.HTTPCookieProcessor(CookieJar()))
+        body = parse.urlencode({'username': username, 'password': password}).encode()
+        self.opener.open(f"{self.base_url}/login", data=body, timeout=30).read()
+
+    def call(self, path: str, data: bytes = None, headers: dict = None) -> int:
+        req = request.Request(f"{self.base_url}{path}", data=data, headers=headers or {})
+        try:
+            with self.opener.open(req, timeout=300) as resp:
+                resp.read()
+                return resp.status
+        except error.HTTPError as e:
+            return e.code
+
+    def upload(self, filename: str, content: bytes) -> int:
+        boundary = uuid.uuid4().hex
+        body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+                "Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n\r\n").encode()
+        body += content + f"\r\n--{boundary}--\r\n".encode()
+        return self.call('/api/student/upload', body, {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+
+    def analysis(self) -> int:
+        return self.call('/api/student/analysis')
+
+
+def run_load(base_url, accounts, scenario, upload_file, concurrency, duration):
+    content = open(upload_file, 'rb').read() if upload_file else None
+    filename = os.path.basename(upload_file) if upload_file else None
+    clients = [Client(base_url, *accounts[i % len(accounts)]) for i in range(concurrency)]
+    latencies, failures = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(client):
+        if scenario == 'upload':
+            steps = itertools.repeat('upload')
+        elif scenario == 'analysis':
+            steps = itertools.repeat('analysis')
+        else:
+            steps = itertools.cycle(['upload', 'analysis', 'analysis', 'analysis', 'analysis'])
+        for step in steps:
+            if time.perf_counter() >= deadline:
+                return
+            started = time.perf_counter()
+            status = client.upload(filename, content) if step == 'upload' else client.analysis()
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if status >= 400:
+                    failures[0] += 1
+
+    threads = [threading.Thread(target=worker, args=(c,)) for c in clients]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {'requests': len(latencies), 'rps': len(latencies) / wall, 'p50': pct(0.5), 'p95': pct(0.95),
+            'failures': failures[0]}
+
+
+def wait_ready(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            request.urlopen(f"{base_url}/login", timeout=2).read()
+            return True
+        except Exception:
+            time.sleep(0.5)
+    return False
+
+
+def start_server(workers, port, max_requests):
+    env = dict(os.environ, WEB_WORKERS=str(workers), PORT=str(port), WEB_MAX_REQUESTS=str(max_requests),
+               WEB_LOG_LEVEL='warning')
+    return subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', '',
+                             'main_app:app'], cwd=ROOT, env=env)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='워커 수별 업로드/분석 처리량 측정')
+    parser.add_argument('--url', help='이미 실행 중인 서버 주소 (지정 시 gunicorn을 띄우지 않음)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--port', type=int, default=6100)
+    parser.add_argument('--account', action='append', required=True, help='학생 계정 id:password (여러 번 지정 가능)')
+    parser.add_argument('--file', help='업로드할 성적표 xlsx (upload/mixed 시나리오)')
+    parser.add_argument('--scenario', choices=['upload', 'analysis', 'mixed'], default='mixed')
+    parser.add_argument('--concurrency', type=int, default=16, help='동시 클라이언트 수')
+    parser.add_argument('--duration', type=float, default=30.0, help='워커 수별 측정 시간(초)')
+    parser.add_argument('--max-requests', type=int, default=1000, help='워커 재시작 주기 (재시작 중 오류 확인용)')
+    args = parser.parse_args()
+
+    if args.scenario != 'analysis' and not args.file:
+        parser.error('upload/mixed 시나리오에는 --file 이 필요합니다.')
+    accounts = [tuple(a.split(':', 1)) for a in args.account]
+
+    targets = [(None, args.url)] if args.url else [(w, f"http://127.0.0.1:{args.port}") for w in args.workers]
+    baseline = None
+    for workers, base_url in targets:
+        server = start_server(workers, args.port, args.max_requests) if workers else None
+        try:
+            if server and not wait_ready(base_url):
+                print(f"워커 {workers}개 서버 기동 실패")
+                continue
+            result = run_load(base_url, accounts, args.scenario, args.file, args.concurrency, args.duration)
+        finally:
+            if server:
+                server.terminate()
+                server.wait(timeout=60)
+        baseline = baseline or result['rps']
+        label = f"워커 {workers}개" if workers else base_url
+        print(f"{label}: {result['requests']}건, {result['rps']:.1f} req/s (x{result['rps'] / baseline:.2f}), "
+              f"p50 {result['p50']:.0f}ms, p95 {result['p95']:.0f}ms, 오류 {result['failures']}건")
+
+
+if __name__ == '__main__':
+    main()
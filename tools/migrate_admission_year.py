@@ -0,0 +1,84 @@
+"""students에 입학년도 저장 생성 컬럼과 (department, admission_year) 인덱스를 추가하고 확인.
+
+사용법:
+    python tools/migrate_admission_year.py [--check-only]
+
+- admission_year = YEAR(admission_date) STORED 컬럼 추가 (추가 시 기존 행 자동 백필)
+- idx_department_admission_year 인덱스 추가
+- 입학일자가 없어 입학년도를 알 수 없는 학생 목록 출력 (분석 시 오류로 표시됨)
+- 학과/입학년도 조회의 실행 계획 출력 (인덱스 범위 검색인지 확인)
+"""
+import argparse
+import os
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from student_schema import COHORT_INDEX, column_exists, ensure_admission_year_column
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+
+
+def report_missing_years(cursor):
+    cursor.execute("SELECT student_id, name, department FROM students WHERE admission_year IS NULL ORDER BY student_id")
+    rows = cursor.fetchall()
+    print(f"입학년도 없음: {len(rows)}명")
+    for student_id, name, department in rows[:50]:
+        print(f"  {student_id} {name} ({department})")
+
+
+def explain_cohort_lookup(cursor):
+    cursor.execute("SELECT department, admission_year FROM students WHERE admission_year IS NOT NULL LIMIT 1")
+    sample = cursor.fetchone()
+    if not sample:
+        print('실행 계획 확인 생략: 입학년도가 있는 학생이 없습니다.')
+        return
+    cursor.execute("EXPLAIN SELECT student_id FROM students WHERE department = %s AND admission_year = %s", sample)
+    columns = [d[0] for d in cursor.description]
+    for row in cursor.fetchall():
+        plan = dict(zip(columns, row))
+        print(f"  {sample[0]} {sample[1]}: type={plan.get('type')} key={plan.get('key')} rows={plan.get('rows')}")
+        if plan.get('key') != COHORT_INDEX:
+            print(f"  ⚠️ {COHORT_INDEX} 인덱스를 사용하지 않습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='students.admission_year 생성 컬럼/인덱스 마이그레이션')
+    parser.add_argument('--check-only', action='store_true', help='변경 없이 상태만 확인')
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    try:
+        if args.check_only:
+            if not column_exists(cursor, 'students', 'admission_year'):
+                print('admission_year 컬럼이 없습니다.')
+                return
+        elif ensure_admission_year_column(cursor):
+            conn.commit()
+            print('admission_year 컬럼/인덱스 추가 완료 (기존 행 백필 포함)')
+        else:
+            print('admission_year 컬럼/인덱스가 이미 있습니다.')
+        report_missing_years(cursor)
+        explain_cohort_lookup(cursor)
+    except Error as e:
+        print('Migration error:', e)
+        conn.rollback()
+    finally:
+        cursor.close(); conn.close()
+        print('Done')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""graduation_analysis_history 테이블 생성 및 현재 분석 결과로 이력 초기화.
+
+사용법:
+    python tools/migrate_analysis_history.py [--batch-size 200] [--dry-run]
+
+- 테이블이 없으면 생성
+- 이력이 하나도 없는 학생의 graduation_analysis 최신 행을 seq=1 키프레임으로 추가
+  (배치마다 커밋, 중단 후 재실행 가능)
+"""
+import argparse
+import os
+import sys
+import json
+
+import mysql.connector
+from mysql.connector import Error
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from analysis_codec import load_stored_analysis
+from analysis_history import HISTORY_TABLE, encode_payload, to_document
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+
+CREATE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {HISTORY_TABLE} (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    student_id VARCHAR(20) NOT NULL COMMENT '학번',
+    seq INT NOT NULL COMMENT '학생별 분석 순번 (1부터)',
+    keyframe_seq INT NOT NULL COMMENT '복원 기준 키프레임 순번',
+    is_keyframe BOOLEAN NOT NULL COMMENT 'TRUE: 전체 문서, FALSE: 직전 스냅샷 대비 델타',
+    payload MEDIUMBLOB NOT NULL COMMENT '압축된 컴팩트 문서 또는 델타 (analysis_history)',
+    analysis_date DATETIME NOT NULL COMMENT '분석 실행 일시',
+    total_completed_credits DECIMAL(5,1) COMMENT '총 이수학점',
+    total_required_credits DECIMAL(5,1) COMMENT '총 필요학점',
+    overall_completion_rate DECIMAL(5,2) COMMENT '전체 이수율 (%)',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+    UNIQUE KEY unique_student_seq (student_id, seq)
+) COMMENT='졸업요건 분석 이력'
+"""
+
+
+def seed(conn, batch_size: int, dry_run: bool) -> int:
+    read_cur = conn.cursor(dictionary=True)
+    write_cur = conn.cursor()
+    last_id = 0
+    seeded = 0
+    insert_sql = (
+        f"INSERT IGNORE INTO {HISTORY_TABLE} (student_id, seq, keyframe_seq, is_keyframe, payload, "
+        "analysis_date, total_completed_credits, total_required_credits, overall_completion_rate) "
+        "VALUES (%s, 1, 1, TRUE, %s, %s, %s, %s, %s)"
+    )
+    while True:
+        read_cur.execute(
+            f"""
+            SELECT ga.id, ga.student_id, ga.analysis_date, ga.total_completed_credits,
+                   ga.total_required_credits, ga.overall_completion_rate,
+                   ga.analysis_result, ga.analysis_blob
+            FROM graduation_analysis ga
+            WHERE ga.id > %s
+              AND NOT EXISTS (SELECT 1 FROM {HISTORY_TABLE} h WHERE h.student_id = ga.student_id)
+            ORDER BY ga.id LIMIT %s
+            """,
+            (last_id, batch_size)
+        )
+        rows = read_cur.fetchall()
+        if not rows:
+            break
+        inserts = []
+        for row in rows:
+            last_id = row['id']
+            try:
+                analysis = load_stored_analysis(row)
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"  id={row['id']} 건너뜀 (본문 복원 실패: {e})")
+                continue
+            if not analysis:
+                continue
+            inserts.append((
+                row['student_id'], encode_payload(to_document(analysis)), row['analysis_date'],
+                row['total_completed_credits'], row['total_required_credits'], row['overall_completion_rate']
+            ))
+        if inserts and not dry_run:
+            write_cur.executemany(insert_sql, inserts)
+            conn.commit()
+        seeded += len(inserts)
+        print(f"  ~id {last_id}: 누적 {seeded}명 이력 초기화")
+    read_cur.close()
+    write_cur.close()
+    return seeded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='분석 이력 테이블 생성 및 초기화')
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--dry-run', action='store_true', help='대상 건수만 확인하고 저장하지 않음')
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    try:
+        if not args.dry_run:
+            print('Executing: CREATE TABLE IF NOT EXISTS', HISTORY_TABLE)
+            cursor.execute(CREATE_SQL)
+            conn.commit()
+        seeded = seed(conn, args.batch_size, args.dry_run)
+        print(f"이력 초기화: {seeded}명")
+    except Error as e:
+        print('Migration error:', e)
+        conn.rollback()
+    finally:
+        cursor.close(); conn.close()
+        print('Done')
+
+
+if __name__ == '__main__':
+    main()
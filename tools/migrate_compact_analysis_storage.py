@@ -0,0 +1,162 @@
+"""graduation_analysis.analysis_result를 압축 인코딩(analysis_blob)으로 일괄 변환.
+
+사용법:
+    python tools/migrate_compact_analysis_storage.py [--batch-size 200] [--dry-run] [--optimize]
+
+- 컬럼(analysis_blob, result_encoding)이 없으면 추가
+- analysis_blob이 비어있는 행을 id 순으로 배치 단위 재인코딩 (배치마다 커밋, 중단 후 재실행 가능)
+- 변환 전/후 본문 바이트 수와 테이블 크기(information_schema)를 출력
+"""
+import argparse
+import os
+import sys
+import json
+
+import mysql.connector
+from mysql.connector import Error
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from analysis_codec import encode_for_storage, load_stored_analysis
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+
+
+def column_exists(cursor, table: str, column: str) -> bool:
+    cursor.execute("SHOW COLUMNS FROM {} LIKE %s".format(table), (column,))
+    return cursor.fetchone() is not None
+
+
+def ensure_columns(cursor):
+    to_add = []
+    if not column_exists(cursor, 'graduation_analysis', 'analysis_blob'):
+        to_add.append("ADD COLUMN analysis_blob MEDIUMBLOB NULL COMMENT '압축 인코딩된 전체 분석 결과' AFTER analysis_result")
+    if not column_exists(cursor, 'graduation_analysis', 'result_encoding'):
+        to_add.append("ADD COLUMN result_encoding VARCHAR(16) NULL COMMENT '본문 인코딩' AFTER analysis_blob")
+    if to_add:
+        alter = f"ALTER TABLE graduation_analysis {', '.join(to_add)}"
+        print('Executing:', alter)
+        cursor.execute(alter)
+
+
+def table_size(cursor) -> dict:
+    """테이블 저장 크기와 본문 바이트 합계"""
+    cursor.execute("ANALYZE TABLE graduation_analysis")
+    cursor.fetchall()
+    cursor.execute(
+        "SELECT data_length, index_length FROM information_schema.tables "
+        "WHERE table_schema = %s AND table_name = 'graduation_analysis'",
+        (db_config['database'],)
+    )
+    data_length, index_length = cursor.fetchone()
+    cursor.execute(
+        "SELECT COUNT(*), COALESCE(SUM(LENGTH(analysis_result)), 0), COALESCE(SUM(LENGTH(analysis_blob)), 0) "
+        "FROM graduation_analysis"
+    )
+    rows, json_bytes, blob_bytes = cursor.fetchone()
+    return {
+        'rows': int(rows),
+        'data_length': int(data_length or 0),
+        'index_length': int(index_length or 0),
+        'payload_bytes': int(json_bytes or 0) + int(blob_bytes or 0),
+    }
+
+
+def print_size(label: str, size: dict):
+    print(f"[{label}] 행 {size['rows']}개, 본문 {size['payload_bytes']:,} bytes, "
+          f"데이터 {size['data_length']:,} bytes, 인덱스 {size['index_length']:,} bytes")
+
+
+def migrate(conn, batch_size: int, dry_run: bool) -> tuple:
+    """(변환 행 수, 변환 전 바이트, 변환 후 바이트)"""
+    read_cur = conn.cursor(dictionary=True)
+    write_cur = conn.cursor()
+    last_id = 0
+    converted = 0
+    before_bytes = 0
+    after_bytes = 0
+    update_sql = (
+        "UPDATE graduation_analysis SET analysis_result = %s, analysis_blob = %s, result_encoding = %s "
+        "WHERE id = %s AND analysis_blob IS NULL"
+    )
+    while True:
+        read_cur.execute(
+            "SELECT id, student_id, analysis_result, analysis_blob FROM graduation_analysis "
+            "WHERE id > %s AND analysis_blob IS NULL ORDER BY id LIMIT %s",
+            (last_id, batch_size)
+        )
+        rows = read_cur.fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            last_id = row['id']
+            try:
+                analysis = load_stored_analysis(row)
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"  id={row['id']} 건너뜀 (JSON 파싱 실패: {e})")
+                continue
+            if not analysis:
+                continue
+            summary, blob, encoding = encode_for_storage(analysis)
+            raw = row['analysis_result']
+            before_bytes += len(raw.encode('utf-8') if isinstance(raw, str) else raw)
+            after_bytes += len(summary.encode('utf-8')) + len(blob)
+            updates.append((summary, blob, encoding, row['id']))
+        if updates and not dry_run:
+            write_cur.executemany(update_sql, updates)
+            conn.commit()
+        converted += len(updates)
+        print(f"  ~id {last_id}: 누적 {converted}행 변환")
+    read_cur.close()
+    write_cur.close()
+    return converted, before_bytes, after_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='graduation_analysis 본문 압축 인코딩 마이그레이션')
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--dry-run', action='store_true', help='변환량만 측정하고 저장하지 않음')
+    parser.add_argument('--optimize', action='store_true', help='변환 후 OPTIMIZE TABLE로 공간 회수')
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    try:
+        ensure_columns(cursor)
+        conn.commit()
+        before = table_size(cursor)
+        print_size('변환 전', before)
+
+        converted, before_bytes, after_bytes = migrate(conn, args.batch_size, args.dry_run)
+        if before_bytes:
+            ratio = (1 - after_bytes / before_bytes) * 100
+            print(f"본문 {before_bytes:,} → {after_bytes:,} bytes ({ratio:.1f}% 감소, {converted}행)")
+        else:
+            print('변환할 행이 없습니다.')
+
+        if args.optimize and not args.dry_run:
+            cursor.execute("OPTIMIZE TABLE graduation_analysis")
+            cursor.fetchall()
+        after = table_size(cursor)
+        print_size('변환 후', after)
+        if before['data_length']:
+            print(f"테이블 데이터 크기 변화: {(1 - after['data_length'] / before['data_length']) * 100:.1f}% 감소")
+    except Error as e:
+        print('Migration error:', e)
+        conn.rollback()
+    finally:
+        cursor.close(); conn.close()
+        print('Done')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""course_records에 is_passed/category_area 컬럼과 인덱스를 추가하고 기존 행을 백필.
+
+사용법:
+    python tools/migrate_course_pass_flags.py [--batch-size 1000] [--all]
+
+- 컬럼/인덱스가 없으면 추가
+- is_passed가 NULL인 행을 id 순 배치로 course_rules 규칙에 따라 채움 (배치마다 커밋, 재실행 가능)
+- --all: 통과 규칙 변경 후 전체 행 재계산
+- 백필 후 student_credit_summary 뷰를 is_passed 기준으로 재생성
+"""
+import argparse
+import os
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from course_rules import category_area_key, is_passed
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+
+VIEW_SQL = """
+CREATE OR REPLACE VIEW student_credit_summary AS
+SELECT
+    s.student_id,
+    s.name,
+    s.department,
+    s.grade,
+    COUNT(cr.id) as total_courses,
+    SUM(CASE WHEN cr.is_passed THEN cr.credit ELSE 0 END) as total_credits,
+    SUM(CASE WHEN cr.category = '교양' AND cr.is_passed THEN cr.credit ELSE 0 END) as liberal_arts_credits,
+    SUM(CASE WHEN cr.category = '전공' AND cr.is_passed THEN cr.credit ELSE 0 END) as major_credits,
+    s.updated_at as last_updated
+FROM students s
+LEFT JOIN course_records cr ON s.student_id = cr.student_id
+GROUP BY s.student_id, s.name, s.department, s.grade, s.updated_at
+"""
+
+
+def column_exists(cursor, table: str, column: str) -> bool:
+    cursor.execute("SHOW COLUMNS FROM {} LIKE %s".format(table), (column,))
+    return cursor.fetchone() is not None
+
+
+def index_exists(cursor, table: str, index: str) -> bool:
+    cursor.execute("SHOW INDEX FROM {} WHERE Key_name = %s".format(table), (index,))
+    return bool(cursor.fetchall())
+
+
+def ensure_columns(cursor):
+    to_add = []
+    if not column_exists(cursor, 'course_records', 'is_passed'):
+        to_add.append("ADD COLUMN is_passed BOOLEAN NULL COMMENT '통과 여부 (수집 시 계산)' AFTER grade")
+    if not column_exists(cursor, 'course_records', 'category_area'):
+        to_add.append("ADD COLUMN category_area VARCHAR(160) NULL COMMENT '이수학점 집계 키' AFTER is_passed")
+    if not index_exists(cursor, 'course_records', 'idx_student_passed_key'):
+        to_add.append("ADD INDEX idx_student_passed_key (student_id, is_passed, category_area)")
+    if to_add:
+        alter = f"ALTER TABLE course_records {', '.join(to_add)}"
+        print('Executing:', alter)
+        cursor.execute(alter)
+
+
+def backfill(conn, batch_size: int, recompute_all: bool) -> int:
+    read_cur = conn.cursor(dictionary=True)
+    write_cur = conn.cursor()
+    last_id = 0
+    updated = 0
+    while True:
+        read_cur.execute(
+            "SELECT id, category, area, grade, completion_type, credit FROM course_records "
+            f"WHERE id > %s{'' if recompute_all else ' AND is_passed IS NULL'} ORDER BY id LIMIT %s",
+            (last_id, batch_size)
+        )
+        rows = read_cur.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+        write_cur.executemany(
+            "UPDATE course_records SET is_passed = %s, category_area = %s WHERE id = %s",
+            [(is_passed(r['grade'], r['completion_type'], r['credit']),
+              category_area_key(r['category'], r['area']), r['id']) for r in rows]
+        )
+        conn.commit()
+        updated += len(rows)
+        print(f"  ~id {last_id}: 누적 {updated}행 갱신")
+    read_cur.close()
+    write_cur.close()
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description='course_records 통과 여부/집계 키 백필')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--all', action='store_true', help='이미 채워진 행도 다시 계산')
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    try:
+        ensure_columns(cursor)
+        conn.commit()
+        updated = backfill(conn, args.batch_size, args.all)
+        print(f"백필 완료: {updated}행")
+        cursor.execute(VIEW_SQL)
+        conn.commit()
+        print('student_credit_summary 뷰 재생성 완료')
+    except Error as e:
+        print('Migration error:', e)
+        conn.rollback()
+    finally:
+        cursor.close(); conn.close()
+        print('Done')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""졸업요건 버전 스냅샷 테이블 생성 및 현재 요건으로 버전 1 초기화.
+
+사용법:
+    python tools/migrate_requirement_versions.py [--dry-run]
+
+- requirement_set_versions 테이블이 없으면 생성
+- graduation_analysis에 requirement_snapshot_id, requirement_version 컬럼 추가
+- 스냅샷이 없는 학과/입학년도마다 현재 graduation_requirements 내용으로 스냅샷 생성
+  (기존 분석 결과는 버전이 NULL이므로 '재분석 필요'로 판정됨)
+"""
+import argparse
+import os
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from requirement_versions import SNAPSHOT_TABLE, snapshot_requirements
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+
+CREATE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {SNAPSHOT_TABLE} (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '스냅샷 ID',
+    department VARCHAR(100) NOT NULL COMMENT '학과',
+    admission_year YEAR NOT NULL COMMENT '입학년도',
+    version INT NOT NULL COMMENT '학과/입학년도별 단조 증가 버전',
+    fingerprint CHAR(40) NOT NULL COMMENT '평가 컬럼 기준 요건 집합 해시',
+    requirements JSON NOT NULL COMMENT '스냅샷 시점 요건 행',
+    change_source VARCHAR(50) COMMENT '생성 경로',
+    changed_by VARCHAR(20) COMMENT '변경한 사용자 ID',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '적용 시작 시각',
+    UNIQUE KEY unique_requirement_version (department, admission_year, version)
+) COMMENT='졸업요건 버전 스냅샷'
+"""
+
+
+def column_exists(cursor, table: str, column: str) -> bool:
+    cursor.execute("SHOW COLUMNS FROM {} LIKE %s".format(table), (column,))
+    return cursor.fetchone() is not None
+
+
+def ensure_analysis_columns(cursor):
+    to_add = []
+    if not column_exists(cursor, 'graduation_analysis', 'requirement_snapshot_id'):
+        to_add.append("ADD COLUMN requirement_snapshot_id INT NULL COMMENT '평가에 사용한 졸업요건 스냅샷 ID'")
+    if not column_exists(cursor, 'graduation_analysis', 'requirement_version'):
+        to_add.append("ADD COLUMN requirement_version INT NULL COMMENT '평가에 사용한 졸업요건 버전'")
+    if to_add:
+        alter = f"ALTER TABLE graduation_analysis {', '.join(to_add)}"
+        print('Executing:', alter)
+        cursor.execute(alter)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='졸업요건 버전 스냅샷 마이그레이션')
+    parser.add_argument('--dry-run', action='store_true', help='대상 학과/입학년도만 출력')
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**db_config)
+    cursor = conn.cursor()
+    try:
+        if not args.dry_run:
+            print('Executing: CREATE TABLE IF NOT EXISTS', SNAPSHOT_TABLE)
+            cursor.execute(CREATE_SQL)
+            ensure_analysis_columns(cursor)
+            conn.commit()
+
+        cursor.execute("SELECT DISTINCT department, admission_year FROM graduation_requirements ORDER BY department, admission_year")
+        pairs = cursor.fetchall()
+        created = 0
+        for department, admission_year in pairs:
+            if args.dry_run:
+                print(f"  대상: {department} {admission_year}")
+                continue
+            snapshot = snapshot_requirements(conn, department, int(admission_year), 'migration')
+            conn.commit()
+            if snapshot['created']:
+                created += 1
+                print(f"  {department} {admission_year}: v{snapshot['version']} (id={snapshot['id']})")
+        print(f"학과/입학년도 {len(pairs)}개 중 {created}개 스냅샷 생성")
+    except Error as e:
+        print('Migration error:', e)
+        conn.rollback()
+    finally:
+        cursor.close(); conn.close()
+        print('Done')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""기존 uploads/, uploads/processed/ 의 업로드 파일을 내용 해시 기반 보관소로 옮기고 정리.
+
+사용법:
+    python tools/migrate_upload_archive.py [--dry-run] [--keep-originals] [--compact] [--keep 5] [--pack-after-days 30]
+
+- 파일명 앞부분의 학번({학번}_{시각}_{원래이름}.xlsx, processed_ 접두어 포함)으로 학생별 manifest에 등록
+- 같은 내용의 파일은 blob 하나로 합쳐짐
+- --compact: 등록 후 보존 정책(최근 N개 + 현재 분석의 원본)과 pack 압축을 바로 실행 (DB에서 분석 일시 조회)
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from upload_archive import UploadArchive
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+
+UPLOAD_FOLDER = os.path.join(ROOT, 'uploads')
+LEGACY_NAME = re.compile(r'^(?:\d{8}_\d{6}_)?(?:processed_)?(\d{6,12})_(\d{8}_\d{6})_(.+\.xlsx)$')
+
+
+def legacy_files():
+    for folder in (UPLOAD_FOLDER, os.path.join(UPLOAD_FOLDER, 'processed')):
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            match = LEGACY_NAME.match(name)
+            if match:
+                yield os.path.join(folder, name), match.group(1), match.group(2), match.group(3)
+
+
+def load_analysis_dates():
+    import mysql.connector
+    connection = mysql.connector.connect(**db_config)
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT student_id, analysis_date FROM graduation_analysis")
+        return {student_id: analysis_date for student_id, analysis_date in cursor.fetchall() if analysis_date}
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='업로드 파일을 내용 해시 보관소로 이전')
+    parser.add_argument('--dry-run', action='store_true')
+    parser.add_argument('--keep-originals', action='store_true', help='이전 후 원본 파일을 지우지 않음')
+    parser.add_argument('--compact', action='store_true', help='이전 후 보존 정책/압축 실행')
+    parser.add_argument('--keep', type=int, default=5, help='학생별 보존 개수')
+    parser.add_argument('--pack-after-days', type=int, default=30)
+    args = parser.parse_args()
+
+    migrated = 0
+    hashes = set()
+    total_bytes = 0
+    archive = None
+    for path, student_id, stamp, original_name in legacy_files():
+        with open(path, 'rb') as f:
+            content = f.read()
+        sha256 = hashlib.sha256(content).hexdigest()
+        hashes.add(sha256)
+        total_bytes += len(content)
+        migrated += 1
+        if args.dry_run:
+            continue
+        uploaded_at = datetime.strptime(stamp, '%Y%m%d_%H%M%S')
+        # manifest 업로드 일시는 파일명의 시각으로 기록
+        archive = UploadArchive(os.path.join(UPLOAD_FOLDER, 'archive'), keep_per_student=args.keep,
+                                pack_after_days=args.pack_after_days, now=lambda: uploaded_at)
+        archive.store(student_id, content, sha256, original_name)
+        if not args.keep_originals:
+            os.remove(path)
+    print(f"업로드 파일 {migrated}개 ({total_bytes:,} bytes) → 고유 내용 {len(hashes)}개")
+
+    if args.compact and not args.dry_run:
+        archive = UploadArchive(os.path.join(UPLOAD_FOLDER, 'archive'), keep_per_student=args.keep,
+                                pack_after_days=args.pack_after_days)
+        stats = archive.compact(load_analysis_dates())
+        print(f"정리: {stats}")
+        print(f"보관소 사용량: {archive.usage()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""DB 없이 요건 스냅샷 파일로 성적표(xlsx)/수강기록 덤프(json)를 일괄 분석.
+
+사용법:
+    # 1) (DB 접속 가능한 곳에서) 요건/인정규칙/커리큘럼 스냅샷 내보내기
+    python tools/offline_analysis.py export --output snapshot.json.gz [--department 경영정보학과] [--year 2021]
+
+    # 2) (오프라인) 폴더/파일 일괄 분석
+    python tools/offline_analysis.py analyze --snapshot snapshot.json.gz transcripts/ dump.json \
+        [--workers 4] [--output results.jsonl] [--department 경영정보학과] [--year 2021]
+
+- json 덤프: {"student_info": {...}, "courses": [...]} 또는 그 목록 (students/course_records 컬럼명)
+- xlsx: 업로드와 같은 파서(EnhancedXlsxParser.parse_excel_file)로 읽고 DB에는 저장하지 않음
+- --department/--year: 성적표에서 학과/입학일자를 읽지 못했을 때 사용할 값
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from offline_snapshot import SnapshotPlans, read_snapshot, write_snapshot
+
+db_config = {
+    'host': '203.255.78.58',
+    'port': 9003,
+    'database': 'graduation_system',
+    'user': 'user29',
+    'password': '123'
+}
+INPUT_SUFFIXES = ('.xlsx', '.json')
+
+_plans = None
+_defaults = {}
+
+
+def export(args):
+    from graduation_requirements_checker import GraduationRequirementsChecker
+    from offline_snapshot import export_snapshot
+
+    checker = GraduationRequirementsChecker(db_config)
+    checker.connect_db()
+    try:
+        cursor = checker.connection.cursor()
+        query = "SELECT DISTINCT department, admission_year FROM graduation_requirements WHERE 1=1"
+        params = []
+        if args.department:
+            query += " AND department = %s"
+            params.append(args.department)
+        if args.year:
+            query += " AND admission_year = %s"
+            params.append(args.year)
+        cursor.execute(query + " ORDER BY department, admission_year", params)
+        pairs = [(row[0], int(row[1])) for row in cursor.fetchall()]
+        cursor.close()
+        snapshot = export_snapshot(checker, pairs)
+    finally:
+        checker.disconnect_db()
+    write_snapshot(snapshot, args.output)
+    print(f"스냅샷 저장: {args.output} ({len(pairs)}개 학과/입학년도, {os.path.getsize(args.output):,} bytes)")
+
+
+def collect_inputs(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for base, _, names in os.walk(path):
+                files.extend(os.path.join(base, n) for n in sorted(names)
+                             if n.lower().endswith(INPUT_SUFFIXES) and not n.startswith('~$'))
+        else:
+            files.append(path)
+    return files
+
+
+def _init_worker(snapshot_path, defaults):
+    global _plans, _defaults
+    logging.disable(logging.WARNING)
+    _plans = SnapshotPlans(read_snapshot(snapshot_path))
+    _defaults = defaults
+
+
+def _with_defaults(student_info):
+    if not student_info.get('department') and _defaults.get('department'):
+        student_info['department'] = _defaults['department']
+    if not student_info.get('admission_date') and _defaults.get('year'):
+        student_info['admission_date'] = f"{_defaults['year']}-03-01"
+    return student_info
+
+
+def _load_students(path):
+    """파일 하나 → [(student_info, courses, parsing_warnings)]"""
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        entries = data if isinstance(data, list) else [data]
+        return [(dict(e.get('student_info') or {}), list(e.get('courses') or []), []) for e in entries]
+
+    from enhanced_xlsx_parser import EnhancedXlsxParser, course_record_to_row, personal_info_to_student_row
+    personal_info, course_records = EnhancedXlsxParser(db_config=None).parse_excel_file(path)
+    warnings = personal_info.pop('parsing_warnings', [])
+    student_info = personal_info_to_student_row(personal_info)
+    student_id = student_info.get('student_id') or os.path.splitext(os.path.basename(path))[0]
+    student_info['student_id'] = student_id
+    courses = [course_record_to_row(student_id, record) for record in course_records]
+    return [(student_info, courses, warnings)]
+
+
+def analyze_file(path):
+    results = []
+    try:
+        students = _load_students(path)
+    except Exception as e:
+        return [{'file': path, 'error': f"읽기 실패: {e}"}]
+    for student_info, courses, warnings in students:
+        result = _plans.analyze(_with_defaults(student_info), courses, parsing_warnings=warnings)
+        result['file'] = path
+        results.append(result)
+    return results
+
+
+def analyze(args):
+    files = collect_inputs(args.inputs)
+    if not files:
+        print('분석할 파일이 없습니다.')
+        return
+    defaults = {'department': args.department, 'year': args.year}
+    started = time.perf_counter()
+    results = []
+    if args.workers <= 1:
+        _init_worker(args.snapshot, defaults)
+        for path in files:
+            results.extend(analyze_file(path))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(args.snapshot, defaults)) as pool:
+            for file_results in pool.map(analyze_file, files, chunksize=4):
+                results.extend(file_results)
+    elapsed = time.perf_counter() - started
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+
+    failures = 0
+    for result in results:
+        if 'error' in result:
+            failures += 1
+            print(f"[오류] {result['file']}: {result['error']}")
+            continue
+        info = result.get('student_info') or {}
+        missing = ', '.join(f"{r['category']}/{r['area']} {r['missing_credits']}" for r in result['missing_requirements'])
+        print(f"{info.get('student_id')} {info.get('name') or ''} "
+              f"{result['total_completed_credits']}/{result['total_required_credits']}학점 "
+              f"({result['overall_completion_rate']}%) 부족: {missing or '없음'}")
+    print(f"분석 {len(results)}건 (오류 {failures}건), {len(files)}개 파일, {elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='요건 스냅샷 기반 오프라인 졸업요건 분석')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_export = sub.add_parser('export', help='DB에서 요건 스냅샷 내보내기')
+    p_export.add_argument('--output', required=True, help='스냅샷 파일 (.json 또는 .json.gz)')
+    p_export.add_argument('--department')
+    p_export.add_argument('--year', type=int)
+
+    p_analyze = sub.add_parser('analyze', help='스냅샷으로 성적표/덤프 일괄 분석 (DB 불필요)')
+    p_analyze.add_argument('--snapshot', required=True)
+    p_analyze.add_argument('inputs', nargs='+', help='xlsx/json 파일 또는 폴더')
+    p_analyze.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    p_analyze.add_argument('--output', help='결과 JSON Lines 파일')
+    p_analyze.add_argument('--department', help='학과를 읽지 못한 성적표에 사용할 학과')
+    p_analyze.add_argument('--year', type=int, help='입학일자를 읽지 못한 성적표에 사용할 입학년도')
+
+    args = parser.parse_args()
+    if args.command == 'export':
+        export(args)
+    else:
+        analyze(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 단일 프로세스 기준 스레드 잠금만 사용
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+KEEP_PER_STUDENT = 5
+# 이 기간이 지난 보관 파일은 묶음(pack) 압축 파일로 옮김
+PACK_AFTER_DAYS = 30
+# 살아 있는 항목 비율이 이보다 낮은 pack은 다시 묶음
+REPACK_LIVE_RATIO = 0.5
+# 방금 저장되어 아직 manifest에 반영되지 않았을 수 있는 blob은 삭제하지 않음
+ORPHAN_GRACE_SECONDS = 3600
+COMPACT_INTERVAL_SECONDS = 6 * 3600
+# 워커는 max_requests마다 재시작되므로 마지막 정리 시각(stamp 파일)을 이 간격으로 확인
+COMPACT_POLL_SECONDS = 300
+
+_thread_lock = threading.RLock()
+
+
+@contextmanager
+def file_lock(path: str, blocking: bool = True):
+    """프로세스 간 잠금 (gunicorn 워커/보관소 정리 도구 공용), 비차단 모드에서 실패하면 False"""
+    if fcntl is None:
+        acquired = _thread_lock.acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                _thread_lock.release()
+        return
+    with open(path, 'a') as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _write_atomic(path: str, data: bytes):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def retained_entries(entries: List[Dict], keep: int, analysis_date: Optional[datetime] = None) -> List[Dict]:
+    """최근 keep개 + 현재 분석 결과의 원본(분석일시 이전 마지막 업로드)"""
+    ordered = sorted(entries, key=lambda e: e['uploaded_at'])
+    kept = ordered[-keep:] if keep > 0 else []
+    if analysis_date is not None:
+        source = [e for e in ordered if _parse_time(e['uploaded_at']) <= analysis_date]
+        if source and source[-1] not in kept:
+            kept.insert(0, source[-1])
+    return kept
+
+
+class UploadArchive:
+    """업로드 성적표 보관소 (내용 해시 기반)
+
+    root/
+      blobs/ab/cd/<sha256>.xlsx   같은 내용은 한 번만 저장 (2단계 분산으로 디렉터리 크기 일정)
+      manifests/<학번>.json        학생별 업로드 목록 (해시, 원래 파일명, 업로드 일시)
+      packs/pack-*.zip, index.json 오래된 blob 묶음과 해시→pack 색인
+      locks/                      manifest/정리 작업 잠금 파일
+    """
+
+    def __init__(self, root: str, keep_per_student: int = KEEP_PER_STUDENT,
+                 pack_after_days: int = PACK_AFTER_DAYS, now: Callable[[], datetime] = datetime.now):
+        self.root = root
+        self.keep_per_student = keep_per_student
+        self.pack_after = timedelta(days=pack_after_days)
+        self.now = now
+        self.blob_dir = os.path.join(root, 'blobs')
+        self.manifest_dir = os.path.join(root, 'manifests')
+        self.pack_dir = os.path.join(root, 'packs')
+        self.pack_index_path = os.path.join(self.pack_dir, 'index.json')
+        self.lock_dir = os.path.join(root, 'locks')
+        for directory in (self.blob_dir, self.manifest_dir, self.pack_dir, self.lock_dir):
+            os.makedirs(directory, exist_ok=True)
+        self._pid = None
+
+    # --- 저장/조회 ---
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], sha256[2:4], f"{sha256}.xlsx")
+
+    def _manifest_path(self, student_id: str) -> str:
+        return os.path.join(self.manifest_dir, f"{student_id}.json")
+
+    def _lock_path(self, name: str) -> str:
+        return os.path.join(self.lock_dir, f"{name}.lock")
+
+    def manifest(self, student_id: str) -> List[Dict]:
+        path = self._manifest_path(student_id)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self, student_id: str, entries: List[Dict]):
+        path = self._manifest_path(student_id)
+        if entries:
+            _write_atomic(path, json.dumps(entries, ensure_ascii=False, indent=1).encode('utf-8'))
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def store(self, student_id: str, content: bytes, sha256: str, original_name: str) -> Dict:
+        """업로드 내용을 보관하고 manifest에 기록 (같은 내용 재업로드는 blob을 다시 쓰지 않음)
+
+        같은 내용의 이전 항목은 새 항목으로 대체되며, 반환값의 'replaced'에 담아 discard 때 되돌린다.
+        """
+        path = self.blob_path(sha256)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            _write_atomic(path, content)
+        entry = {'sha256': sha256, 'original_name': original_name, 'size': len(content),
+                 'uploaded_at': self.now().isoformat(timespec='seconds')}
+        with file_lock(self._lock_path(student_id)):
+            entries = self.manifest(student_id)
+            replaced = next((e for e in entries if e['sha256'] == sha256), None)
+            entries = [e for e in entries if e['sha256'] != sha256]
+            entries.append(entry)
+            self._write_manifest(student_id, entries)
+        return dict(entry, replaced=replaced)
+
+    def discard(self, student_id: str, stored: Dict):
+        """처리에 실패한 업로드(store 반환값)의 항목만 manifest에서 제거 (blob은 다음 정리 때 삭제)
+
+        같은 내용의 이전 업로드를 대체했으면 그 항목을 되살려 현재 분석의 원본이 보존 대상에서 빠지지 않게 한다.
+        """
+        with file_lock(self._lock_path(student_id)):
+            entries = self.manifest(student_id)
+            kept = [e for e in entries
+                    if (e['sha256'], e['uploaded_at']) != (stored['sha256'], stored['uploaded_at'])]
+            replaced = stored.get('replaced')
+            if replaced is not None and all(e['sha256'] != replaced['sha256'] for e in kept):
+                kept = sorted(kept + [replaced], key=lambda e: e['uploaded_at'])
+            if kept != entries:
+                self._write_manifest(student_id, kept)
+
+    def _pack_index(self) -> Dict[str, str]:
+        if not os.path.exists(self.pack_index_path):
+            return {}
+        with open(self.pack_index_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def read(self, sha256: str) -> Optional[bytes]:
+        path = self.blob_path(sha256)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+        pack = self._pack_index().get(sha256)
+        if pack is None:
+            return None
+        with zipfile.ZipFile(os.path.join(self.pack_dir, pack)) as archive:
+            return archive.read(f"{sha256}.xlsx")
+
+    def usage(self) -> Dict:
+        loose = sum(os.path.getsize(os.path.join(base, name))
+                    for base, _, names in os.walk(self.blob_dir) for name in names if name.endswith('.xlsx'))
+        packed = sum(os.path.getsize(os.path.join(self.pack_dir, name))
+                     for name in os.listdir(self.pack_dir) if name.endswith('.zip'))
+        return {'loose_bytes': loose, 'packed_bytes': packed, 'students': len(os.listdir(self.manifest_dir))}
+
+    # --- 보존 정책/정리 ---
+
+    def _stamp_path(self) -> str:
+        return os.path.join(self.lock_dir, '_compact.stamp')
+
+    def last_compacted(self) -> Optional[float]:
+        """마지막 정리 완료 시각 (epoch 초, 정리한 적 없으면 None)"""
+        try:
+            return os.path.getmtime(self._stamp_path())
+        except OSError:
+            return None
+
+    def compaction_due(self, interval_seconds: float = COMPACT_INTERVAL_SECONDS) -> bool:
+        last = self.last_compacted()
+        return last is None or time.time() - last >= interval_seconds
+
+    def compact(self, analysis_dates: Optional[Dict[str, datetime]] = None,
+                min_interval: Optional[float] = None) -> Dict:
+        """보존 정책 적용 → 참조 없는 blob 삭제 → 오래된 blob을 pack으로 이동 → 빈 pack 재구성
+
+        여러 프로세스가 동시에 실행하지 않도록 잠금을 잡고, 이미 실행 중이면 건너뛴다.
+        min_interval이 있으면 잠금을 잡은 뒤 마지막 정리 후 그만큼 지나지 않았을 때도 건너뛴다.
+        """
+        analysis_dates = analysis_dates or {}
+        with file_lock(self._lock_path('_compact'), blocking=False) as acquired:
+            if not acquired:
+                return {'skipped': True}
+            if min_interval is not None and not self.compaction_due(min_interval):
+                return {'skipped': True}
+            started = time.time()
+            stats = {'pruned_entries': 0, 'deleted_blobs': 0, 'packed_blobs': 0, 'repacked': 0}
+            live: Dict[str, datetime] = {}
+            for name in os.listdir(self.manifest_dir):
+                if not name.endswith('.json'):
+                    continue
+                student_id = name[:-len('.json')]
+                with file_lock(self._lock_path(student_id)):
+                    entries = self.manifest(student_id)
+                    kept = retained_entries(entries, self.keep_per_student, analysis_dates.get(student_id))
+                    if len(kept) != len(entries):
+                        stats['pruned_entries'] += len(entries) - len(kept)
+                        self._write_manifest(student_id, kept)
+                for entry in kept:
+                    uploaded_at = _parse_time(entry['uploaded_at'])
+                    live[entry['sha256']] = max(live.get(entry['sha256'], uploaded_at), uploaded_at)
+
+            index = self._pack_index()
+            pack_threshold = self.now() - self.pack_after
+            to_pack = []
+            for base, _, names in os.walk(self.blob_dir):
+                for name in names:
+                    if not name.endswith('.xlsx'):
+                        continue
+                    sha256 = name[:-len('.xlsx')]
+                    path = os.path.join(base, name)
+                    if os.path.getmtime(path) >= started - ORPHAN_GRACE_SECONDS:
+                        continue
+                    if sha256 not in live:
+                        os.remove(path)
+                        stats['deleted_blobs'] += 1
+                    elif live[sha256] < pack_threshold:
+                        to_pack.append(sha256)
+
+            # 살아 있는 항목이 적은 pack은 남은 항목을 새 pack으로 옮김
+            members: Dict[str, List[str]] = {}
+            for sha256, pack in index.items():
+                members.setdefault(pack, []).append(sha256)
+            stale_packs = []
+            for pack, shas in members.items():
+                alive = [s for s in shas if s in live]
+                if len(alive) < len(shas) * REPACK_LIVE_RATIO:
+                    stale_packs.append(pack)
+                    with zipfile.ZipFile(os.path.join(self.pack_dir, pack)) as archive:
+                        for sha256 in alive:
+                            if not os.path.exists(self.blob_path(sha256)):
+                                _write_atomic(self.blob_path(sha256), archive.read(f"{sha256}.xlsx"))
+                            to_pack.append(sha256)
+                    for sha256 in shas:
+                        index.pop(sha256, None)
+                    stats['repacked'] += 1
+            for sha256 in [s for s, pack in index.items() if s not in live]:
+                index.pop(sha256)
+
+            new_members = sorted({s for s in to_pack if s not in index})
+            if new_members:
+                pack = f"pack-{self.now().strftime('%Y%m%d%H%M%S')}-{os.getpid()}.zip"
+                tmp_path = os.path.join(self.pack_dir, f".tmp.{pack}")
+                with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+                    for sha256 in new_members:
+                        archive.write(self.blob_path(sha256), f"{sha256}.xlsx")
+                os.replace(tmp_path, os.path.join(self.pack_dir, pack))
+                for sha256 in new_members:
+                    index[sha256] = pack
+                stats['packed_blobs'] = len(new_members)
+            # 색인을 먼저 기록한 뒤 pack으로 옮긴 loose 파일/빈 pack 삭제 (중단되어도 읽기 가능)
+            _write_atomic(self.pack_index_path, json.dumps(index).encode('utf-8'))
+            for sha256 in set(to_pack):
+                path = self.blob_path(sha256)
+                if sha256 in index and os.path.exists(path) and os.path.getmtime(path) < started - ORPHAN_GRACE_SECONDS:
+                    os.remove(path)
+            referenced_packs = set(index.values())
+            for name in os.listdir(self.pack_dir):
+                if name.endswith('.zip') and not name.startswith('.tmp.') and name not in referenced_packs:
+                    os.remove(os.path.join(self.pack_dir, name))
+            stats['elapsed_seconds'] = round(time.time() - started, 2)
+            with open(self._stamp_path(), 'w', encoding='utf-8') as f:
+                f.write(datetime.now().isoformat(timespec='seconds'))
+            return stats
+
+    def start_compactor(self, load_analysis_dates: Callable[[], Dict[str, datetime]],
+                        interval_seconds: float = COMPACT_INTERVAL_SECONDS,
+                        poll_seconds: float = COMPACT_POLL_SECONDS):
+        """워커마다 한 번 백그라운드 정리 스레드 시작 (실제 정리는 잠금을 잡은 한 프로세스만)
+
+        마지막 정리 시각은 locks/_compact.stamp에 남기므로 워커가 자주 재시작되어도 주기가 이어진다.
+        """
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+
+        def run():
+            while True:
+                time.sleep(poll_seconds)
+                if not self.compaction_due(interval_seconds):
+                    continue
+                try:
+                    stats = self.compact(load_analysis_dates(), min_interval=interval_seconds)
+                    if not stats.get('skipped'):
+                        logger.info(f"업로드 보관소 정리: {stats}")
+                except Exception as e:
+                    logger.error(f"업로드 보관소 정리 오류: {e}")
+
+        threading.Thread(target=run, name='upload-archive-compactor', daemon=True).start()
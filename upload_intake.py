@@ -0,0 +1,125 @@
+import hashlib
+import io
+import os
+import zipfile
+from typing import BinaryIO, Iterator, Tuple
+
+CHUNK_SIZE = 64 * 1024
+# xlsx(OOXML) 압축 해제 한도: 정상 성적표는 수십 개 파트, 수 MB 이내
+MAX_ZIP_ENTRIES = 500
+MAX_UNCOMPRESSED_SIZE = 100 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 200
+# 압축률 검사는 이 크기 이상 파트에만 (작은 XML은 압축률이 높게 나와도 무해)
+RATIO_CHECK_MIN_SIZE = 1024 * 1024
+REQUIRED_PARTS = ('[Content_Types].xml', 'xl/workbook.xml')
+ZIP_SIGNATURE = b'PK\x03\x04'
+
+
+class UploadRejected(Exception):
+    """업로드 파일 거부 (status: 응답 HTTP 코드)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class UploadIntake:
+    """검증을 통과한 업로드 내용과 SHA-256"""
+
+    def __init__(self, content: bytes, sha256: str, entries: int, uncompressed_size: int):
+        self.content = content
+        self.sha256 = sha256
+        self.entries = entries
+        self.uncompressed_size = uncompressed_size
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.content)
+
+
+def _limited_chunks(stream: BinaryIO, max_size: int) -> Iterator[bytes]:
+    """크기 한도를 넘는 순간 UploadRejected(413)로 중단하며 청크 단위로 읽음"""
+    size = 0
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        size += len(chunk)
+        if size > max_size:
+            raise UploadRejected(f"파일 크기는 {max_size // (1024 * 1024)}MB를 넘을 수 없습니다.", 413)
+        yield chunk
+
+
+def read_limited(stream: BinaryIO, max_size: int) -> Tuple[bytes, str]:
+    """크기 한도를 넘는 순간 중단하며 읽고 SHA-256을 함께 계산"""
+    buffer = io.BytesIO()
+    digest = hashlib.sha256()
+    for chunk in _limited_chunks(stream, max_size):
+        digest.update(chunk)
+        buffer.write(chunk)
+    return buffer.getvalue(), digest.hexdigest()
+
+
+def copy_limited(stream: BinaryIO, path: str, max_size: int) -> int:
+    """크기 한도를 확인하며 파일로 바로 복사하고 크기 반환 (대용량 업로드를 메모리에 올리지 않음)
+
+    한도를 넘거나 쓰기에 실패하면 만들던 파일을 지운다.
+    """
+    size = 0
+    try:
+        with open(path, 'wb') as f:
+            for chunk in _limited_chunks(stream, max_size):
+                f.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return size
+
+
+def check_xlsx_container(content: bytes) -> Tuple[int, int]:
+    """ZIP 서명과 중앙 디렉터리(항목 수/해제 크기/압축률/필수 파트) 검사, (항목 수, 해제 크기) 반환
+
+    압축을 풀지 않고 중앙 디렉터리만 읽는다. zipfile은 선언된 크기까지만 해제하므로
+    여기서 확인한 크기가 파서가 실제로 풀 수 있는 상한이 된다.
+    """
+    if not content.startswith(ZIP_SIGNATURE):
+        raise UploadRejected('올바른 Excel(.xlsx) 파일이 아닙니다.')
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            infos = archive.infolist()
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, ValueError) as e:
+        raise UploadRejected(f"손상된 Excel 파일입니다: {e}")
+
+    if len(infos) > MAX_ZIP_ENTRIES:
+        raise UploadRejected(f"Excel 파일 구성 항목이 너무 많습니다 ({len(infos)}개).")
+    total = 0
+    names = set()
+    for info in infos:
+        if info.flag_bits & 0x1:
+            raise UploadRejected('암호가 설정된 Excel 파일은 업로드할 수 없습니다.')
+        if info.file_size >= RATIO_CHECK_MIN_SIZE and \
+                info.file_size > max(info.compress_size, 1) * MAX_COMPRESSION_RATIO:
+            raise UploadRejected('비정상적으로 압축된 Excel 파일입니다.')
+        total += info.file_size
+        names.add(info.filename)
+    if total > MAX_UNCOMPRESSED_SIZE:
+        raise UploadRejected('Excel 파일의 압축 해제 크기가 너무 큽니다.')
+    missing = [part for part in REQUIRED_PARTS if part not in names]
+    if missing:
+        raise UploadRejected('Excel 통합문서(.xlsx) 형식이 아닙니다.')
+    return len(infos), total
+
+
+def intake_upload(stream: BinaryIO, max_size: int) -> UploadIntake:
+    """업로드 스트림을 크기 제한으로 읽고 xlsx 컨테이너를 검사 (디스크/파서 전 단계)"""
+    content, sha256 = read_limited(stream, max_size)
+    if not content:
+        raise UploadRejected('빈 파일입니다.')
+    entries, uncompressed = check_xlsx_container(content)
+    return UploadIntake(content, sha256, entries, uncompressed)